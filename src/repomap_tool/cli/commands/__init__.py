@@ -9,5 +9,6 @@ from .index import index
 from .search import search
 from .explore import explore
 from .inspect import inspect
+from .serve import serve
 
-__all__ = ["system", "index", "search", "explore", "inspect"]
+__all__ = ["system", "index", "search", "explore", "inspect", "serve"]
@@ -45,15 +45,14 @@ def create_exploration_controller_with_repomap(
     Returns:
         Properly configured ExplorationController instance
     """
-    from repomap_tool.core.container import create_container
     from repomap_tool.cli.controllers import ControllerConfig
     from repomap_tool.cli.services import get_service_factory
 
-    # Create DI container
-    container = create_container(config_obj)
+    # Get DI container (shared with the RepoMap service below)
+    service_factory = get_service_factory()
+    container = service_factory.get_container(config_obj)
 
     # Initialize RepoMap service (critical for controller dependencies)
-    service_factory = get_service_factory()
     repomap = service_factory.create_repomap_service(config_obj)
 
     # Create controller configuration
@@ -7,13 +7,27 @@ This module contains commands for project indexing and setup.
 """
 
 import sys
-from typing import Optional, Literal
+import time
+from typing import Any, List, Optional, Literal
 
 import click
 from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeElapsedColumn,
+)
 
 from ...models import create_error_response
 from ...core import RepoMapService
+from ...core.file_watcher import (
+    WATCH_BACKENDS,
+    FileChange,
+    create_file_watcher,
+    run_watch_loop,
+)
 from ..config.loader import (
     resolve_project_path,
     create_default_config,
@@ -70,10 +84,30 @@ def index() -> None:
 )
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
 @click.option("--max-workers", type=int, default=4, help="Maximum worker threads")
+@click.option(
+    "--executor",
+    type=click.Choice(["thread", "process"]),
+    default=None,
+    help="Parse with worker threads or processes (process scales with cores)",
+)
 @click.option(
     "--parallel-threshold", type=int, default=100, help="Parallel processing threshold"
 )
 @click.option("--no-progress", is_flag=True, help="Disable progress bars")
+@click.option(
+    "--no-comments", is_flag=True, help="Skip extracting comments for parsed tags"
+)
+@click.option(
+    "--git-index",
+    is_flag=True,
+    help="List files from the git index instead of walking the project tree",
+)
+@click.option(
+    "--embedding-batch-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Identifiers encoded per embedding model call",
+)
 @click.option("--no-monitoring", is_flag=True, help="Disable performance monitoring")
 @click.option("--allow-fallback", is_flag=True, help="Allow fallback to basic search")
 @click.option("--cache-size", type=int, default=1000, help="Maximum cache entries")
@@ -111,8 +145,12 @@ def create(
     output: str,
     verbose: bool,
     max_workers: int,
+    executor: Optional[str],
     parallel_threshold: int,
     no_progress: bool,
+    no_comments: bool,
+    git_index: bool,
+    embedding_batch_size: Optional[int],
     no_monitoring: bool,
     allow_fallback: bool,
     cache_size: int,
@@ -149,6 +187,10 @@ def create(
             no_progress=no_progress,
             no_monitoring=no_monitoring,
             log_level=log_level,
+            executor=executor,
+            no_comments=no_comments,
+            git_index=git_index,
+            embedding_batch_size=embedding_batch_size,
         )
 
         # Initialize RepoMap using service factory
@@ -160,6 +202,15 @@ def create(
         # Analyze project
         project_info = repomap.analyze_project()
 
+        index_stats = getattr(repomap, "index_stats", None)
+        if verbose and index_stats is not None:
+            console = get_index_console()
+            for name, stage in index_stats.stages.items():
+                console.print(
+                    f"[dim]{name}: {stage.items} files, "
+                    f"{index_stats.stage_throughput(name):.1f} files/s[/dim]"
+                )
+
         # Pre-compute embeddings during indexing
         if (
             hasattr(repomap, "embedding_matcher")
@@ -167,23 +218,19 @@ def create(
             and repomap.embedding_matcher.enabled
         ):
             console = get_index_console()
-            console.print("[cyan]Computing embeddings for all identifiers...[/cyan]")
 
             # Get all identifiers from tree-sitter cache
-            identifiers_with_files = {}
+            identifiers: List[str] = []
             if hasattr(repomap, "_get_cached_tags"):
-                tags = repomap._get_cached_tags()
-                for tag in tags:
-                    if tag.name and tag.file:
-                        identifiers_with_files[tag.name] = tag.file
-
-            # Batch compute and cache
-            if identifiers_with_files:
-                repomap.embedding_matcher.batch_compute_embeddings(
-                    identifiers_with_files
-                )
-                console.print(
-                    f"[green]✓ Cached embeddings for {len(identifiers_with_files)} identifiers[/green]"
+                identifiers = [
+                    tag.name
+                    for tag in repomap._get_cached_tags()
+                    if tag.name and tag.file
+                ]
+
+            if identifiers:
+                _precompute_embeddings(
+                    repomap.embedding_matcher, identifiers, console, not no_progress
                 )
             else:
                 console.print(
@@ -215,3 +262,125 @@ def create(
         output_config = OutputConfig(format=OutputFormat.TEXT)
         output_manager.display_error(e, output_config)
         sys.exit(1)
+
+
+def _precompute_embeddings(
+    embedding_matcher: Any,
+    identifiers: List[str],
+    console: Console,
+    show_progress: bool,
+) -> None:
+    """Embed the identifiers the embedding cache lacks, reporting progress.
+
+    Batches are persisted as they finish, so rerunning an interrupted
+    ``index create`` only embeds what is still missing.
+    """
+    console.print("[cyan]Computing embeddings for missing identifiers...[/cyan]")
+    if show_progress:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.completed]{task.completed}/{task.total}"),
+            TextColumn("•"),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Embedding identifiers", total=None)
+
+            def advance(done: int, missing: int) -> None:
+                progress.update(task, completed=done, total=missing)
+
+            stats = embedding_matcher.precompute_embeddings(
+                identifiers, progress=advance
+            )
+    else:
+        stats = embedding_matcher.precompute_embeddings(identifiers)
+
+    console.print(
+        f"[green]✓ Cached embeddings for {int(stats['total'])} identifiers: "
+        f"{int(stats['computed'])} computed, {int(stats['cached'])} already cached "
+        f"({stats['identifiers_per_second']:.1f} identifiers/s)[/green]"
+    )
+    if stats["failed"]:
+        console.print(
+            f"[yellow]{int(stats['failed'])} identifiers failed to embed; "
+            "rerun to retry them[/yellow]"
+        )
+
+
+@index.command()
+@click.argument(
+    "project_path",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True),
+    required=False,
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True),
+    help="Configuration file (JSON/YAML)",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(WATCH_BACKENDS),
+    default="auto",
+    help="File watching backend (native requires watchdog)",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.05),
+    default=1.0,
+    help="Polling interval in seconds (polling backend)",
+)
+@click.option("--verbose", "-v", is_flag=True, help="Verbose output")
+def watch(
+    project_path: Optional[str],
+    config: Optional[str],
+    backend: str,
+    interval: float,
+    verbose: bool,
+) -> None:
+    """Keep the project index up to date as files change."""
+
+    try:
+        resolved_project_path = resolve_project_path(project_path, config)
+        config_obj, _ = load_or_create_config(
+            project_path=resolved_project_path,
+            config_file=config,
+            create_if_missing=True,
+            verbose=verbose,
+        )
+
+        from repomap_tool.cli.services import get_service_factory
+
+        repomap = get_service_factory().create_repomap_service(config_obj)
+        repomap.enable_live_index()
+
+        project_root = str(config_obj.project_root)
+        watcher = create_file_watcher(project_root, backend=backend, interval=interval)
+        console = get_index_console()
+        console.print(
+            f"[cyan]Watching {project_root} with {type(watcher).__name__} "
+            "(Ctrl+C to stop)[/cyan]"
+        )
+
+        def apply(changes: List[FileChange]) -> None:
+            start = time.perf_counter()
+            stats = repomap.apply_file_changes(changes)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            console.print(
+                f"[green]✓[/green] {stats['created']} created, "
+                f"{stats['modified']} modified, {stats['deleted']} deleted "
+                f"({elapsed_ms:.0f}ms)"
+            )
+
+        run_watch_loop(watcher, apply)
+
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        output_manager = get_output_manager()
+        output_config = OutputConfig(format=OutputFormat.TEXT)
+        output_manager.display_error(e, output_config)
+        sys.exit(1)
@@ -198,11 +198,11 @@ def centrality(
             output_manager.display_progress("📁 Inspecting all files")
 
         # Use DI container to get Controllers
-        from repomap_tool.core.container import create_container
         from repomap_tool.cli.controllers import ControllerConfig
+        from repomap_tool.cli.services import get_service_factory
 
-        # Create DI container and get Controller
-        container = create_container(config_obj)
+        # Get (possibly warm) DI container and Controller
+        container = get_service_factory().get_container(config_obj)
         centrality_controller = container.centrality_controller()
 
         # Configure Controller
@@ -318,11 +318,11 @@ def impact(
         output_manager.display_progress(f"📁 Target files: {', '.join(files)}")
 
         # Use DI container to get Controllers
-        from repomap_tool.core.container import create_container
         from repomap_tool.cli.controllers import ControllerConfig
+        from repomap_tool.cli.services import get_service_factory
 
-        # Create DI container and get Controller
-        container = create_container(config_obj)
+        # Get (possibly warm) DI container and Controller
+        container = get_service_factory().get_container(config_obj)
         impact_controller = container.impact_controller()
 
         # Configure Controller
@@ -147,7 +147,6 @@ def search(
                 ControllerConfig,
                 AnalysisType,
             )
-            from repomap_tool.core.container import create_container
 
             progress.update(task, description="Creating service factory...")
             service_factory = get_service_factory()
@@ -158,7 +157,7 @@ def search(
             progress.update(
                 task, description="Loading dependency injection container..."
             )
-            container = create_container(config_obj)
+            container = service_factory.get_container(config_obj)
 
             progress.update(task, description="Initializing fuzzy matcher...")
             fuzzy_matcher = container.fuzzy_matcher()
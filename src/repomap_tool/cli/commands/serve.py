@@ -0,0 +1,139 @@
+"""
+Daemon command for RepoMap-Tool CLI.
+
+This module contains the ``serve`` command, which keeps indexes, dependency
+graphs and embedding models resident so that other commands run in
+milliseconds instead of seconds.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import click
+
+from ...core.file_watcher import (
+    WATCH_BACKENDS,
+    FileChange,
+    NativeWatcher,
+    PollingWatcher,
+    create_file_watcher,
+    run_watch_loop,
+)
+from ..daemon import (
+    SOCKET_ENV_VAR,
+    DaemonServer,
+    default_socket_path,
+    request_daemon,
+)
+from ..utils.console import get_console
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    envvar=SOCKET_ENV_VAR,
+    default=None,
+    help=f"Unix socket path (default: ${SOCKET_ENV_VAR} or a per-user path)",
+)
+@click.option(
+    "--watch",
+    "watch_paths",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False, dir_okay=True),
+    help="Project to watch for changes and keep indexed in memory (repeatable)",
+)
+@click.option(
+    "--watch-backend",
+    type=click.Choice(WATCH_BACKENDS),
+    default="auto",
+    help="File watching backend (native requires watchdog)",
+)
+@click.option("--stop", is_flag=True, help="Stop the daemon listening on the socket")
+@click.option("--status", is_flag=True, help="Report whether a daemon is running")
+@click.pass_context
+def serve(
+    ctx: click.Context,
+    socket_path: Optional[str],
+    watch_paths: Tuple[str, ...],
+    watch_backend: str,
+    stop: bool,
+    status: bool,
+) -> None:
+    """Run a background daemon that keeps analysis state in memory.
+
+    Point clients at it with REPOMAP_DAEMON_SOCKET; every other command is
+    then forwarded to the daemon and falls back to local execution when the
+    daemon is unreachable.
+    """
+    console = get_console(ctx)
+    socket_path = socket_path or default_socket_path()
+
+    if stop or status:
+        response = request_daemon(
+            socket_path, {"op": "shutdown" if stop else "ping"}, timeout=5.0
+        )
+        if response is None:
+            console.print(f"[yellow]No daemon running on {socket_path}[/yellow]")
+            sys.exit(1)
+        if stop:
+            console.print(f"[green]Stopped daemon on {socket_path}[/green]")
+        else:
+            console.print(
+                f"[green]Daemon running on {socket_path}[/green] "
+                f"(pid {response['pid']}, {response['served']} requests served)"
+            )
+        return
+
+    server = DaemonServer(socket_path, ctx.find_root().command)
+    try:
+        server.bind()
+    except (OSError, RuntimeError) as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+
+    for watch_path in watch_paths:
+        project_root = str(Path(watch_path).resolve())
+        try:
+            watcher = create_file_watcher(project_root, backend=watch_backend)
+        except ImportError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            server.close()
+            sys.exit(1)
+        threading.Thread(
+            target=_watch_project,
+            args=(server, project_root, watcher),
+            name=f"repomap-watch-{project_root}",
+            daemon=True,
+        ).start()
+        console.print(f"[cyan]Watching {project_root}[/cyan]")
+
+    console.print(f"[green]Serving on {socket_path}[/green]")
+    console.print(f"export {SOCKET_ENV_VAR}={socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+
+
+def _watch_project(
+    server: DaemonServer,
+    project_root: str,
+    watcher: Union[PollingWatcher, NativeWatcher],
+) -> None:
+    """Apply file changes to every warm service for a project."""
+    from repomap_tool.cli.services import get_service_factory
+
+    factory = get_service_factory()
+    with server.lock:
+        factory.enable_live_index(project_root)
+
+    def apply(changes: List[FileChange]) -> None:
+        with server.lock:
+            for service in factory.get_repomap_services(project_root):
+                service.apply_file_changes(changes)
+
+    run_watch_loop(watcher, apply, stop_event=server.stopped)
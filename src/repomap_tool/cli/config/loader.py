@@ -411,6 +411,10 @@ def apply_environment_overrides(config: RepoMapConfig) -> RepoMapConfig:
         except ValueError:
             pass
 
+    embedding_backend_env = os.environ.get("REPOMAP_EMBEDDING_BACKEND")
+    if embedding_backend_env in ("sentence-transformers", "hashing"):
+        config.embedding.backend = embedding_backend_env  # type: ignore
+
     refresh_cache_env = os.environ.get("REPOMAP_REFRESH_CACHE")
     if refresh_cache_env:
         config.refresh_cache = refresh_cache_env.lower() in ("true", "1", "yes")
@@ -498,6 +502,14 @@ def apply_cli_overrides(
         config.semantic_match.enabled = kwargs["semantic_enabled"]
     if "max_workers" in kwargs:
         config.performance.max_workers = kwargs["max_workers"]
+    if kwargs.get("executor") is not None:
+        config.performance.executor = kwargs["executor"]
+    if kwargs.get("no_comments"):
+        config.performance.extract_comments = False
+    if kwargs.get("git_index"):
+        config.performance.use_git_index = True
+    if kwargs.get("embedding_batch_size") is not None:
+        config.embedding.batch_size = kwargs["embedding_batch_size"]
 
     # Override performance settings if provided
     if cache_size is not None:
@@ -0,0 +1,348 @@
+"""
+Long-running daemon that keeps RepoMap services warm between CLI calls.
+
+Starting ``repomap-tool`` pays for imports, container wiring, tag loading,
+graph construction and (for semantic search) loading an embedding model.
+The daemon pays those costs once: it listens on a Unix socket and runs each
+forwarded command in-process, so the service factory's cached services,
+containers and models are reused by every later request.
+
+Clients opt in by exporting ``REPOMAP_DAEMON_SOCKET``. When the daemon is not
+reachable the CLI silently falls back to running the command locally.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import click
+
+from repomap_tool.core.logging_service import get_logger
+from repomap_tool.core.project_snapshot import refresh_project_snapshots
+
+logger = get_logger(__name__)
+
+SOCKET_ENV_VAR = "REPOMAP_DAEMON_SOCKET"
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+_HEADER = struct.Struct("!I")
+
+
+def default_socket_path() -> str:
+    """Return the default daemon socket path for the current user."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime_dir) if runtime_dir else Path.home() / ".repomap-tool"
+    return str(base / "repomap-tool.sock")
+
+
+def send_message(sock: socket.socket, payload: Dict[str, Any]) -> None:
+    """Send a length-prefixed JSON message."""
+    data = json.dumps(payload).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Receive a length-prefixed JSON message.
+
+    Returns:
+        Decoded message, or None if the peer closed the connection
+    """
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message of {length} bytes exceeds limit")
+    data = _recv_exact(sock, length)
+    if data is None:
+        return None
+    message: Dict[str, Any] = json.loads(data.decode("utf-8"))
+    return message
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def request_daemon(
+    socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon and wait for its response.
+
+    Args:
+        socket_path: Path to the daemon's Unix socket
+        request: Request payload
+        timeout: Optional socket timeout in seconds
+
+    Returns:
+        Response payload, or None if the daemon is not reachable
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            send_message(sock, request)
+            return recv_message(sock)
+    except (FileNotFoundError, ConnectionRefusedError, socket.timeout) as e:
+        logger.debug(f"Daemon at {socket_path} not reachable: {e}")
+        return None
+
+
+def forward_to_daemon(
+    argv: Sequence[str], socket_path: str
+) -> Optional[Dict[str, Any]]:
+    """Run a CLI invocation on the daemon.
+
+    Args:
+        argv: Command line arguments, without the program name
+        socket_path: Path to the daemon's Unix socket
+
+    Returns:
+        Response with ``stdout``, ``stderr`` and ``exit_code``, or None if
+        the daemon is not reachable
+    """
+    columns = os.environ.get("COLUMNS")
+    if columns is None and sys.stdout.isatty():
+        columns = str(os.get_terminal_size(sys.stdout.fileno()).columns)
+    return request_daemon(
+        socket_path,
+        {"op": "run", "argv": list(argv), "cwd": os.getcwd(), "columns": columns},
+    )
+
+
+class DaemonClientGroup(click.Group):
+    """Click group that forwards invocations to a running daemon.
+
+    Forwarding only happens for real command-line runs (``standalone_mode``)
+    when ``REPOMAP_DAEMON_SOCKET`` is set, so the daemon itself and
+    programmatic callers always execute locally.
+    """
+
+    def main(
+        self,
+        args: Optional[Sequence[str]] = None,
+        prog_name: Optional[str] = None,
+        complete_var: Optional[str] = None,
+        standalone_mode: bool = True,
+        **extra: Any,
+    ) -> Any:
+        socket_path = os.environ.get(SOCKET_ENV_VAR)
+        if socket_path and standalone_mode:
+            argv = list(sys.argv[1:] if args is None else args)
+            if argv[:1] != ["serve"]:
+                response = forward_to_daemon(argv, socket_path)
+                if response is not None:
+                    sys.stdout.write(response.get("stdout", ""))
+                    sys.stderr.write(response.get("stderr", ""))
+                    sys.stdout.flush()
+                    sys.exit(response.get("exit_code", 1))
+        return super().main(
+            args, prog_name, complete_var, standalone_mode=standalone_mode, **extra
+        )
+
+
+class DaemonServer:
+    """Serve CLI invocations over a Unix socket from a single warm process.
+
+    Requests are handled one at a time: commands change the working
+    directory and redirect the standard streams, which are process-wide.
+    Background work on the shared services (such as applying file changes)
+    must hold ``lock`` so it never overlaps a request.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        command: click.Command,
+        prog_name: str = "repomap-tool",
+    ):
+        """
+        Initialize the daemon server.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            command: Root click command used to run forwarded invocations
+            prog_name: Program name shown in usage messages
+        """
+        if not socket_path:
+            raise ValueError("socket_path must not be empty")
+        self.socket_path = socket_path
+        self.command = command
+        self.prog_name = prog_name
+        self.requests_served = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._running = False
+
+    def bind(self) -> None:
+        """Create and bind the listening socket.
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the path
+        """
+        path = Path(self.socket_path)
+        if path.exists():
+            if request_daemon(self.socket_path, {"op": "ping"}, timeout=1.0):
+                raise RuntimeError(f"A daemon is already running on {path}")
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(path))
+        os.chmod(path, 0o600)
+        sock.listen()
+        self._sock = sock
+        logger.debug(f"Daemon listening on {path}")
+
+    def serve_forever(self) -> None:
+        """Accept and handle requests until a shutdown request arrives."""
+        if self._sock is None:
+            self.bind()
+        assert self._sock is not None
+
+        self._running = True
+        try:
+            while self._running:
+                conn, _ = self._sock.accept()
+                with conn:
+                    try:
+                        request = recv_message(conn)
+                        if request is None:
+                            continue
+                        with self.lock:
+                            response = self.handle_request(request)
+                        send_message(conn, response)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Failed to handle daemon request: {e}")
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Close the listening socket and remove the socket file."""
+        self._running = False
+        self.stopped.set()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a decoded request.
+
+        Args:
+            request: Request payload with an ``op`` field
+
+        Returns:
+            Response payload
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "served": self.requests_served}
+        if op == "shutdown":
+            self._running = False
+            return {"ok": True}
+        if op == "run":
+            response = self.run_command(
+                request.get("argv", []),
+                cwd=request.get("cwd"),
+                columns=request.get("columns"),
+            )
+            self.requests_served += 1
+            return response
+        return {"ok": False, "error": f"Unknown operation: {op!r}"}
+
+    def run_command(
+        self,
+        argv: List[str],
+        cwd: Optional[str] = None,
+        columns: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run a CLI invocation in-process and capture its output.
+
+        Args:
+            argv: Command line arguments, without the program name
+            cwd: Client working directory used to resolve relative paths
+            columns: Client terminal width for rich output
+
+        Returns:
+            Response with ``stdout``, ``stderr``, ``exit_code`` and the
+            server-side ``elapsed_ms``
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        saved_cwd = os.getcwd()
+        saved_stdin = sys.stdin
+        saved_columns = os.environ.get("COLUMNS")
+        start = time.perf_counter()
+        exit_code = 0
+
+        try:
+            if cwd:
+                os.chdir(cwd)
+            if columns:
+                os.environ["COLUMNS"] = str(columns)
+            # Never block on prompts: the client's stdin is not forwarded
+            sys.stdin = io.StringIO()
+            # Project listings and warm services are shared across requests;
+            # catch up with files changed since the previous one
+            refresh_project_snapshots()
+            from repomap_tool.cli.services import get_service_factory
+
+            get_service_factory().refresh_indexes()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    result = self.command.main(
+                        args=argv, prog_name=self.prog_name, standalone_mode=False
+                    )
+                    if isinstance(result, int):
+                        exit_code = result
+                except click.ClickException as e:
+                    e.show(file=stderr)
+                    exit_code = e.exit_code
+                except click.exceptions.Exit as e:
+                    exit_code = e.exit_code
+                except click.Abort:
+                    stderr.write("Aborted!\n")
+                    exit_code = 1
+                except SystemExit as e:
+                    code = e.code
+                    if isinstance(code, int):
+                        exit_code = code
+                    elif code is not None:
+                        stderr.write(f"{code}\n")
+                        exit_code = 1
+                except Exception:
+                    traceback.print_exc(file=stderr)
+                    exit_code = 1
+        finally:
+            sys.stdin = saved_stdin
+            os.chdir(saved_cwd)
+            if saved_columns is None:
+                os.environ.pop("COLUMNS", None)
+            else:
+                os.environ["COLUMNS"] = saved_columns
+
+        return {
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+            "exit_code": exit_code,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
@@ -18,10 +18,12 @@ from .commands.index import index
 from .commands.search import search
 from .commands.explore import explore
 from .commands.inspect import inspect
+from .commands.serve import serve
+from .daemon import DaemonClientGroup
 from .utils.console import ConsoleProvider, RichConsoleFactory
 
 
-@click.group()
+@click.group(cls=DaemonClientGroup)
 @click.option("--no-color", is_flag=True, help="Disable colored output")
 @click.pass_context
 def cli(ctx: click.Context, no_color: bool) -> None:
@@ -40,6 +42,7 @@ cli.add_command(index)
 cli.add_command(search)
 cli.add_command(explore)
 cli.add_command(inspect)
+cli.add_command(serve)
 
 
 if __name__ == "__main__":
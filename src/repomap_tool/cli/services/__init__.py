@@ -10,9 +10,12 @@ from .service_factory import (
     get_service_factory,
     clear_service_cache,
 )
+from ..daemon import DaemonServer, DaemonClientGroup
 
 __all__ = [
     "ServiceFactory",
     "get_service_factory",
     "clear_service_cache",
+    "DaemonServer",
+    "DaemonClientGroup",
 ]
@@ -5,6 +5,7 @@ This module provides a centralized way to create services for CLI commands
 using the dependency injection container.
 """
 
+import hashlib
 import logging
 from repomap_tool.core.logging_service import get_logger
 from typing import Optional, Any
@@ -32,6 +33,35 @@ class ServiceFactory:
         """Initialize the service factory."""
         self._containers: dict[str, Any] = {}
         self._services: dict[str, Any] = {}
+        self._live_roots: set[str] = set()
+
+    @staticmethod
+    def _cache_key(prefix: str, config: RepoMapConfig) -> str:
+        """Build a cache key unique to the project root and configuration.
+
+        Keying on the full configuration keeps a long-lived process (such as
+        the ``serve`` daemon) from handing out a service built with different
+        options for the same project.
+        """
+        digest = hashlib.sha1(config.model_dump_json().encode()).hexdigest()[:12]
+        return f"{prefix}_{config.project_root}_{digest}"
+
+    def get_container(self, config: RepoMapConfig) -> Any:
+        """Get the DI container for a configuration, creating it once.
+
+        Args:
+            config: RepoMap configuration
+
+        Returns:
+            Container whose singletons are shared by every service of this
+            configuration
+        """
+        cache_key = self._cache_key("container", config)
+        container = self._containers.get(cache_key)
+        if container is None:
+            container = create_container(config)
+            self._containers[cache_key] = container
+        return container
 
     def create_repomap_service(self, config: RepoMapConfig) -> RepoMapService:
         """Create a RepoMapService with all dependencies injected.
@@ -42,13 +72,12 @@ class ServiceFactory:
         Returns:
             RepoMapService instance with injected dependencies
         """
-        cache_key = f"repomap_{config.project_root}"
+        cache_key = self._cache_key("repomap", config)
 
         if cache_key in self._services:
             return self._services[cache_key]  # type: ignore
         # Create DI container
-        container = create_container(config)
-        self._containers[cache_key] = container
+        container = self.get_container(config)
 
         # Get all dependencies from container
         console: Console = container.console()
@@ -83,10 +112,57 @@ class ServiceFactory:
             spellchecker_service=spellchecker_service,
         )
 
+        if str(config.project_root) in self._live_roots:
+            service.enable_live_index()
+
         self._services[cache_key] = service
         logger.debug(f"Created RepoMapService for {config.project_root}")
         return service
 
+    def get_repomap_services(self, project_root: str) -> list[RepoMapService]:
+        """Get every cached RepoMapService for a project.
+
+        Args:
+            project_root: Project root directory
+
+        Returns:
+            Services created for this project, one per configuration
+        """
+        root = str(Path(project_root).resolve())
+        return [
+            service
+            for key, service in self._services.items()
+            if key.startswith("repomap_") and str(service.config.project_root) == root
+        ]
+
+    def enable_live_index(self, project_root: str) -> None:
+        """Keep a project's tags in memory for current and future services.
+
+        Args:
+            project_root: Project root directory whose changes are watched
+        """
+        self._live_roots.add(str(Path(project_root).resolve()))
+        for service in self.get_repomap_services(project_root):
+            service.enable_live_index()
+
+    def refresh_indexes(self) -> None:
+        """Bring every cached service of an unwatched project up to date.
+
+        Services of projects with a live index are kept current by their
+        watcher; the others re-index the files changed since they last ran.
+        """
+        for key, service in list(self._services.items()):
+            if not key.startswith("repomap_"):
+                continue
+            if str(service.config.project_root) in self._live_roots:
+                continue
+            try:
+                service.refresh_index()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to refresh index for {service.config.project_root}: {e}"
+                )
+
     def create_entrypoint_discoverer(
         self, repo_map_service: RepoMapService, config: RepoMapConfig
     ) -> EntrypointDiscoverer:
@@ -99,16 +175,13 @@ class ServiceFactory:
         Returns:
             EntrypointDiscoverer instance with injected dependencies
         """
-        cache_key = f"discoverer_{config.project_root}"
+        cache_key = self._cache_key("discoverer", config)
 
         if cache_key in self._services:
             return self._services[cache_key]  # type: ignore
 
-        # Get container (reuse existing one for this project)
-        container = self._containers.get(f"repomap_{config.project_root}")
-        if container is None:
-            container = create_container(config)
-            self._containers[f"repomap_{config.project_root}"] = container
+        # Get container (reuse existing one for this configuration)
+        container = self.get_container(config)
 
         # Get dependencies from container
         import_analyzer = container.import_analyzer()
@@ -142,7 +215,7 @@ class ServiceFactory:
         Returns:
             TreeBuilder instance with injected dependencies
         """
-        cache_key = f"tree_builder_{config.project_root}"
+        cache_key = self._cache_key("tree_builder", config)
 
         if cache_key in self._services:
             return self._services[cache_key]  # type: ignore
@@ -174,16 +247,13 @@ class ServiceFactory:
         Returns:
             TreeManager instance with injected dependencies
         """
-        cache_key = f"tree_manager_{config.project_root}"
+        cache_key = self._cache_key("tree_manager", config)
 
         if cache_key in self._services:
             return self._services[cache_key]  # type: ignore
 
-        # Get container (reuse existing one for this project)
-        container = self._containers.get(f"repomap_{config.project_root}")
-        if container is None:
-            container = create_container(config)
-            self._containers[f"repomap_{config.project_root}"] = container
+        # Get container (reuse existing one for this configuration)
+        container = self.get_container(config)
 
         # Get dependencies from container
         session_manager = container.session_manager()
@@ -209,19 +279,16 @@ class ServiceFactory:
         Returns:
             FuzzyMatcher instance with injected dependencies
         """
-        cache_key = f"fuzzy_matcher_{config.project_root}"
+        cache_key = self._cache_key("fuzzy_matcher", config)
 
         if cache_key in self._services:
             return self._services[cache_key]  # type: ignore
 
-        # Get container (reuse existing one for this project)
-        container = self._containers.get(f"repomap_{config.project_root}")
-        if container is None:
-            container = create_container(config)
-            self._containers[f"repomap_{config.project_root}"] = container
+        # Get container (reuse existing one for this configuration)
+        container = self.get_container(config)
 
         # Get fuzzy matcher from container
-        fuzzy_matcher = container.fuzzy_matcher()
+        fuzzy_matcher: FuzzyMatcher = container.fuzzy_matcher()
         self._services[cache_key] = fuzzy_matcher
         logger.debug(f"Created FuzzyMatcher for {config.project_root}")
         return fuzzy_matcher
@@ -235,16 +302,13 @@ class ServiceFactory:
         Returns:
             LLM analyzer instance
         """
-        cache_key = f"llm_analyzer_{config.project_root}"
+        cache_key = self._cache_key("llm_analyzer", config)
 
         if cache_key in self._services:
             return self._services[cache_key]
 
-        # Get container (reuse existing one for this project)
-        container = self._containers.get(f"repomap_{config.project_root}")
-        if container is None:
-            container = create_container(config)
-            self._containers[f"repomap_{config.project_root}"] = container
+        # Get container (reuse existing one for this configuration)
+        container = self.get_container(config)
 
         # Get LLM analyzer from container
         llm_analyzer = container.llm_file_analyzer()
@@ -263,10 +327,9 @@ class ServiceFactory:
             self._services.clear()
             logger.debug("Cleared all service caches")
         else:
-            keys_to_remove = [k for k in self._containers.keys() if project_root in k]
-            for key in keys_to_remove:
-                self._containers.pop(key, None)
-                self._services.pop(key, None)
+            for cache in (self._containers, self._services):
+                for key in [k for k in cache if project_root in k]:
+                    cache.pop(key, None)
             logger.debug(f"Cleared service cache for {project_root}")
 
 
@@ -31,6 +31,7 @@ from .models import (
     AnalysisFormat,
     FileImpactAnalysis,
     FileCentralityAnalysis,
+    ParsedFile,
 )
 
 # Core classes - always available for basic functionality
@@ -53,6 +54,7 @@ __all__ = [
     "ImpactReport",
     "BreakingChangeRisk",
     "FileAnalysisResult",
+    "ParsedFile",
     "CrossFileRelationship",
     "FileImpactAnalysis",
     "FileCentralityAnalysis",
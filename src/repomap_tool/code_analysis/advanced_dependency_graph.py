@@ -9,7 +9,7 @@ import logging
 from ..core.config_service import get_config
 from ..core.logging_service import get_logger
 from typing import List, Dict, Set, Optional, Any, Tuple
-from collections import defaultdict, deque
+from collections import Counter, defaultdict, deque
 
 from .dependency_graph import DependencyGraph
 from .call_graph_builder import CallGraphBuilder
@@ -29,6 +29,9 @@ class AdvancedDependencyGraph(DependencyGraph):
         self.function_dependencies: Dict[str, Set[str]] = {}
         self.function_dependents: Dict[str, Set[str]] = {}
         self.centrality_scores: Dict[str, float] = {}
+        # Number of calls behind each (caller, callee) edge, so removing one
+        # file's calls only drops edges no other call still supports
+        self._call_edge_counts: Counter[Tuple[str, str]] = Counter()
 
         logger.debug("AdvancedDependencyGraph initialized")
 
@@ -59,19 +62,18 @@ class AdvancedDependencyGraph(DependencyGraph):
             # Initialize maps
             self.function_dependencies = defaultdict(set)
             self.function_dependents = defaultdict(set)
+            self._call_edge_counts = Counter()
 
             # Process all function calls
             for call in self.call_graph.function_calls:
-                if (
-                    call.caller
-                    and call.callee
-                    and call.caller != "unknown"
-                    and call.callee != "unknown"
-                ):
+                edge = self._call_edge(call)
+                if edge:
+                    caller, callee = edge
+                    self._call_edge_counts[edge] += 1
                     # caller depends on callee
-                    self.function_dependencies[call.caller].add(call.callee)
+                    self.function_dependencies[caller].add(callee)
                     # callee is depended on by caller
-                    self.function_dependents[call.callee].add(call.caller)
+                    self.function_dependents[callee].add(caller)
 
             logger.info(
                 f"Built function dependency maps: {len(self.function_dependencies)} functions"
@@ -80,6 +82,136 @@ class AdvancedDependencyGraph(DependencyGraph):
         except Exception as e:
             logger.error(f"Error building function dependency maps: {e}")
 
+    @staticmethod
+    def _call_edge(call: FunctionCall) -> Optional[Tuple[str, str]]:
+        """Get the (caller, callee) edge a call contributes, if any."""
+        if (
+            call.caller
+            and call.callee
+            and call.caller != "unknown"
+            and call.callee != "unknown"
+        ):
+            return (call.caller, call.callee)
+        return None
+
+    def add_file(self, file_path: str) -> None:
+        """Add a file to the graph and its calls to the call graph.
+
+        Args:
+            file_path: Path to the file to add
+        """
+        super().add_file(file_path)
+        self._refresh_file_calls(file_path)
+
+    def update_file(self, file_path: str) -> None:
+        """Re-analyze a changed file's imports and calls.
+
+        Args:
+            file_path: Path to the modified file
+        """
+        if file_path not in self.nodes:
+            self.add_file(file_path)
+            return
+        super().update_file(file_path)
+        self._refresh_file_calls(file_path)
+
+    def remove_file(self, file_path: str) -> None:
+        """Remove a file and its calls from the graphs.
+
+        Args:
+            file_path: Path to the file to remove
+        """
+        super().remove_file(file_path)
+        self.replace_file_calls(file_path, [])
+
+    def _refresh_file_calls(self, file_path: str) -> None:
+        """Re-extract one file's calls if a call graph has been built."""
+        if self.call_graph is None:
+            return
+
+        from .file_filter import FileFilter
+
+        calls: List[FunctionCall] = []
+        # Same filter build_call_graph applies to the whole project
+        if FileFilter.filter_analyzable_files([file_path], exclude_tests=True):
+            calls = self.call_graph_builder.analyze_file_calls(file_path)
+        self.replace_file_calls(file_path, calls)
+
+    def replace_file_calls(self, file_path: str, calls: List[FunctionCall]) -> None:
+        """Replace the calls made from one file in the integrated call graph.
+
+        Function maps and locations are adjusted for the old and new calls
+        only, rather than rebuilt from every call in the project.
+
+        Args:
+            file_path: File whose calls changed
+            calls: The file's current calls (empty if it was deleted)
+        """
+        if self.call_graph is None:
+            return
+
+        old_calls = [
+            c for c in self.call_graph.function_calls if c.file_path == file_path
+        ]
+        if not old_calls and not calls:
+            return
+
+        self.call_graph.function_calls = [
+            c for c in self.call_graph.function_calls if c.file_path != file_path
+        ] + list(calls)
+
+        locations = self.call_graph.function_locations
+        for call in old_calls:
+            if call.caller and locations.get(call.caller) == file_path:
+                del locations[call.caller]
+            edge = self._call_edge(call)
+            if edge is None:
+                continue
+            self._call_edge_counts[edge] -= 1
+            if self._call_edge_counts[edge] <= 0:
+                del self._call_edge_counts[edge]
+                caller, callee = edge
+                self._discard_function_edge(self.function_dependencies, caller, callee)
+                self._discard_function_edge(self.function_dependents, callee, caller)
+
+        for call in calls:
+            if call.caller and call.caller != "unknown":
+                locations[call.caller] = file_path
+            edge = self._call_edge(call)
+            if edge is None:
+                continue
+            caller, callee = edge
+            self._call_edge_counts[edge] += 1
+            self.function_dependencies.setdefault(caller, set()).add(callee)
+            self.function_dependents.setdefault(callee, set()).add(caller)
+
+        node = self.nodes.get(file_path)
+        if node is not None:
+            node.functions = list(
+                dict.fromkeys(
+                    call.caller
+                    for call in calls
+                    if call.caller and locations.get(call.caller) == file_path
+                )
+            )
+            node.structural_info = {
+                "function_count": len(node.functions),
+                "function_dependencies": self._get_file_function_dependencies(
+                    file_path
+                ),
+                "function_dependents": self._get_file_function_dependents(file_path),
+            }
+
+    @staticmethod
+    def _discard_function_edge(
+        edges: Dict[str, Set[str]], source: str, target: str
+    ) -> None:
+        targets = edges.get(source)
+        if targets is not None:
+            targets.discard(target)
+            if not targets:
+                del edges[source]
+
     def _update_nodes_with_function_info(self) -> None:
         """Update dependency nodes with function information from call graph."""
         if not self.call_graph:
@@ -625,5 +757,6 @@ class AdvancedDependencyGraph(DependencyGraph):
         self.call_graph = None
         self.function_dependencies.clear()
         self.function_dependents.clear()
+        self._call_edge_counts.clear()
         self.centrality_scores.clear()
         logger.info("Advanced dependency graph cleared")
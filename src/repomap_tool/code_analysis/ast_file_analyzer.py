@@ -38,11 +38,16 @@ class AnalysisType(str, Enum):
 class ASTFileAnalyzer:
     """Tree-sitter-based analyzer for individual files and cross-file relationships."""
 
-    def __init__(self, project_root: Optional[str] = None):
+    def __init__(
+        self,
+        project_root: Optional[str] = None,
+        tree_sitter_parser: Optional[Any] = None,
+    ):
         """Initialize the tree-sitter file analyzer.
 
         Args:
             project_root: Root path of the project for resolving relative imports
+            tree_sitter_parser: Shared TreeSitterParser; a private one is created if omitted
         """
         # Ensure project_root is always a string, not a ConfigurationOption
         self.project_root = str(project_root) if project_root is not None else None
@@ -51,9 +56,12 @@ class ASTFileAnalyzer:
         self.cache_enabled = True
 
         # Initialize tree-sitter parser
-        from .tree_sitter_parser import TreeSitterParser
+        if tree_sitter_parser is None:
+            from .tree_sitter_parser import TreeSitterParser
 
-        self.tree_sitter_parser = TreeSitterParser()
+            tree_sitter_parser = TreeSitterParser()
+
+        self.tree_sitter_parser = tree_sitter_parser
 
         logger.debug(
             f"ASTFileAnalyzer initialized with tree-sitter for project: {self.project_root}"
@@ -81,30 +89,25 @@ class ASTFileAnalyzer:
             # Resolve file path
             full_path = self._resolve_file_path(file_path)
 
+            # Read and parse once via the shared per-file analysis
+            parsed = self.tree_sitter_parser.analyze_file(full_path)
+            tags = parsed.tags
+
             # Check for syntax errors first
             analysis_errors = []
-            try:
-                with open(full_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
+            if parsed.error:
+                analysis_errors.append(f"File read error: {parsed.error}")
+            elif full_path.endswith(".py"):
                 # Try to parse Python files for syntax errors
-                if full_path.endswith(".py"):
-                    try:
-                        compile(content, full_path, "exec")
-                    except SyntaxError as e:
-                        analysis_errors.append(
-                            f"Syntax error at line {e.lineno}: {e.msg}"
-                        )
-                    except Exception as e:
-                        analysis_errors.append(f"Parse error: {str(e)}")
-            except Exception as e:
-                analysis_errors.append(f"File read error: {str(e)}")
-
-            # Use TreeSitterParser directly for tag extraction
-            tags = self.tree_sitter_parser.parse_file(full_path)
+                try:
+                    compile(parsed.content, full_path, "exec")
+                except SyntaxError as e:
+                    analysis_errors.append(f"Syntax error at line {e.lineno}: {e.msg}")
+                except Exception as e:
+                    analysis_errors.append(f"Parse error: {str(e)}")
 
             # Extract information from tags
-            imports = self._extract_imports_from_tags(tags, full_path)
+            imports = self._extract_imports_from_tags(tags, full_path, parsed.content)
             defined_functions = self._extract_functions_from_tags(tags)
             defined_classes = self._extract_classes_from_tags(tags)
             function_calls = self._extract_function_calls_from_tags(tags, full_path)
@@ -118,7 +121,7 @@ class ASTFileAnalyzer:
                 defined_classes=defined_classes,
                 used_classes=[],  # TODO: Extract from tags if needed
                 used_variables=[],  # TODO: Extract from tags if needed
-                line_count=self._get_line_count(full_path),
+                line_count=parsed.line_count,
                 analysis_errors=analysis_errors,
             )
 
@@ -160,15 +163,17 @@ class ASTFileAnalyzer:
         return file_path
 
     def _extract_imports_from_tags(
-        self, tags: List[Any], file_path: str
+        self, tags: List[Any], file_path: str, content: Optional[str] = None
     ) -> List[Import]:
         """Extract imports from file content since tree-sitter tags don't include imports."""
         imports = []
 
         try:
-            # Read file content to extract imports
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            # Read file content to extract imports unless already loaded
+            if content is None:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            lines = content.split("\n")
 
             for line_num, line in enumerate(lines, 1):
                 line = line.strip()
@@ -471,14 +476,6 @@ class ASTFileAnalyzer:
 
         return calls
 
-    def _get_line_count(self, file_path: str) -> int:
-        """Get line count of a file."""
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return len(f.readlines())
-        except Exception:
-            return 0
-
     def analyze_multiple_files(
         self, file_paths: List[str], analysis_type: AnalysisType = AnalysisType.ALL
     ) -> Dict[str, FileAnalysisResult]:
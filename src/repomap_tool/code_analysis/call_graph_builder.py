@@ -56,8 +56,8 @@ class PythonCallAnalyzer(CallAnalyzer):
             return []
 
         try:
-            # Get all tags from tree-sitter
-            tags = self.tree_sitter_parser.parse_file(file_path)
+            # Get call tags from the shared per-file analysis
+            tags = self.tree_sitter_parser.analyze_file(file_path).calls
 
             # Look for function call tags
             for tag in tags:
@@ -111,24 +111,36 @@ class PythonCallAnalyzer(CallAnalyzer):
 class JavaScriptCallAnalyzer(CallAnalyzer):
     """Parser for JavaScript/TypeScript function calls using tree-sitter."""
 
-    def __init__(self, project_root: Optional[str] = None):
-        """Initialize with project root for tree-sitter RepoMap."""
+    def __init__(
+        self,
+        project_root: Optional[str] = None,
+        tree_sitter_parser: Optional[Any] = None,
+    ):
+        """Initialize with project root for tree-sitter RepoMap.
+
+        Args:
+            project_root: Root path of the project
+            tree_sitter_parser: Shared TreeSitterParser; a private one is created if omitted
+        """
         super().__init__()
         self.project_root = project_root
         self._repo_map = None
 
         # Initialize tree-sitter parser
-        from .tree_sitter_parser import TreeSitterParser
+        if tree_sitter_parser is None:
+            from .tree_sitter_parser import TreeSitterParser
 
-        self.tree_sitter_parser = TreeSitterParser()
+            tree_sitter_parser = TreeSitterParser()
+
+        self.tree_sitter_parser = tree_sitter_parser
 
     def extract_calls(self, file_content: str, file_path: str) -> List[FunctionCall]:
         """Extract JavaScript/TypeScript function calls using TreeSitterParser."""
         calls = []
 
         try:
-            # Use TreeSitterParser directly for tag extraction
-            tags = self.tree_sitter_parser.parse_file(file_path)
+            # Get call tags from the shared per-file analysis
+            tags = self.tree_sitter_parser.analyze_file(file_path).calls
 
             # Extract function calls from tags
             for tag in tags:
@@ -195,17 +207,27 @@ class CallGraphBuilder:
     ) -> None:
         """Initialize the call graph builder with language analyzers."""
         self.project_root = project_root
+
+        # Create tree_sitter_parser if not provided
+        if tree_sitter_parser is None:
+            from .tree_sitter_parser import TreeSitterParser
+
+            tree_sitter_parser = TreeSitterParser(project_root=project_root)
+
         self.tree_sitter_parser = tree_sitter_parser
 
-        # Initialize Python analyzer with tree-sitter
+        # All analyzers share one parser so each file is parsed only once
         python_analyzer = PythonCallAnalyzer(tree_sitter_parser=tree_sitter_parser)
+        javascript_analyzer = JavaScriptCallAnalyzer(
+            project_root=project_root, tree_sitter_parser=tree_sitter_parser
+        )
 
         self.language_analyzers: Dict[str, CallAnalyzer] = {
             "py": python_analyzer,
-            "js": JavaScriptCallAnalyzer(),
-            "ts": JavaScriptCallAnalyzer(),  # TypeScript uses same analyzer
-            "jsx": JavaScriptCallAnalyzer(),
-            "tsx": JavaScriptCallAnalyzer(),
+            "js": javascript_analyzer,
+            "ts": javascript_analyzer,  # TypeScript uses same analyzer
+            "jsx": javascript_analyzer,
+            "tsx": javascript_analyzer,
         }
 
         # File extensions that should be analyzed
@@ -304,19 +326,20 @@ class CallGraphBuilder:
             return []
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            analysis = self.tree_sitter_parser.analyze_file(file_path)
+            if analysis.error:
+                logger.warning(
+                    f"Could not read {file_path}, skipping: {analysis.error}"
+                )
+                return []
 
             # Get the appropriate analyzer
             analyzer = self.language_analyzers[file_ext]
-            calls = analyzer.extract_calls(content, file_path)
+            calls = analyzer.extract_calls(analysis.content, file_path)
 
             logger.debug(f"Analyzed {file_path}: found {len(calls)} function calls")
             return calls
 
-        except UnicodeDecodeError:
-            logger.warning(f"Could not decode {file_path} as UTF-8, skipping")
-            return []
         except Exception as e:
             logger.error(f"Failed to analyze calls in {file_path}: {e}")
             return []
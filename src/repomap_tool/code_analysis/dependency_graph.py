@@ -190,40 +190,38 @@ class DependencyGraph:
             return
 
         try:
-            # Create node
-            node = DependencyNode(file_path=file_path, language="python")
-            self.nodes[file_path] = node
-            self.graph.add_node(file_path, **asdict(node))
-
-            # Analyze imports and add edges
+            self._add_node(file_path)
             file_imports = self.import_analyzer.analyze_file_imports(file_path)
-
-            # Update node with import information
-            node.imports = [
-                imp.module
-                for imp in file_imports.imports
-                if imp.resolved_path and imp.module
-            ]
-            node.language = file_imports.language or "unknown"
-
-            # Add edges
-            for imp in file_imports.imports:
-                if imp.resolved_path and imp.resolved_path in self.nodes:
-                    # Edge direction: imported_file → importing_file (so predecessors give dependencies)
-                    resolved_path = imp.resolved_path
-                    self.graph.add_edge(resolved_path, file_path)
-                    if self.nodes[resolved_path].imported_by is None:
-                        self.nodes[resolved_path].imported_by = []
-                    # At this point, imported_by is guaranteed to be a list
-                    imported_by = self.nodes[resolved_path].imported_by
-                    assert imported_by is not None  # Type assertion for MyPy
-                    imported_by.append(file_path)
+            self._connect_imports(file_path, file_imports)
 
             logger.info(f"Added file {file_path} to dependency graph")
 
         except Exception as e:
             logger.error(f"Error adding file {file_path}: {e}")
 
+    def update_file(self, file_path: str) -> None:
+        """Re-analyze a changed file and replace its import edges.
+
+        Only the changed file is parsed; edges from files that import it are
+        kept, so the graph matches a full rebuild without re-reading them.
+
+        Args:
+            file_path: Path to the modified file
+        """
+        if file_path not in self.nodes:
+            self.add_file(file_path)
+            return
+
+        try:
+            file_imports = self.import_analyzer.analyze_file_imports(file_path)
+            self._disconnect_imports(file_path)
+            self._connect_imports(file_path, file_imports)
+
+            logger.debug(f"Updated file {file_path} in dependency graph")
+
+        except Exception as e:
+            logger.error(f"Error updating file {file_path}: {e}")
+
     def remove_file(self, file_path: str) -> None:
         """Remove a file from the dependency graph.
 
@@ -235,22 +233,48 @@ class DependencyGraph:
             return
 
         try:
-            # Remove edges
-            self.graph.remove_node(file_path)
+            # Only the files it imports list it in imported_by
+            self._disconnect_imports(file_path)
 
-            # Remove from our node collection
+            # Remove remaining (incoming) edges and the node itself
+            self.graph.remove_node(file_path)
             del self.nodes[file_path]
 
-            # Update imported_by lists in other nodes
-            for node in self.nodes.values():
-                if node.imported_by and file_path in node.imported_by:
-                    node.imported_by.remove(file_path)
-
             logger.info(f"Removed file {file_path} from dependency graph")
 
         except Exception as e:
             logger.error(f"Error removing file {file_path}: {e}")
 
+    def _connect_imports(self, file_path: str, file_imports: FileImports) -> None:
+        """Add edges from a file to the project files it imports."""
+        node = self.nodes[file_path]
+        node.imports = [
+            imp.module
+            for imp in file_imports.imports
+            if imp.resolved_path and imp.module
+        ]
+        node.language = file_imports.language or "unknown"
+
+        # Same direction as build_graph: importing file -> imported file
+        for imp in file_imports.imports:
+            resolved_path = imp.resolved_path
+            if resolved_path and resolved_path in self.nodes:
+                self.graph.add_edge(file_path, resolved_path)
+                imported_by = self.nodes[resolved_path].imported_by
+                if imported_by is None:
+                    imported_by = self.nodes[resolved_path].imported_by = []
+                imported_by.append(file_path)
+
+    def _disconnect_imports(self, file_path: str) -> None:
+        """Remove the edges from a file to the files it imports."""
+        for target in list(self.graph.successors(file_path)):
+            self.graph.remove_edge(file_path, target)
+            target_node = self.nodes.get(target)
+            if target_node is not None and target_node.imported_by:
+                target_node.imported_by = [
+                    path for path in target_node.imported_by if path != file_path
+                ]
+
     def get_dependencies(self, file_path: str) -> List[str]:
         """Get files that a given file depends on.
 
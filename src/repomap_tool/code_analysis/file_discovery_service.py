@@ -11,7 +11,7 @@ from typing import List, Optional, Dict, Any
 from pathlib import Path
 
 from .file_filter import FileFilter
-from ..core.file_scanner import get_project_files
+from ..core.project_snapshot import ProjectSnapshot, get_project_snapshot
 
 logger = get_logger(__name__)
 
@@ -19,33 +19,55 @@ logger = get_logger(__name__)
 class FileDiscoveryService:
     """Centralized service for file discovery and filtering."""
 
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, snapshot: Optional[ProjectSnapshot] = None):
         """Initialize the file discovery service.
 
         Args:
             project_root: Root path of the project
+            snapshot: Project snapshot to list files from (defaults to the
+                shared snapshot of project_root)
         """
         self.project_root = project_root
+        self._snapshot = snapshot
+        self._generation: Optional[int] = None
         self._all_files_cache: Optional[List[str]] = None
         self._code_files_cache: Optional[List[str]] = None
         self._analyzable_files_cache: Optional[List[str]] = None
 
         logger.debug(f"FileDiscoveryService initialized for project: {project_root}")
 
+    @property
+    def snapshot(self) -> ProjectSnapshot:
+        """Snapshot the file lists are derived from."""
+        if self._snapshot is None:
+            self._snapshot = get_project_snapshot(self.project_root)
+        return self._snapshot
+
+    def _sync_generation(self) -> None:
+        """Drop cached file lists derived from an older snapshot generation."""
+        generation = self.snapshot.generation
+        if generation != self._generation:
+            self.clear_cache()
+            self._generation = generation
+
     def get_all_files(self, use_cache: bool = True) -> List[str]:
         """Get all files in the project (raw discovery, no filtering).
 
         Args:
-            use_cache: Whether to use cached results
+            use_cache: Whether to use cached results (otherwise the snapshot
+                is refreshed first)
 
         Returns:
             List of all project files (absolute paths)
         """
+        if not use_cache:
+            self.snapshot.refresh()
+        self._sync_generation()
         if use_cache and self._all_files_cache is not None:
             return self._all_files_cache
 
         logger.debug("Discovering all project files")
-        all_files = get_project_files(self.project_root, verbose=False)
+        all_files = self.snapshot.files
 
         if use_cache:
             self._all_files_cache = all_files
@@ -66,6 +88,7 @@ class FileDiscoveryService:
             List of code files (absolute paths)
         """
         cache_key = f"code_files_{exclude_tests}"
+        self._sync_generation()
         if use_cache and self._code_files_cache is not None:
             return self._code_files_cache
 
@@ -93,6 +116,7 @@ class FileDiscoveryService:
         Returns:
             List of analyzable files (absolute paths)
         """
+        self._sync_generation()
         if use_cache and self._analyzable_files_cache is not None:
             return self._analyzable_files_cache
 
@@ -155,13 +179,16 @@ class FileDiscoveryService:
 
 
 # Service factory function (no singleton - each project needs its own instance)
-def create_file_discovery_service(project_root: str) -> FileDiscoveryService:
+def create_file_discovery_service(
+    project_root: str, snapshot: Optional[ProjectSnapshot] = None
+) -> FileDiscoveryService:
     """Create a new file discovery service instance for a project.
 
     Args:
         project_root: Project root path
+        snapshot: Project snapshot to list files from
 
     Returns:
         FileDiscoveryService instance
     """
-    return FileDiscoveryService(project_root)
+    return FileDiscoveryService(project_root, snapshot=snapshot)
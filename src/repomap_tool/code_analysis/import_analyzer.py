@@ -11,14 +11,24 @@ import logging
 import re
 from pathlib import Path
 from typing import List, Dict, Optional, Set, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from .models import Import, FileImports, ProjectImports, ImportType
 from ..core.config_service import get_config
 from ..core.logging_service import get_logger
+from ..core.parallel_processor import (
+    DEFAULT_CHUNK_SIZE,
+    EXECUTOR_TYPES,
+    chunk_files,
+    worker_context,
+)
 
 logger = get_logger(__name__)
 
+# Per-process analyzer created by the pool initializer so its tree-sitter
+# parsers and compiled queries stay warm across chunks
+_worker_analyzer: Optional["ImportAnalyzer"] = None
+
 
 class ImportParser:
     """Base class for language-specific import parsers."""
@@ -57,8 +67,8 @@ class PythonImportParser(ImportParser):
             return []
 
         try:
-            # Get all tags from tree-sitter
-            tags = self.tree_sitter_parser.parse_file(file_path)
+            # Get import tags from the shared per-file analysis
+            tags = self.tree_sitter_parser.analyze_file(file_path).imports
 
             # Look for import-related tags
             for tag in tags:
@@ -132,8 +142,8 @@ class JavaScriptImportParser(ImportParser):
             return []
 
         try:
-            # Use tree-sitter to parse the file
-            tags = self.tree_sitter_parser.parse_file(file_path)
+            # Get import tags from the shared per-file analysis
+            tags = self.tree_sitter_parser.analyze_file(file_path).imports
 
             # Extract imports from tree-sitter tags
             for tag in tags:
@@ -231,8 +241,8 @@ class JavaImportParser(ImportParser):
             return []
 
         try:
-            # Use tree-sitter to parse the file
-            tags = self.tree_sitter_parser.parse_file(file_path)
+            # Get import tags from the shared per-file analysis
+            tags = self.tree_sitter_parser.analyze_file(file_path).imports
 
             # Extract imports from tree-sitter tags
             for tag in tags:
@@ -307,8 +317,8 @@ class GoImportParser(ImportParser):
             return []
 
         try:
-            # Use tree-sitter to parse the file
-            tags = self.tree_sitter_parser.parse_file(file_path)
+            # Get import tags from the shared per-file analysis
+            tags = self.tree_sitter_parser.analyze_file(file_path).imports
 
             # Extract imports from tree-sitter tags
             for tag in tags:
@@ -376,8 +386,8 @@ class CSharpImportParser(ImportParser):
             return []
 
         try:
-            # Use tree-sitter to parse the file
-            tags = self.tree_sitter_parser.parse_file(file_path)
+            # Get import tags from the shared per-file analysis
+            tags = self.tree_sitter_parser.analyze_file(file_path).imports
 
             # Extract imports from tree-sitter tags
             for tag in tags:
@@ -440,11 +450,24 @@ class ImportAnalyzer:
         self,
         project_root: Optional[str] = None,
         tree_sitter_parser: Optional[Any] = None,
+        executor: Optional[str] = None,
     ) -> None:
-        """Initialize the import analyzer with language parsers."""
+        """Initialize the import analyzer with language parsers.
+
+        Args:
+            project_root: Root path of the project
+            tree_sitter_parser: Shared TreeSitterParser; a private one is created if omitted
+            executor: "thread" (default) or "process" for project-wide analysis
+        """
+        executor = executor or "thread"
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"Invalid executor: {executor}. Must be one of {EXECUTOR_TYPES}"
+            )
+
         # Ensure project_root is always a string, not a ConfigurationOption
         self.project_root = str(project_root) if project_root is not None else None
-        self.tree_sitter_parser = tree_sitter_parser
+        self.executor = executor
 
         # Create tree_sitter_parser if not provided
         if tree_sitter_parser is None:
@@ -492,12 +515,21 @@ class ImportAnalyzer:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            # Shared per-file analysis: read and parsed once for all analyzers
+            analysis = self.tree_sitter_parser.analyze_file(file_path)
+            if analysis.error:
+                logger.warning(
+                    f"Could not read {file_path}, skipping: {analysis.error}"
+                )
+                return FileImports(
+                    file_path=file_path,
+                    imports=[],
+                    language=Path(file_path).suffix.lstrip("."),
+                )
 
             # Get the appropriate parser
             parser = self.language_parsers[Path(file_path).suffix.lstrip(".")]
-            imports = parser.extract_imports(content, file_path)
+            imports = parser.extract_imports(analysis.content, file_path)
 
             # Resolve import paths
             resolved_imports = self._resolve_import_paths(imports, file_path)
@@ -511,13 +543,6 @@ class ImportAnalyzer:
             logger.debug(f"Analyzed {file_path}: found {len(imports)} imports")
             return file_imports
 
-        except UnicodeDecodeError:
-            logger.warning(f"Could not decode {file_path} as UTF-8, skipping")
-            return FileImports(
-                file_path=file_path,
-                imports=[],
-                language=Path(file_path).suffix.lstrip("."),
-            )
         except Exception as e:
             logger.error(f"Failed to analyze imports in {file_path}: {e}")
             return FileImports(
@@ -557,7 +582,37 @@ class ImportAnalyzer:
         file_imports: Dict[str, FileImports] = {}
 
         # Use parallel processing for large projects
-        if len(analyzable_files) > 10 and max_workers > 1:
+        if (
+            len(analyzable_files) > 10
+            and max_workers > 1
+            and self.executor == "process"
+        ):
+            # Workers parse chunks with their own warm parsers and return results
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=worker_context(),
+                initializer=_init_import_worker,
+                initargs=(project_path,),
+            ) as executor:
+                future_to_chunk = {
+                    executor.submit(_analyze_imports_chunk, chunk): chunk
+                    for chunk in chunk_files(analyzable_files, DEFAULT_CHUNK_SIZE)
+                }
+
+                for chunk_future in as_completed(future_to_chunk):
+                    chunk = future_to_chunk[chunk_future]
+                    try:
+                        for chunk_imports in chunk_future.result():
+                            file_imports[chunk_imports.file_path] = chunk_imports
+                    except Exception as e:
+                        logger.error(
+                            f"Error analyzing chunk of {len(chunk)} files: {e}"
+                        )
+                        for file_path in chunk:
+                            file_imports[file_path] = FileImports(
+                                file_path=file_path, imports=[]
+                            )
+        elif len(analyzable_files) > 10 and max_workers > 1:
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 future_to_file = {
                     executor.submit(self.analyze_file_imports, file_path): file_path
@@ -891,3 +946,24 @@ class ImportAnalyzer:
         self.language_parsers[extension] = parser
         self.analyzable_extensions.add(extension)
         logger.info(f"Added parser for {extension} files")
+
+
+def _init_import_worker(project_root: str) -> None:
+    """Pool initializer: create this worker process's import analyzer."""
+    global _worker_analyzer
+    _worker_analyzer = ImportAnalyzer(project_root=project_root)
+
+
+def _analyze_imports_chunk(file_paths: List[str]) -> List[FileImports]:
+    """Analyze a chunk of files in a worker process."""
+    if _worker_analyzer is None:
+        raise RuntimeError("Worker process import analyzer was not initialized")
+
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append(_worker_analyzer.analyze_file_imports(file_path))
+        except Exception as e:
+            logger.error(f"Error analyzing {file_path}: {e}")
+            results.append(FileImports(file_path=file_path, imports=[]))
+    return results
@@ -1,7 +1,7 @@
 """Code analysis data models for tree-sitter parsing."""
 
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, Set, Tuple
 from enum import Enum
 
 
@@ -20,6 +20,25 @@ class CodeTag:
     comment: Optional[str] = None  # Associated comment
 
 
+@dataclass
+class ParsedFile:
+    """Everything extracted from a single tree-sitter parse of a file.
+
+    Produced once per file version by TreeSitterParser.analyze_file and shared
+    by the import, call and file analyzers.
+    """
+
+    file_path: str  # Absolute file path
+    fingerprint: Tuple[int, int, int]  # (size, mtime_ns, inode) when parsed
+    content: str
+    tags: List[CodeTag]
+    imports: List[CodeTag]  # Import/require/using tags
+    calls: List[CodeTag]  # Call reference tags
+    comments: List[Dict[str, Any]]  # Comment nodes with text and positions
+    line_count: int
+    error: Optional[str] = None  # Read/decode error, if any
+
+
 class AnalysisFormat(str, Enum):
     """Format options for analysis output."""
 
@@ -10,17 +10,23 @@ imports, function calls, and definitions.
 from __future__ import annotations
 
 import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from grep_ast import filename_to_lang
 from grep_ast.tsl import get_language, get_parser
 
 from repomap_tool.core.logging_service import get_logger
-from repomap_tool.code_analysis.models import CodeTag
+from repomap_tool.code_analysis.models import CodeTag, ParsedFile
 
 logger = get_logger(__name__)
 
+# Node types that hold comments across the supported grammars
+_COMMENT_NODE_TYPES = frozenset({"comment", "line_comment", "block_comment"})
+
 
 class TreeSitterParser:
     """Universal tree-sitter parser for all languages."""
@@ -30,6 +36,8 @@ class TreeSitterParser:
         project_root: Optional[str] = None,
         custom_queries_dir: Optional[str] = None,
         cache: Optional[Any] = None,
+        analysis_cache_size: int = 1024,
+        extract_comments: bool = True,
     ):
         """Initialize the tree-sitter parser.
 
@@ -37,9 +45,24 @@ class TreeSitterParser:
             project_root: Root directory of the project for relative path resolution
             custom_queries_dir: Directory containing custom query files (.scm).
                               Defaults to code_analysis/queries/ directory
+            analysis_cache_size: Maximum number of ParsedFile records kept in memory
+            extract_comments: Whether to collect comments and attach them to tags
         """
+        if analysis_cache_size < 1:
+            raise ValueError(
+                f"analysis_cache_size must be positive, got {analysis_cache_size}"
+            )
+
         self.project_root = project_root or "."
+        self.extract_comments = extract_comments
         self._query_cache: Dict[str, str] = {}
+        # Compiled queries and parsers keep per-call cursor state, so they are
+        # cached per thread (one entry per language) rather than shared
+        self._local = threading.local()
+        # One ParsedFile per file version, shared by all analyzers (LRU order)
+        self._analysis_cache: "OrderedDict[str, ParsedFile]" = OrderedDict()
+        self._analysis_cache_size = analysis_cache_size
+        self._analysis_lock = threading.Lock()
         self.tag_cache = cache  # Can be None to disable caching
 
         # Set custom queries directory - use package resources for reliable access
@@ -94,31 +117,141 @@ class TreeSitterParser:
             List of CodeTag objects with detailed information
         """
         try:
-            # Get language for the file
-            lang = filename_to_lang(file_path)
-            if not lang:
+            if not filename_to_lang(file_path):
                 logger.debug(f"No language detected for {file_path}")
                 return []
 
-            # Get parser and language
-            parser = get_parser(lang)
-            language = get_language(lang)
-
-            # Load query file
-            query_scm = self._load_query(lang)
-            if not query_scm:
-                logger.warning(f"No query file found for language: {lang}")
-                return []
-
             # Read file content
             code = self._read_file(file_path)
             if not code:
                 logger.warning(f"Could not read file: {file_path}")
                 return []
 
+            tags, _ = self._parse_code(file_path, code)
+            return tags
+
+        except Exception as e:
+            logger.error(f"Error parsing file {file_path} with tree-sitter: {e}")
+            return []
+
+    def analyze_file(self, file_path: str) -> ParsedFile:
+        """Parse a file once and return everything analyzers need from it.
+
+        Records are memoized per path and reused while the file's
+        (size, mtime_ns, inode) fingerprint is unchanged, so the import, call
+        and file analyzers share a single parse.
+
+        Args:
+            file_path: Path to the file to analyze
+
+        Returns:
+            ParsedFile with content, tags, imports, calls, comments and line count
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError as e:
+            return self._empty_analysis(file_path, (0, 0, 0), str(e))
+
+        fingerprint = (st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._analysis_lock:
+            cached = self._analysis_cache.get(file_path)
+            if cached is not None and cached.fingerprint == fingerprint:
+                self._analysis_cache.move_to_end(file_path)
+                return cached
+
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not read file {file_path}: {e}")
+            analysis = self._empty_analysis(file_path, fingerprint, str(e))
+        else:
+            tags: List[CodeTag] = []
+            comments: List[Dict[str, Any]] = []
+            if content and filename_to_lang(file_path):
+                tags, comments = self._parse_code(file_path, content)
+
+            line_count = content.count("\n")
+            if content and not content.endswith("\n"):
+                line_count += 1
+
+            analysis = ParsedFile(
+                file_path=file_path,
+                fingerprint=fingerprint,
+                content=content,
+                tags=tags,
+                imports=[tag for tag in tags if self._is_import_kind(tag.kind)],
+                calls=[tag for tag in tags if self._is_call_kind(tag.kind)],
+                comments=comments,
+                line_count=line_count,
+            )
+
+        with self._analysis_lock:
+            self._analysis_cache[file_path] = analysis
+            self._analysis_cache.move_to_end(file_path)
+            while len(self._analysis_cache) > self._analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
+
+        return analysis
+
+    def clear_analysis_cache(self) -> None:
+        """Drop all memoized ParsedFile records."""
+        with self._analysis_lock:
+            self._analysis_cache.clear()
+
+    def _empty_analysis(
+        self, file_path: str, fingerprint: Tuple[int, int, int], error: str
+    ) -> ParsedFile:
+        """Build a ParsedFile for a file that could not be read."""
+        return ParsedFile(
+            file_path=file_path,
+            fingerprint=fingerprint,
+            content="",
+            tags=[],
+            imports=[],
+            calls=[],
+            comments=[],
+            line_count=0,
+            error=error,
+        )
+
+    @staticmethod
+    def _is_import_kind(kind: str) -> bool:
+        """Check whether a tag kind denotes an import across supported languages."""
+        return "import" in kind.lower() or kind.startswith(("require.", "using."))
+
+    @staticmethod
+    def _is_call_kind(kind: str) -> bool:
+        """Check whether a tag kind denotes a call reference."""
+        return kind == "name.reference.call" or kind == "ref"
+
+    def _parse_code(
+        self, file_path: str, code: str
+    ) -> Tuple[List[CodeTag], List[Dict[str, Any]]]:
+        """Parse source code and extract tags and comments.
+
+        Args:
+            file_path: Path of the file the code came from
+            code: Source code content
+
+        Returns:
+            Tuple of (tags with associated comments, comment nodes)
+        """
+        try:
+            lang = filename_to_lang(file_path)
+            if not lang:
+                logger.debug(f"No language detected for {file_path}")
+                return [], []
+
+            # Get cached parser and compiled query
+            parser = self._get_parser(lang)
+            query = self._get_compiled_query(lang)
+            if query is None:
+                logger.warning(f"No query file found for language: {lang}")
+                return [], []
+
             # Parse with tree-sitter
             tree = parser.parse(bytes(code, "utf-8"))
-            query = language.query(query_scm)
             captures = query.captures(tree.root_node)
 
             # Extract ALL tags WITHOUT filtering
@@ -163,15 +296,20 @@ class TreeSitterParser:
 
             logger.debug(f"Parsed {len(tags)} tags from {file_path}")
 
+            if not self.extract_comments:
+                return tags, []
+
             # Associate comments with code elements
+            comment_nodes: List[Dict[str, Any]] = []
+            self._find_comment_nodes(tree.root_node, comment_nodes)
             tags_with_comments = self._associate_comments_with_code(
-                tags, tree.root_node, code
+                tags, comment_nodes, code
             )
-            return tags_with_comments
+            return tags_with_comments, comment_nodes
 
         except Exception as e:
             logger.error(f"Error parsing file {file_path} with tree-sitter: {e}")
-            return []
+            return [], []
 
     def get_tags(self, file_path: str, use_cache: bool = True) -> List[CodeTag]:
         """Get tags for a file, using cache if available
@@ -195,8 +333,8 @@ class TreeSitterParser:
                         f"Invalid cached tags type for {file_path}, falling back to parsing"
                     )
 
-        # Parse file using existing parse_file method
-        tags = self.parse_file(file_path)
+        # Parse file, sharing the memoized analysis with other consumers
+        tags = self.analyze_file(file_path).tags
 
         # Cache results
         if use_cache and self.tag_cache:
@@ -205,6 +343,48 @@ class TreeSitterParser:
 
         return tags
 
+    def _get_parser(self, lang: str) -> Any:
+        """Get this thread's parser for a language, creating it once.
+
+        Args:
+            lang: Language identifier
+
+        Returns:
+            Tree-sitter parser for the language
+        """
+        parsers = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+
+        parser = parsers.get(lang)
+        if parser is None:
+            parser = parsers[lang] = get_parser(lang)
+        return parser
+
+    def _get_compiled_query(self, lang: str) -> Optional[Any]:
+        """Get this thread's compiled tags query for a language.
+
+        The .scm source is compiled once per language and thread instead of
+        once per parsed file.
+
+        Args:
+            lang: Language identifier
+
+        Returns:
+            Compiled tree-sitter query or None if no query file exists
+        """
+        queries = getattr(self._local, "queries", None)
+        if queries is None:
+            queries = self._local.queries = {}
+
+        if lang in queries:
+            return queries[lang]
+
+        query_scm = self._load_query(lang)
+        query = get_language(lang).query(query_scm) if query_scm else None
+        queries[lang] = query
+        return query
+
     def _load_query(self, lang: str) -> Optional[str]:
         """Load the .scm query file for this language.
 
@@ -265,29 +445,41 @@ class TreeSitterParser:
         return None
 
     def _associate_comments_with_code(
-        self, tags: List[CodeTag], root_node: Any, code: str
+        self, tags: List[CodeTag], comment_nodes: List[Dict[str, Any]], code: str
     ) -> List[CodeTag]:
         """Associate comments with nearest code elements.
 
+        Comment nodes arrive in document order, so each tag is matched with a
+        bisect over comment start lines instead of scanning every comment.
+
         Args:
             tags: List of parsed tags
-            root_node: Tree-sitter root node
+            comment_nodes: Comment nodes collected from the tree, in document order
             code: Source code content
 
         Returns:
             Tags with associated comments
         """
         try:
-            # Find all comment nodes in the tree
-            comment_nodes: List[Any] = []
-            self._find_comment_nodes(root_node, comment_nodes)
+            if not comment_nodes:
+                return tags
+
+            comment_lines = [comment["line"] for comment in comment_nodes]
+            cleaned: Dict[int, Optional[str]] = {}
 
-            # Associate comments with nearest code elements
             for tag in tags:
-                comment = self._find_nearest_comment(tag, comment_nodes, code)
-                if comment:
+                index = self._find_nearest_comment(tag, comment_lines)
+                if index is None:
+                    continue
+
+                if index not in cleaned:
+                    # Clean comment text, removing comment markers
+                    text = comment_nodes[index]["text"].strip()
+                    cleaned[index] = self._clean_comment_text(text) or None
+
+                if cleaned[index]:
                     # Add comment as a new attribute to CodeTag
-                    tag.comment = comment
+                    tag.comment = cleaned[index]
 
             return tags
         except Exception as e:
@@ -295,84 +487,72 @@ class TreeSitterParser:
             return tags
 
     def _find_comment_nodes(self, node: Any, comment_nodes: List[Dict]) -> None:
-        """Recursively find all comment nodes in the tree.
+        """Collect all comment nodes under a node in document order.
+
+        Uses a tree cursor walk rather than recursion, so deep trees neither
+        hit the recursion limit nor build per-node child lists. The walk
+        visits at most ``node.descendant_count`` nodes, so a cursor that
+        stops advancing cannot loop forever.
 
         Args:
-            node: Current tree-sitter node
+            node: Root tree-sitter node to walk
             comment_nodes: List to store comment nodes
         """
         try:
-            if hasattr(node, "type") and node.type in [
-                "comment",
-                "line_comment",
-                "block_comment",
-            ]:
-                comment_text = (
-                    node.text.decode("utf-8") if hasattr(node, "text") else ""
-                )
-                comment_nodes.append(
-                    {
-                        "text": comment_text,
-                        "line": node.start_point[0] + 1,
-                        "column": node.start_point[1],
-                        "end_line": node.end_point[0] + 1,
-                        "end_column": node.end_point[1],
-                    }
-                )
+            cursor = node.walk()
+            for _ in range(node.descendant_count):
+                current = cursor.node
+                is_comment = current.type in _COMMENT_NODE_TYPES
+                if is_comment:
+                    comment_nodes.append(
+                        {
+                            "text": current.text.decode("utf-8"),
+                            "line": current.start_point[0] + 1,
+                            "column": current.start_point[1],
+                            "end_line": current.end_point[0] + 1,
+                            "end_column": current.end_point[1],
+                        }
+                    )
 
-            # Recursively check children
-            if hasattr(node, "children"):
-                for child in node.children:
-                    self._find_comment_nodes(child, comment_nodes)
+                # Comments have no interesting children; otherwise descend
+                if not is_comment and cursor.goto_first_child():
+                    continue
+                while not cursor.goto_next_sibling():
+                    if not cursor.goto_parent():
+                        return
+            logger.debug("Comment walk stopped: cursor did not reach the end")
         except Exception as e:
             logger.debug(f"Error finding comment nodes: {e}")
 
     def _find_nearest_comment(
-        self, tag: CodeTag, comment_nodes: List[Dict], code: str
-    ) -> Optional[str]:
-        """Find the nearest comment for a code element.
+        self, tag: CodeTag, comment_lines: List[int]
+    ) -> Optional[int]:
+        """Find the nearest comment preceding a code element.
 
         Args:
             tag: Code element tag
-            comment_nodes: List of comment nodes
-            code: Source code content
+            comment_lines: Sorted comment start lines (1-based)
 
         Returns:
-            Associated comment text or None
+            Index of the first comment on the closest line within 5 lines
+            before the tag, or None
         """
-        try:
-            tag_line = tag.line
-            if tag_line <= 0:
-                return None
-
-            # Find comments within 5 lines before the tag
-            nearest_comment = None
-            min_distance = float("inf")
-
-            for comment in comment_nodes:
-                comment_line = comment.get("line", 0)
-                if comment_line <= 0:
-                    continue
-
-                # Only consider comments before the tag (within 5 lines)
-                if comment_line < tag_line and (tag_line - comment_line) <= 5:
-                    distance = tag_line - comment_line
-                    if distance < min_distance:
-                        min_distance = distance
-                        nearest_comment = comment
-
-            if nearest_comment:
-                # Clean comment text
-                comment_text = nearest_comment["text"].strip()
-                # Remove comment markers
-                comment_text = self._clean_comment_text(comment_text)
-                return comment_text if comment_text else None
+        tag_line = tag.line
+        if tag_line <= 0:
+            return None
 
+        # Last comment starting strictly before the tag
+        index = bisect_left(comment_lines, tag_line) - 1
+        if index < 0:
             return None
-        except Exception as e:
-            logger.debug(f"Error finding nearest comment: {e}")
+
+        comment_line = comment_lines[index]
+        if comment_line <= 0 or tag_line - comment_line > 5:
             return None
 
+        # Prefer the first comment on that line
+        return bisect_left(comment_lines, comment_line, 0, index)
+
     def _clean_comment_text(self, comment_text: str) -> str:
         """Clean comment text by removing markers.
 
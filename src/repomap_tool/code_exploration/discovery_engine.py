@@ -388,11 +388,6 @@ class EntrypointDiscoverer:
         try:
             logger.debug(f"Building dependency graph for project: {project_path}")
 
-            # Get project files first
-            from repomap_tool.core.file_scanner import get_project_files
-
-            project_files = get_project_files(project_path, verbose=False)
-
             # Analyze project imports
             project_imports = self.import_analyzer.analyze_project_imports(project_path)
 
@@ -10,10 +10,14 @@ import re
 import logging
 from ..core.config_service import get_config
 from ..core.logging_service import get_logger
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from collections import Counter
 import math
 
+import numpy as np
+
+from .tfidf_index import TfidfIndex, top_k_indices
+
 logger = get_logger(__name__)
 
 
@@ -45,6 +49,8 @@ class AdaptiveSemanticMatcher:
         self.word_to_identifiers: Dict[str, Set[str]] = (
             {}
         )  # word -> set of identifiers containing it
+        # Sparse vectors of the learned identifiers
+        self.tfidf_index: Optional[TfidfIndex] = None
 
         # Similarity cache
         self.similarity_cache: Dict[str, float] = {}
@@ -114,9 +120,9 @@ class AdaptiveSemanticMatcher:
                     self.word_to_identifiers[word] = set()
                 self.word_to_identifiers[word].add(identifier)
 
-        # Calculate IDF for each word
-        for word, freq in self.word_frequencies.items():
-            self.idf_cache[word] = math.log(self.total_identifiers / freq)
+        # Vectorize every identifier once; the index also holds each word's IDF
+        self.tfidf_index = TfidfIndex(self.identifier_words)
+        self.idf_cache = self.tfidf_index.idf_by_word()
 
         if self.verbose:
             logger.info(
@@ -236,30 +242,49 @@ class AdaptiveSemanticMatcher:
     def find_semantic_matches(
         self,
         query: str,
-        all_identifiers: Set[str],
+        all_identifiers: Iterable[str],
         threshold: float = get_config("HYBRID_THRESHOLD", 0.1),
+        max_results: Optional[int] = None,
     ) -> List[Tuple[str, float]]:
         """
         Find semantic matches for a query among all identifiers.
 
+        Only learned identifiers sharing a word with the query are scored;
+        every other identifier has a similarity of 0.
+
         Args:
             query: The search query
             all_identifiers: Set of all available identifiers
             threshold: Minimum similarity threshold (0.0 to 1.0)
+            max_results: Maximum number of matches to return (None for all)
 
         Returns:
             List of (identifier, similarity_score) tuples, sorted by score
         """
-        matches = []
-
-        for identifier in all_identifiers:
-            similarity = self.semantic_similarity(query, identifier)
-
-            if similarity >= threshold:
-                matches.append((identifier, similarity))
-
-        # Sort by similarity score (highest first)
-        matches.sort(key=lambda x: x[1], reverse=True)
+        if not isinstance(all_identifiers, (set, frozenset)):
+            all_identifiers = set(all_identifiers)
+
+        matched: List[str] = []
+        scores = np.empty(0, dtype=np.float64)
+        if self.tfidf_index is not None:
+            rows, scores = self.tfidf_index.similarities(self.split_identifier(query))
+            matched = self.tfidf_index.identifiers_at(rows)
+            if not self.tfidf_index.covers(all_identifiers):
+                # Drop learned identifiers that are not being searched
+                searched = np.array([i in all_identifiers for i in matched], dtype=bool)
+                matched = [i for i, keep in zip(matched, searched.tolist()) if keep]
+                scores = scores[searched]
+
+        if threshold <= 0:
+            # Identifiers sharing no word with the query score 0 and pass too
+            found = set(matched)
+            unmatched = [i for i in all_identifiers if i not in found]
+            matched.extend(unmatched)
+            scores = np.concatenate([scores, np.zeros(len(unmatched))])
+
+        positions = np.flatnonzero(scores >= threshold)
+        order = positions[top_k_indices(scores[positions], max_results)]
+        matches = [(matched[p], float(scores[p])) for p in order.tolist()]
 
         if self.verbose:
             logger.debug(f"Semantic matches for '{query}' (threshold: {threshold}):")
@@ -281,23 +306,18 @@ class AdaptiveSemanticMatcher:
         Returns:
             List of (related_identifier, similarity_score) tuples
         """
-        if identifier not in self.identifier_words:
+        if self.tfidf_index is None:
+            return []
+        row = self.tfidf_index.row_of(identifier)
+        if row is None:
             return []
 
-        related = []
-        identifier_vector = self.get_identifier_vector(identifier)
-
-        for other_identifier in self.identifier_words.keys():
-            if other_identifier != identifier:
-                similarity = self.cosine_similarity(
-                    identifier_vector, self.get_identifier_vector(other_identifier)
-                )
-                if similarity > 0.1:  # Low threshold to get more results
-                    related.append((other_identifier, similarity))
-
-        # Sort and limit results
-        related.sort(key=lambda x: x[1], reverse=True)
-        return related[:max_results]
+        rows, scores = self.tfidf_index.similarities(self.tfidf_index.row_words(row))
+        # Low threshold to get more results
+        keep = np.flatnonzero((scores > 0.1) & (rows != row))
+        top = keep[top_k_indices(scores[keep], max_results)]
+        related = self.tfidf_index.identifiers_at(rows[top])
+        return list(zip(related, scores[top].tolist()))
 
     def get_word_importance(self, word: str) -> float:
         """
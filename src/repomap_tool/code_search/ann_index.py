@@ -0,0 +1,347 @@
+"""
+Approximate nearest-neighbour index over identifier embeddings.
+
+Exact embedding search multiplies the query with every identifier's vector.
+An IVF (inverted file) index clusters the vectors with spherical k-means
+and files each one under its nearest centroid. A search ranks the centroids
+against the query and only scans the vectors of the ``n_probe`` closest
+lists, trading a little recall for a scan of roughly
+``n_probe / n_lists`` of the vectors. Probing every list is exact.
+
+All vectors must be unit length, so dot products are cosine similarities.
+"""
+
+import os
+from pathlib import Path
+from typing import AbstractSet, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from ..core.logging_service import get_logger
+from .tfidf_index import top_k_indices
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+# k-means trains on at most this many vectors per list
+_TRAINING_POINTS_PER_LIST = 64
+
+# Query-centroid and list scans score at most this many rows at once
+_CHUNK_ROWS = 16384
+
+
+def default_list_count(size: int) -> int:
+    """Number of lists for an index of ``size`` vectors: about sqrt(size)."""
+    return max(1, int(round(np.sqrt(size))))
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, clusters: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """
+    Cluster unit-length vectors by cosine similarity.
+
+    Args:
+        vectors: Unit-length rows to cluster
+        clusters: Number of centroids
+        iterations: Lloyd iterations
+        seed: Seed for the initial centroids and empty-cluster reseeding
+
+    Returns:
+        Unit-length centroids, one row per cluster
+    """
+    rng = np.random.default_rng(seed)
+    clusters = min(clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest(vectors, centroids)
+        # Sum each cluster's members with one sparse product
+        membership = sparse.csr_matrix(
+            (
+                np.ones(len(vectors), dtype=np.float32),
+                (assignments, np.arange(len(vectors))),
+            ),
+            shape=(clusters, len(vectors)),
+        )
+        sums = np.asarray(membership @ vectors)
+        empty = np.flatnonzero(np.asarray(membership.sum(axis=1)).ravel() == 0)
+        if len(empty):
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+def recall_at_k(
+    approximate: Sequence[Sequence[Tuple[str, float]]],
+    exact: Sequence[Sequence[Tuple[str, float]]],
+    k: int,
+) -> float:
+    """
+    Share of the exact top-k results an approximate search found.
+
+    Args:
+        approximate: Approximate results of each query
+        exact: Exact results of the same queries, best first
+        k: Number of top results compared per query
+
+    Returns:
+        Mean recall over the queries with any exact result (1.0 if none)
+    """
+    recalls = []
+    for found, expected in zip(approximate, exact):
+        wanted = {key for key, _ in expected[:k]}
+        if wanted:
+            recalls.append(len(wanted & {key for key, _ in found[:k]}) / len(wanted))
+    return float(np.mean(recalls)) if recalls else 1.0
+
+
+class IVFIndex:
+    """Inverted-file index of unit-length vectors keyed by identifier."""
+
+    def __init__(self, centroids: np.ndarray, n_probe: int = 8) -> None:
+        """
+        Create an empty index over fixed centroids.
+
+        Args:
+            centroids: Unit-length centroid of each list
+            n_probe: Lists scanned per query by default
+        """
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.n_probe = n_probe
+        self._list_keys: List[List[str]] = [[] for _ in range(self.n_lists)]
+        self._list_vectors: List[np.ndarray] = [
+            np.empty((0, self.dimension), dtype=np.float32) for _ in range(self.n_lists)
+        ]
+        self._keys: Set[str] = set()
+
+    @classmethod
+    def build(
+        cls,
+        keys: Sequence[str],
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_probe: int = 8,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Train centroids on the vectors and index them.
+
+        Args:
+            keys: Identifier of each vector
+            vectors: Unit-length rows
+            n_lists: Number of lists (default: about sqrt of the vector count)
+            n_probe: Lists scanned per query by default
+            iterations: k-means iterations
+            seed: Seed for sampling and k-means
+
+        Returns:
+            The built index
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if n_lists is None or n_lists <= 0:
+            n_lists = default_list_count(len(vectors))
+        n_lists = max(1, min(n_lists, len(vectors)))
+
+        training = vectors
+        sample_size = n_lists * _TRAINING_POINTS_PER_LIST
+        if len(vectors) > sample_size:
+            rng = np.random.default_rng(seed)
+            training = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        index = cls(spherical_kmeans(training, n_lists, iterations, seed), n_probe)
+        index.add(keys, vectors)
+        return index
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.centroids.shape[1])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def keys(self) -> Set[str]:
+        """Identifiers in the index."""
+        return set(self._keys)
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> int:
+        """
+        File new vectors under their nearest centroids. Keys already in the
+        index are skipped: an identifier's embedding does not change for a
+        given model.
+
+        Args:
+            keys: Identifier of each vector
+            vectors: Unit-length rows
+
+        Returns:
+            Number of vectors added
+        """
+        new: List[int] = []
+        seen = set(self._keys)
+        for position, key in enumerate(keys):
+            if key not in seen:
+                seen.add(key)
+                new.append(position)
+        if not new:
+            return 0
+        vectors = np.ascontiguousarray(np.asarray(vectors)[new], dtype=np.float32)
+        keys = [keys[position] for position in new]
+        assignments = _nearest(vectors, self.centroids)
+        order = np.argsort(assignments, kind="stable")
+        lists, starts = np.unique(assignments[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        for list_id, start, end in zip(lists.tolist(), starts.tolist(), ends.tolist()):
+            members = order[start:end]
+            self._list_vectors[list_id] = np.concatenate(
+                [self._list_vectors[list_id], vectors[members]]
+            )
+            self._list_keys[list_id].extend(keys[m] for m in members.tolist())
+        self._keys.update(keys)
+        return len(keys)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        threshold: float = 0.0,
+        top_k: Optional[int] = None,
+        n_probe: Optional[int] = None,
+        allowed: Optional[AbstractSet[str]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Approximate matches of each query.
+
+        Args:
+            queries: Unit-length query rows
+            threshold: Minimum similarity
+            top_k: Maximum matches per query (None for all found)
+            n_probe: Lists scanned per query (default: the index's n_probe)
+            allowed: Only return these identifiers
+
+        Returns:
+            For each query, (identifier, similarity) tuples, best first
+        """
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        n_probe = max(1, min(n_probe or self.n_probe, self.n_lists))
+        centroid_scores = queries @ self.centroids.T
+        if n_probe < self.n_lists:
+            probed = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+        else:
+            probed = np.tile(np.arange(self.n_lists), (len(queries), 1))
+
+        results: List[List[Tuple[str, float]]] = []
+        for query, lists in zip(queries, probed):
+            keys: List[str] = []
+            scores: List[np.ndarray] = []
+            for list_id in lists.tolist():
+                list_scores = self._list_vectors[list_id] @ query
+                passing = np.flatnonzero(list_scores >= threshold)
+                list_keys = self._list_keys[list_id]
+                if allowed is not None:
+                    passing = np.array(
+                        [p for p in passing.tolist() if list_keys[p] in allowed],
+                        dtype=np.int64,
+                    )
+                keys.extend(list_keys[p] for p in passing.tolist())
+                scores.append(list_scores[passing])
+            merged = np.concatenate(scores) if scores else np.empty(0)
+            order = top_k_indices(merged, top_k)
+            results.append([(keys[p], float(merged[p])) for p in order.tolist()])
+        return results
+
+    def save(self, path: Union[str, Path], model_name: str) -> None:
+        """
+        Write the index to a .npz file atomically.
+
+        Args:
+            path: Destination file
+            model_name: Embedding model the vectors come from
+        """
+        path = Path(path)
+        keys = [key for list_keys in self._list_keys for key in list_keys]
+        sizes = np.array([len(list_keys) for list_keys in self._list_keys])
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as handle:
+            np.savez(
+                handle,
+                version=np.array(INDEX_VERSION),
+                model=np.array(model_name),
+                n_probe=np.array(self.n_probe),
+                centroids=self.centroids,
+                sizes=sizes,
+                keys=np.array(keys, dtype=str),
+                vectors=(
+                    np.concatenate(self._list_vectors)
+                    if keys
+                    else np.empty((0, self.dimension), dtype=np.float32)
+                ),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], model_name: str) -> Optional["IVFIndex"]:
+        """
+        Read an index written by ``save``.
+
+        Args:
+            path: Index file
+            model_name: Embedding model the caller's vectors come from
+
+        Returns:
+            The index, or None if it is missing, unreadable or was built for
+            another model
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if (
+                    int(data["version"]) != INDEX_VERSION
+                    or str(data["model"]) != model_name
+                ):
+                    return None
+                index = cls(data["centroids"], int(data["n_probe"]))
+                keys = data["keys"].tolist()
+                vectors = data["vectors"]
+                sizes = data["sizes"].tolist()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable ANN index {path}: {e}")
+            return None
+
+        start = 0
+        for list_id, size in enumerate(sizes):
+            index._list_keys[list_id] = keys[start : start + size]
+            index._list_vectors[list_id] = np.ascontiguousarray(
+                vectors[start : start + size], dtype=np.float32
+            )
+            start += size
+        index._keys = set(keys)
+        return index
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of each vector's most similar centroid, scored in chunks."""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _CHUNK_ROWS):
+        chunk = vectors[start : start + _CHUNK_ROWS]
+        assignments[start : start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit length as a contiguous float32 matrix. All-zero
+    rows stay zero, so they score 0 against everything."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    normalized: np.ndarray = np.divide(
+        matrix, norms, out=np.zeros_like(matrix), where=norms > 0
+    )
+    return normalized
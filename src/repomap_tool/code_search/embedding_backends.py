@@ -0,0 +1,168 @@
+"""
+Embedding backends for EmbeddingMatcher.
+
+A backend is anything with a SentenceTransformer-style ``encode`` method.
+``sentence-transformers`` runs a transformer model (CodeRankEmbed by
+default); it imports torch and may download the model on first use, so it
+is only imported when selected. ``hashing`` needs nothing beyond numpy and
+works offline: it hashes an identifier's subwords and character n-grams
+into a fixed number of signed coordinates, a sparse random projection of
+the bag of features, so names sharing words or word fragments point in
+similar directions.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import Any, Dict, List, Protocol, Sequence, Tuple, Union
+
+import numpy as np
+
+EMBEDDING_BACKENDS = ("sentence-transformers", "hashing")
+
+# Subwords whose projections HashingEmbedder keeps in memory
+_WORD_CACHE_SIZE = 1 << 16
+
+# Subwords of identifiers and queries: split on separators, then on case
+# changes and digit runs ("parseHTTPResponse2" -> parse, http, response, 2)
+_SEPARATORS = re.compile(r"[^A-Za-z0-9]+")
+_SUBWORDS = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+
+class EmbeddingBackend(Protocol):
+    """What EmbeddingMatcher needs from an embedding model."""
+
+    def encode(
+        self,
+        texts: Union[str, Sequence[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+    ) -> np.ndarray:
+        """Embed one text (1-D result) or a batch (one row per text)."""
+        ...
+
+
+def split_subwords(text: str) -> List[str]:
+    """Lower-cased words of an identifier or free-text query."""
+    words: List[str] = []
+    for part in _SEPARATORS.split(text):
+        words.extend(word.lower() for word in _SUBWORDS.findall(part))
+    return words
+
+
+def _feature_hashes(feature: str, projections: int) -> List[int]:
+    """Stable 32-bit hashes of a feature, one per projection; the low bits
+    pick a coordinate and the top bit is its sign."""
+    digest = hashlib.blake2b(feature.encode(), digest_size=4 * projections).digest()
+    hashes: List[int] = np.frombuffer(digest, dtype="<u4").tolist()
+    return hashes
+
+
+class HashingEmbedder:
+    """Dependency-free embeddings from hashed subwords and character n-grams."""
+
+    def __init__(
+        self,
+        dimension: int = 256,
+        ngram_range: Tuple[int, int] = (3, 5),
+        projections: int = 4,
+        ngram_weight: float = 0.5,
+    ) -> None:
+        """
+        Configure the vectorizer.
+
+        Args:
+            dimension: Length of the embeddings
+            ngram_range: Smallest and largest character n-gram of a subword
+            projections: Signed coordinates each feature is hashed to
+            ngram_weight: Weight of an n-gram relative to a whole subword
+        """
+        if dimension < 1 or projections < 1:
+            raise ValueError("dimension and projections must be positive")
+        self.dimension = dimension
+        self.ngram_range = ngram_range
+        self.projections = projections
+        self.ngram_weight = ngram_weight
+        self._words: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def model_name(self) -> str:
+        """Name the persistent store keys this vectorizer's embeddings by."""
+        low, high = self.ngram_range
+        return f"hashing-{self.dimension}-{low}-{high}-{self.projections}"
+
+    def features(self, word: str) -> Dict[str, float]:
+        """Weighted features of one subword: itself and its character n-grams."""
+        low, high = self.ngram_range
+        features = {f"w:{word}": 1.0}
+        # fastText-style boundary markers keep prefixes and suffixes apart
+        marked = f"<{word}>"
+        for size in range(low, high + 1):
+            for start in range(len(marked) - size + 1):
+                gram = f"g:{marked[start : start + size]}"
+                features[gram] = features.get(gram, 0.0) + self.ngram_weight
+        return features
+
+    def encode(
+        self,
+        texts: Union[str, Sequence[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """
+        Embed texts as unit-length float32 vectors.
+
+        Args:
+            texts: One text or a batch
+            batch_size: Ignored; accepted for SentenceTransformer compatibility
+            convert_to_numpy: Ignored; results are always numpy arrays
+
+        Returns:
+            A 1-D vector for one text, otherwise one row per text. Texts
+            without any word embed as zero vectors.
+        """
+        single = isinstance(texts, str)
+        batch: List[str] = [texts] if isinstance(texts, str) else list(texts)
+        positions: List[np.ndarray] = []
+        weights: List[np.ndarray] = []
+        for row, text in enumerate(batch):
+            for word, count in Counter(split_subwords(text)).items():
+                slots, word_weights = self._word_vector(word)
+                # Sublinear counts, so a repeated word does not dominate
+                scale = 1.0 + np.log(count) if count > 1 else 1.0
+                positions.append(slots + row * self.dimension)
+                weights.append(scale * word_weights if count > 1 else word_weights)
+
+        size = len(batch) * self.dimension
+        flat: np.ndarray
+        if positions:
+            flat = np.bincount(
+                np.concatenate(positions),
+                weights=np.concatenate(weights),
+                minlength=size,
+            )
+        else:
+            flat = np.zeros(size)
+        matrix = flat.reshape(len(batch), self.dimension).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix[0] if single else matrix
+
+    def _word_vector(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse projection of a subword's features, memoized per word."""
+        cached = self._words.get(word)
+        if cached is None:
+            slots: List[int] = []
+            weights: List[float] = []
+            for feature, weight in self.features(word).items():
+                for value in _feature_hashes(feature, self.projections):
+                    slots.append(value % self.dimension)
+                    weights.append(weight if value >> 31 else -weight)
+            cached = (
+                np.array(slots, dtype=np.int64),
+                np.array(weights, dtype=np.float64),
+            )
+            if len(self._words) < _WORD_CACHE_SIZE:
+                self._words[word] = cached
+        return cached
@@ -1,66 +1,163 @@
-"""Embedding-based semantic matcher using CodeRankEmbed."""
+"""Embedding-based semantic matcher (CodeRankEmbed or an offline backend)."""
 
 import hashlib
+import time
 import numpy as np
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
-
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from ..core.logging_service import get_logger
+from .ann_index import IVFIndex, normalize_rows
+from .embedding_backends import EMBEDDING_BACKENDS, HashingEmbedder
+from .embedding_store import EmbeddingStore
+from .tfidf_index import top_k_indices
 
 logger = get_logger(__name__)
 
+# Identifier rows scored per matrix product, bounding the score buffer to
+# this many rows times the number of queries
+SCORE_CHUNK_ROWS = 16384
+
+# Identifiers encoded per model call
+EMBEDDING_BATCH_SIZE = 64
+
+# ANN index file, kept next to the embedding store
+ANN_INDEX_FILE = "embeddings.ivf.npz"
+
+# Loaded models shared by every matcher in the process, keyed by
+# (model_name, device), so a long-lived process loads each model only once.
+_MODEL_CACHE: Dict[Tuple[str, str], Any] = {}
+
+
+def _load_model(model_name: str, device: str) -> Any:
+    """Load a SentenceTransformer model, reusing an already loaded instance."""
+    key = (model_name, device)
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        # Imported here: torch is slow to import and only this backend needs it
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(model_name, trust_remote_code=True, device=device)
+        _MODEL_CACHE[key] = model
+    return model
+
 
 class EmbeddingMatcher:
-    """Semantic matching using CodeRankEmbed embeddings with persistent caching."""
+    """Semantic matching using embeddings with persistent caching."""
 
     def __init__(
         self,
         model_name: str = "nomic-ai/CodeRankEmbed",
         cache_manager: Optional[Any] = None,
         cache_dir: Optional[str] = None,
+        store_dtype: str = "float32",
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        ann_enabled: bool = False,
+        ann_min_identifiers: int = 20000,
+        ann_lists: int = 0,
+        ann_probe: int = 8,
+        backend: str = "sentence-transformers",
+        hashing_dimension: int = 256,
     ):
         """
-        Initialize EmbeddingMatcher with CodeRankEmbed model.
+        Initialize EmbeddingMatcher with an embedding backend.
 
         Args:
             model_name: Model name (default: CodeRankEmbed)
             cache_manager: Optional CacheManager for file change detection
             cache_dir: Directory for persistent embedding cache
+            store_dtype: Row dtype of the persistent cache ("float32" or
+                "float16")
+            batch_size: Identifiers encoded per model call
+            ann_enabled: Search large identifier sets through an approximate
+                IVF index instead of scoring every identifier
+            ann_min_identifiers: Smallest identifier set searched through
+                the ANN index
+            ann_lists: Number of IVF lists (0: about sqrt of the identifiers)
+            ann_probe: IVF lists scanned per query; higher trades latency
+                for recall
+            backend: "sentence-transformers" runs model_name; "hashing" embeds
+                hashed subwords and character n-grams offline, without torch
+            hashing_dimension: Embedding length of the hashing backend
         """
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(
+                f"Unknown embedding backend {backend!r}, expected one of "
+                f"{', '.join(EMBEDDING_BACKENDS)}"
+            )
+        self.backend = backend
+        self.hashing_dimension = hashing_dimension
         self.model_name = model_name
         self.cache_manager = cache_manager
         self.cache_dir = cache_dir or ".repomap/cache/embeddings"
+        if backend == "hashing":
+            # Separate store, so switching backends keeps the model's cache
+            self.cache_dir = str(Path(self.cache_dir) / "hashing")
+        self.store_dtype = store_dtype or "float32"
+        self.batch_size = max(1, batch_size)
         self.enabled = False
         self.model = None
+        self.store: Optional[EmbeddingStore] = None
         self.embedding_cache: Dict[str, np.ndarray] = {}
+        self.score_chunk_rows = SCORE_CHUNK_ROWS
+        # Unit-length embeddings of the last identifier set searched, one
+        # contiguous row per identifier
+        self._matrix_identifiers: Optional[FrozenSet[str]] = None
+        self._matrix_rows: List[str] = []
+        self._matrix_row_of: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self.ann_enabled = ann_enabled
+        self.ann_min_identifiers = ann_min_identifiers
+        self.ann_lists = ann_lists
+        self.ann_probe = ann_probe
+        self.ann_index: Optional[IVFIndex] = None
+        self._ann_loaded = False
 
         # Initialize model with GPU detection
         try:
-            logger.debug(f"Initializing EmbeddingMatcher with model: {model_name}")
-            logger.debug(f"Cache directory: {self.cache_dir}")
-
-            # Detect and use GPU if available
-            device = self._detect_best_device()
-            logger.debug(f"Using device: {device}")
-
-            self.model = SentenceTransformer(
-                model_name, trust_remote_code=True, device=device
-            )
+            self.model = self._load_backend()
             self.enabled = True
-            logger.debug(f"✓ EmbeddingMatcher initialized successfully on {device}")
         except Exception as e:
             logger.warning(f"Failed to initialize EmbeddingMatcher: {e}")
             logger.warning("Embedding-based search will be disabled")
 
-        # Create cache directory
+        # Open the persistent embedding store
         if self.enabled:
             try:
-                Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+                self.store = EmbeddingStore(
+                    self.cache_dir, self.model_name, dtype=self.store_dtype
+                )
+                self._import_legacy_files()
             except Exception as e:
-                logger.warning(f"Failed to create cache directory: {e}")
+                logger.warning(f"Failed to open embedding store: {e}")
+
+    def _load_backend(self) -> Any:
+        """Create the configured backend's model."""
+        logger.debug(f"Cache directory: {self.cache_dir}")
+        if self.backend == "hashing":
+            model = HashingEmbedder(dimension=self.hashing_dimension)
+            self.model_name = model.model_name
+            logger.debug(f"✓ EmbeddingMatcher using {self.model_name}")
+            return model
+
+        logger.debug(f"Initializing EmbeddingMatcher with model: {self.model_name}")
+        # Detect and use GPU if available
+        device = self._detect_best_device()
+        logger.debug(f"Using device: {device}")
+        model = _load_model(self.model_name, device)
+        logger.debug(f"✓ EmbeddingMatcher initialized successfully on {device}")
+        return model
 
     def _detect_best_device(self) -> str:
         """
@@ -100,9 +197,51 @@ class EmbeddingMatcher:
         """Generate cache key from text."""
         return hashlib.sha256(text.encode()).hexdigest()[:16]
 
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get file path for cached embedding."""
-        return Path(self.cache_dir) / f"{cache_key}.npy"
+    def _import_legacy_files(self) -> None:
+        """Move embeddings cached one .npy file per identifier into the store."""
+        if self.store is None:
+            return
+        keys: List[str] = []
+        embeddings: List[np.ndarray] = []
+        paths = list(Path(self.cache_dir).glob("*.npy"))
+        for path in paths:
+            try:
+                embeddings.append(np.load(path))
+                keys.append(path.stem)
+            except Exception as e:
+                logger.debug(f"Skipping unreadable cached embedding {path}: {e}")
+        if keys:
+            try:
+                self.store.put_many(keys, np.vstack(embeddings))
+            except ValueError as e:
+                logger.debug(f"Not importing legacy embeddings: {e}")
+        for path in paths:
+            path.unlink(missing_ok=True)
+        if keys:
+            logger.info(f"Imported {len(keys)} cached embeddings into the store")
+
+    def _load_stored(self, cache_keys: List[str]) -> Dict[str, np.ndarray]:
+        """Stored embeddings of the keys missing from memory, read in one
+        memory-mapped gather and kept in memory."""
+        if self.store is None or not cache_keys:
+            return {}
+        try:
+            found, matrix = self.store.get_many(cache_keys)
+        except Exception as e:
+            logger.debug(f"Failed to load cached embeddings: {e}")
+            return {}
+        loaded: Dict[str, np.ndarray] = dict(zip(found, matrix))
+        self.embedding_cache.update(loaded)
+        return loaded
+
+    def _store_embeddings(self, cache_keys: List[str], embeddings: Any) -> None:
+        """Append computed embeddings to the persistent store."""
+        if self.store is None:
+            return
+        try:
+            self.store.put_many(cache_keys, embeddings)
+        except Exception as e:
+            logger.debug(f"Failed to save embeddings to cache: {e}")
 
     def get_embedding(
         self, text: str, file_path: Optional[str] = None
@@ -126,9 +265,7 @@ class EmbeddingMatcher:
                 "Model is None despite enabled=True - attempting re-initialization"
             )
             try:
-                self.model = SentenceTransformer(
-                    self.model_name, trust_remote_code=True
-                )
+                self.model = self._load_backend()
                 logger.info("Model re-initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to re-initialize model: {e}")
@@ -141,20 +278,12 @@ class EmbeddingMatcher:
             return self.embedding_cache[cache_key]
 
         # Check persistent cache
-        cache_path = self._get_cache_path(cache_key)
-        if cache_path.exists():
-            try:
-                # Check if file is still valid via cache manager
-                if self.cache_manager and file_path:
-                    # If file was modified, cache is invalid
-                    # For now, just load - cache invalidation happens at index time
-                    pass
-                else:
-                    embedding = np.load(cache_path)
-                    self.embedding_cache[cache_key] = embedding
-                    return embedding  # type: ignore[no-any-return]
-            except Exception as e:
-                logger.debug(f"Failed to load cached embedding: {e}")
+        # With a cache manager and file path, cache invalidation happens at
+        # index time, so the stored embedding is not trusted here
+        if not (self.cache_manager and file_path):
+            stored = self._load_stored([cache_key])
+            if cache_key in stored:
+                return stored[cache_key]
 
         # Compute embedding
         try:
@@ -170,10 +299,7 @@ class EmbeddingMatcher:
             embedding = self.model.encode(text, convert_to_numpy=True)
 
             # Save to persistent cache
-            try:
-                np.save(cache_path, embedding)
-            except Exception as e:
-                logger.debug(f"Failed to save embedding to cache: {e}")
+            self._store_embeddings([cache_key], embedding)
 
             # Store in memory cache
             self.embedding_cache[cache_key] = embedding
@@ -198,33 +324,11 @@ class EmbeddingMatcher:
         if not self.enabled or not self.model:
             return {}
 
-        results = {}
-        to_compute = []
-        to_compute_keys = []
-
         # Check what's already cached
-        for identifier, file_path in identifiers.items():
-            cache_key = self._get_cache_key(identifier)
-            cache_path = self._get_cache_path(cache_key)
-
-            # Check in-memory cache
-            if cache_key in self.embedding_cache:
-                results[identifier] = self.embedding_cache[cache_key]
-                continue
-
-            # Check persistent cache
-            if cache_path.exists():
-                try:
-                    embedding = np.load(cache_path)
-                    self.embedding_cache[cache_key] = embedding
-                    results[identifier] = embedding
-                    continue
-                except Exception:
-                    pass
-
-            # Need to compute
-            to_compute.append(identifier)
-            to_compute_keys.append(cache_key)
+        results = self.load_cached_embeddings(set(identifiers))
+        to_compute = [
+            identifier for identifier in identifiers if identifier not in results
+        ]
 
         # Batch compute remaining
         if to_compute:
@@ -232,39 +336,111 @@ class EmbeddingMatcher:
                 logger.info(
                     f"Computing embeddings for {len(to_compute)} identifiers..."
                 )
-                embeddings = self.model.encode(to_compute, convert_to_numpy=True)
-
-                for i, identifier in enumerate(to_compute):
-                    embedding = embeddings[i]
-                    cache_key = to_compute_keys[i]
-                    cache_path = self._get_cache_path(cache_key)
-
-                    # Save to persistent cache
-                    try:
-                        np.save(cache_path, embedding)
-                    except Exception as e:
-                        logger.debug(f"Failed to save embedding: {e}")
-
-                    # Store in memory and results
-                    self.embedding_cache[cache_key] = embedding
-                    results[identifier] = embedding
+                for batch in self._length_batches(to_compute):
+                    embeddings = self._encode_batch(batch)
+                    for identifier, embedding in zip(batch, embeddings):
+                        # Store in memory and results
+                        self.embedding_cache[self._get_cache_key(identifier)] = (
+                            embedding
+                        )
+                        results[identifier] = embedding
 
             except Exception as e:
                 logger.error(f"Failed to batch compute embeddings: {e}")
 
         return results
 
-    def load_cached_embeddings(self, identifiers: Set[str]) -> Dict[str, np.ndarray]:
+    def precompute_embeddings(
+        self,
+        identifiers: Iterable[str],
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, float]:
+        """
+        Compute and store the embeddings the persistent cache lacks.
+
+        This is the index-time stage: only missing identifiers are encoded,
+        and nothing is loaded into memory. Every batch is stored as soon as
+        it is encoded, so an interrupted run resumes where it stopped.
+
+        Args:
+            identifiers: Identifier texts
+            batch_size: Identifiers per model call (default: the matcher's)
+            progress: Called after each batch with the number of missing
+                identifiers done so far and the number missing
+
+        Returns:
+            Dict with the total, cached, computed and failed identifier
+            counts, the seconds spent encoding and identifiers_per_second
+        """
+        unique = list(dict.fromkeys(identifiers))
+        stats: Dict[str, float] = {
+            "total": len(unique),
+            "cached": 0,
+            "computed": 0,
+            "failed": 0,
+            "seconds": 0.0,
+            "identifiers_per_second": 0.0,
+        }
+        if not self.enabled or not self.model:
+            return stats
+
+        keys = {self._get_cache_key(identifier): identifier for identifier in unique}
+        missing_keys = self.store.missing(keys) if self.store else list(keys)
+        missing = [keys[cache_key] for cache_key in missing_keys]
+        stats["cached"] = len(unique) - len(missing)
+
+        start = time.perf_counter()
+        done = 0
+        for batch in self._length_batches(missing, batch_size):
+            try:
+                self._encode_batch(batch)
+                stats["computed"] += len(batch)
+            except Exception as e:
+                logger.error(f"Failed to compute a batch of embeddings: {e}")
+                stats["failed"] += len(batch)
+            done += len(batch)
+            if progress is not None:
+                progress(done, len(missing))
+        stats["seconds"] = time.perf_counter() - start
+        if stats["computed"] and stats["seconds"] > 0:
+            stats["identifiers_per_second"] = stats["computed"] / stats["seconds"]
+        return stats
+
+    def _length_batches(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> List[List[str]]:
+        """Split texts into batches of similar length, so little of each
+        batch the model encodes is padding."""
+        size = max(1, batch_size or self.batch_size)
+        ordered = sorted(texts, key=len)
+        return [ordered[i : i + size] for i in range(0, len(ordered), size)]
+
+    def _encode_batch(self, batch: List[str]) -> np.ndarray:
+        """Encode one batch and append it to the persistent cache."""
+        assert self.model is not None  # Callers check the model is loaded
+        embeddings = np.asarray(
+            self.model.encode(batch, batch_size=len(batch), convert_to_numpy=True)
+        )
+        self._store_embeddings(
+            [self._get_cache_key(text) for text in batch], embeddings
+        )
+        return embeddings
+
+    def load_cached_embeddings(
+        self, identifiers: Iterable[str]
+    ) -> Dict[str, np.ndarray]:
         """
         Load cached embeddings for identifiers.
 
         Args:
-            identifiers: Set of identifier texts
+            identifiers: Identifier texts
 
         Returns:
             Dict mapping identifier to embedding (only successfully loaded)
         """
         results = {}
+        uncached: Dict[str, str] = {}
 
         for identifier in identifiers:
             cache_key = self._get_cache_key(identifier)
@@ -272,22 +448,21 @@ class EmbeddingMatcher:
             # Check in-memory cache
             if cache_key in self.embedding_cache:
                 results[identifier] = self.embedding_cache[cache_key]
-                continue
-
-            # Check persistent cache
-            cache_path = self._get_cache_path(cache_key)
-            if cache_path.exists():
-                try:
-                    embedding = np.load(cache_path)
-                    self.embedding_cache[cache_key] = embedding
-                    results[identifier] = embedding
-                except Exception:
-                    pass
+            else:
+                uncached[cache_key] = identifier
+
+        # Check persistent cache: one gather from the memory-mapped store
+        for cache_key, embedding in self._load_stored(list(uncached)).items():
+            results[uncached[cache_key]] = embedding
 
         return results
 
     def find_semantic_matches(
-        self, query: str, identifiers: Set[str], threshold: float = 0.3
+        self,
+        query: str,
+        identifiers: Set[str],
+        threshold: float = 0.3,
+        top_k: Optional[int] = None,
     ) -> List[Tuple[str, float]]:
         """
         Find semantically similar identifiers using embeddings.
@@ -296,55 +471,194 @@ class EmbeddingMatcher:
             query: Query text
             identifiers: Set of identifier texts to search
             threshold: Minimum similarity score (0.0-1.0)
+            top_k: Maximum number of matches to return (None for all)
 
         Returns:
             List of (identifier, similarity_score) tuples, sorted by score
         """
-        if not self.enabled or not self.model:
-            return []
+        return self.find_semantic_matches_batch([query], identifiers, threshold, top_k)[
+            0
+        ]
 
-        # Get query embedding
-        query_embedding = self.get_embedding(query)
-        if query_embedding is None:
-            return []
+    def find_semantic_matches_batch(
+        self,
+        queries: List[str],
+        identifiers: Iterable[str],
+        threshold: float = 0.3,
+        top_k: Optional[int] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Find semantically similar identifiers for many queries at once.
 
-        # Load cached embeddings
-        cached_embeddings = self.load_cached_embeddings(identifiers)
+        Embeddings are kept normalized in one matrix, so the cosine scores of
+        every query come from one matrix product per chunk of identifiers.
 
-        # Compute missing embeddings on demand
-        missing = identifiers - set(cached_embeddings.keys())
-        if missing:
-            for identifier in missing:
-                embedding = self.get_embedding(identifier)
-                if embedding is not None:
-                    cached_embeddings[identifier] = embedding
+        Args:
+            queries: Query texts
+            identifiers: Identifier texts to search
+            threshold: Minimum similarity score (0.0-1.0)
+            top_k: Maximum number of matches per query (None for all)
 
-        # Calculate similarities
-        matches = []
-        query_embedding_2d = query_embedding.reshape(1, -1)
+        Returns:
+            For each query, a list of (identifier, similarity_score) tuples,
+            sorted by score
+        """
+        results: List[List[Tuple[str, float]]] = [[] for _ in queries]
+        if not queries or not self.enabled or not self.model:
+            return results
+
+        query_embeddings = self.batch_compute_embeddings(dict.fromkeys(queries, ""))
+        asked = [i for i, query in enumerate(queries) if query in query_embeddings]
+        if not asked:
+            return results
+        query_matrix = normalize_rows(
+            np.vstack([query_embeddings[queries[i]] for i in asked])
+        )
+        if not isinstance(identifiers, (set, frozenset)):
+            identifiers = set(identifiers)
+
+        if self.ann_enabled and len(identifiers) >= self.ann_min_identifiers:
+            index = self._ann_index_for(identifiers)
+            if index is not None and index.dimension == query_matrix.shape[1]:
+                allowed = None if len(index) == len(identifiers) else identifiers
+                found = index.search(query_matrix, threshold, top_k, allowed=allowed)
+                for position, matches in zip(asked, found):
+                    results[position] = matches
+                return results
+
+        rows, matrix = self._normalized_matrix(identifiers)
+        if not rows:
+            return results
+        if query_matrix.shape[1] != matrix.shape[1]:
+            logger.debug("Query and identifier embedding dimensions differ")
+            return results
+
+        # Score a chunk of rows at a time, keeping each query's passing rows
+        # (at most top_k of them per chunk)
+        kept_rows: List[List[np.ndarray]] = [[] for _ in asked]
+        kept_scores: List[List[np.ndarray]] = [[] for _ in asked]
+        chunk = max(1, self.score_chunk_rows)
+        for start in range(0, len(rows), chunk):
+            scores = matrix[start : start + chunk] @ query_matrix.T
+            for column in range(len(asked)):
+                column_scores = scores[:, column]
+                passing = np.flatnonzero(column_scores >= threshold)
+                if top_k is not None:
+                    passing = passing[top_k_indices(column_scores[passing], top_k)]
+                kept_rows[column].append(passing + start)
+                kept_scores[column].append(column_scores[passing])
+
+        for column, position in enumerate(asked):
+            matched = np.concatenate(kept_rows[column])
+            scores = np.concatenate(kept_scores[column])
+            order = top_k_indices(scores, top_k)
+            results[position] = [
+                (rows[row], score)
+                for row, score in zip(
+                    matched[order].tolist(), scores[order].astype(float).tolist()
+                )
+            ]
+        return results
 
-        for identifier, embedding in cached_embeddings.items():
-            embedding_2d = embedding.reshape(1, -1)
-            similarity = cosine_similarity(query_embedding_2d, embedding_2d)[0][0]
+    def _normalized_matrix(
+        self, identifiers: Iterable[str]
+    ) -> Tuple[List[str], np.ndarray]:
+        """Unit-length embeddings of the identifiers as one contiguous
+        matrix, computing missing embeddings in one batch. The matrix of the
+        last identifier set is kept for the next search, and subsets of that
+        set (such as rerank candidates) are gathered from it."""
+        if not isinstance(identifiers, (set, frozenset)):
+            identifiers = set(identifiers)
+        if self._matrix is not None and self._matrix_identifiers is not None:
+            if self._matrix_identifiers == identifiers:
+                return self._matrix_rows, self._matrix
+            if identifiers <= self._matrix_identifiers:
+                positions = [
+                    self._matrix_row_of[identifier]
+                    for identifier in identifiers
+                    if identifier in self._matrix_row_of
+                ]
+                return (
+                    [self._matrix_rows[position] for position in positions],
+                    self._matrix[positions],
+                )
 
-            if similarity >= threshold:
-                matches.append((identifier, float(similarity)))
+        embeddings = self.load_cached_embeddings(identifiers)
+        missing = {
+            identifier: "" for identifier in identifiers if identifier not in embeddings
+        }
+        if missing:
+            embeddings.update(self.batch_compute_embeddings(missing))
+
+        rows = list(embeddings)
+        if rows:
+            matrix = normalize_rows(np.vstack([embeddings[row] for row in rows]))
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        self._matrix_identifiers = frozenset(identifiers)
+        self._matrix_rows = rows
+        self._matrix_row_of = {identifier: row for row, identifier in enumerate(rows)}
+        self._matrix = matrix
+        return rows, matrix
+
+    def _ann_index_for(self, identifiers: AbstractSet[str]) -> Optional[IVFIndex]:
+        """
+        The ANN index, covering at least the identifiers.
 
-        # Sort by similarity descending
-        matches.sort(key=lambda x: x[1], reverse=True)
-        return matches
+        The index is loaded from next to the embedding store on first use,
+        built when there is none (or when most of its entries are no longer
+        searched), and otherwise extended with the identifiers it lacks.
+        """
+        path = Path(self.cache_dir) / ANN_INDEX_FILE
+        if not self._ann_loaded:
+            self._ann_loaded = True
+            self.ann_index = IVFIndex.load(path, self.model_name)
+            if self.ann_index is not None:
+                self.ann_index.n_probe = self.ann_probe
+
+        index = self.ann_index
+        if index is None or len(index) > 2 * len(identifiers):
+            rows, matrix = self._normalized_matrix(identifiers)
+            if not rows:
+                return None
+            logger.info(f"Building ANN index over {len(rows)} identifiers...")
+            index = IVFIndex.build(
+                rows, matrix, n_lists=self.ann_lists, n_probe=self.ann_probe
+            )
+        else:
+            missing = [
+                identifier for identifier in identifiers if identifier not in index
+            ]
+            if not missing:
+                return index
+            embeddings = self.load_cached_embeddings(set(missing))
+            uncached = {m: "" for m in missing if m not in embeddings}
+            if uncached:
+                embeddings.update(self.batch_compute_embeddings(uncached))
+            if not embeddings:
+                return index
+            rows = list(embeddings)
+            index.add(rows, normalize_rows(np.vstack([embeddings[r] for r in rows])))
+
+        self.ann_index = index
+        try:
+            index.save(path, self.model_name)
+        except Exception as e:
+            logger.debug(f"Failed to save ANN index: {e}")
+        return index
 
     def clear_cache(self) -> None:
         """Clear in-memory embedding cache."""
         self.embedding_cache.clear()
+        self._matrix_identifiers = None
+        self._matrix_rows = []
+        self._matrix_row_of = {}
+        self._matrix = None
 
     def get_cache_stats(self) -> Dict[str, int]:
         """Get cache statistics."""
-        persistent_count = 0
-        if Path(self.cache_dir).exists():
-            persistent_count = len(list(Path(self.cache_dir).glob("*.npy")))
-
         return {
             "memory_cache_size": len(self.embedding_cache),
-            "persistent_cache_size": persistent_count,
+            "persistent_cache_size": len(self.store) if self.store else 0,
+            "persistent_stale_rows": self.store.stale_rows if self.store else 0,
         }
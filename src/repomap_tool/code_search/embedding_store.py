@@ -0,0 +1,450 @@
+"""
+Consolidated on-disk store for identifier embeddings.
+
+All vectors of an embedding cache directory live in one append-only matrix
+file read through ``np.memmap``, so loading the embeddings of every
+identifier costs one mapping and one gather instead of a file open per
+identifier. Three files make up a store:
+
+- ``embeddings.json``: header recording the model name, dimension and dtype
+- ``embeddings.vectors``: the rows of the matrix, back to back
+- ``embeddings.keys``: append-only log of (key, row) records; a row of -1
+  removes the key
+
+A key written twice, or removed, leaves its old row behind. Once such stale
+rows make up most of the file, the store rewrites the live rows into fresh
+files in a background thread.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.logging_service import get_logger
+
+# Advisory file locks serialize writers across processes where available
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+STORE_VERSION = 1
+
+# Row dtypes the vectors file can be written in
+STORE_DTYPES = ("float32", "float16")
+
+_HEADER_FILE = "embeddings.json"
+_VECTORS_FILE = "embeddings.vectors"
+_KEYS_FILE = "embeddings.keys"
+_LOCK_FILE = "embeddings.lock"
+
+# One keys-log record: the 64-bit cache key and its row (-1 removes the key)
+_RECORD_DTYPE = np.dtype([("key", "<u8"), ("row", "<i8")])
+
+# Compact once stale rows are at least this share of the file, and this many
+_COMPACT_RATIO = 0.5
+_COMPACT_MIN_STALE = 1024
+
+
+def key_to_int(cache_key: str) -> int:
+    """64-bit integer form of a 16 hex digit cache key."""
+    return int(cache_key[:16], 16)
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped matrix of embeddings keyed by cache key.
+
+    Keys are the 16 hex digit text hashes EmbeddingMatcher already uses.
+    Reads pick up rows appended by other processes; writes are serialized
+    by a lock file where ``fcntl`` is available.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        model_name: str,
+        dtype: str = "float32",
+        compact_ratio: float = _COMPACT_RATIO,
+        compact_min_stale: int = _COMPACT_MIN_STALE,
+    ) -> None:
+        """
+        Open a store, creating it if needed.
+
+        A store written for another model or row dtype is discarded.
+
+        Args:
+            directory: Directory holding the store files
+            model_name: Embedding model the vectors come from
+            dtype: Row dtype on disk: "float32" or "float16"
+            compact_ratio: Share of stale rows that triggers a compaction
+            compact_min_stale: Minimum stale rows before compacting
+
+        Raises:
+            ValueError: If dtype is not supported
+        """
+        if dtype not in STORE_DTYPES:
+            raise ValueError(f"Invalid store dtype: {dtype}. Valid: {STORE_DTYPES}")
+        self.directory = Path(directory)
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.compact_ratio = compact_ratio
+        self.compact_min_stale = compact_min_stale
+
+        self.header_path = self.directory / _HEADER_FILE
+        self.vectors_path = self.directory / _VECTORS_FILE
+        self.keys_path = self.directory / _KEYS_FILE
+        self.lock_path = self.directory / _LOCK_FILE
+
+        self.dimension: Optional[int] = None
+        self._lock = threading.RLock()
+        self._rows: Dict[int, int] = {}
+        self._row_count = 0
+        self._keys_offset = 0
+        self._keys_inode: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self._compaction: Optional[threading.Thread] = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._file_lock():
+            self._open()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._rows)
+
+    def __contains__(self, cache_key: str) -> bool:
+        with self._lock:
+            self._sync()
+            return key_to_int(cache_key) in self._rows
+
+    def missing(self, cache_keys: Iterable[str]) -> List[str]:
+        """Keys without a stored embedding, in the order given."""
+        with self._lock:
+            self._sync()
+            return [
+                cache_key
+                for cache_key in cache_keys
+                if key_to_int(cache_key) not in self._rows
+            ]
+
+    @property
+    def stale_rows(self) -> int:
+        """Rows in the vectors file no key points at."""
+        with self._lock:
+            self._sync()
+            return self._row_count - len(self._rows)
+
+    def get(self, cache_key: str) -> Optional[np.ndarray]:
+        """Embedding stored under a key, or None."""
+        keys, matrix = self.get_many([cache_key])
+        return matrix[0] if keys else None
+
+    def get_many(self, cache_keys: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Gather the stored embeddings of many keys with one memory-mapped read.
+
+        Args:
+            cache_keys: Keys to look up
+
+        Returns:
+            Tuple of (keys found, float32 matrix with their rows in that order)
+        """
+        with self._lock:
+            self._sync()
+            found: List[str] = []
+            rows: List[int] = []
+            for cache_key in cache_keys:
+                row = self._rows.get(key_to_int(cache_key))
+                if row is not None:
+                    found.append(cache_key)
+                    rows.append(row)
+            if not rows or self.dimension is None:
+                return [], np.empty((0, self.dimension or 0), dtype=np.float32)
+            matrix = self._mapped()
+            return found, np.asarray(matrix[np.array(rows)], dtype=np.float32)
+
+    def put_many(
+        self, cache_keys: Sequence[str], vectors: Union[np.ndarray, Sequence]
+    ) -> None:
+        """
+        Append embeddings, replacing any stored under the same keys.
+
+        Args:
+            cache_keys: Key of each vector
+            vectors: One vector per key, all of the store's dimension
+
+        Raises:
+            ValueError: If the vectors do not match the keys or the dimension
+        """
+        matrix = np.asarray(vectors, dtype=self.dtype)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if len(matrix) != len(cache_keys):
+            raise ValueError(f"Got {len(matrix)} vectors for {len(cache_keys)} keys")
+        if not len(cache_keys):
+            return
+
+        with self._lock, self._file_lock():
+            self._sync()
+            if self.dimension is None:
+                self.dimension = int(matrix.shape[1])
+                self._write_header()
+            elif matrix.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match the "
+                    f"store's {self.dimension}"
+                )
+
+            # Vectors first: a record only ever points at a fully written row.
+            # Drop any partial row an interrupted append left behind.
+            first_row = self._row_count
+            os.truncate(
+                self.vectors_path, first_row * self.dimension * self.dtype.itemsize
+            )
+            with open(self.vectors_path, "ab") as handle:
+                handle.write(np.ascontiguousarray(matrix).tobytes())
+            keys = [key_to_int(cache_key) for cache_key in cache_keys]
+            records = np.empty(len(keys), dtype=_RECORD_DTYPE)
+            records["key"] = keys
+            records["row"] = np.arange(first_row, first_row + len(keys))
+            self._append_records(records)
+        self._maybe_compact()
+
+    def discard(self, cache_keys: Iterable[str]) -> int:
+        """
+        Remove keys from the store. Their rows go stale.
+
+        Args:
+            cache_keys: Keys to remove
+
+        Returns:
+            Number of keys that were stored
+        """
+        with self._lock, self._file_lock():
+            self._sync()
+            keys = [
+                key
+                for key in {key_to_int(cache_key) for cache_key in cache_keys}
+                if key in self._rows
+            ]
+            if keys:
+                records = np.empty(len(keys), dtype=_RECORD_DTYPE)
+                records["key"] = keys
+                records["row"] = -1
+                self._append_records(records)
+        if keys:
+            self._maybe_compact()
+        return len(keys)
+
+    def compact(self) -> int:
+        """
+        Rewrite the live rows into fresh files, dropping stale rows.
+
+        Returns:
+            Number of stale rows dropped
+        """
+        with self._lock, self._file_lock():
+            self._sync()
+            stale = self._row_count - len(self._rows)
+            if stale == 0 or self.dimension is None:
+                return 0
+
+            items = sorted(self._rows.items(), key=lambda item: item[1])
+            keys = np.array([key for key, _ in items], dtype=np.uint64)
+            old_rows = np.array([row for _, row in items], dtype=np.int64)
+            records = np.empty(len(items), dtype=_RECORD_DTYPE)
+            records["key"] = keys
+            records["row"] = np.arange(len(items))
+
+            vectors_tmp = self.vectors_path.with_suffix(".vectors.tmp")
+            keys_tmp = self.keys_path.with_suffix(".keys.tmp")
+            self._mapped()[old_rows].tofile(vectors_tmp)
+            records.tofile(keys_tmp)
+            # Vectors first, so the old keys log never points past the new
+            # vectors file's end
+            os.replace(vectors_tmp, self.vectors_path)
+            os.replace(keys_tmp, self.keys_path)
+
+            self._matrix = None
+            self._load_records()
+        logger.debug(f"Compacted embedding store, dropped {stale} stale rows")
+        return stale
+
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        """Start compacting in a daemon thread unless one is already running."""
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return None
+            self._compaction = threading.Thread(
+                target=self._compact_quietly,
+                name="embedding-store-compaction",
+                daemon=True,
+            )
+            self._compaction.start()
+            return self._compaction
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Wait for a background compaction to finish."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join(timeout)
+
+    def clear(self) -> None:
+        """Remove every stored embedding."""
+        with self._lock, self._file_lock():
+            self._reset()
+
+    def _compact_quietly(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            logger.warning(f"Embedding store compaction failed: {e}")
+
+    def _maybe_compact(self) -> None:
+        stale = self._row_count - len(self._rows)
+        if (
+            stale >= self.compact_min_stale
+            and stale >= self.compact_ratio * self._row_count
+        ):
+            self.compact_in_background()
+
+    def _open(self) -> None:
+        """Read the header and keys log, resetting an incompatible store."""
+        header = None
+        if self.header_path.exists():
+            try:
+                header = json.loads(self.header_path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable embedding store header, resetting: {e}")
+        if header is None:
+            self._reset()
+            return
+        if (
+            header.get("version") != STORE_VERSION
+            or header.get("model") != self.model_name
+            or header.get("dtype") != self.dtype.name
+        ):
+            logger.info(
+                f"Embedding store was written for {header.get('model')} "
+                f"({header.get('dtype')}), resetting it for {self.model_name}"
+            )
+            self._reset()
+            return
+        self.dimension = header.get("dimension")
+        self._load_records()
+
+    def _reset(self) -> None:
+        for path in (self.vectors_path, self.keys_path):
+            path.unlink(missing_ok=True)
+        self.dimension = None
+        self._write_header()
+        self.keys_path.touch()
+        self.vectors_path.touch()
+        self._matrix = None
+        self._load_records()
+
+    def _write_header(self) -> None:
+        header = {
+            "version": STORE_VERSION,
+            "model": self.model_name,
+            "dimension": self.dimension,
+            "dtype": self.dtype.name,
+        }
+        tmp = self.header_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(header))
+        os.replace(tmp, self.header_path)
+
+    def _load_records(self) -> None:
+        """Rebuild the key -> row index from the whole keys log."""
+        self._rows = {}
+        self._row_count = 0
+        self._keys_offset = 0
+        self._keys_inode = None
+        self._sync()
+
+    def _sync(self) -> None:
+        """Apply records appended to the keys log since the last read."""
+        try:
+            stat = os.stat(self.keys_path)
+        except FileNotFoundError:
+            return
+        if self._keys_inode is not None and stat.st_ino != self._keys_inode:
+            # Compacted by another process
+            self._matrix = None
+            self._keys_inode = None
+            self._rows = {}
+            self._keys_offset = 0
+            if self.header_path.exists():
+                self.dimension = json.loads(self.header_path.read_text()).get(
+                    "dimension"
+                )
+        self._keys_inode = stat.st_ino
+        if stat.st_size <= self._keys_offset:
+            self._row_count = self._rows_on_disk()
+            return
+
+        with open(self.keys_path, "rb") as handle:
+            handle.seek(self._keys_offset)
+            data = handle.read()
+        complete = len(data) - len(data) % _RECORD_DTYPE.itemsize
+        records = np.frombuffer(data[:complete], dtype=_RECORD_DTYPE)
+        self._keys_offset += complete
+
+        if self.dimension is None and self.header_path.exists():
+            self.dimension = json.loads(self.header_path.read_text()).get("dimension")
+        self._row_count = self._rows_on_disk()
+        rows = self._rows
+        for key, row in zip(records["key"].tolist(), records["row"].tolist()):
+            if row < 0:
+                rows.pop(key, None)
+            elif row < self._row_count:
+                rows[key] = row
+
+    def _rows_on_disk(self) -> int:
+        if not self.dimension:
+            return 0
+        try:
+            size = os.path.getsize(self.vectors_path)
+        except FileNotFoundError:
+            return 0
+        return size // (self.dimension * self.dtype.itemsize)
+
+    def _mapped(self) -> np.memmap:
+        """The vectors file mapped read-only, remapped when it grew."""
+        if self._matrix is None or len(self._matrix) < self._row_count:
+            self._matrix = np.memmap(
+                self.vectors_path,
+                dtype=self.dtype,
+                mode="r",
+                shape=(self._row_count, self.dimension or 0),
+            )
+        return self._matrix
+
+    def _append_records(self, records: np.ndarray) -> None:
+        with open(self.keys_path, "ab") as handle:
+            handle.write(records.tobytes())
+        self._sync()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive advisory lock across processes (no-op without
+        fcntl)."""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self.lock_path, "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,421 @@
+"""
+Candidate index for fuzzy identifier matching.
+
+Scoring an identifier with every FuzzyMatcher strategy costs tens of
+microseconds, so a query over a large project is dominated by identifiers
+that cannot possibly reach the threshold. A FuzzyCandidateIndex is built once
+per identifier set and narrows each query to a shortlist that provably
+contains every identifier that could score at or above the threshold:
+
+- exact, prefix, suffix and substring matches are found by searching one
+  string holding every lowered identifier,
+- word and token overlaps come from posting lists,
+- fuzzywuzzy ratios are bounded from character counts: a ratio is
+  2 * matches / total length, and the matches between two strings can never
+  exceed the characters they have in common.
+
+Only the shortlist is scored, with the matcher's unchanged scoring code, so
+results are identical to a full scan.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fuzzywuzzy import utils
+
+# Same word split as FuzzyMatcher's word strategy
+_WORD_SPLIT = re.compile(r"[_\-\s]+")
+# Identifiers made only of these characters are their own fuzzywuzzy
+# full_process() output: one token, nothing stripped
+_SIMPLE_IDENTIFIER = re.compile(r"[a-z0-9_]+")
+_SEPARATOR = "\x00"
+
+# Character buckets for the count bounds: a-z, 0-9, "_" and everything else.
+# Merging characters into a bucket can only raise the common count, so the
+# bounds stay valid.
+_OTHER_BUCKET = 37
+_NUM_BUCKETS = 38
+_BUCKET_OF_ASCII = np.full(128, _OTHER_BUCKET, dtype=np.intp)
+_BUCKET_OF_ASCII[ord("a") : ord("z") + 1] = np.arange(26)
+_BUCKET_OF_ASCII[ord("0") : ord("9") + 1] = np.arange(26, 36)
+_BUCKET_OF_ASCII[ord("_")] = 36
+
+# Slack on the ratio bounds so float rounding never excludes a match
+_BOUND_EPSILON = 1e-9
+
+
+def _bucket_codes(codes: np.ndarray) -> np.ndarray:
+    buckets = np.full(len(codes), _OTHER_BUCKET, dtype=np.intp)
+    ascii_mask = codes < 128
+    buckets[ascii_mask] = _BUCKET_OF_ASCII[codes[ascii_mask]]
+    return buckets
+
+
+def _char_counts(text: str) -> np.ndarray:
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    return np.bincount(_bucket_codes(codes), minlength=_NUM_BUCKETS)
+
+
+def _sorted_tokens(tokens: Iterable[str]) -> str:
+    return " ".join(sorted(tokens))
+
+
+def query_tokens(query_lower: str) -> List[str]:
+    """Tokens fuzzywuzzy's token ratios see in a string."""
+    processed: str = utils.full_process(query_lower, force_ascii=True)
+    return processed.split()
+
+
+def is_single_token(text: str) -> bool:
+    """Whether fuzzywuzzy's token forms of a lowered string are the string
+    itself: one token, with nothing for full_process to strip."""
+    return _SIMPLE_IDENTIFIER.fullmatch(text) is not None
+
+
+def max_contained_score(length: int, strategies: Sequence[str]) -> int:
+    """Best score a prefix, suffix or substring match of a query of this
+    length can get, or 0 if none of those strategies is enabled."""
+    scores = [0]
+    if "prefix" in strategies:
+        scores.append(min(95, 70 + length * 2))
+    if "suffix" in strategies:
+        scores.append(min(90, 65 + length * 2))
+    if "substring" in strategies:
+        # The position bonus is at most 10
+        scores.append(min(85, 60 + length * 2 + 10))
+    return max(scores)
+
+
+class FuzzyCandidateIndex:
+    """Shortlists the identifiers a FuzzyMatcher query could match.
+
+    The index holds the identifiers' lowered and fuzzywuzzy token forms,
+    their character counts and posting lists. It never changes after it is
+    built; a matcher builds a new one when its identifier set changes.
+    """
+
+    def __init__(self, identifiers: Iterable[str]) -> None:
+        self.identifiers: List[str] = list(identifiers)
+        self._identifier_array = np.array(self.identifiers, dtype=object)
+        self._members = frozenset(self.identifiers)
+        self._lowered = [ident.lower() for ident in self.identifiers]
+        self._lowered_array = np.array(self._lowered, dtype=object)
+        count = len(self._lowered)
+
+        # Identifiers differing only in case share a lowered form; the few
+        # that do are kept apart so the common case is one plain dict
+        self._id_by_lowered = dict(zip(self._lowered, range(count)))
+        self._more_ids_by_lowered: Dict[str, List[int]] = {}
+        if len(self._id_by_lowered) != count:
+            for i, lowered in enumerate(self._lowered):
+                if self._id_by_lowered[lowered] != i:
+                    self._more_ids_by_lowered.setdefault(lowered, []).append(i)
+
+        # Every lowered identifier followed by a separator, for substring
+        # search; _starts[i] is where identifier i begins
+        self._blob = _SEPARATOR.join(self._lowered + [""])
+        lengths = np.fromiter(map(len, self._lowered), dtype=np.int64, count=count)
+        starts = np.zeros(count, dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=starts[1:])
+        self._starts: List[int] = starts.tolist()
+        self._lengths = lengths
+
+        # Per-bucket character counts, one contiguous row per bucket
+        codes = np.frombuffer(self._blob.encode("utf-32-le"), dtype=np.uint32)
+        owners = np.repeat(np.arange(count, dtype=np.int64), lengths + 1)
+        buckets = _bucket_codes(codes)
+        buckets[starts + lengths] = _NUM_BUCKETS
+        counts = np.bincount(
+            buckets * count + owners, minlength=(_NUM_BUCKETS + 1) * count
+        ).reshape(_NUM_BUCKETS + 1, count)[:_NUM_BUCKETS]
+        self._char_counts = np.minimum(counts, 255).astype(np.uint8)
+
+        # Identifiers whose fuzzywuzzy token forms differ from the lowered
+        # identifier. Everyone else's sorted-token and token-set strings are
+        # the lowered identifier itself.
+        self._complex = (self._char_counts[_OTHER_BUCKET] > 0) | (lengths == 0)
+        self._complex_ids = np.flatnonzero(self._complex)
+        self._ids_by_token: Dict[str, List[int]] = {}
+        sorted_forms = []
+        set_forms = []
+        token_counts = []
+        set_token_counts = []
+        for i in self._complex_ids.tolist():
+            tokens = query_tokens(self._lowered[i])
+            unique_tokens = set(tokens)
+            for token in unique_tokens:
+                self._ids_by_token.setdefault(token, []).append(i)
+            sorted_forms.append(_sorted_tokens(tokens))
+            set_forms.append(_sorted_tokens(unique_tokens))
+            token_counts.append(len(tokens))
+            set_token_counts.append(len(unique_tokens))
+        self._sorted_forms = self._lowered_array.copy()
+        self._sorted_forms[self._complex_ids] = sorted_forms
+        self._set_forms = self._lowered_array.copy()
+        self._set_forms[self._complex_ids] = set_forms
+        self._complex_sorted_lengths = np.fromiter(
+            map(len, sorted_forms), dtype=np.int64, count=len(sorted_forms)
+        )
+        self._complex_set_lengths = np.fromiter(
+            map(len, set_forms), dtype=np.int64, count=len(set_forms)
+        )
+        self._complex_token_counts = np.array(token_counts, dtype=np.int64)
+        self._complex_set_token_counts = np.array(set_token_counts, dtype=np.int64)
+
+        # Built on the first query that uses the word strategy
+        self._ids_by_word: Optional[Dict[str, List[int]]] = None
+        self._word_counts: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.identifiers)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Length of each lowered identifier."""
+        return self._lengths
+
+    def identifiers_at(self, ids: np.ndarray) -> List[str]:
+        """Identifiers at the given positions."""
+        identifiers: List[str] = self._identifier_array[ids].tolist()
+        return identifiers
+
+    def lowered_forms(self, ids: np.ndarray) -> List[str]:
+        """Lowered identifiers at the given positions."""
+        lowered: List[str] = self._lowered_array[ids].tolist()
+        return lowered
+
+    def lowered_array(self, ids: np.ndarray) -> np.ndarray:
+        """Lowered identifiers at the given positions, as an object array."""
+        lowered: np.ndarray = self._lowered_array[ids]
+        return lowered
+
+    def sorted_token_forms(self, ids: np.ndarray) -> List[str]:
+        """fuzzywuzzy token_sort strings of the identifiers at ids."""
+        forms: List[str] = self._sorted_forms[ids].tolist()
+        return forms
+
+    def token_set_forms(self, ids: np.ndarray) -> List[str]:
+        """Sorted distinct-token strings of the identifiers at ids."""
+        forms: List[str] = self._set_forms[ids].tolist()
+        return forms
+
+    def has_complex_tokens(self, ids: np.ndarray) -> np.ndarray:
+        """Whether each identifier's token forms differ from its lowered form."""
+        complex_forms: np.ndarray = self._complex[ids]
+        return complex_forms
+
+    def covers(self, identifiers: Iterable[str]) -> bool:
+        """Whether the index was built from exactly these identifiers."""
+        if not isinstance(identifiers, (set, frozenset)):
+            identifiers = set(identifiers)
+        return len(identifiers) == len(self._members) and self._members == identifiers
+
+    def candidates(
+        self, query_lower: str, threshold: int, strategies: Sequence[str]
+    ) -> List[str]:
+        """Identifiers that could score at least ``threshold``.
+
+        Args:
+            query_lower: Lowered query
+            threshold: FuzzyMatcher threshold (0-100)
+            strategies: FuzzyMatcher strategies
+
+        Returns:
+            Shortlist containing every identifier the matcher would return
+        """
+        return self.identifiers_at(
+            self.candidate_ids(query_lower, threshold, strategies)
+        )
+
+    def candidate_ids(
+        self,
+        query_lower: str,
+        threshold: int,
+        strategies: Sequence[str],
+        contained: Optional[Dict[int, int]] = None,
+    ) -> np.ndarray:
+        """Positions in ``identifiers`` of the shortlist, in ascending order.
+
+        ``contained`` is the result of ``containing(query_lower)`` when the
+        caller already has it.
+        """
+        if threshold <= 0:
+            return np.arange(len(self.identifiers))
+
+        selected = np.zeros(len(self.identifiers), dtype=bool)
+        selected[self.ids_with_lowered(query_lower)] = True
+
+        # Prefix, suffix and substring matches all contain the query; skip
+        # the search when none of them could reach the threshold
+        if max_contained_score(len(query_lower), strategies) >= threshold:
+            if contained is None:
+                contained = self.containing(query_lower)
+            selected[list(contained)] = True
+
+        # Word overlap needs at least one shared word
+        if "word" in strategies:
+            ids_by_word, _ = self._word_postings()
+            for word in set(_WORD_SPLIT.split(query_lower)):
+                selected[ids_by_word.get(word, [])] = True
+
+        if "levenshtein" in strategies:
+            self._select_ratio_candidates(query_lower, threshold, selected)
+
+        return np.flatnonzero(selected)
+
+    def ids_with_lowered(self, lowered: str) -> List[int]:
+        """Positions of the identifiers whose lowered form is ``lowered``."""
+        i = self._id_by_lowered.get(lowered)
+        if i is None:
+            return []
+        return [i] + self._more_ids_by_lowered.get(lowered, [])
+
+    def ids_sharing_tokens(self, tokens: Iterable[str]) -> List[int]:
+        """Positions of the identifiers with any of these fuzzywuzzy tokens."""
+        ids: List[int] = []
+        for token in set(tokens):
+            ids.extend(self.ids_with_lowered(token))
+            ids.extend(self._ids_by_token.get(token, ()))
+        return ids
+
+    def containing(self, query_lower: str) -> Dict[int, int]:
+        """Identifiers whose lowered form contains the query.
+
+        Returns:
+            Identifier position -> where the query first occurs in it
+        """
+        found: Dict[int, int] = {}
+        blob = self._blob
+        starts = self._starts
+        lengths = self._lengths
+        length = len(query_lower)
+        pos = blob.find(query_lower)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            end = starts[i] + int(lengths[i])
+            if pos + length <= end:
+                found[i] = pos - starts[i]
+                # The rest of this identifier cannot add anything
+                pos = blob.find(query_lower, end + 1)
+            else:
+                pos = blob.find(query_lower, pos + 1)
+        return found
+
+    def word_overlap(self, query_lower: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct words each identifier shares with the query.
+
+        Words are split the way FuzzyMatcher's word strategy splits them.
+
+        Returns:
+            (size of the intersection, size of the union) per identifier
+        """
+        ids_by_word, word_counts = self._word_postings()
+        query_words = set(_WORD_SPLIT.split(query_lower))
+        shared = np.zeros(len(self.identifiers), dtype=np.int64)
+        for word in query_words:
+            ids = ids_by_word.get(word)
+            if ids:
+                shared[ids] += 1
+        return shared, len(query_words) + word_counts - shared
+
+    def _word_postings(self) -> Tuple[Dict[str, List[int]], np.ndarray]:
+        if self._ids_by_word is None or self._word_counts is None:
+            ids_by_word: Dict[str, List[int]] = {}
+            word_counts = np.zeros(len(self.identifiers), dtype=np.int64)
+            for i, lowered in enumerate(self._lowered):
+                words = set(_WORD_SPLIT.split(lowered))
+                word_counts[i] = len(words)
+                for word in words:
+                    ids_by_word.setdefault(word, []).append(i)
+            self._ids_by_word = ids_by_word
+            self._word_counts = word_counts
+        return self._ids_by_word, self._word_counts
+
+    def _select_ratio_candidates(
+        self, query_lower: str, threshold: int, selected: np.ndarray
+    ) -> None:
+        """Select identifiers whose best fuzzywuzzy ratio could reach threshold.
+
+        fuzzywuzzy rounds 100 * r to an int, so a score of ``threshold``
+        needs r >= (threshold - 0.5) / 100. Each ratio is 2 * M / (a + b)
+        for strings of lengths a and b with M matching characters, and M is
+        at most C, the characters the strings share:
+
+        - ratio and partial_ratio compare the shorter string s with a window
+          of the longer one that is at most len(s) long, giving
+          r <= 2C / (len(s) + C);
+        - token_sort_ratio and token_set_ratio compare token strings built
+          from the same characters plus single spaces, giving
+          r <= 2 (C + common spaces) / (sum of token string lengths),
+          except that token_set_ratio is 100 whenever one token set contains
+          the other, so identifiers sharing a token are always kept.
+        """
+        required = (threshold - 0.5) / 100 - _BOUND_EPSILON
+        query_counts = _char_counts(query_lower)
+        lengths = self._lengths
+
+        common = np.zeros(len(lengths), dtype=np.int64)
+        for bucket in np.flatnonzero(query_counts).tolist():
+            common += np.minimum(self._char_counts[bucket], query_counts[bucket])
+
+        shorter = np.minimum(lengths, len(query_lower))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            partial_bound = np.where(shorter > 0, 2 * common / (shorter + common), 0.0)
+        selected |= partial_bound >= required
+
+        # Token strategies
+        tokens = query_tokens(query_lower)
+        unique_tokens = set(tokens)
+        selected[self.ids_sharing_tokens(unique_tokens)] = True
+        if not tokens:
+            # Both token ratios are 0 against an empty token string, except
+            # that token_sort_ratio is 100 when the other side is empty too
+            selected[self._complex_ids[self._complex_sorted_lengths == 0]] = True
+            return
+
+        if is_single_token(query_lower):
+            # Simple identifiers' token forms are the lowered strings
+            # themselves, which the partial bound already covers
+            subset = self._complex_ids
+            sorted_lengths = self._complex_sorted_lengths
+            set_lengths = self._complex_set_lengths
+            token_counts = self._complex_token_counts
+            set_token_counts = self._complex_set_token_counts
+        else:
+            subset = np.arange(len(lengths))
+            sorted_lengths = lengths.copy()
+            set_lengths = lengths.copy()
+            token_counts = np.ones(len(lengths), dtype=np.int64)
+            set_token_counts = token_counts.copy()
+            sorted_lengths[self._complex_ids] = self._complex_sorted_lengths
+            set_lengths[self._complex_ids] = self._complex_set_lengths
+            token_counts[self._complex_ids] = self._complex_token_counts
+            set_token_counts[self._complex_ids] = self._complex_set_token_counts
+        if not len(subset):
+            return
+
+        subset_common = common[subset]
+        for query_length, query_count, other_lengths, other_counts in (
+            (
+                len(_sorted_tokens(tokens)),
+                len(tokens),
+                sorted_lengths,
+                token_counts,
+            ),
+            (
+                len(_sorted_tokens(unique_tokens)),
+                len(unique_tokens),
+                set_lengths,
+                set_token_counts,
+            ),
+        ):
+            spaces = np.minimum(np.maximum(other_counts - 1, 0), query_count - 1)
+            matches = np.minimum(
+                subset_common + spaces, np.minimum(other_lengths, query_length)
+            )
+            total = other_lengths + query_length
+            with np.errstate(divide="ignore", invalid="ignore"):
+                token_bound = np.where(total > 0, 2 * matches / total, 0.0)
+            selected[subset[token_bound >= required]] = True
@@ -9,9 +9,11 @@ import re
 import logging
 from ..core.config_service import get_config
 from ..core.logging_service import get_logger
-from typing import List, Set, Tuple, Dict, Optional, Any
+from typing import Any, Dict, List, Optional, Set, Tuple
 from fuzzywuzzy import fuzz
 from ..core.cache_manager import CacheManager
+from .fuzzy_index import FuzzyCandidateIndex
+from .fuzzy_scoring import score_candidates
 
 
 # Configure logging
@@ -38,6 +40,7 @@ class FuzzyMatcher:
         verbose: bool = True,
         cache_max_size: int = 1000,
         cache_ttl: int = get_config("CACHE_TTL", 3600),
+        index_min_identifiers: int = 1000,
     ) -> None:
         """
         Initialize the fuzzy matcher.
@@ -49,12 +52,16 @@ class FuzzyMatcher:
             verbose: Whether to log matching details
             cache_max_size: Maximum number of cache entries
             cache_ttl: Time to live for cache entries in seconds
+            index_min_identifiers: Smallest identifier set worth building a
+                candidate index for; smaller sets are scanned
         """
         self.threshold = max(0, min(100, threshold))  # Clamp to 0-100
         self.strategies = strategies or ["prefix", "substring", "levenshtein"]
         self.cache_results = cache_results
         self.verbose = verbose
         self.enabled = True  # Add enabled attribute for compatibility
+        self.index_min_identifiers = index_min_identifiers
+        self._candidate_index: Optional[FuzzyCandidateIndex] = None
 
         # Initialize cache manager with bounded memory
         self.cache_manager: Optional[CacheManager]
@@ -95,7 +102,7 @@ class FuzzyMatcher:
             return []
 
         # Check cache first
-        cache_key = f"{query}_{self.threshold}_{','.join(sorted(self.strategies))}"
+        cache_key = self._cache_key(query)
         if self.cache_results and self.cache_manager:
             cached_result = self.cache_manager.get(cache_key)
             if cached_result is not None:
@@ -103,77 +110,116 @@ class FuzzyMatcher:
                     logger.debug(f"Cache hit for query: {query}")
                 return cached_result  # type: ignore
 
-        matches = []
-        query_lower = query.lower()
-
-        for ident in all_identifiers:
-            ident_lower = ident.lower()
-            best_score = 0
-
-            # Strategy 1: Exact match (highest priority)
-            if query_lower == ident_lower:
-                matches.append((ident, 100))
-                continue
-
-            # Strategy 2: Prefix matching
-            if "prefix" in self.strategies and ident_lower.startswith(query_lower):
-                # Score based on query length and position
-                score = min(95, 70 + len(query_lower) * 2)
-                best_score = max(best_score, score)
+        matches = self._match(
+            query, all_identifiers, self._get_candidate_index(all_identifiers)
+        )
 
-            # Strategy 3: Suffix matching
-            if "suffix" in self.strategies and ident_lower.endswith(query_lower):
-                # Slightly lower score than prefix
-                score = min(90, 65 + len(query_lower) * 2)
-                best_score = max(best_score, score)
+        # Cache the result
+        if self.cache_results and self.cache_manager:
+            self.cache_manager.set(cache_key, matches)
 
-            # Strategy 4: Substring matching
-            if "substring" in self.strategies and query_lower in ident_lower:
-                # Score based on query length and position
-                position = ident_lower.find(query_lower)
-                position_bonus = max(0, 10 - position)  # Bonus for early position
-                score = min(85, 60 + len(query_lower) * 2 + position_bonus)
-                best_score = max(best_score, score)
+        if self.verbose:
+            logger.debug(f"Query '{query}' matched {len(matches)} identifiers")
 
-            # Strategy 5: Levenshtein distance
-            if "levenshtein" in self.strategies:
-                # Use multiple fuzzy matching algorithms
-                ratio = fuzz.ratio(query_lower, ident_lower)
-                partial_ratio = fuzz.partial_ratio(query_lower, ident_lower)
-                token_sort_ratio = fuzz.token_sort_ratio(query_lower, ident_lower)
-                token_set_ratio = fuzz.token_set_ratio(query_lower, ident_lower)
+        return matches
 
-                # Take the best score from all algorithms
-                score = max(ratio, partial_ratio, token_sort_ratio, token_set_ratio)
+    def _match(
+        self,
+        query: str,
+        all_identifiers: Set[str],
+        index: Optional[FuzzyCandidateIndex],
+    ) -> List[Tuple[str, int]]:
+        """Score a query, in one batch over the index's shortlist when there
+        is an index and identifier by identifier otherwise."""
+        query_lower = query.lower()
+        if index is not None:
+            matches = score_candidates(
+                index, query_lower, self.threshold, self.strategies
+            )
+        else:
+            matches = []
+            for ident in all_identifiers:
+                score = self._score_identifier(query_lower, ident)
                 if score >= self.threshold:
-                    best_score = max(best_score, score)
-
-            # Strategy 6: Word-based matching
-            if "word" in self.strategies:
-                query_words = set(re.split(r"[_\-\s]+", query_lower))
-                ident_words = set(re.split(r"[_\-\s]+", ident_lower))
-
-                if query_words.intersection(ident_words):
-                    common_words = len(query_words.intersection(ident_words))
-                    total_words = len(query_words.union(ident_words))
-                    score = int((common_words / total_words) * 100)
-                    if score >= self.threshold:
-                        best_score = max(best_score, score)
-
-            if best_score >= self.threshold:
-                matches.append((ident, best_score))
+                    matches.append((ident, score))
 
         # Sort by score (highest first), then by identifier name for consistency
         matches.sort(key=lambda x: (-x[1], x[0]))
+        return matches
 
-        # Cache the result
-        if self.cache_results and self.cache_manager:
-            self.cache_manager.set(cache_key, matches)
+    def _get_candidate_index(
+        self, all_identifiers: Set[str], query_count: int = 1
+    ) -> Optional[FuzzyCandidateIndex]:
+        """Get the candidate index for an identifier set, building it when
+        the set changed. Small sets are cheaper to scan than to index,
+        unless many queries share the index."""
+        if len(all_identifiers) * query_count < self.index_min_identifiers:
+            return None
+        index = self._candidate_index
+        if index is None or not index.covers(all_identifiers):
+            index = FuzzyCandidateIndex(all_identifiers)
+            self._candidate_index = index
+            if self.verbose:
+                logger.debug(
+                    f"Built fuzzy candidate index for {len(index)} identifiers"
+                )
+        return index
+
+    def _score_identifier(self, query_lower: str, ident: str) -> int:
+        """Best score of one identifier over the enabled strategies."""
+        ident_lower = ident.lower()
+        best_score = 0
+
+        # Strategy 1: Exact match (highest priority)
+        if query_lower == ident_lower:
+            return 100
+
+        # Strategy 2: Prefix matching
+        if "prefix" in self.strategies and ident_lower.startswith(query_lower):
+            # Score based on query length and position
+            score = min(95, 70 + len(query_lower) * 2)
+            best_score = max(best_score, score)
+
+        # Strategy 3: Suffix matching
+        if "suffix" in self.strategies and ident_lower.endswith(query_lower):
+            # Slightly lower score than prefix
+            score = min(90, 65 + len(query_lower) * 2)
+            best_score = max(best_score, score)
+
+        # Strategy 4: Substring matching
+        if "substring" in self.strategies and query_lower in ident_lower:
+            # Score based on query length and position
+            position = ident_lower.find(query_lower)
+            position_bonus = max(0, 10 - position)  # Bonus for early position
+            score = min(85, 60 + len(query_lower) * 2 + position_bonus)
+            best_score = max(best_score, score)
+
+        # Strategy 5: Levenshtein distance
+        if "levenshtein" in self.strategies:
+            # Use multiple fuzzy matching algorithms
+            ratio = fuzz.ratio(query_lower, ident_lower)
+            partial_ratio = fuzz.partial_ratio(query_lower, ident_lower)
+            token_sort_ratio = fuzz.token_sort_ratio(query_lower, ident_lower)
+            token_set_ratio = fuzz.token_set_ratio(query_lower, ident_lower)
+
+            # Take the best score from all algorithms
+            score = max(ratio, partial_ratio, token_sort_ratio, token_set_ratio)
+            if score >= self.threshold:
+                best_score = max(best_score, score)
 
-        if self.verbose:
-            logger.debug(f"Query '{query}' matched {len(matches)} identifiers")
+        # Strategy 6: Word-based matching
+        if "word" in self.strategies:
+            query_words = set(re.split(r"[_\-\s]+", query_lower))
+            ident_words = set(re.split(r"[_\-\s]+", ident_lower))
 
-        return matches
+            if query_words.intersection(ident_words):
+                common_words = len(query_words.intersection(ident_words))
+                total_words = len(query_words.union(ident_words))
+                score = int((common_words / total_words) * 100)
+                if score >= self.threshold:
+                    best_score = max(best_score, score)
+
+        return best_score
 
     def batch_match_identifiers(
         self, queries: List[str], all_identifiers: Set[str]
@@ -181,6 +227,9 @@ class FuzzyMatcher:
         """
         Match multiple queries against all identifiers.
 
+        The candidate index and identifier forms are built once and shared
+        by every query.
+
         Args:
             queries: List of identifiers to search for
             all_identifiers: Set of all available identifiers
@@ -188,11 +237,35 @@ class FuzzyMatcher:
         Returns:
             Dictionary mapping queries to their match results
         """
-        results = {}
+        results: Dict[str, List[Tuple[str, int]]] = {}
+        pending = []
         for query in queries:
-            results[query] = self.match_identifiers(query, all_identifiers)
+            if query in results:
+                continue
+            if not query or not all_identifiers:
+                results[query] = []
+                continue
+            cache_key = self._cache_key(query)
+            if self.cache_results and self.cache_manager:
+                cached_result = self.cache_manager.get(cache_key)
+                if cached_result is not None:
+                    results[query] = cached_result
+                    continue
+            results[query] = []
+            pending.append(query)
+
+        if pending:
+            index = self._get_candidate_index(all_identifiers, len(pending))
+            for query in pending:
+                matches = self._match(query, all_identifiers, index)
+                if self.cache_results and self.cache_manager:
+                    self.cache_manager.set(self._cache_key(query), matches)
+                results[query] = matches
         return results
 
+    def _cache_key(self, query: str) -> str:
+        return f"{query}_{self.threshold}_{','.join(sorted(self.strategies))}"
+
     def get_match_summary(
         self, query: str, all_identifiers: Set[str], max_matches: int = 5
     ) -> str:
@@ -0,0 +1,279 @@
+"""
+Batch scoring for fuzzy identifier matching.
+
+FuzzyMatcher's strategies score one identifier at a time through Python
+calls to fuzzywuzzy. This module scores a query against a whole candidate
+shortlist at once: edit distances come from one rapidfuzz ``cdist`` call per
+string form, over the lowered and tokenized forms a FuzzyCandidateIndex
+precomputed, and the rest is NumPy arithmetic.
+
+Scores are exactly those of FuzzyMatcher's per-identifier strategies:
+
+- fuzzywuzzy's ratio is round(100 * (1 - indel distance / total length)).
+  It is computed here from the same integer distances in the same floating
+  point order, so ties at .5 round the same way.
+- partial_ratio is fuzzywuzzy's heuristic, which only tries the windows of
+  the longer string that line up with a matching block. rapidfuzz's
+  partial_ratio tries every window, so it is an upper bound: a cdist call
+  with a ``score_cutoff`` finds the few pairs whose heuristic score could
+  still raise the result, and only those run the heuristic.
+"""
+
+from typing import List, Sequence, Tuple
+
+import Levenshtein
+import numpy as np
+from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz as rapid_fuzz
+from rapidfuzz import process
+from rapidfuzz.distance import Indel
+
+from .fuzzy_index import (
+    FuzzyCandidateIndex,
+    is_single_token,
+    max_contained_score,
+    query_tokens,
+)
+
+# Slack on score cutoffs so float rounding never drops a pair
+_CUTOFF_EPSILON = 1e-6
+# Any character works as padding: a match on it only raises the bound
+_PADDING = "\x00"
+
+
+def score_candidates(
+    index: FuzzyCandidateIndex,
+    query_lower: str,
+    threshold: int,
+    strategies: Sequence[str],
+) -> List[Tuple[str, int]]:
+    """Score a query against the index's shortlist for it.
+
+    Args:
+        index: Candidate index over the identifiers
+        query_lower: Lowered, non-empty query
+        threshold: FuzzyMatcher threshold (0-100)
+        strategies: FuzzyMatcher strategies
+
+    Returns:
+        Unsorted (identifier, score) pairs scoring at least ``threshold``
+    """
+    found = None
+    if max_contained_score(len(query_lower), strategies) >= threshold:
+        found = index.containing(query_lower)
+    ids = index.candidate_ids(query_lower, threshold, strategies, found)
+    if not len(ids):
+        return []
+    best = np.zeros(len(ids), dtype=np.int64)
+
+    if found:
+        found_ids = np.fromiter(found, dtype=np.int64, count=len(found))
+        best[np.searchsorted(ids, found_ids)] = _contained_scores(
+            index.lowered_forms(found_ids),
+            list(found.values()),
+            query_lower,
+            strategies,
+        )
+
+    if "levenshtein" in strategies:
+        scores = _levenshtein_scores(index, ids, query_lower, threshold)
+        best = np.maximum(best, np.where(scores >= threshold, scores, 0))
+
+    if "word" in strategies:
+        shared, union = index.word_overlap(query_lower)
+        shared = shared[ids]
+        union = union[ids]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(shared > 0, ((shared / union) * 100).astype(np.int64), 0)
+        best = np.maximum(best, np.where(scores >= threshold, scores, 0))
+
+    exact = index.ids_with_lowered(query_lower)
+    if exact:
+        best[np.searchsorted(ids, exact)] = 100
+
+    rows = np.flatnonzero(best >= threshold)
+    return list(zip(index.identifiers_at(ids[rows]), best[rows].tolist()))
+
+
+def _contained_scores(
+    lowered: List[str],
+    positions: List[int],
+    query_lower: str,
+    strategies: Sequence[str],
+) -> List[int]:
+    """Prefix, suffix and substring scores of identifiers containing the
+    query, given where it first occurs in each."""
+    length = len(query_lower)
+    prefix = min(95, 70 + length * 2) if "prefix" in strategies else 0
+    suffix = min(90, 65 + length * 2) if "suffix" in strategies else 0
+    substring = "substring" in strategies
+
+    scores = []
+    for ident_lower, position in zip(lowered, positions):
+        score = prefix if position == 0 else 0
+        if suffix and ident_lower.endswith(query_lower):
+            score = max(score, suffix)
+        if substring:
+            position_bonus = max(0, 10 - position)
+            score = max(score, min(85, 60 + length * 2 + position_bonus))
+        scores.append(score)
+    return scores
+
+
+def _levenshtein_scores(
+    index: FuzzyCandidateIndex,
+    ids: np.ndarray,
+    query_lower: str,
+    threshold: int,
+) -> np.ndarray:
+    """Best of fuzzywuzzy's four ratios for each candidate.
+
+    A score is exact wherever the best ratio reaches ``threshold``; below
+    it, it may be lower than fuzzywuzzy's, which never changes a match.
+    """
+    lowered = index.lowered_forms(ids)
+    lengths = index.lengths[ids]
+    distances = _indel_distances(query_lower, lowered)
+    totals = len(query_lower) + lengths
+    scores = _ratio_scores(distances, totals)
+
+    # A single-token query compares with single-token identifiers exactly
+    # like ratio does; only identifiers with other token forms need more
+    if is_single_token(query_lower):
+        rows = np.flatnonzero(index.has_complex_tokens(ids))
+    else:
+        rows = np.arange(len(ids))
+    if len(rows):
+        token_scores = _token_scores(
+            index, ids[rows], [lowered[row] for row in rows], query_lower
+        )
+        scores[rows] = np.maximum(scores[rows], token_scores)
+
+    # partial_ratio compares the shorter string with a window of the longer
+    # one no longer than itself, and the window shares at most the LCS of
+    # the two strings, so ratio <= 2 * LCS / (shorter length + LCS)
+    matched = (totals - distances) // 2
+    shorter = np.minimum(len(query_lower), lengths)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bound = np.where(shorter > 0, 200 * matched / (shorter + matched), 0.0)
+    needed = np.maximum(threshold - 0.5, scores + 0.5) - _CUTOFF_EPSILON
+    rows = np.flatnonzero(bound >= needed)
+    if len(rows):
+        upper = _partial_upper_bounds(
+            query_lower, index.lowered_array(ids[rows]), lengths[rows], threshold
+        )
+        for row in rows[upper >= needed[rows]].tolist():
+            scores[row] = max(scores[row], _partial_ratio(query_lower, lowered[row]))
+
+    return scores
+
+
+def _partial_upper_bounds(
+    query_lower: str, choices: np.ndarray, lengths: np.ndarray, threshold: int
+) -> np.ndarray:
+    """Upper bounds on fuzzywuzzy's partial_ratio, from rapidfuzz's.
+
+    fuzzywuzzy only tries windows as long as the shorter string, or
+    suffixes of the longer one, while rapidfuzz also tries its short
+    prefixes. Padding the longer string in front with as many characters
+    as the shorter one has turns those prefixes into windows that score no
+    better than the first full window, which tightens the bound.
+    """
+    cutoff = max(0.0, threshold - 0.5 - _CUTOFF_EPSILON)
+    upper = np.zeros(len(choices), dtype=np.float64)
+    length = len(query_lower)
+    padding = _PADDING * length
+
+    # The query is the shorter string (ties go to the query, as in
+    # fuzzywuzzy)
+    rows = np.flatnonzero(lengths >= length)
+    if len(rows):
+        upper[rows] = process.cdist(
+            [query_lower],
+            [padding + choice for choice in choices[rows].tolist()],
+            scorer=rapid_fuzz.partial_ratio,
+            score_cutoff=cutoff,
+            dtype=np.float64,
+        )[0]
+    rows = np.flatnonzero(lengths < length)
+    if len(rows):
+        upper[rows] = process.cdist(
+            [padding + query_lower],
+            choices[rows].tolist(),
+            scorer=rapid_fuzz.partial_ratio,
+            score_cutoff=cutoff,
+            dtype=np.float64,
+        )[0]
+    return upper
+
+
+def _token_scores(
+    index: FuzzyCandidateIndex,
+    ids: np.ndarray,
+    lowered: List[str],
+    query_lower: str,
+) -> np.ndarray:
+    """Best of token_sort_ratio and token_set_ratio for each identifier."""
+    tokens = query_tokens(query_lower)
+    sorted_query = " ".join(sorted(tokens))
+    sorted_forms = index.sorted_token_forms(ids)
+    form_lengths = np.fromiter(map(len, sorted_forms), np.int64, len(sorted_forms))
+    scores = _ratio_scores(
+        _indel_distances(sorted_query, sorted_forms), len(sorted_query) + form_lengths
+    )
+    if not tokens:
+        # token_set_ratio is 0 for an empty token string
+        return scores
+
+    unique_tokens = set(tokens)
+    set_query = " ".join(sorted(unique_tokens))
+    set_forms = index.token_set_forms(ids)
+    form_lengths = np.fromiter(map(len, set_forms), np.int64, len(set_forms))
+    # Without a shared token, token_set_ratio compares the sorted token sets
+    set_scores = np.where(
+        form_lengths > 0,
+        _ratio_scores(
+            _indel_distances(set_query, set_forms), len(set_query) + form_lengths
+        ),
+        0,
+    )
+    shared = np.flatnonzero(np.isin(ids, index.ids_sharing_tokens(unique_tokens)))
+    for row in shared.tolist():
+        set_scores[row] = fuzz.token_set_ratio(query_lower, lowered[row])
+    best: np.ndarray = np.maximum(scores, set_scores)
+    return best
+
+
+def _indel_distances(query: str, choices: List[str]) -> np.ndarray:
+    distances: np.ndarray = process.cdist(
+        [query], choices, scorer=Indel.distance, dtype=np.int64
+    )[0]
+    return distances
+
+
+def _ratio_scores(distances: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """fuzzywuzzy ratio from indel distances and summed lengths (two empty
+    strings are equal, so they score 100)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = 1.0 - distances / totals
+    return np.where(totals > 0, np.rint(100 * ratios), 100).astype(np.int64)
+
+
+def _partial_ratio(s1: str, s2: str) -> int:
+    """fuzzywuzzy's partial_ratio, without its per-call wrappers."""
+    if s1 == s2:
+        return 100
+    if not s1 or not s2:
+        return 0
+    shorter, longer = (s1, s2) if len(s1) <= len(s2) else (s2, s1)
+    window = len(shorter)
+    best = 0.0
+    for short_start, long_start, _ in Levenshtein.matching_blocks(
+        Levenshtein.opcodes(shorter, longer), shorter, longer
+    ):
+        start = max(0, long_start - short_start)
+        ratio = Levenshtein.ratio(shorter, longer[start : start + window])
+        if ratio > 0.995:
+            return 100
+        best = max(best, ratio)
+    return int(round(100 * best))
@@ -8,21 +8,33 @@ This module provides a comprehensive approach by using:
 3. Domain semantic matching (programming knowledge)
 4. ML embedding matching (CodeRankEmbed)
 5. Context-aware scoring
+
+Searches run in two stages. A cheap recall stage collects the identifiers
+that can reach the threshold at all: fuzzy matches from one indexed
+FuzzyMatcher call, identifiers sharing a word or a domain category with the
+query through a word -> identifiers index, and, for multi-word queries,
+embedding matches. Each gets an upper bound on its overall score, and only
+the best ``max_candidates`` go through the full multi-signal rerank.
 """
 
 import re
 import logging
+import time
 from ..core.config_service import get_config
 from ..core.logging_service import get_logger
-from typing import Dict, List, Set, Tuple, Any, Optional
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple, Any, Optional
 from collections import Counter
 import math
 
 # Import our existing fuzzy matcher
 from .fuzzy_matcher import FuzzyMatcher
+from .tfidf_index import TfidfIndex
 
 logger = get_logger(__name__)
 
+# Slack on score bounds so float rounding never drops a candidate
+_BOUND_EPSILON = 1e-9
+
 
 class HybridMatcher:
     """
@@ -43,6 +55,7 @@ class HybridMatcher:
         semantic_threshold: float = get_config("SEMANTIC_THRESHOLD", 0.3),
         use_word_embeddings: bool = False,
         verbose: bool = True,
+        max_candidates: int = get_config("HYBRID_MAX_CANDIDATES", 1000),
     ):
         """
         Initialize the enhanced hybrid matcher.
@@ -54,6 +67,7 @@ class HybridMatcher:
             semantic_threshold: Threshold for semantic similarity (0.0-1.0)
             use_word_embeddings: Whether to use word embeddings (requires more dependencies)
             verbose: Whether to log matching details
+            max_candidates: Most recalled candidates to rerank per query
         """
         self.fuzzy_matcher = fuzzy_matcher
         self.embedding_matcher = embedding_matcher
@@ -84,6 +98,7 @@ class HybridMatcher:
         self.semantic_threshold = semantic_threshold
         self.use_word_embeddings = use_word_embeddings
         self.verbose = verbose
+        self.max_candidates = max_candidates
         self.enabled = True
 
         # TF-IDF components
@@ -91,6 +106,19 @@ class HybridMatcher:
         self.total_identifiers = 0
         self.idf_cache: Dict[str, float] = {}
 
+        # Word -> identifiers containing it, over _indexed_identifiers, for
+        # identifier sets the TF-IDF model was not built from
+        self._identifiers_by_word: Dict[str, List[str]] = {}
+        self._indexed_identifiers: FrozenSet[str] = frozenset()
+        # Sparse vectors of the identifiers the TF-IDF model was built from,
+        # and the TF-IDF scores of the last query scored against them
+        self.tfidf_index: Optional[TfidfIndex] = None
+        self._tfidf_query: Optional[str] = None
+        self._tfidf_query_scores: Dict[str, float] = {}
+
+        # Stage timings (ms) and candidate counts of the last search
+        self.last_search_metrics: Dict[str, Any] = {}
+
         # Word embeddings (optional)
         self.word_vectors: Dict[str, List[float]] = {}
         if use_word_embeddings:
@@ -177,23 +205,48 @@ class HybridMatcher:
         Args:
             all_identifiers: Set of all identifiers in the codebase
         """
-        self.total_identifiers = len(all_identifiers)
-
-        # Count word frequencies across all identifiers
-        for identifier in all_identifiers:
-            words = self.split_identifier(identifier)
-            for word in set(words):  # Count unique words per identifier
-                self.word_frequencies[word] += 1
-
-        # Calculate IDF for each word
-        for word, freq in self.word_frequencies.items():
-            self.idf_cache[word] = math.log(self.total_identifiers / freq)
+        if self.tfidf_index is not None and self.tfidf_index.covers(all_identifiers):
+            return  # Already built for this identifier set
+        self.tfidf_index = TfidfIndex(
+            {
+                identifier: self.split_identifier(identifier)
+                for identifier in all_identifiers
+            }
+        )
+        self._tfidf_query = None
+        self._tfidf_query_scores = {}
+        self.total_identifiers = len(self.tfidf_index)
+
+        # Document frequency: the number of identifiers containing each word
+        self.word_frequencies = Counter(
+            dict(
+                zip(
+                    self.tfidf_index.words,
+                    self.tfidf_index.document_frequencies.tolist(),
+                )
+            )
+        )
+        self.idf_cache = self.tfidf_index.idf_by_word()
 
         if self.verbose:
             logger.info(
                 f"Built TF-IDF model with {len(self.word_frequencies)} unique words"
             )
 
+    def _get_word_index(self, all_identifiers: Iterable[str]) -> Dict[str, List[str]]:
+        """Get the word -> identifiers index for an identifier set, building
+        it when the set changed."""
+        if not isinstance(all_identifiers, (set, frozenset)):
+            all_identifiers = set(all_identifiers)
+        if all_identifiers != self._indexed_identifiers:
+            identifiers_by_word: Dict[str, List[str]] = {}
+            for identifier in all_identifiers:
+                for word in set(self.split_identifier(identifier)):
+                    identifiers_by_word.setdefault(word, []).append(identifier)
+            self._identifiers_by_word = identifiers_by_word
+            self._indexed_identifiers = frozenset(all_identifiers)
+        return self._identifiers_by_word
+
     def calculate_tfidf_similarity(self, query: str, identifier: str) -> float:
         """
         Calculate TF-IDF similarity between query and identifier.
@@ -205,6 +258,12 @@ class HybridMatcher:
         Returns:
             Similarity score between 0.0 and 1.0
         """
+        if (
+            self.tfidf_index is not None
+            and self.tfidf_index.row_of(identifier) is not None
+        ):
+            return self._indexed_tfidf_scores(query).get(identifier, 0.0)
+
         query_words = set(self.split_identifier(query))
         identifier_words = set(self.split_identifier(identifier))
 
@@ -248,6 +307,17 @@ class HybridMatcher:
         similarity = numerator / (query_magnitude * identifier_magnitude)
         return similarity
 
+    def _indexed_tfidf_scores(self, query: str) -> Dict[str, float]:
+        """TF-IDF similarity of a query with the indexed identifiers sharing
+        a word with it, scored in one pass and kept for the query's rerank."""
+        if query != self._tfidf_query and self.tfidf_index is not None:
+            rows, scores = self.tfidf_index.similarities(self.split_identifier(query))
+            self._tfidf_query_scores = dict(
+                zip(self.tfidf_index.identifiers_at(rows), scores.tolist())
+            )
+            self._tfidf_query = query
+        return self._tfidf_query_scores
+
     def calculate_word_vector_similarity(self, query: str, identifier: str) -> float:
         """
         Calculate similarity using word vectors (if available).
@@ -342,52 +412,25 @@ class HybridMatcher:
         fuzzy_matches = self.fuzzy_matcher.match_identifiers(query, {identifier})
         fuzzy_score = fuzzy_matches[0][1] / 100.0 if fuzzy_matches else 0.0
 
-        # Get TF-IDF similarity
-        tfidf_score = self.calculate_tfidf_similarity(query, identifier)
-
-        # Get word vector similarity
-        vector_score = self.calculate_word_vector_similarity(query, identifier)
-
-        # Get context similarity
-        context_score = self.calculate_context_similarity(query, identifier)
+        # Get embedding similarity (CodeRankEmbed)
+        embedding_score = self._embedding_scores(query, [identifier]).get(
+            identifier, 0.0
+        )
 
-        # Get domain semantic similarity (programming knowledge)
-        domain_semantic_score = 0.0
-        if self.domain_semantic_matcher:
-            try:
-                domain_semantic_score = (
-                    self.domain_semantic_matcher.semantic_similarity(query, identifier)
-                )
-            except Exception as e:
-                if self.verbose:
-                    logger.debug(f"Domain semantic similarity failed: {e}")
-                domain_semantic_score = 0.0
+        return self._combine_scores(query, identifier, fuzzy_score, embedding_score)
 
-        # Get embedding similarity (CodeRankEmbed) - only for multi-word queries
-        embedding_score = 0.0
-        if (
+    def _embeddings_active(self, query: str) -> bool:
+        """Whether embedding similarity counts for a query."""
+        return bool(
             self.embedding_matcher
             and hasattr(self.embedding_matcher, "enabled")
             and self.embedding_matcher.enabled
-            and len(query.split()) > 1
-        ):  # Only use embeddings for multi-word queries
-            try:
-                from sklearn.metrics.pairwise import cosine_similarity
-
-                query_emb = self.embedding_matcher.get_embedding(query)
-                identifier_emb = self.embedding_matcher.get_embedding(identifier)
-                if query_emb is not None and identifier_emb is not None:
-                    embedding_score = cosine_similarity(
-                        query_emb.reshape(1, -1), identifier_emb.reshape(1, -1)
-                    )[0][0]
-                    # Ensure score is in [0, 1]
-                    embedding_score = max(0.0, min(1.0, float(embedding_score)))
-            except Exception as e:
-                if self.verbose:
-                    logger.debug(f"Embedding similarity failed: {e}")
-                embedding_score = 0.0
+            and len(query.split()) > 1  # Only use embeddings for multi-word queries
+        )
 
-        # Intelligent weighting based on available matchers
+    def _signal_weights(self) -> Dict[str, float]:
+        """Weight of each signal in the overall score, based on the
+        available matchers."""
         if (
             self.embedding_matcher
             and hasattr(self.embedding_matcher, "enabled")
@@ -395,55 +438,92 @@ class HybridMatcher:
             and self.domain_semantic_matcher
         ):
             # Full semantic stack: fuzzy + domain + ML embeddings
-            weights = {
+            return {
                 "fuzzy": 0.25,  # 25% - string similarity
                 "tfidf": 0.20,  # 20% - statistical similarity
                 "domain_semantic": 0.30,  # 30% - programming domain knowledge
                 "embedding": 0.25,  # 25% - ML semantic understanding
             }
-            overall_score = (
-                fuzzy_score * weights["fuzzy"]
-                + tfidf_score * weights["tfidf"]
-                + domain_semantic_score * weights["domain_semantic"]
-                + embedding_score * weights["embedding"]
-            )
         elif self.domain_semantic_matcher:
             # Domain knowledge + fuzzy (no ML embeddings)
-            weights = {
+            return {
                 "fuzzy": 0.40,  # 40% - string similarity
                 "tfidf": 0.30,  # 30% - statistical similarity
                 "domain_semantic": 0.30,  # 30% - programming domain knowledge
             }
-            overall_score = (
-                fuzzy_score * weights["fuzzy"]
-                + tfidf_score * weights["tfidf"]
-                + domain_semantic_score * weights["domain_semantic"]
-            )
         elif (
             self.embedding_matcher
             and hasattr(self.embedding_matcher, "enabled")
             and self.embedding_matcher.enabled
         ):
             # ML embeddings + fuzzy (no domain knowledge)
-            weights = {
+            return {
                 "fuzzy": 0.35,  # 35% - string similarity
                 "tfidf": 0.25,  # 25% - statistical similarity
                 "embedding": 0.40,  # 40% - ML semantic understanding
             }
-            overall_score = (
-                fuzzy_score * weights["fuzzy"]
-                + tfidf_score * weights["tfidf"]
-                + embedding_score * weights["embedding"]
-            )
         else:
             # Fallback: fuzzy + TF-IDF only
-            weights = {
+            return {
                 "fuzzy": 0.60,  # 60% - string similarity
                 "tfidf": 0.40,  # 40% - statistical similarity
             }
-            overall_score = (
-                fuzzy_score * weights["fuzzy"] + tfidf_score * weights["tfidf"]
+
+    def _embedding_scores(self, query: str, identifiers: List[str]) -> Dict[str, float]:
+        """Embedding similarity of each identifier to a query, clamped to
+        [0, 1]. Empty unless embeddings count for the query."""
+        if not identifiers or not self._embeddings_active(query):
+            return {}
+        try:
+            # No threshold: every embedded identifier is scored, in one
+            # matrix product
+            matches = self.embedding_matcher.find_semantic_matches(
+                query, set(identifiers), threshold=float("-inf")
             )
+            # Ensure scores are in [0, 1]
+            return {
+                identifier: max(0.0, min(1.0, float(similarity)))
+                for identifier, similarity in matches
+            }
+        except Exception as e:
+            if self.verbose:
+                logger.debug(f"Embedding similarity failed: {e}")
+            return {}
+
+    def _combine_scores(
+        self, query: str, identifier: str, fuzzy_score: float, embedding_score: float
+    ) -> Tuple[float, Dict[str, float]]:
+        """Compute the remaining signals for an identifier and weight them
+        into its overall score."""
+        # Get TF-IDF similarity
+        tfidf_score = self.calculate_tfidf_similarity(query, identifier)
+
+        # Get word vector similarity
+        vector_score = self.calculate_word_vector_similarity(query, identifier)
+
+        # Get context similarity
+        context_score = self.calculate_context_similarity(query, identifier)
+
+        # Get domain semantic similarity (programming knowledge)
+        domain_semantic_score = 0.0
+        if self.domain_semantic_matcher:
+            try:
+                domain_semantic_score = (
+                    self.domain_semantic_matcher.semantic_similarity(query, identifier)
+                )
+            except Exception as e:
+                if self.verbose:
+                    logger.debug(f"Domain semantic similarity failed: {e}")
+                domain_semantic_score = 0.0
+
+        signals = {
+            "fuzzy": fuzzy_score,
+            "tfidf": tfidf_score,
+            "domain_semantic": domain_semantic_score,
+            "embedding": embedding_score,
+        }
+        weights = self._signal_weights()
+        overall_score = sum(signals[name] * weight for name, weight in weights.items())
 
         component_scores: Dict[str, float] = {
             "fuzzy": fuzzy_score,
@@ -458,6 +538,153 @@ class HybridMatcher:
 
         return overall_score, component_scores
 
+    def _recall_candidates(
+        self, query: str, all_identifiers: Set[str], threshold: float
+    ) -> Tuple[List[str], Dict[str, float], Dict[str, float]]:
+        """
+        Collect the identifiers whose overall score can reach the threshold.
+
+        An identifier scores 0 on every signal it has no recall hit for,
+        except embeddings, where it scores below the recall cutoff. Summing
+        each signal's weight times an upper bound on its score therefore
+        bounds the overall score, and identifiers bounded below the
+        threshold can be skipped.
+
+        Args:
+            query: The search query
+            all_identifiers: Set of all available identifiers
+            threshold: Minimum overall score
+
+        Returns:
+            Tuple of (candidates with the best bounds first, at most
+            max_candidates of them, fuzzy scores, recalled embedding scores)
+        """
+        weights = self._signal_weights()
+        metrics = self.last_search_metrics
+        bounds: Dict[str, float] = {}
+        if threshold <= 0:
+            # Every identifier passes
+            bounds = dict.fromkeys(all_identifiers, 0.0)
+
+        # Fuzzy: one indexed call scores every identifier
+        start = time.perf_counter()
+        fuzzy_scores = {
+            identifier: score / 100.0
+            for identifier, score in self.fuzzy_matcher.match_identifiers(
+                query, all_identifiers
+            )
+        }
+        for identifier, score in fuzzy_scores.items():
+            bounds[identifier] = weights["fuzzy"] * score
+        metrics["recall_fuzzy_ms"] = _elapsed_ms(start)
+
+        # TF-IDF: identifiers sharing a query word
+        start = time.perf_counter()
+        if self.tfidf_index is not None and self.tfidf_index.covers(all_identifiers):
+            # One sparse product scores them all
+            tfidf_scores = self._indexed_tfidf_scores(query)
+        else:
+            tfidf_scores = {
+                identifier: self.calculate_tfidf_similarity(query, identifier)
+                for identifier in self._identifiers_with_words(
+                    self.split_identifier(query), all_identifiers
+                )
+            }
+        for identifier, tfidf_score in tfidf_scores.items():
+            bounds[identifier] = bounds.get(identifier, 0.0) + weights["tfidf"] * min(
+                1.0, tfidf_score
+            )
+        metrics["recall_tfidf_ms"] = _elapsed_ms(start)
+
+        # Domain: identifiers with a word in one of the query's categories
+        if "domain_semantic" in weights:
+            start = time.perf_counter()
+            for identifier in self._domain_candidates(query, all_identifiers):
+                bounds[identifier] = (
+                    bounds.get(identifier, 0.0) + weights["domain_semantic"]
+                )
+            metrics["recall_domain_ms"] = _elapsed_ms(start)
+
+        # Embeddings: an identifier no other signal recalled needs an
+        # embedding score of at least threshold / weight to pass
+        embedding_scores: Dict[str, float] = {}
+        if "embedding" in weights and self._embeddings_active(query):
+            start = time.perf_counter()
+            cutoff = threshold / weights["embedding"]
+            if cutoff <= 1.0:
+                try:
+                    recalled = self.embedding_matcher.find_semantic_matches(
+                        query, set(all_identifiers), threshold=cutoff
+                    )
+                except Exception as e:
+                    if self.verbose:
+                        logger.debug(f"Embedding recall failed: {e}")
+                    recalled = []
+                for identifier, score in recalled:
+                    embedding_scores[identifier] = max(0.0, min(1.0, float(score)))
+                    bounds.setdefault(identifier, 0.0)
+            # Identifiers outside the embedding recall score below the cutoff
+            unrecalled = min(1.0, cutoff)
+            for identifier in bounds:
+                bounds[identifier] += weights["embedding"] * embedding_scores.get(
+                    identifier, unrecalled
+                )
+            metrics["recall_embedding_ms"] = _elapsed_ms(start)
+
+        candidates = [
+            identifier
+            for identifier, bound in bounds.items()
+            if bound + _BOUND_EPSILON >= threshold
+        ]
+        metrics["recall_candidates"] = len(candidates)
+        if len(candidates) > self.max_candidates:
+            candidates.sort(key=lambda identifier: -bounds[identifier])
+            del candidates[self.max_candidates :]
+        return candidates, fuzzy_scores, embedding_scores
+
+    def _domain_candidates(self, query: str, all_identifiers: Set[str]) -> Set[str]:
+        """Identifiers sharing a domain category with the query, or all of
+        them if the domain matcher cannot list its category words."""
+        reverse_mappings = getattr(
+            self.domain_semantic_matcher, "reverse_mappings", None
+        )
+        if not isinstance(reverse_mappings, dict) or not hasattr(
+            self.domain_semantic_matcher, "get_semantic_categories"
+        ):
+            return set(all_identifiers)
+        try:
+            query_categories = set(
+                self.domain_semantic_matcher.get_semantic_categories(query)
+            )
+        except Exception:
+            return set(all_identifiers)
+
+        if not query_categories:
+            return set()
+        return self._identifiers_with_words(
+            [
+                word
+                for word, category in reverse_mappings.items()
+                if category in query_categories
+            ],
+            all_identifiers,
+        )
+
+    def _identifiers_with_words(
+        self, words: List[str], all_identifiers: Set[str]
+    ) -> Set[str]:
+        """Identifiers containing any of the words, read from the TF-IDF
+        index's posting lists when it was built from this identifier set."""
+        if self.tfidf_index is not None and self.tfidf_index.covers(all_identifiers):
+            return set(
+                self.tfidf_index.identifiers_at(self.tfidf_index.rows_with_words(words))
+            )
+        identifiers_by_word = self._get_word_index(all_identifiers)
+        candidates: Set[str] = set()
+        for word in words:
+            candidates.update(identifiers_by_word.get(word, ()))
+        return candidates
+
     def find_hybrid_matches(
         self,
         query: str,
@@ -467,6 +694,9 @@ class HybridMatcher:
         """
         Find hybrid matches for a query among all identifiers.
 
+        Only the identifiers the recall stage returns are scored on every
+        signal. Stage timings end up in ``last_search_metrics``.
+
         Args:
             query: The search query
             all_identifiers: Set of all available identifiers
@@ -480,10 +710,28 @@ class HybridMatcher:
             f"find_hybrid_matches: query='{query}', identifiers={len(all_identifiers)}, threshold={threshold}"
         )
 
-        matches: List[Tuple[str, float, Dict[str, float]]] = []
+        self.last_search_metrics = {}
+        candidates, fuzzy_scores, embedding_scores = self._recall_candidates(
+            query, all_identifiers, threshold
+        )
+
+        # Rerank the candidates on every signal
+        start = time.perf_counter()
+        missing = [
+            identifier
+            for identifier in candidates
+            if identifier not in embedding_scores
+        ]
+        embedding_scores.update(self._embedding_scores(query, missing))
 
-        for identifier in all_identifiers:
-            overall_score, component_scores = self.hybrid_similarity(query, identifier)
+        matches: List[Tuple[str, float, Dict[str, float]]] = []
+        for identifier in candidates:
+            overall_score, component_scores = self._combine_scores(
+                query,
+                identifier,
+                fuzzy_scores.get(identifier, 0.0),
+                embedding_scores.get(identifier, 0.0),
+            )
 
             # Log first few scores
             if len(matches) < 5:
@@ -493,9 +741,13 @@ class HybridMatcher:
 
             if overall_score >= threshold:
                 matches.append((identifier, overall_score, component_scores))
+        self.last_search_metrics["rerank_ms"] = _elapsed_ms(start)
+        self.last_search_metrics["reranked_candidates"] = len(candidates)
 
         # Log filtering results
-        logger.debug(f"Before filtering: {len(all_identifiers)} identifiers")
+        logger.debug(
+            f"Recalled {len(candidates)} of {len(all_identifiers)} identifiers"
+        )
         logger.debug(f"After threshold {threshold}: {len(matches)} matches")
 
         # Sort by overall score (highest first)
@@ -630,3 +882,7 @@ class HybridMatcher:
                 suggestions.append(f"{words[i]}{words[j]}")
 
         return suggestions[:10]  # Limit to 10 suggestions
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
@@ -0,0 +1,171 @@
+"""
+Sparse TF-IDF index over identifiers.
+
+AdaptiveSemanticMatcher and HybridMatcher weight each word of an identifier
+by its IDF (term frequency is always 1) and compare identifiers with a query
+by cosine similarity. A TfidfIndex holds every identifier's vector as one
+row of a CSR matrix with precomputed row norms. Its column-major copy doubles
+as the word -> identifiers posting lists, so scoring a query only reads the
+rows of identifiers sharing at least one of its words.
+"""
+
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """Positions of the k highest scores, highest first.
+
+    Ties keep their original order. argpartition finds the k-th highest
+    score first, so only the scores reaching it are sorted.
+    """
+    if k is not None and k < len(scores):
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        # Every score tied with the k-th competes for the last places
+        top = np.flatnonzero(scores >= kth)
+        ranked: np.ndarray = top[np.argsort(-scores[top], kind="stable")[:k]]
+        return ranked
+    return np.argsort(-scores, kind="stable")
+
+
+class TfidfIndex:
+    """IDF-weighted word vectors of a fixed set of identifiers.
+
+    Each identifier's weight for a word it contains is
+    ``log(identifier count / identifiers containing the word)``.
+    """
+
+    def __init__(self, words_by_identifier: Mapping[str, Iterable[str]]) -> None:
+        """
+        Build the index.
+
+        Args:
+            words_by_identifier: Each identifier's words (duplicates are
+                ignored, since term frequency is always 1)
+        """
+        self.identifiers: List[str] = list(words_by_identifier)
+        self._members = frozenset(self.identifiers)
+        self._rows = {
+            identifier: row for row, identifier in enumerate(self.identifiers)
+        }
+
+        vocabulary: Dict[str, int] = {}
+        columns: List[int] = []
+        indptr = [0]
+        for words in words_by_identifier.values():
+            for word in set(words):
+                columns.append(vocabulary.setdefault(word, len(vocabulary)))
+            indptr.append(len(columns))
+        self.vocabulary = vocabulary
+        self.words: List[str] = list(vocabulary)
+
+        column_array = np.array(columns, dtype=np.int64)
+        self.document_frequencies = np.bincount(column_array, minlength=len(vocabulary))
+        # math.log, so the weights equal those of the dict-based matchers
+        self.idf = np.array(
+            [
+                math.log(len(self.identifiers) / frequency)
+                for frequency in self.document_frequencies.tolist()
+            ],
+            dtype=np.float64,
+        )
+
+        self.matrix = sparse.csr_matrix(
+            (self.idf[column_array], column_array, np.array(indptr, dtype=np.int64)),
+            shape=(len(self.identifiers), len(vocabulary)),
+        )
+        self.norms: np.ndarray = np.sqrt(
+            np.asarray(self.matrix.multiply(self.matrix).sum(axis=1)).ravel()
+        )
+        # Column-major copy: the rows containing each word
+        self._by_word = self.matrix.tocsc()
+
+    def __len__(self) -> int:
+        return len(self.identifiers)
+
+    def covers(self, identifiers: Iterable[str]) -> bool:
+        """Whether the index was built from exactly these identifiers."""
+        if not isinstance(identifiers, (set, frozenset)):
+            identifiers = set(identifiers)
+        return self._members == identifiers
+
+    def idf_by_word(self) -> Dict[str, float]:
+        """IDF of every indexed word."""
+        return dict(zip(self.words, self.idf.tolist()))
+
+    def row_of(self, identifier: str) -> Optional[int]:
+        """Row of an identifier, or None if it is not indexed."""
+        return self._rows.get(identifier)
+
+    def identifiers_at(self, rows: np.ndarray) -> List[str]:
+        """Identifiers at the given rows."""
+        return [self.identifiers[row] for row in rows.tolist()]
+
+    def row_words(self, row: int) -> List[str]:
+        """Indexed words of the identifier at a row."""
+        indptr: np.ndarray = self.matrix.indptr
+        indices: np.ndarray = self.matrix.indices
+        start, end = int(indptr[row]), int(indptr[row + 1])
+        return [self.words[column] for column in indices[start:end].tolist()]
+
+    def rows_with_words(self, words: Iterable[str]) -> np.ndarray:
+        """Sorted rows of the identifiers containing any of the words."""
+        columns = self._columns(words)
+        if not len(columns):
+            return np.empty(0, dtype=np.int64)
+        indptr: np.ndarray = self._by_word.indptr
+        indices: np.ndarray = self._by_word.indices
+        rows: np.ndarray = np.unique(
+            np.concatenate([indices[indptr[c] : indptr[c + 1]] for c in columns])
+        )
+        return rows
+
+    def similarities(self, words: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine similarity of a query with the identifiers sharing a word
+        with it. Every other identifier scores 0.
+
+        Args:
+            words: The query's words
+
+        Returns:
+            Tuple of (sorted rows, similarity of each)
+        """
+        columns = self._columns(words)
+        query_weights = self.idf[columns]
+        query_norm = np.sqrt(np.dot(query_weights, query_weights))
+        if not len(columns) or query_norm == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        # Sum the shared words' weight products row by row, reading only the
+        # query's columns
+        indptr: np.ndarray = self._by_word.indptr
+        indices: np.ndarray = self._by_word.indices
+        data: np.ndarray = self._by_word.data
+        rows = np.concatenate([indices[indptr[c] : indptr[c + 1]] for c in columns])
+        products = np.concatenate(
+            [
+                data[indptr[c] : indptr[c + 1]] * weight
+                for c, weight in zip(columns, query_weights)
+            ]
+        )
+        rows, positions = np.unique(rows, return_inverse=True)
+        dots = np.bincount(positions, weights=products, minlength=len(rows))
+
+        norms = self.norms[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(norms > 0, dots / (query_norm * norms), 0.0)
+        return rows, scores
+
+    def _columns(self, words: Iterable[str]) -> np.ndarray:
+        return np.array(
+            sorted(
+                {self.vocabulary[word] for word in words if word in self.vocabulary}
+            ),
+            dtype=np.int64,
+        )
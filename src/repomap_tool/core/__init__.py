@@ -5,7 +5,18 @@ This package contains the main components for code analysis and search functiona
 """
 
 from .repo_map import RepoMapService
-from .file_scanner import parse_gitignore, should_ignore_file
+from .file_scanner import IgnoreMatcher, parse_gitignore, should_ignore_file
 from .cache_manager import CacheManager
+from .project_snapshot import ProjectSnapshot
+from .identifier_index import IdentifierIndex, IdentifierLocation
 
-__all__ = ["RepoMapService", "parse_gitignore", "should_ignore_file", "CacheManager"]
+__all__ = [
+    "RepoMapService",
+    "IgnoreMatcher",
+    "parse_gitignore",
+    "should_ignore_file",
+    "CacheManager",
+    "ProjectSnapshot",
+    "IdentifierIndex",
+    "IdentifierLocation",
+]
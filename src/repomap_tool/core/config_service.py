@@ -23,6 +23,7 @@ class ConfigDefaults:
     HYBRID_THRESHOLD: float = 0.3
     HYBRID_FUZZY_WEIGHT: float = 0.55
     HYBRID_SEMANTIC_WEIGHT: float = 0.45
+    HYBRID_MAX_CANDIDATES: int = 1000
 
     # === PERFORMANCE CONFIGURATION ===
     MAX_WORKERS: int = 4
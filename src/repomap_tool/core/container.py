@@ -26,6 +26,7 @@ if TYPE_CHECKING:
     from repomap_tool.code_analysis.path_resolver import PathResolver
     from repomap_tool.code_analysis.import_analyzer import ImportAnalyzer
     from repomap_tool.code_analysis.call_graph_builder import CallGraphBuilder
+    from repomap_tool.code_analysis.tree_sitter_parser import TreeSitterParser
     from repomap_tool.utils.path_normalizer import PathNormalizer
     from repomap_tool.code_search.fuzzy_matcher import FuzzyMatcher
     from repomap_tool.code_search.adaptive_semantic_matcher import (
@@ -69,6 +70,18 @@ class Container(containers.DeclarativeContainer):
         providers.Singleton(
             "repomap_tool.core.tag_cache.TreeSitterTagCache",
             cache_dir=config.cache_dir,
+            hash_algorithm=config.performance.cache_hash_algorithm,
+        ),
+    )
+
+    # Shared tree-sitter parser: analyzers reuse its per-file analysis records
+    tree_sitter_parser: "providers.Singleton[TreeSitterParser]" = cast(
+        "providers.Singleton[TreeSitterParser]",
+        providers.Singleton(
+            "repomap_tool.code_analysis.tree_sitter_parser.TreeSitterParser",
+            project_root=config.project_root,
+            cache=tag_cache,
+            extract_comments=config.performance.extract_comments,
         ),
     )
 
@@ -95,6 +108,7 @@ class Container(containers.DeclarativeContainer):
         providers.Singleton(
             "repomap_tool.code_analysis.ast_file_analyzer.ASTFileAnalyzer",
             project_root=config.project_root,
+            tree_sitter_parser=tree_sitter_parser,
         ),
     )
 
@@ -151,11 +165,8 @@ class Container(containers.DeclarativeContainer):
         providers.Singleton(
             "repomap_tool.code_analysis.import_analyzer.ImportAnalyzer",
             project_root=config.project_root,
-            tree_sitter_parser=providers.Singleton(
-                "repomap_tool.code_analysis.tree_sitter_parser.TreeSitterParser",
-                project_root=config.project_root,
-                cache=tag_cache,
-            ),
+            tree_sitter_parser=tree_sitter_parser,
+            executor=config.performance.executor,
         ),
     )
 
@@ -193,6 +204,10 @@ class Container(containers.DeclarativeContainer):
             max_workers=config.performance.max_workers,
             enable_progress=config.performance.enable_progress,
             console=console,
+            executor=config.performance.executor,
+            chunk_size=config.performance.process_chunk_size,
+            extract_comments=config.performance.extract_comments,
+            queue_size=config.performance.pipeline_queue_size,
         ),
     )
 
@@ -214,6 +229,14 @@ class Container(containers.DeclarativeContainer):
         model_name="nomic-ai/CodeRankEmbed",  # FIXED: Use hardcoded value instead of config
         cache_manager=cache_manager,
         cache_dir=config.embedding.cache_dir,
+        store_dtype=config.embedding.store_dtype,
+        batch_size=config.embedding.batch_size,
+        ann_enabled=config.embedding.ann_enabled,
+        ann_min_identifiers=config.embedding.ann_min_identifiers,
+        ann_lists=config.embedding.ann_lists,
+        ann_probe=config.embedding.ann_probe,
+        backend=config.embedding.backend,
+        hashing_dimension=config.embedding.hashing_dimension,
     )
 
     adaptive_semantic_matcher: "providers.Factory[AdaptiveSemanticMatcher]" = cast(
@@ -267,11 +290,7 @@ class Container(containers.DeclarativeContainer):
         providers.Singleton(
             "repomap_tool.code_analysis.call_graph_builder.CallGraphBuilder",
             project_root=config.project_root,
-            tree_sitter_parser=providers.Singleton(
-                "repomap_tool.code_analysis.tree_sitter_parser.TreeSitterParser",
-                project_root=config.project_root,
-                cache=tag_cache,
-            ),
+            tree_sitter_parser=tree_sitter_parser,
         ),
     )
 
@@ -381,6 +400,22 @@ def create_container(config: RepoMapConfig) -> Container:
                 "performance": {
                     "max_workers": config.performance.max_workers,
                     "enable_progress": config.performance.enable_progress,
+                    "cache_hash_algorithm": config.performance.cache_hash_algorithm,
+                    "executor": config.performance.executor,
+                    "process_chunk_size": config.performance.process_chunk_size,
+                    "extract_comments": config.performance.extract_comments,
+                    "pipeline_queue_size": config.performance.pipeline_queue_size,
+                },
+                "embedding": {
+                    "cache_dir": config.embedding.cache_dir,
+                    "store_dtype": config.embedding.store_dtype,
+                    "batch_size": config.embedding.batch_size,
+                    "ann_enabled": config.embedding.ann_enabled,
+                    "ann_min_identifiers": config.embedding.ann_min_identifiers,
+                    "ann_lists": config.embedding.ann_lists,
+                    "ann_probe": config.embedding.ann_probe,
+                    "backend": config.embedding.backend,
+                    "hashing_dimension": config.embedding.hashing_dimension,
                 },
                 "verbose": config.verbose,
             }
@@ -6,8 +6,275 @@ This module handles project file discovery and gitignore pattern matching.
 
 import fnmatch
 import logging
+import os
+import queue
+import re
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# Comprehensive default exclusions for all common languages and tools
+DEFAULT_EXCLUSIONS = [
+    # Git and version control
+    ".git/",
+    ".git/**",
+    ".svn/",
+    ".svn/**",
+    ".hg/",
+    ".hg/**",
+    # Python
+    "__pycache__/",
+    "__pycache__/**",
+    "*.pyc",
+    "*.pyo",
+    "*.pyd",
+    ".pytest_cache/",
+    ".pytest_cache/**",
+    "*.egg-info/",
+    "*.egg-info/**",
+    "dist/",
+    "dist/**",
+    "build/",
+    "build/**",
+    ".coverage",
+    "htmlcov/",
+    "htmlcov/**",
+    ".mypy_cache/",
+    ".mypy_cache/**",
+    ".tox/",
+    ".tox/**",
+    ".ruff_cache/",
+    ".ruff_cache/**",
+    # Node.js / JavaScript / TypeScript
+    "node_modules/",
+    "node_modules/**",
+    "npm-debug.log*",
+    "yarn-debug.log*",
+    "yarn-error.log*",
+    ".npm/",
+    ".npm/**",
+    ".yarn/",
+    ".yarn/**",
+    "yarn.lock",
+    "package-lock.json",
+    "*.tsbuildinfo",
+    ".tscache/",
+    ".tscache/**",
+    "coverage/",
+    "coverage/**",
+    ".nyc_output/",
+    ".nyc_output/**",
+    "*.tgz",
+    "*.tar.gz",
+    # Java
+    "target/",
+    "target/**",
+    "*.class",
+    "*.jar",
+    "*.war",
+    "*.ear",
+    "*.nar",
+    ".gradle/",
+    ".gradle/**",
+    "gradle/wrapper/",
+    "gradle/wrapper/**",
+    ".mvn/",
+    ".mvn/**",
+    "mvnw",
+    "mvnw.cmd",
+    "gradlew",
+    "gradlew.bat",
+    # C/C++
+    "*.o",
+    "*.obj",
+    "*.exe",
+    "*.dll",
+    "*.so",
+    "*.dylib",
+    "*.a",
+    "*.lib",
+    "Debug/",
+    "Debug/**",
+    "Release/",
+    "Release/**",
+    "CMakeFiles/",
+    "CMakeFiles/**",
+    "CMakeCache.txt",
+    "Makefile",
+    # Go
+    "vendor/",
+    "vendor/**",
+    "*.exe",
+    "*.exe~",
+    "*.test",
+    "*.out",
+    "go.work",
+    "go.work.sum",
+    # Rust
+    "Cargo.lock",
+    "*.pdb",
+    # PHP
+    "composer.lock",
+    "*.log",
+    # Ruby
+    "Gemfile.lock",
+    "*.gem",
+    ".bundle/",
+    ".bundle/**",
+    # .NET
+    "bin/",
+    "bin/**",
+    "obj/",
+    "obj/**",
+    "*.dll",
+    "*.exe",
+    "*.pdb",
+    "*.cache",
+    "packages/",
+    "packages/**",
+    "*.user",
+    "*.suo",
+    "*.sln.docstates",
+    # Virtual environments and package managers
+    ".venv/",
+    ".venv/**",
+    "venv/",
+    "venv/**",
+    "env/",
+    "env/**",
+    ".env",
+    ".conda/",
+    ".conda/**",
+    "conda-meta/",
+    "conda-meta/**",
+    # IDEs and editors
+    ".vscode/",
+    ".vscode/**",
+    ".idea/",
+    ".idea/**",
+    "*.swp",
+    "*.swo",
+    "*~",
+    ".vs/",
+    ".vs/**",
+    "*.suo",
+    "*.user",
+    "*.userosscache",
+    "*.sln.docstates",
+    ".emacs.d/",
+    ".emacs.d/**",
+    ".vim/",
+    ".vim/**",
+    # OS and system files
+    ".DS_Store",
+    "Thumbs.db",
+    "desktop.ini",
+    "*.lnk",
+    ".directory",
+    "*.tmp",
+    "*.temp",
+    "*.log",
+    "*.pid",
+    "*.seed",
+    "*.pid.lock",
+    # Docker and containers
+    ".dockerignore",
+    "Dockerfile*",
+    "docker-compose*.yml",
+    "*.dockerfile",
+    # CI/CD and deployment (but keep scripts and config files)
+    ".github/workflows/",
+    ".github/workflows/**",
+    ".gitlab-ci.yml",
+    ".travis.yml",
+    ".circleci/",
+    ".circleci/**",
+    "Jenkinsfile",
+    "azure-pipelines.yml",
+    # Documentation and build artifacts
+    "docs/_build/",
+    "docs/_build/**",
+    "site/",
+    "site/**",
+    "_site/",
+    "_site/**",
+    "*.pdf",
+    "*.doc",
+    "*.docx",
+    "*.ppt",
+    "*.pptx",
+    "*.xls",
+    "*.xlsx",
+    # Media and binary files
+    "*.jpg",
+    "*.jpeg",
+    "*.png",
+    "*.gif",
+    "*.bmp",
+    "*.tiff",
+    "*.ico",
+    "*.mp3",
+    "*.mp4",
+    "*.avi",
+    "*.mov",
+    "*.wmv",
+    "*.flv",
+    "*.webm",
+    "*.zip",
+    "*.rar",
+    "*.7z",
+    "*.tar",
+    "*.gz",
+    "*.bz2",
+    "*.xz",
+    "*.ttf",
+    "*.otf",
+    "*.woff",
+    "*.woff2",
+    "*.eot",
+    # Database files
+    "*.db",
+    "*.sqlite",
+    "*.sqlite3",
+    "*.mdb",
+    "*.accdb",
+    # Backup and temporary files
+    "*.bak",
+    "*.backup",
+    "*.old",
+    "*.orig",
+    "*.rej",
+    "*.swp",
+    "*.swo",
+    "*.cache",
+    "*.lock",
+    # Configuration and tool files
+    "*.gitconfig",
+    "*.gitattributes",
+    "*.gitkeep",
+    "*.git-blame-ignore-revs",
+    "*.tool-versions",
+    "*.nvmrc",
+    "*.npmrc",
+    "*.rooignore",
+    "*.roomodes",
+    "*.vscodeignore",
+    "*.prettierignore",
+    "*.env",
+    "*.sample",
+    "*.example",
+    # Build and package files
+    "*.snap",
+    "*.db-shm",
+    "*.db-wal",
+    "*.val",
+    # Media files
+    "*.wav",
+    # Husky git hooks
+    "husky/pre-push",
+    "husky/pre-commit",
+]
 
 
 def parse_gitignore(gitignore_path: Path) -> List[str]:
@@ -157,322 +424,674 @@ def _pattern_matches(rel_path_str: str, pattern: str) -> bool:
     return False
 
 
-def get_project_files(project_root: str, verbose: bool = False) -> List[str]:
+_GLOB_CHARS = frozenset("*?[")
+_TRIE_END = "\0"
+
+
+def _has_glob(pattern: str) -> bool:
+    return not _GLOB_CHARS.isdisjoint(pattern)
+
+
+def _fnmatch_body(pattern: str) -> str:
+    """fnmatch.translate without its trailing end-of-string anchor."""
+    translated = fnmatch.translate(pattern)
+    return translated[: -len("\\Z")] if translated.endswith("\\Z") else translated
+
+
+class _PatternGroup:
+    """Patterns of one polarity compiled into a single "does any match" test.
+
+    Each pattern is routed to the cheapest structure that reproduces
+    _pattern_matches exactly: component hash sets, an anchored prefix trie,
+    extension/suffix/prefix literals, and one combined regex for the rest.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._names: Set[str] = set()
+        self._trie: Dict[str, Any] = {}
+        self._extensions: Set[str] = set()
+        suffixes: Set[str] = set()
+        prefixes: Set[str] = set()
+        full_globs: List[str] = []
+        prefix_globs: List[str] = []
+        self._infixes: List[Tuple[str, str]] = []
+
+        for pattern in patterns:
+            if "**" in pattern:
+                if pattern.startswith("**/"):
+                    # Any leading sub-path matches, or any single component equals
+                    body = pattern[3:]
+                    if body.endswith("/"):
+                        body = body[:-1]
+                    if not body:
+                        continue
+                    if _has_glob(body):
+                        prefix_globs.append(_fnmatch_body(body))
+                        self._names.add(body)
+                    elif "/" in body:
+                        self._add_prefix(body)
+                    else:
+                        self._names.add(body)
+                elif pattern.endswith("/**"):
+                    self._add_prefix(pattern[:-3])
+                elif "/**/" in pattern:
+                    prefix, suffix = pattern.split("/**/", 1)
+                    self._infixes.append((prefix + "/", suffix))
+                # Any other use of ** never matches
+            elif pattern.endswith("/"):
+                self._add_prefix(pattern[:-1])
+            elif "*" in pattern or "?" in pattern:
+                head, tail = pattern[:1], pattern[1:]
+                if head == "*" and tail and not _has_glob(tail):
+                    if tail.startswith("."):
+                        self._extensions.add(tail)
+                    else:
+                        suffixes.add(tail)
+                elif pattern.endswith("*") and not _has_glob(pattern[:-1]):
+                    prefixes.add(pattern[:-1])
+                else:
+                    full_globs.append(fnmatch.translate(pattern))
+            else:
+                self._add_prefix(pattern)
+
+        self._suffixes = tuple(sorted(suffixes))
+        self._prefixes = tuple(sorted(prefixes))
+        self._full_regex = (
+            re.compile("|".join(f"(?:{g})" for g in full_globs)) if full_globs else None
+        )
+        self._prefix_regex = (
+            re.compile("|".join(f"(?:{g}(?:/|\\Z))" for g in prefix_globs))
+            if prefix_globs
+            else None
+        )
+
+    def _add_prefix(self, path: str) -> None:
+        """Match the path itself and everything below it."""
+        parts = path.split("/")
+        if "" in parts:
+            # Relative paths never have empty components
+            return
+        node = self._trie
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[_TRIE_END] = True
+
+    def matches(self, rel_path: str, parts: List[str]) -> bool:
+        if self._names and not self._names.isdisjoint(parts):
+            return True
+
+        node = self._trie
+        for part in parts:
+            child = node.get(part)
+            if child is None:
+                break
+            node = child
+            if _TRIE_END in node:
+                return True
+
+        if self._extensions:
+            name = parts[-1]
+            dot = name.find(".")
+            while dot != -1:
+                if name[dot:] in self._extensions:
+                    return True
+                dot = name.find(".", dot + 1)
+
+        if self._suffixes and rel_path.endswith(self._suffixes):
+            return True
+        if self._prefixes and rel_path.startswith(self._prefixes):
+            return True
+        if self._full_regex is not None and self._full_regex.match(rel_path):
+            return True
+        if self._prefix_regex is not None and self._prefix_regex.match(rel_path):
+            return True
+
+        for prefix, suffix in self._infixes:
+            if rel_path.startswith(prefix) and suffix in rel_path[len(prefix) :]:
+                return True
+
+        return False
+
+
+class IgnoreMatcher:
+    """Ignore patterns compiled once for fast repeated matching.
+
+    Gives the same answers as should_ignore_file, including last-match-wins
+    negation, without looping over every pattern for every path.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """
+        Compile ignore patterns.
+
+        Args:
+            patterns: Gitignore-style patterns in precedence order
+        """
+        # Consecutive patterns of the same polarity form one group; the last
+        # group with any match decides, exactly like the last matching pattern
+        runs: List[Tuple[bool, List[str]]] = []
+        for pattern in patterns:
+            if not pattern or pattern.isspace():
+                continue
+            negated = pattern.startswith("!")
+            if negated:
+                pattern = pattern[1:]
+            if not runs or runs[-1][0] != negated:
+                runs.append((negated, []))
+            runs[-1][1].append(pattern)
+
+        self._groups = [
+            (negated, _PatternGroup(group)) for negated, group in reversed(runs)
+        ]
+
+    def matches(self, rel_path: str) -> bool:
+        """Check whether a path relative to the project root is ignored.
+
+        Args:
+            rel_path: "/"-separated path relative to the project root
+
+        Returns:
+            True if the path should be ignored
+        """
+        return self.decide(rel_path) is True
+
+    def decide(self, rel_path: str) -> Optional[bool]:
+        """Like matches, but distinguish "not ignored" from "no pattern matched".
+
+        Args:
+            rel_path: "/"-separated path relative to the patterns' directory
+
+        Returns:
+            True if ignored, False if re-included by a negation, or None if
+            no pattern matched
+        """
+        parts = rel_path.split("/")
+        for negated, group in self._groups:
+            if group.matches(rel_path, parts):
+                return not negated
+        return None
+
+
+_IgnoreStack = Tuple[Tuple[str, IgnoreMatcher], ...]
+
+
+class ProjectIgnoreRules:
+    """Ignore rules for a whole project, including nested .gitignore files.
+
+    The project root contributes DEFAULT_EXCLUSIONS, .git/info/exclude and
+    its .gitignore; every subdirectory may add its own .gitignore whose
+    patterns are relative to that directory. As in git, a deeper file takes
+    precedence over its parents. Each directory's stack of matchers is built
+    once from its parent's stack.
+    """
+
+    def __init__(self, project_root: str, nested: bool = True):
+        """
+        Load the root ignore rules.
+
+        Args:
+            project_root: Root directory of the project
+            nested: Whether to honour .gitignore files below the root
+        """
+        self.project_root = project_root
+        self.nested = nested
+        self.root_patterns = get_ignore_patterns(project_root)
+        self._stacks: Dict[str, _IgnoreStack] = {
+            "": (("", IgnoreMatcher(self.root_patterns)),)
+        }
+
+    def enter_directory(
+        self, rel_dir: str, has_gitignore: Optional[bool] = None
+    ) -> None:
+        """Build the matcher stack for a directory.
+
+        Args:
+            rel_dir: Directory relative to the project root ("" for the root)
+            has_gitignore: Whether the directory contains a .gitignore, if
+                already known from a directory listing
+        """
+        self._stack(rel_dir, has_gitignore)
+
+    def _stack(
+        self, rel_dir: str, has_gitignore: Optional[bool] = None
+    ) -> _IgnoreStack:
+        stack = self._stacks.get(rel_dir)
+        if stack is not None:
+            return stack
+
+        stack = self._stack(rel_dir.rpartition("/")[0])
+        if self.nested and has_gitignore is not False:
+            patterns = parse_gitignore(Path(self.project_root, rel_dir, ".gitignore"))
+            if patterns:
+                stack = ((rel_dir + "/", IgnoreMatcher(patterns)),) + stack
+        self._stacks[rel_dir] = stack
+        return stack
+
+    def is_ignored(self, rel_path: str) -> bool:
+        """Check a path whose parent directories are not ignored.
+
+        Args:
+            rel_path: "/"-separated path relative to the project root
+
+        Returns:
+            True if the closest .gitignore with a matching pattern ignores it
+        """
+        for prefix, matcher in self._stack(rel_path.rpartition("/")[0]):
+            decision = matcher.decide(rel_path[len(prefix) :])
+            if decision is not None:
+                return decision
+        return False
+
+
+def get_ignore_patterns(project_root: str) -> List[str]:
+    """
+    Get the ignore patterns applied at the root of a project.
+
+    Args:
+        project_root: Root directory of the project
+
+    Returns:
+        Default exclusions followed by .git/info/exclude and the root
+        .gitignore patterns (later patterns take precedence)
+    """
+    root = Path(project_root)
+    return (
+        DEFAULT_EXCLUSIONS
+        + parse_gitignore(root / ".git" / "info" / "exclude")
+        + parse_gitignore(root / ".gitignore")
+    )
+
+
+def is_project_file(
+    file_path: str, project_root: str, rules: Optional[ProjectIgnoreRules] = None
+) -> bool:
+    """
+    Check whether get_project_files would include a path, without walking.
+
+    Args:
+        file_path: Absolute path of the file to check
+        project_root: Root directory of the project
+        rules: Project ignore rules (loaded if omitted)
+
+    Returns:
+        True if the file is under the root and neither it nor any parent
+        directory is ignored
+    """
+    path = Path(file_path)
+    if path.name == ".gitignore":
+        return False
+
+    try:
+        rel_parts = path.relative_to(project_root).parts
+    except ValueError:
+        return False
+
+    if rules is None:
+        rules = ProjectIgnoreRules(project_root)
+
+    # get_project_files prunes ignored directories before looking at files
+    for depth in range(1, len(rel_parts) + 1):
+        if rules.is_ignored("/".join(rel_parts[:depth])):
+            return False
+    return True
+
+
+def _git_ls_files(project_root: str, *args: str) -> Optional[List[str]]:
+    try:
+        result = subprocess.run(
+            ["git", "-C", project_root, "ls-files", "-z", *args],
+            capture_output=True,
+            check=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logging.debug(f"git ls-files failed in {project_root}: {e}")
+        return None
+    return [path for path in os.fsdecode(result.stdout).split("\0") if path]
+
+
+def list_git_files(project_root: str) -> Optional[List[str]]:
+    """
+    List project files from the git index instead of walking the tree.
+
+    Tracked files still present on disk plus untracked files that git does
+    not ignore, so git's own handling of every .gitignore,
+    .git/info/exclude and core.excludesFile applies. Submodules are skipped.
+
+    Args:
+        project_root: Root directory of the project
+
+    Returns:
+        "/"-separated paths relative to project_root, or None if the
+        directory is not inside a git work tree or git is unavailable
+    """
+    staged = _git_ls_files(project_root, "--stage")
+    if staged is None:
+        return None
+    others = _git_ls_files(project_root, "--others", "--exclude-standard")
+    deleted = _git_ls_files(project_root, "--deleted")
+    if others is None or deleted is None:
+        return None
+
+    tracked: Dict[str, None] = {}
+    for entry in staged:
+        info, _, rel_path = entry.partition("\t")
+        # Gitlinks (mode 160000) are submodule checkouts, not files
+        if not info.startswith("160000 "):
+            tracked[rel_path] = None
+    for rel_path in deleted:
+        tracked.pop(rel_path, None)
+    return list(tracked) + others
+
+
+# Directories listed concurrently by the project walker
+DEFAULT_WALK_WORKERS = 4
+
+
+def project_path_prefix(project_root: str) -> str:
+    """
+    Get the prefix that turns a relative path into a listed project path.
+
+    Listed paths are joined onto the root the same way Path(root) / name
+    would be, so "./" and trailing separators are normalized away.
+
+    Args:
+        project_root: Root directory of the project
+
+    Returns:
+        Prefix ending in "/", or "" for the current directory
+    """
+    root_str = str(Path(project_root))
+    if root_str == ".":
+        return ""
+    return root_str if root_str.endswith("/") else root_str + "/"
+
+
+def get_project_files(
+    project_root: str,
+    verbose: bool = False,
+    use_git_index: bool = False,
+    max_workers: int = DEFAULT_WALK_WORKERS,
+) -> List[str]:
     """
     Get list of project files, respecting .gitignore patterns.
 
     Args:
         project_root: Root directory of the project
         verbose: Whether to enable verbose logging
+        use_git_index: Read the file list from git when the project is a git
+            checkout instead of walking the directory tree
+        max_workers: Directories listed concurrently while walking
 
     Returns:
-        List of file paths relative to project root
+        List of file paths relative to project root, sorted so the result
+        does not depend on the order concurrent directory reads finish
     """
-    import os
-
-    # Parse .gitignore file
-    gitignore_path = Path(project_root) / ".gitignore"
-    gitignore_patterns = parse_gitignore(gitignore_path)
-
-    # Add comprehensive default exclusions for all common languages and tools
-    default_exclusions = [
-        # Git and version control
-        ".git/",
-        ".git/**",
-        ".svn/",
-        ".svn/**",
-        ".hg/",
-        ".hg/**",
-        # Python
-        "__pycache__/",
-        "__pycache__/**",
-        "*.pyc",
-        "*.pyo",
-        "*.pyd",
-        ".pytest_cache/",
-        ".pytest_cache/**",
-        "*.egg-info/",
-        "*.egg-info/**",
-        "dist/",
-        "dist/**",
-        "build/",
-        "build/**",
-        ".coverage",
-        "htmlcov/",
-        "htmlcov/**",
-        ".mypy_cache/",
-        ".mypy_cache/**",
-        ".tox/",
-        ".tox/**",
-        ".ruff_cache/",
-        ".ruff_cache/**",
-        # Node.js / JavaScript / TypeScript
-        "node_modules/",
-        "node_modules/**",
-        "npm-debug.log*",
-        "yarn-debug.log*",
-        "yarn-error.log*",
-        ".npm/",
-        ".npm/**",
-        ".yarn/",
-        ".yarn/**",
-        "yarn.lock",
-        "package-lock.json",
-        "*.tsbuildinfo",
-        ".tscache/",
-        ".tscache/**",
-        "coverage/",
-        "coverage/**",
-        ".nyc_output/",
-        ".nyc_output/**",
-        "*.tgz",
-        "*.tar.gz",
-        # Java
-        "target/",
-        "target/**",
-        "*.class",
-        "*.jar",
-        "*.war",
-        "*.ear",
-        "*.nar",
-        ".gradle/",
-        ".gradle/**",
-        "gradle/wrapper/",
-        "gradle/wrapper/**",
-        ".mvn/",
-        ".mvn/**",
-        "mvnw",
-        "mvnw.cmd",
-        "gradlew",
-        "gradlew.bat",
-        # C/C++
-        "*.o",
-        "*.obj",
-        "*.exe",
-        "*.dll",
-        "*.so",
-        "*.dylib",
-        "*.a",
-        "*.lib",
-        "Debug/",
-        "Debug/**",
-        "Release/",
-        "Release/**",
-        "CMakeFiles/",
-        "CMakeFiles/**",
-        "CMakeCache.txt",
-        "Makefile",
-        # Go
-        "vendor/",
-        "vendor/**",
-        "*.exe",
-        "*.exe~",
-        "*.test",
-        "*.out",
-        "go.work",
-        "go.work.sum",
-        # Rust
-        "Cargo.lock",
-        "*.pdb",
-        # PHP
-        "composer.lock",
-        "*.log",
-        # Ruby
-        "Gemfile.lock",
-        "*.gem",
-        ".bundle/",
-        ".bundle/**",
-        # .NET
-        "bin/",
-        "bin/**",
-        "obj/",
-        "obj/**",
-        "*.dll",
-        "*.exe",
-        "*.pdb",
-        "*.cache",
-        "packages/",
-        "packages/**",
-        "*.user",
-        "*.suo",
-        "*.sln.docstates",
-        # Virtual environments and package managers
-        ".venv/",
-        ".venv/**",
-        "venv/",
-        "venv/**",
-        "env/",
-        "env/**",
-        ".env",
-        ".conda/",
-        ".conda/**",
-        "conda-meta/",
-        "conda-meta/**",
-        # IDEs and editors
-        ".vscode/",
-        ".vscode/**",
-        ".idea/",
-        ".idea/**",
-        "*.swp",
-        "*.swo",
-        "*~",
-        ".vs/",
-        ".vs/**",
-        "*.suo",
-        "*.user",
-        "*.userosscache",
-        "*.sln.docstates",
-        ".emacs.d/",
-        ".emacs.d/**",
-        ".vim/",
-        ".vim/**",
-        # OS and system files
-        ".DS_Store",
-        "Thumbs.db",
-        "desktop.ini",
-        "*.lnk",
-        ".directory",
-        "*.tmp",
-        "*.temp",
-        "*.log",
-        "*.pid",
-        "*.seed",
-        "*.pid.lock",
-        # Docker and containers
-        ".dockerignore",
-        "Dockerfile*",
-        "docker-compose*.yml",
-        "*.dockerfile",
-        # CI/CD and deployment (but keep scripts and config files)
-        ".github/workflows/",
-        ".github/workflows/**",
-        ".gitlab-ci.yml",
-        ".travis.yml",
-        ".circleci/",
-        ".circleci/**",
-        "Jenkinsfile",
-        "azure-pipelines.yml",
-        # Documentation and build artifacts
-        "docs/_build/",
-        "docs/_build/**",
-        "site/",
-        "site/**",
-        "_site/",
-        "_site/**",
-        "*.pdf",
-        "*.doc",
-        "*.docx",
-        "*.ppt",
-        "*.pptx",
-        "*.xls",
-        "*.xlsx",
-        # Media and binary files
-        "*.jpg",
-        "*.jpeg",
-        "*.png",
-        "*.gif",
-        "*.bmp",
-        "*.tiff",
-        "*.ico",
-        "*.mp3",
-        "*.mp4",
-        "*.avi",
-        "*.mov",
-        "*.wmv",
-        "*.flv",
-        "*.webm",
-        "*.zip",
-        "*.rar",
-        "*.7z",
-        "*.tar",
-        "*.gz",
-        "*.bz2",
-        "*.xz",
-        "*.ttf",
-        "*.otf",
-        "*.woff",
-        "*.woff2",
-        "*.eot",
-        # Database files
-        "*.db",
-        "*.sqlite",
-        "*.sqlite3",
-        "*.mdb",
-        "*.accdb",
-        # Backup and temporary files
-        "*.bak",
-        "*.backup",
-        "*.old",
-        "*.orig",
-        "*.rej",
-        "*.swp",
-        "*.swo",
-        "*.cache",
-        "*.lock",
-        # Configuration and tool files
-        "*.gitconfig",
-        "*.gitattributes",
-        "*.gitkeep",
-        "*.git-blame-ignore-revs",
-        "*.tool-versions",
-        "*.nvmrc",
-        "*.npmrc",
-        "*.rooignore",
-        "*.roomodes",
-        "*.vscodeignore",
-        "*.prettierignore",
-        "*.env",
-        "*.sample",
-        "*.example",
-        # Build and package files
-        "*.snap",
-        "*.db-shm",
-        "*.db-wal",
-        "*.val",
-        # Media files
-        "*.wav",
-        # Husky git hooks
-        "husky/pre-push",
-        "husky/pre-commit",
-    ]
-
-    # Combine gitignore patterns with default exclusions
-    all_patterns = default_exclusions + gitignore_patterns
-
-    if gitignore_patterns and verbose:
-        logging.info(f"Loaded {len(gitignore_patterns)} .gitignore patterns")
+    root_prefix = project_path_prefix(project_root)
+
+    if use_git_index:
+        git_files = list_git_files(project_root)
+        if git_files is not None:
+            if verbose:
+                logging.info(f"Listed {len(git_files)} files from the git index")
+            return filter_git_files(git_files, root_prefix)
+        logging.debug(f"{project_root} is not a git checkout, walking the tree")
+
+    rules = ProjectIgnoreRules(project_root)
+
     if verbose:
-        logging.info(f"Using {len(default_exclusions)} default exclusion patterns")
+        logging.info(
+            f"Loaded {len(rules.root_patterns) - len(DEFAULT_EXCLUSIONS)} "
+            f"root ignore patterns"
+        )
+        logging.info(f"Using {len(DEFAULT_EXCLUSIONS)} default exclusion patterns")
 
-    files = []
-    for root, dirs, filenames in os.walk(project_root):
-        # Filter out ignored directories
-        dirs[:] = [
-            d
-            for d in dirs
-            if not should_ignore_file(
-                Path(root) / d,
-                all_patterns,
-                Path(project_root),
-            )
-        ]
+    files = sorted(
+        iter_project_files(project_root, rules=rules, max_workers=max_workers)
+    )
+    if verbose:
+        logging.info(f"Found {len(files)} project files")
+    return files
 
-        for filename in filenames:
-            file_path = Path(root) / filename
 
-            # Always ignore .gitignore file itself
-            if filename == ".gitignore":
-                if verbose:
-                    logging.debug(f"Ignoring .gitignore file: {file_path}")
-                continue
+class DirectoryListing(NamedTuple):
+    """The entries of one project directory that survive the ignore rules."""
+
+    rel_dir: str
+    mtime_ns: int
+    files: List[str]
+    stats: List[Optional[os.stat_result]]
+    subdirs: List[str]
+    has_gitignore: bool
+
+
+def _read_directory(
+    abs_dir: str, with_stat: bool
+) -> Optional[Tuple[int, List[os.DirEntry[str]]]]:
+    """Do a directory's system calls: list it and, if asked, stat its files."""
+    try:
+        with os.scandir(abs_dir) as it:
+            entries = list(it)
+        mtime_ns = os.stat(abs_dir).st_mtime_ns
+    except OSError as e:
+        logging.debug(f"Cannot list {abs_dir}: {e}")
+        return None
+
+    if with_stat:
+        for entry in entries:
+            try:
+                if not entry.is_dir():
+                    # Cached on the DirEntry for _filter_directory
+                    entry.stat()
+            except OSError:
+                pass
+    return mtime_ns, entries
+
+
+def _filter_directory(
+    rel_dir: str,
+    mtime_ns: int,
+    entries: List[os.DirEntry[str]],
+    rules: ProjectIgnoreRules,
+    root_prefix: str,
+    with_stat: bool,
+) -> DirectoryListing:
+    """Apply the ignore rules to a directory's entries."""
+    has_gitignore = any(entry.name == ".gitignore" for entry in entries)
+    rules.enter_directory(rel_dir, has_gitignore)
+
+    rel_prefix = rel_dir + "/" if rel_dir else ""
+    out_prefix = root_prefix + rel_prefix
+    listing = DirectoryListing(rel_dir, mtime_ns, [], [], [], has_gitignore)
+    for entry in entries:
+        rel_path = rel_prefix + entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            # Like os.walk: symlinked directories are not descended into
+            if not entry.is_symlink() and not rules.is_ignored(rel_path):
+                listing.subdirs.append(rel_path)
+            continue
+
+        # Always ignore .gitignore files themselves
+        if entry.name == ".gitignore" or rules.is_ignored(rel_path):
+            continue
+
+        listing.files.append(out_prefix + entry.name)
+        if with_stat:
+            try:
+                listing.stats.append(entry.stat())
+            except OSError:
+                listing.stats.append(None)
 
-            # Check if file should be ignored
-            if should_ignore_file(file_path, all_patterns, Path(project_root)):
-                if verbose:
-                    logging.debug(f"Ignoring file (gitignore): {file_path}")
+    return listing
+
+
+def list_project_directory(
+    project_root: str,
+    rel_dir: str,
+    rules: ProjectIgnoreRules,
+    with_stat: bool = False,
+) -> Optional[DirectoryListing]:
+    """
+    List one project directory with os.scandir.
+
+    Entry types come from the directory listing itself, so files are only
+    stat'ed when with_stat is set, and then through the DirEntry.
+
+    Args:
+        project_root: Root directory of the project
+        rel_dir: Directory relative to the project root ("" for the root)
+        rules: Project ignore rules
+        with_stat: Whether to stat the listed files
+
+    Returns:
+        The directory's project files and subdirectories to descend into, or
+        None if it cannot be listed
+    """
+    root_prefix = project_path_prefix(project_root)
+    read = _read_directory(
+        root_prefix + rel_dir if rel_dir else project_root, with_stat
+    )
+    if read is None:
+        return None
+    return _filter_directory(rel_dir, read[0], read[1], rules, root_prefix, with_stat)
+
+
+def walk_project(
+    project_root: str,
+    rules: Optional[ProjectIgnoreRules] = None,
+    max_workers: int = DEFAULT_WALK_WORKERS,
+    with_stat: bool = False,
+    start: str = "",
+) -> Iterator[DirectoryListing]:
+    """
+    Walk a project, listing directories concurrently.
+
+    Worker threads only make the system calls (scandir, and stat when
+    asked); ignore matching happens on the consuming thread, which queues
+    each surviving subdirectory as soon as its parent is read. Listings are
+    yielded as they complete, so consumers can start on the first files
+    while the rest of the tree is still being read, and listing latency
+    (network filesystems, cold caches) overlaps instead of adding up.
+
+    Args:
+        project_root: Root directory of the project
+        rules: Project ignore rules (loaded if omitted)
+        max_workers: Directories read concurrently; 1 walks in os.walk
+            order on the calling thread
+        with_stat: Whether to stat the listed files
+        start: Directory to walk, relative to the project root
+
+    Yields:
+        One DirectoryListing per directory, parents before their children
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    if rules is None:
+        rules = ProjectIgnoreRules(project_root)
+    root_prefix = project_path_prefix(project_root)
+
+    def abs_dir(rel_dir: str) -> str:
+        return root_prefix + rel_dir if rel_dir else project_root
+
+    if max_workers == 1:
+        stack = [start]
+        while stack:
+            rel_dir = stack.pop()
+            read = _read_directory(abs_dir(rel_dir), with_stat)
+            if read is not None:
+                listing = _filter_directory(
+                    rel_dir, read[0], read[1], rules, root_prefix, with_stat
+                )
+                yield listing
+                stack.extend(reversed(listing.subdirs))
+        return
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="repomap-walk"
+    )
+    # Completed reads arrive here in completion order; waiting on the
+    # queue stays O(1) however many directories are outstanding
+    completed: "queue.SimpleQueue[Tuple[str, Future[Any]]]" = queue.SimpleQueue()
+    outstanding = 0
+
+    def submit(rel_dir: str) -> None:
+        nonlocal outstanding
+        future = executor.submit(_read_directory, abs_dir(rel_dir), with_stat)
+        future.add_done_callback(lambda f: completed.put((rel_dir, f)))
+        outstanding += 1
+
+    try:
+        submit(start)
+        while outstanding:
+            rel_dir, future = completed.get()
+            outstanding -= 1
+            read = future.result()
+            if read is None:
                 continue
+            listing = _filter_directory(
+                rel_dir, read[0], read[1], rules, root_prefix, with_stat
+            )
+            for subdir in listing.subdirs:
+                submit(subdir)
+            yield listing
+    finally:
+        # Also reached when the consumer stops iterating early
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_project_files(
+    project_root: str,
+    rules: Optional[ProjectIgnoreRules] = None,
+    max_workers: int = DEFAULT_WALK_WORKERS,
+) -> Iterator[str]:
+    """
+    Stream project file paths as directories are listed.
+
+    Args:
+        project_root: Root directory of the project
+        rules: Project ignore rules (loaded if omitted)
+        max_workers: Directories listed concurrently
+
+    Yields:
+        The same paths get_project_files returns, in discovery order
+    """
+    for listing in walk_project(project_root, rules=rules, max_workers=max_workers):
+        yield from listing.files
 
-            # Return absolute path for consistent path handling
-            files.append(str(file_path))
 
+def filter_git_files(rel_paths: List[str], root_prefix: str) -> List[str]:
+    """
+    Apply DEFAULT_EXCLUSIONS to a git file listing (git applied the rest).
+
+    Args:
+        rel_paths: Paths from list_git_files
+        root_prefix: Prefix from project_path_prefix
+
+    Returns:
+        Project file paths
+    """
+    matcher = IgnoreMatcher(DEFAULT_EXCLUSIONS)
+    ignored_dirs: Dict[str, bool] = {"": False}
+
+    def dir_ignored(rel_dir: str) -> bool:
+        ignored = ignored_dirs.get(rel_dir)
+        if ignored is None:
+            ignored = dir_ignored(rel_dir.rpartition("/")[0]) or matcher.matches(
+                rel_dir
+            )
+            ignored_dirs[rel_dir] = ignored
+        return ignored
+
+    files = []
+    for rel_path in rel_paths:
+        parent, _, filename = rel_path.rpartition("/")
+        if filename == ".gitignore" or dir_ignored(parent):
+            continue
+        if not matcher.matches(rel_path):
+            files.append(root_prefix + rel_path)
     return files
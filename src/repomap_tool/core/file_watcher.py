@@ -0,0 +1,338 @@
+"""
+Filesystem watching for incremental index updates.
+
+Watchers report which project files were created, modified or deleted so the
+tag cache, identifier index and dependency graphs can be updated for just
+those files. The native watcher uses OS notifications (inotify, FSEvents,
+ReadDirectoryChangesW) through the optional ``watchdog`` package; the polling
+watcher needs no dependencies but re-stats every project file each interval.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .file_scanner import (
+    ProjectIgnoreRules,
+    get_project_files,
+    is_project_file,
+    iter_project_files,
+)
+from .logging_service import get_logger
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+WATCH_BACKENDS = ("auto", "native", "polling")
+
+ChangeKind = Literal["created", "modified", "deleted"]
+_StatKey = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """A single change to a project file."""
+
+    path: str
+    kind: ChangeKind
+
+
+def _stat_key(path: str) -> Optional[_StatKey]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+class PollingWatcher:
+    """Portable watcher that diffs stat snapshots of the project files."""
+
+    def __init__(self, project_root: str, interval: float = 1.0):
+        """
+        Initialize the polling watcher.
+
+        Args:
+            project_root: Root directory of the project
+            interval: Seconds between scans
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.project_root = os.path.abspath(project_root)
+        self.interval = interval
+        self._snapshot: Dict[str, _StatKey] = {}
+
+    def start(self) -> None:
+        """Record the initial state of the project."""
+        self._snapshot = self._scan()
+
+    def stop(self) -> None:
+        """Stop watching (nothing to release for polling)."""
+
+    def _scan(self) -> Dict[str, _StatKey]:
+        snapshot = {}
+        for path in get_project_files(self.project_root):
+            key = _stat_key(path)
+            if key is not None:
+                snapshot[path] = key
+        return snapshot
+
+    def poll(self) -> List[FileChange]:
+        """Scan once and return changes since the previous scan."""
+        current = self._scan()
+        previous = self._snapshot
+        self._snapshot = current
+
+        changes = [
+            FileChange(path, "created" if path not in previous else "modified")
+            for path, key in current.items()
+            if previous.get(path) != key
+        ]
+        changes.extend(
+            FileChange(path, "deleted") for path in previous if path not in current
+        )
+        return changes
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> List[FileChange]:
+        """Block until files change or the timeout expires.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Changes detected, empty if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changes = self.poll()
+            if changes:
+                return changes
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return []
+            time.sleep(
+                self.interval if remaining is None else min(self.interval, remaining)
+            )
+
+
+class NativeWatcher:
+    """Watcher driven by OS file notifications via watchdog.
+
+    Only the paths named by events are examined, so the cost of a batch is
+    proportional to the number of changed files rather than the project size.
+    """
+
+    def __init__(self, project_root: str, debounce: float = 0.2):
+        """
+        Initialize the native watcher.
+
+        Args:
+            project_root: Root directory of the project
+            debounce: Seconds to wait for a burst of events to settle
+        """
+        if not WATCHDOG_AVAILABLE:
+            raise ImportError(
+                "Native file watching requires watchdog: pip install watchdog"
+            )
+        if debounce < 0:
+            raise ValueError(f"debounce must not be negative, got {debounce}")
+        self.project_root = os.path.abspath(project_root)
+        self.debounce = debounce
+        self._rules: Optional[ProjectIgnoreRules] = None
+        self._known: Set[str] = set()
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._observer: Optional[Any] = None
+
+    def start(self) -> None:
+        """Record the current project files and start the observer."""
+        self._rules = ProjectIgnoreRules(self.project_root)
+        self._known = set(get_project_files(self.project_root))
+
+        handler = _PathCollector(self._on_path)
+        observer = Observer()
+        observer.schedule(handler, self.project_root, recursive=True)
+        observer.start()
+        self._observer = observer
+
+    def stop(self) -> None:
+        """Stop the observer."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _on_path(self, path: str) -> None:
+        with self._lock:
+            self._pending.add(path)
+        self._event.set()
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> List[FileChange]:
+        """Block until files change or the timeout expires.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Changes detected, empty if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return []
+            if not self._event.wait(remaining):
+                return []
+
+            # Let editors finish their write/rename sequence
+            time.sleep(self.debounce)
+            with self._lock:
+                paths = self._pending
+                self._pending = set()
+                self._event.clear()
+
+            changes = self._classify(paths)
+            if changes:
+                return changes
+
+    def _classify(self, paths: Iterable[str]) -> List[FileChange]:
+        changes: Dict[str, ChangeKind] = {}
+        paths = sorted(set(paths))
+        rules_changed = any(
+            os.path.basename(path) in (".gitignore", "exclude") for path in paths
+        )
+        if self._rules is None or rules_changed:
+            # Ignore rules changed: reload them for the new and modified files
+            self._rules = ProjectIgnoreRules(self.project_root)
+
+        for path in paths:
+            if os.path.isdir(path):
+                # A directory created or moved in: pick up its files
+                prefix = path.rstrip(os.sep) + os.sep
+                for root, _, filenames in os.walk(path):
+                    for filename in filenames:
+                        file_path = os.path.join(root, filename)
+                        if file_path.startswith(prefix):
+                            self._record(file_path, changes)
+            elif os.path.exists(path):
+                self._record(path, changes)
+            elif path in self._known:
+                self._known.discard(path)
+                changes[path] = "deleted"
+            else:
+                # A directory removed or moved out: drop everything under it
+                prefix = path.rstrip(os.sep) + os.sep
+                for known in [p for p in self._known if p.startswith(prefix)]:
+                    self._known.discard(known)
+                    changes[known] = "deleted"
+
+        if rules_changed:
+            # Untouched files may have become ignored or un-ignored
+            current = set(iter_project_files(self.project_root, rules=self._rules))
+            for path in self._known - current:
+                changes[path] = "deleted"
+            for path in current - self._known:
+                changes[path] = "created"
+            self._known = current
+
+        return [FileChange(path, kind) for path, kind in changes.items()]
+
+    def _record(self, path: str, changes: Dict[str, ChangeKind]) -> None:
+        if not is_project_file(path, self.project_root, self._rules):
+            return
+        if path in self._known:
+            changes[path] = "modified"
+        else:
+            self._known.add(path)
+            changes[path] = "created"
+
+
+if WATCHDOG_AVAILABLE:
+
+    class _PathCollector(FileSystemEventHandler):
+        """Forward every path named by a filesystem event."""
+
+        def __init__(self, callback: Callable[[str], None]) -> None:
+            super().__init__()
+            self._callback = callback
+
+        def on_any_event(self, event: FileSystemEvent) -> None:
+            if event.event_type in ("opened", "closed_no_write"):
+                return
+            # A directory "modified" event only echoes changes to its entries
+            if event.is_directory and event.event_type == "modified":
+                return
+            self._callback(os.fsdecode(event.src_path))
+            dest_path = getattr(event, "dest_path", "")
+            if dest_path:
+                self._callback(os.fsdecode(dest_path))
+
+
+def create_file_watcher(
+    project_root: str, backend: str = "auto", interval: float = 1.0
+) -> Union[PollingWatcher, NativeWatcher]:
+    """Create a watcher for a project.
+
+    Args:
+        project_root: Root directory of the project
+        backend: "native", "polling", or "auto" to prefer native when
+            watchdog is installed
+        interval: Polling interval in seconds (polling backend only)
+
+    Returns:
+        An unstarted watcher
+    """
+    if backend not in WATCH_BACKENDS:
+        raise ValueError(
+            f"Unknown watch backend {backend!r}; expected one of {WATCH_BACKENDS}"
+        )
+    if backend == "native" or (backend == "auto" and WATCHDOG_AVAILABLE):
+        return NativeWatcher(project_root)
+    if backend == "auto":
+        logger.info("watchdog is not installed, falling back to polling")
+    return PollingWatcher(project_root, interval=interval)
+
+
+def run_watch_loop(
+    watcher: Union[PollingWatcher, NativeWatcher],
+    on_changes: Callable[[List[FileChange]], Any],
+    stop_event: Optional[threading.Event] = None,
+    poll_timeout: float = 1.0,
+) -> None:
+    """Start a watcher and pass each batch of changes to a callback.
+
+    Args:
+        watcher: Unstarted watcher from create_file_watcher
+        on_changes: Called with every non-empty batch of changes
+        stop_event: Ends the loop once set (runs until interrupted if None)
+        poll_timeout: Seconds between checks of stop_event
+    """
+    watcher.start()
+    try:
+        while stop_event is None or not stop_event.is_set():
+            changes = watcher.wait_for_changes(timeout=poll_timeout)
+            if changes:
+                on_changes(changes)
+    finally:
+        watcher.stop()
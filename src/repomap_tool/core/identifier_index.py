@@ -0,0 +1,109 @@
+"""
+Inverted index from identifier names to their locations.
+
+Search matches over distinct identifier names and then needs a file and line
+for every result. An IdentifierIndex answers that with one dictionary lookup
+per result, and keeps every definition and reference location of a name, not
+only the first one seen.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from ..code_analysis.models import CodeTag
+
+
+class IdentifierLocation(NamedTuple):
+    """Where an identifier occurs."""
+
+    file: str
+    line: Optional[int]
+    kind: str
+
+    @property
+    def is_definition(self) -> bool:
+        """Whether the tag defines the identifier (e.g. name.definition.class)."""
+        return "definition" in self.kind
+
+
+class IdentifierIndex:
+    """Identifier name -> definition and reference locations.
+
+    Locations are kept per file so a changed file can be replaced without
+    rebuilding the index. Definitions are stored ahead of references, so
+    ``primary_location`` is a constant-time lookup.
+    """
+
+    def __init__(self) -> None:
+        # name -> (definitions, references)
+        self._locations: Dict[
+            str, Tuple[List[IdentifierLocation], List[IdentifierLocation]]
+        ] = {}
+        # file -> names with a location in it
+        self._names_by_file: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_tags(cls, tags_by_file: Dict[str, List[CodeTag]]) -> "IdentifierIndex":
+        """Build an index from each file's tags."""
+        index = cls()
+        for file_path, tags in tags_by_file.items():
+            index.replace_file(file_path, tags)
+        return index
+
+    @property
+    def identifiers(self) -> List[str]:
+        """Distinct identifier names."""
+        return list(self._locations)
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._locations
+
+    def add(self, file_path: str, name: str, location: IdentifierLocation) -> None:
+        """Record one location of an identifier found in file_path."""
+        if not name:
+            return
+        definitions, references = self._locations.setdefault(name, ([], []))
+        (definitions if location.is_definition else references).append(location)
+        self._names_by_file.setdefault(file_path, set()).add(name)
+
+    def replace_file(self, file_path: str, tags: Optional[Iterable[CodeTag]]) -> None:
+        """Replace the locations contributed by one file.
+
+        Args:
+            file_path: File whose locations are replaced
+            tags: The file's current tags, or None if the file was removed
+        """
+        self.remove_file(file_path)
+        for tag in tags or ():
+            self.add(
+                file_path, tag.name, IdentifierLocation(file_path, tag.line, tag.kind)
+            )
+
+    def remove_file(self, file_path: str) -> None:
+        """Drop every location contributed by a file."""
+        for name in self._names_by_file.pop(file_path, ()):
+            definitions, references = self._locations[name]
+            definitions[:] = [loc for loc in definitions if loc.file != file_path]
+            references[:] = [loc for loc in references if loc.file != file_path]
+            if not definitions and not references:
+                del self._locations[name]
+
+    def locations(self, name: str) -> List[IdentifierLocation]:
+        """All locations of an identifier, definitions first."""
+        entry = self._locations.get(name)
+        if entry is None:
+            return []
+        return entry[0] + entry[1]
+
+    def primary_location(self, name: str) -> Optional[IdentifierLocation]:
+        """The location to report for an identifier: its first definition,
+        or its first reference if it is never defined in the project."""
+        entry = self._locations.get(name)
+        if entry is None:
+            return None
+        definitions, references = entry
+        if definitions:
+            return definitions[0]
+        return references[0] if references else None
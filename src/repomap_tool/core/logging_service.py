@@ -6,6 +6,7 @@ eliminating duplicate logger setup across the codebase.
 """
 
 import logging
+import os
 import sys
 from typing import Optional, Dict, Any
 from pathlib import Path
@@ -15,6 +16,23 @@ _logging_configured = False
 _logger_cache: Dict[str, logging.Logger] = {}
 
 
+def _quiet_transformers() -> None:
+    """Limit transformers to errors without importing it.
+
+    Importing transformers takes seconds and loads torch, which only the
+    sentence-transformers embedding backend needs. It reads
+    TRANSFORMERS_VERBOSITY when it is first imported.
+    """
+    os.environ.setdefault("TRANSFORMERS_VERBOSITY", "error")
+    transformers = sys.modules.get("transformers")
+    if transformers is not None:
+        transformers.logging.set_verbosity_error()
+
+    # Set specific transformers loggers
+    transformers_logger = logging.getLogger("transformers_modules")
+    transformers_logger.setLevel(logging.ERROR)
+
+
 class LoggingService:
     """Centralized logging service for RepoMap-Tool."""
 
@@ -101,38 +119,20 @@ class LoggingService:
         import logging
 
         # Configure transformers library
-        try:
-            import transformers
-
-            transformers.logging.set_verbosity_error()
+        _quiet_transformers()
 
-            # Set specific transformers loggers
-            transformers_logger = logging.getLogger("transformers_modules")
-            transformers_logger.setLevel(logging.ERROR)
+        # Configure sentence_transformers library (by logger name: importing
+        # it would load torch)
+        st_logger = logging.getLogger("sentence_transformers")
+        st_logger.setLevel(logging.ERROR)
 
-        except ImportError:
-            pass
-
-        # Configure sentence_transformers library
-        try:
-            import sentence_transformers
+        # Also suppress the specific SentenceTransformer logger
+        st_model_logger = logging.getLogger("sentence_transformers.SentenceTransformer")
+        st_model_logger.setLevel(logging.ERROR)
 
-            # Set sentence_transformers logger to ERROR level
-            st_logger = logging.getLogger("sentence_transformers")
-            st_logger.setLevel(logging.ERROR)
-
-            # Also suppress the specific SentenceTransformer logger
-            st_model_logger = logging.getLogger(
-                "sentence_transformers.SentenceTransformer"
-            )
-            st_model_logger.setLevel(logging.ERROR)
-
-            # Suppress any other sentence_transformers related loggers
-            st_util_logger = logging.getLogger("sentence_transformers.util")
-            st_util_logger.setLevel(logging.ERROR)
-
-        except ImportError:
-            pass
+        # Suppress any other sentence_transformers related loggers
+        st_util_logger = logging.getLogger("sentence_transformers.util")
+        st_util_logger.setLevel(logging.ERROR)
 
     def get_logger(self, name: str) -> logging.Logger:
         """Get a logger instance for the specified name.
@@ -334,31 +334,15 @@ def _suppress_external_library_logs() -> None:
     import logging
 
     # Configure transformers library
-    try:
-        import transformers
-
-        transformers.logging.set_verbosity_error()
-
-        # Set specific transformers loggers
-        transformers_logger = logging.getLogger("transformers_modules")
-        transformers_logger.setLevel(logging.ERROR)
-
-    except ImportError:
-        pass
+    _quiet_transformers()
 
     # Configure sentence-transformers library
-    try:
-        import sentence_transformers
-
-        sentence_transformers_logger = logging.getLogger("sentence_transformers")
-        sentence_transformers_logger.setLevel(logging.WARNING)
-
-        # Also configure the specific SentenceTransformer logger
-        st_logger = logging.getLogger("sentence_transformers.SentenceTransformer")
-        st_logger.setLevel(logging.WARNING)
+    sentence_transformers_logger = logging.getLogger("sentence_transformers")
+    sentence_transformers_logger.setLevel(logging.WARNING)
 
-    except ImportError:
-        pass
+    # Also configure the specific SentenceTransformer logger
+    st_logger = logging.getLogger("sentence_transformers.SentenceTransformer")
+    st_logger.setLevel(logging.WARNING)
 
     # Configure other external libraries
     external_loggers = ["torch", "numpy", "scipy", "sklearn", "networkx"]
@@ -5,12 +5,32 @@ This module provides sophisticated parallel processing capabilities with
 progress tracking, error handling, and performance monitoring.
 """
 
+import multiprocessing
+import os
+import queue
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 import logging
 
 from .config_service import get_config
@@ -27,6 +47,181 @@ from rich.console import Console
 
 from ..exceptions import ParallelProcessingError
 
+EXECUTOR_TYPES = ("thread", "process")
+DEFAULT_CHUNK_SIZE = 32
+DEFAULT_QUEUE_SIZE = 256
+
+# Stages of the streaming indexing pipeline (see run_pipeline)
+PIPELINE_STAGES = ("discover", "parse", "write")
+
+# How often a stage blocked on a queue checks whether the pipeline stopped
+_QUEUE_POLL_INTERVAL = 0.1
+
+# Queue marker: the producing stage has no more items
+_END = object()
+
+# Compact tag row sent back from worker processes:
+# (name, kind, line, column, end_line, end_column, comment)
+TagRow = Tuple[str, str, int, int, Optional[int], Optional[int], Optional[str]]
+
+# Per-process parser, created once by the pool initializer so its tree-sitter
+# parsers and compiled queries stay warm across chunks
+_worker_parser: Optional[Any] = None
+
+
+def worker_context() -> Any:
+    """Start method for parse worker processes.
+
+    Pools are created while other threads may hold locks (SQLite
+    connections, logging handlers), and a forked child would inherit them
+    locked, so workers come from a forkserver, or are spawned where there
+    is none.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def chunk_files(files: List[str], chunk_size: int) -> List[List[str]]:
+    """Split a file list into consecutive chunks of at most chunk_size."""
+    return [files[i : i + chunk_size] for i in range(0, len(files), chunk_size)]
+
+
+def pack_tags(tags: List[Any]) -> List[TagRow]:
+    """Convert CodeTag objects to compact tuples for inter-process transfer."""
+    return [
+        (
+            tag.name,
+            tag.kind,
+            tag.line,
+            tag.column,
+            tag.end_line,
+            tag.end_column,
+            tag.comment,
+        )
+        for tag in tags
+    ]
+
+
+def unpack_tags(file_path: str, rows: List[TagRow]) -> List[Any]:
+    """Rebuild CodeTag objects for a file from compact tuples."""
+    from ..code_analysis.models import CodeTag
+
+    return [
+        CodeTag(
+            name=name,
+            kind=kind,
+            file=file_path,
+            line=line,
+            column=column,
+            end_line=end_line,
+            end_column=end_column,
+            comment=comment,
+        )
+        for name, kind, line, column, end_line, end_column, comment in rows
+    ]
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Yield consecutive lists of at most size items from any iterable."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class _PipelineStopped(Exception):
+    """Raised in a pipeline stage when another stage failed."""
+
+
+def _put(q: "queue.Queue[Any]", item: Any, stop: threading.Event) -> float:
+    """Put an item on a bounded queue, waiting for room.
+
+    Returns:
+        Seconds spent waiting for room (backpressure)
+
+    Raises:
+        _PipelineStopped: If the pipeline stopped while waiting
+    """
+    start = time.perf_counter()
+    while True:
+        try:
+            q.put(item, timeout=_QUEUE_POLL_INTERVAL)
+            return time.perf_counter() - start
+        except queue.Full:
+            if stop.is_set():
+                raise _PipelineStopped()
+
+
+def _take(q: "queue.Queue[Any]", stop: threading.Event) -> Tuple[Any, float]:
+    """Take an item from a queue, waiting for one.
+
+    Returns:
+        Tuple of (item, seconds spent waiting for it)
+
+    Raises:
+        _PipelineStopped: If the pipeline stopped while waiting
+    """
+    start = time.perf_counter()
+    while True:
+        try:
+            return q.get(timeout=_QUEUE_POLL_INTERVAL), time.perf_counter() - start
+        except queue.Empty:
+            if stop.is_set():
+                raise _PipelineStopped()
+
+
+def _init_parse_worker(project_root: str, extract_comments: bool = True) -> None:
+    """Pool initializer: create this worker process's parser."""
+    global _worker_parser
+    from ..code_analysis.tree_sitter_parser import TreeSitterParser
+
+    _worker_parser = TreeSitterParser(
+        project_root=project_root, extract_comments=extract_comments
+    )
+
+
+def _parse_chunk(
+    file_paths: List[str],
+) -> Tuple[int, float, List[Tuple[str, Optional[List[TagRow]], Optional[str]]]]:
+    """Parse a chunk of files in a worker process.
+
+    Returns:
+        Tuple of (worker pid, elapsed seconds,
+        [(file_path, tag rows or None, error or None)])
+    """
+    if _worker_parser is None:
+        raise ParallelProcessingError("Worker process parser was not initialized")
+
+    start_time = time.time()
+    results: List[Tuple[str, Optional[List[TagRow]], Optional[str]]] = []
+    for file_path in file_paths:
+        try:
+            tags = _worker_parser.parse_file(file_path)
+            results.append((file_path, pack_tags(tags), None))
+        except Exception as e:
+            results.append((file_path, None, str(e)))
+    return os.getpid(), time.time() - start_time, results
+
+
+@dataclass
+class StageStats:
+    """Counters for one stage of the streaming indexing pipeline."""
+
+    items: int = 0
+    busy_time: float = 0.0  # seconds spent working, summed over workers
+    idle_time: float = 0.0  # seconds spent waiting for input
+    blocked_time: float = 0.0  # seconds spent waiting for room downstream
+
+    @property
+    def items_per_second(self) -> float:
+        """Items handled per second of work (per worker for parallel stages)."""
+        if self.busy_time == 0:
+            return 0.0
+        return self.items / self.busy_time
+
 
 @dataclass
 class ProcessingStats:
@@ -36,12 +231,14 @@ class ProcessingStats:
     processed_files: int = 0
     successful_files: int = 0
     failed_files: int = 0
+    cached_files: int = 0
     total_identifiers: int = 0
     start_time: float = field(default_factory=time.time)
     end_time: Optional[float] = None
     errors: List[Tuple[str, str]] = field(
         default_factory=list
     )  # (file_path, error_message)
+    stages: Dict[str, StageStats] = field(default_factory=dict)
 
     @property
     def processing_time(self) -> float:
@@ -73,6 +270,28 @@ class ProcessingStats:
         self.successful_files += 1
         self.total_identifiers += identifiers_count
 
+    def add_stage(
+        self,
+        name: str,
+        items: int = 0,
+        busy_time: float = 0.0,
+        idle_time: float = 0.0,
+        blocked_time: float = 0.0,
+    ) -> None:
+        """Add work done by one worker of a pipeline stage."""
+        stage = self.stages.setdefault(name, StageStats())
+        stage.items += items
+        stage.busy_time += busy_time
+        stage.idle_time += idle_time
+        stage.blocked_time += blocked_time
+
+    def stage_throughput(self, name: str) -> float:
+        """Get the items per wall-clock second a pipeline stage handled."""
+        stage = self.stages.get(name)
+        if stage is None or self.processing_time == 0:
+            return 0.0
+        return stage.items / self.processing_time
+
     def finalize(self) -> None:
         """Finalize the statistics."""
         self.end_time = time.time()
@@ -92,6 +311,10 @@ class ParallelTagExtractor:
         max_workers: Optional[int] = None,
         enable_progress: bool = True,
         console: Optional[Console] = None,
+        executor: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        extract_comments: Optional[bool] = None,
+        queue_size: Optional[int] = None,
     ):
         """
         Initialize the parallel tag extractor.
@@ -100,11 +323,30 @@ class ParallelTagExtractor:
             max_workers: Maximum number of worker threads (default: from config)
             enable_progress: Whether to show progress bars
             console: Rich console for progress display
+            executor: "thread" (default) or "process" to parse in worker processes
+            chunk_size: Files sent to a worker process per task
+            extract_comments: Whether parsed tags get their nearby comments
+            queue_size: Capacity of each queue between pipeline stages
         """
         # Use config default if not provided
         if max_workers is None:
             max_workers = get_config("MAX_WORKERS", 4)
+        executor = executor or "thread"
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"Invalid executor: {executor}. Must be one of {EXECUTOR_TYPES}"
+            )
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        queue_size = queue_size or DEFAULT_QUEUE_SIZE
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be positive, got {queue_size}")
         self.max_workers = max_workers
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.extract_comments = extract_comments is not False
         self.enable_progress = enable_progress
         if console is None:
             raise ValueError("Console must be injected - no fallback allowed")
@@ -125,6 +367,7 @@ class ParallelTagExtractor:
         project_root: str,
         repo_map: Any,
         progress_callback: Optional[Callable[[str, int], None]] = None,
+        tag_cache: Optional[Any] = None,
     ) -> Tuple[List[str], ProcessingStats]:
         """
         Extract tags from files in parallel with comprehensive monitoring.
@@ -134,6 +377,8 @@ class ParallelTagExtractor:
             project_root: Root directory of the project
             repo_map: Repository map object for tag extraction
             progress_callback: Optional callback for progress updates
+            tag_cache: TreeSitterTagCache the process executor reads and fills
+                (default: a cache in ~/.repomap-tool/cache)
 
         Returns:
             Tuple of (identifiers, processing_stats)
@@ -158,76 +403,655 @@ class ParallelTagExtractor:
                     total=len(files),
                 )
 
-            # Process files in parallel
+            # Worker processes cannot share repo_map, so it keeps the thread path
+            if self.executor == "process" and repo_map is None:
+                self._extract_tags_with_processes(
+                    files,
+                    project_root,
+                    tag_cache,
+                    all_identifiers,
+                    progress,
+                    task_id,
+                    progress_callback,
+                )
+            else:
+                self._extract_tags_with_threads(
+                    files,
+                    project_root,
+                    repo_map,
+                    all_identifiers,
+                    progress,
+                    task_id,
+                    progress_callback,
+                )
+
+        # Finalize statistics
+        self._stats.finalize()
+
+        # Log final statistics
+        self._log_processing_summary()
+
+        return all_identifiers, self._stats
+
+    def _extract_tags_with_threads(
+        self,
+        files: List[str],
+        project_root: str,
+        repo_map: Any,
+        all_identifiers: List[str],
+        progress: Optional[Progress],
+        task_id: Any,
+        progress_callback: Optional[Callable[[str, int], None]],
+    ) -> None:
+        """Extract identifiers with a thread pool, one task per file."""
+        # Process files in parallel
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Submit all file processing tasks
+            future_to_file = {
+                executor.submit(
+                    self._process_file_with_monitoring,
+                    file_path,
+                    project_root,
+                    repo_map,
+                ): file_path
+                for file_path in files
+            }
+
+            # Collect results as they complete
+            for future in as_completed(future_to_file):
+                file_path = future_to_file[future]
+                worker_id = threading.current_thread().ident or 0
+
+                try:
+                    start_time = time.time()
+                    identifiers = future.result()
+                    processing_time = time.time() - start_time
+
+                    # Update statistics
+                    with self._lock:
+                        all_identifiers.extend(identifiers)
+                        self._stats.add_success(len(identifiers))
+                        self._stats.processed_files += 1
+
+                        # Track worker performance
+                        if worker_id not in self._worker_times:
+                            self._worker_times[worker_id] = []
+                        self._worker_times[worker_id].append(processing_time)
+
+                    # Update progress
+                    if progress and task_id:
+                        progress.update(task_id, advance=1)
+
+                    # Call progress callback
+                    if progress_callback:
+                        progress_callback(file_path, len(identifiers))
+
+                    # Log successful processing
+                    self.logger.debug(
+                        f"Processed {file_path}: {len(identifiers)} identifiers "
+                        f"({processing_time:.3f}s)"
+                    )
+
+                except Exception as e:
+                    error_msg = str(e)
+                    with self._lock:
+                        self._stats.add_error(file_path, error_msg)
+                        self._stats.processed_files += 1
+
+                    # Log error
+                    self.logger.warning(f"Failed to process {file_path}: {error_msg}")
+
+                    # Update progress even for failures
+                    if progress and task_id:
+                        progress.update(task_id, advance=1)
+
+    def _extract_tags_with_processes(
+        self,
+        files: List[str],
+        project_root: str,
+        tag_cache: Optional[Any],
+        all_identifiers: List[str],
+        progress: Optional[Progress],
+        task_id: Any,
+        progress_callback: Optional[Callable[[str, int], None]],
+    ) -> None:
+        """Extract identifiers with worker processes, writing tags in this process.
+
+        Files already valid in the tag cache are served from it; only the misses
+        are sent to the pool, and their tags are stored here in batched writes.
+        A cache is only created (and closed afterwards) when none is given.
+        """
+        from .tag_cache import TreeSitterTagCache
+
+        abs_files = [str(Path(project_root) / file_path) for file_path in files]
+        owns_cache = tag_cache is None
+        if tag_cache is None:
+            tag_cache = TreeSitterTagCache(Path.home() / ".repomap-tool" / "cache")
+
+        def record(
+            file_path: str, tags: Optional[List[Any]], error: Optional[str]
+        ) -> None:
+            self._stats.processed_files += 1
+            if error is not None or tags is None:
+                self._stats.add_error(file_path, error or "no tags returned")
+                self.logger.warning(f"Failed to process {file_path}: {error}")
+            else:
+                identifiers = [tag.name for tag in tags if tag.name]
+                all_identifiers.extend(identifiers)
+                self._stats.add_success(len(identifiers))
+                if progress_callback:
+                    progress_callback(file_path, len(identifiers))
+
+            if progress and task_id:
+                progress.update(task_id, advance=1)
+
+        try:
+            cached = tag_cache.get_tags_bulk(abs_files)
+            for file_path, cached_tags in cached.items():
+                record(file_path, cached_tags, None)
+
+            misses = [file_path for file_path in abs_files if file_path not in cached]
+            with tag_cache.batched_writes():
+                for file_path, tags, error in self.iter_file_tags(misses, project_root):
+                    if tags is not None:
+                        tag_cache.set_tags(file_path, tags)
+                    record(file_path, tags, error)
+        finally:
+            if owns_cache:
+                tag_cache.close()
+
+    def iter_file_tags(
+        self, files: List[str], project_root: str
+    ) -> Iterator[Tuple[str, Optional[List[Any]], Optional[str]]]:
+        """Parse files with the configured executor, yielding results as they finish.
+
+        With the process executor, files are sent to workers in chunks of
+        ``chunk_size``; each worker keeps a warm TreeSitterParser and returns
+        compact tag rows. Nothing is written to the tag cache here.
+
+        Args:
+            files: Absolute file paths to parse
+            project_root: Root directory of the project
+
+        Yields:
+            Tuples of (file_path, tags or None, error message or None)
+        """
+        if not files:
+            return
+
+        if self.executor == "process":
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=worker_context(),
+                initializer=_init_parse_worker,
+                initargs=(project_root, self.extract_comments),
+            ) as executor:
+                future_to_chunk = {
+                    executor.submit(_parse_chunk, chunk): chunk
+                    for chunk in chunk_files(files, self.chunk_size)
+                }
+                for chunk_future in as_completed(future_to_chunk):
+                    chunk = future_to_chunk[chunk_future]
+                    try:
+                        worker_id, elapsed, results = chunk_future.result()
+                    except Exception as e:
+                        for file_path in chunk:
+                            yield file_path, None, str(e)
+                        continue
+
+                    with self._lock:
+                        self._worker_times.setdefault(worker_id, []).extend(
+                            [elapsed / len(chunk)] * len(chunk)
+                        )
+                    for file_path, rows, error in results:
+                        tags = (
+                            unpack_tags(file_path, rows) if rows is not None else None
+                        )
+                        yield file_path, tags, error
+        else:
+            from ..code_analysis.tree_sitter_parser import TreeSitterParser
+
+            # Parsers and compiled queries are cached per thread
+            parser = TreeSitterParser(
+                project_root=project_root, extract_comments=self.extract_comments
+            )
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all file processing tasks
                 future_to_file = {
-                    executor.submit(
-                        self._process_file_with_monitoring,
-                        file_path,
-                        project_root,
-                        repo_map,
-                    ): file_path
+                    executor.submit(parser.parse_file, file_path): file_path
                     for file_path in files
                 }
-
-                # Collect results as they complete
                 for future in as_completed(future_to_file):
                     file_path = future_to_file[future]
-                    worker_id = threading.current_thread().ident or 0
-
                     try:
-                        start_time = time.time()
-                        identifiers = future.result()
-                        processing_time = time.time() - start_time
-
-                        # Update statistics
-                        with self._lock:
-                            all_identifiers.extend(identifiers)
-                            self._stats.add_success(len(identifiers))
-                            self._stats.processed_files += 1
-
-                            # Track worker performance
-                            if worker_id not in self._worker_times:
-                                self._worker_times[worker_id] = []
-                            self._worker_times[worker_id].append(processing_time)
-
-                        # Update progress
-                        if progress and task_id:
-                            progress.update(task_id, advance=1)
-
-                        # Call progress callback
-                        if progress_callback:
-                            progress_callback(file_path, len(identifiers))
-
-                        # Log successful processing
-                        self.logger.debug(
-                            f"Processed {file_path}: {len(identifiers)} identifiers "
-                            f"({processing_time:.3f}s)"
-                        )
-
+                        yield file_path, future.result(), None
                     except Exception as e:
-                        error_msg = str(e)
-                        with self._lock:
-                            self._stats.add_error(file_path, error_msg)
-                            self._stats.processed_files += 1
-
-                        # Log error
-                        self.logger.warning(
-                            f"Failed to process {file_path}: {error_msg}"
-                        )
+                        yield file_path, None, str(e)
 
-                        # Update progress even for failures
-                        if progress and task_id:
-                            progress.update(task_id, advance=1)
+    def populate_tag_cache(
+        self, files: List[str], project_root: str, tag_cache: Any
+    ) -> ProcessingStats:
+        """Parse files with the configured executor and store their tags.
+
+        Tags are written by the calling process, so wrap this in
+        ``tag_cache.batched_writes()`` to group the inserts.
+
+        Args:
+            files: Absolute file paths to parse
+            project_root: Root directory of the project
+            tag_cache: TreeSitterTagCache receiving the tags
+
+        Returns:
+            ProcessingStats for the run
+        """
+        self._stats = ProcessingStats(total_files=len(files))
+
+        progress_context = (
+            self._create_progress_context() if self.enable_progress else nullcontext()
+        )
+        with progress_context as progress:
+            task_id = None
+            if progress:
+                task_id = progress.add_task(
+                    f"Parsing {len(files)} files with {self.max_workers} "
+                    f"{self.executor} workers...",
+                    total=len(files),
+                )
+
+            for file_path, tags, error in self.iter_file_tags(files, project_root):
+                self._stats.processed_files += 1
+                if error is not None or tags is None:
+                    self._stats.add_error(file_path, error or "no tags returned")
+                else:
+                    tag_cache.set_tags(file_path, tags)
+                    self._stats.add_success(len(tags))
+
+                if progress and task_id:
+                    progress.update(task_id, advance=1)
 
-        # Finalize statistics
         self._stats.finalize()
+        self._log_processing_summary()
+        return self._stats
+
+    def run_pipeline(
+        self,
+        files: Iterable[str],
+        project_root: str,
+        tag_cache: Any,
+        on_tags: Optional[Callable[[str, List[Any]], None]] = None,
+        show_progress: Optional[bool] = None,
+    ) -> ProcessingStats:
+        """Stream files through discovery, parsing and cache writes.
+
+        The stages run concurrently and hand files on through queues of at
+        most ``queue_size`` entries:
+
+        - discover checks files against the tag cache in batches of
+          ``chunk_size`` and passes on only those that must be parsed
+        - parse runs ``max_workers`` threads, or worker processes fed in
+          chunks, over those files
+        - write stores the tags on the calling thread; it is the only stage
+          that writes to the tag cache
+
+        A stage that gets ahead waits for room in its output queue, so memory
+        use is bounded by the queue sizes instead of the number of files. Tags
+        are written with ``tag_cache.set_tags``; wrap the call in
+        ``tag_cache.batched_writes()`` to group the inserts.
+
+        Args:
+            files: Absolute file paths to index, possibly a lazy iterator
+            project_root: Root directory of the project
+            tag_cache: TreeSitterTagCache checked and filled by the pipeline
+            on_tags: Called on the calling thread with (file_path, tags) for
+                every file. Cached tags are then read in batches and passed on
+                too, instead of only being validated.
+            show_progress: Show a progress bar once a file needs parsing
+                (default: ``enable_progress``)
+
+        Returns:
+            ProcessingStats with per-stage counters in ``stages``
+        """
+        stats = ProcessingStats()
+        self._stats = stats
+        parse_queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        write_queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        failures: List[BaseException] = []
+
+        def run_stage(target: Callable[..., None], *args: Any) -> None:
+            try:
+                target(*args)
+            except _PipelineStopped:
+                pass
+            except BaseException as e:
+                failures.append(e)
+                stop.set()
+
+        if self.executor == "process":
+            parse_stages: List[Tuple[Callable[..., None], Tuple[Any, ...]]] = [
+                (
+                    self._parse_stage_processes,
+                    (project_root, parse_queue, write_queue, stop),
+                )
+            ]
+        else:
+            from ..code_analysis.tree_sitter_parser import TreeSitterParser
+
+            # Parsers and compiled queries are cached per thread
+            parser = TreeSitterParser(
+                project_root=project_root, extract_comments=self.extract_comments
+            )
+            parse_stages = [
+                (self._parse_stage_threads, (parser, parse_queue, write_queue, stop))
+            ] * self.max_workers
+
+        threads = [
+            threading.Thread(
+                target=run_stage,
+                args=(
+                    self._discover_stage,
+                    files,
+                    tag_cache,
+                    on_tags is not None,
+                    parse_queue,
+                    write_queue,
+                    len(parse_stages),
+                    stop,
+                ),
+                name="repomap-pipeline-discover",
+                daemon=True,
+            )
+        ]
+        threads.extend(
+            threading.Thread(
+                target=run_stage,
+                args=(target, *args),
+                name=f"repomap-pipeline-parse-{i}",
+                daemon=True,
+            )
+            for i, (target, args) in enumerate(parse_stages)
+        )
+
+        for thread in threads:
+            thread.start()
+        try:
+            self._write_stage(
+                tag_cache,
+                on_tags,
+                write_queue,
+                len(parse_stages),
+                stop,
+                self.enable_progress if show_progress is None else show_progress,
+                len(files) if isinstance(files, (list, tuple)) else None,
+            )
+        except _PipelineStopped:
+            pass
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        stats.finalize()
+        if failures:
+            raise ParallelProcessingError(
+                f"Indexing pipeline failed: {failures[0]}"
+            ) from failures[0]
 
-        # Log final statistics
         self._log_processing_summary()
+        return stats
 
-        return all_identifiers, self._stats
+    def _discover_stage(
+        self,
+        files: Iterable[str],
+        tag_cache: Any,
+        load_cached: bool,
+        parse_queue: "queue.Queue[Any]",
+        write_queue: "queue.Queue[Any]",
+        consumers: int,
+        stop: threading.Event,
+    ) -> None:
+        """Pipeline stage: queue the files whose cached tags are missing or stale."""
+        counters = StageStats()
+        try:
+            for batch in _batched(files, self.chunk_size):
+                start_time = time.perf_counter()
+                # Read-only, so every database write stays on the write stage
+                if load_cached:
+                    cached = tag_cache.get_tags_bulk(batch, read_only=True)
+                else:
+                    cached = dict.fromkeys(
+                        tag_cache.get_valid_files(batch, read_only=True)
+                    )
+                counters.busy_time += time.perf_counter() - start_time
+                counters.items += len(batch)
+                with self._lock:
+                    self._stats.total_files += len(batch)
+                    self._stats.cached_files += len(cached)
+                    self._stats.processed_files += len(cached)
+                    self._stats.successful_files += len(cached)
+
+                for file_path in batch:
+                    if file_path not in cached:
+                        counters.blocked_time += _put(parse_queue, file_path, stop)
+                    elif load_cached:
+                        counters.blocked_time += _put(
+                            write_queue,
+                            (file_path, cached[file_path], None, True),
+                            stop,
+                        )
+        finally:
+            with self._lock:
+                self._stats.add_stage(
+                    "discover",
+                    counters.items,
+                    counters.busy_time,
+                    counters.idle_time,
+                    counters.blocked_time,
+                )
+
+        for _ in range(consumers):
+            _put(parse_queue, _END, stop)
+
+    def _parse_stage_threads(
+        self,
+        parser: Any,
+        parse_queue: "queue.Queue[Any]",
+        write_queue: "queue.Queue[Any]",
+        stop: threading.Event,
+    ) -> None:
+        """Pipeline stage: one parse worker thread."""
+        counters = StageStats()
+        try:
+            while True:
+                file_path, waited = _take(parse_queue, stop)
+                counters.idle_time += waited
+                if file_path is _END:
+                    break
+
+                start_time = time.perf_counter()
+                item: Tuple[str, Optional[List[Any]], Optional[str], bool]
+                try:
+                    item = (file_path, parser.parse_file(file_path), None, False)
+                except Exception as e:
+                    item = (file_path, None, str(e), False)
+                counters.busy_time += time.perf_counter() - start_time
+                counters.items += 1
+                counters.blocked_time += _put(write_queue, item, stop)
+        finally:
+            with self._lock:
+                self._stats.add_stage(
+                    "parse",
+                    counters.items,
+                    counters.busy_time,
+                    counters.idle_time,
+                    counters.blocked_time,
+                )
+
+        _put(write_queue, _END, stop)
+
+    def _parse_stage_processes(
+        self,
+        project_root: str,
+        parse_queue: "queue.Queue[Any]",
+        write_queue: "queue.Queue[Any]",
+        stop: threading.Event,
+    ) -> None:
+        """Pipeline stage: feed worker processes in chunks, forwarding results.
+
+        At most two chunks per worker are in flight; results are forwarded in
+        submission order.
+        """
+        counters = StageStats()
+        in_flight: Deque[Tuple[List[str], "Future[Any]"]] = deque()
+
+        def forward(chunk: List[str], future: "Future[Any]") -> None:
+            try:
+                worker_id, elapsed, results = future.result()
+            except Exception as e:
+                results = [(file_path, None, str(e)) for file_path in chunk]
+            else:
+                counters.busy_time += elapsed
+                with self._lock:
+                    self._worker_times.setdefault(worker_id, []).extend(
+                        [elapsed / len(chunk)] * len(chunk)
+                    )
+            counters.items += len(chunk)
+            for file_path, rows, error in results:
+                tags = unpack_tags(file_path, rows) if rows is not None else None
+                counters.blocked_time += _put(
+                    write_queue, (file_path, tags, error, False), stop
+                )
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=worker_context(),
+                initializer=_init_parse_worker,
+                initargs=(project_root, self.extract_comments),
+            ) as executor:
+                try:
+                    self._feed_processes(
+                        executor, parse_queue, in_flight, forward, stop
+                    )
+                finally:
+                    # Do not wait for queued chunks if the pipeline stopped
+                    for _, future in in_flight:
+                        future.cancel()
+        finally:
+            with self._lock:
+                self._stats.add_stage(
+                    "parse",
+                    counters.items,
+                    counters.busy_time,
+                    counters.idle_time,
+                    counters.blocked_time,
+                )
+
+        _put(write_queue, _END, stop)
+
+    def _feed_processes(
+        self,
+        executor: ProcessPoolExecutor,
+        parse_queue: "queue.Queue[Any]",
+        in_flight: Deque[Tuple[List[str], "Future[Any]"]],
+        forward: Callable[[List[str], "Future[Any]"], None],
+        stop: threading.Event,
+    ) -> None:
+        """Submit queued files to worker processes in chunks until the end marker."""
+        max_in_flight = self.max_workers * 2
+        chunk: List[str] = []
+        done = False
+        while not done:
+            try:
+                file_path = parse_queue.get(timeout=_QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                if stop.is_set():
+                    raise _PipelineStopped()
+                # Forward finished chunks while waiting for input
+                while in_flight and in_flight[0][1].done():
+                    forward(*in_flight.popleft())
+                continue
+
+            done = file_path is _END
+            if not done:
+                chunk.append(file_path)
+            if chunk and (done or len(chunk) >= self.chunk_size):
+                if len(in_flight) >= max_in_flight:
+                    forward(*in_flight.popleft())
+                in_flight.append((chunk, executor.submit(_parse_chunk, chunk)))
+                chunk = []
+
+        while in_flight:
+            forward(*in_flight.popleft())
+
+    def _write_stage(
+        self,
+        tag_cache: Any,
+        on_tags: Optional[Callable[[str, List[Any]], None]],
+        write_queue: "queue.Queue[Any]",
+        producers: int,
+        stop: threading.Event,
+        show_progress: bool,
+        total: Optional[int],
+    ) -> None:
+        """Pipeline stage: store parsed tags until every parse worker finished.
+
+        The progress bar is only started once a file had to be parsed, so a
+        run that finds everything cached stays quiet.
+        """
+        counters = StageStats()
+        progress_context: Any = None
+        progress: Optional[Progress] = None
+        task_id: Any = None
+        try:
+            while producers:
+                item, waited = _take(write_queue, stop)
+                counters.idle_time += waited
+                if item is _END:
+                    producers -= 1
+                    continue
+
+                file_path, tags, error, cached = item
+                start_time = time.perf_counter()
+                if cached:
+                    with self._lock:
+                        self._stats.total_identifiers += len(tags)
+                elif error is not None or tags is None:
+                    with self._lock:
+                        self._stats.processed_files += 1
+                        self._stats.add_error(file_path, error or "no tags returned")
+                    self.logger.debug(f"Failed to parse {file_path}: {error}")
+                else:
+                    tag_cache.set_tags(file_path, tags)
+                    with self._lock:
+                        self._stats.processed_files += 1
+                        self._stats.add_success(len(tags))
+                if on_tags is not None and tags is not None:
+                    on_tags(file_path, tags)
+                counters.busy_time += time.perf_counter() - start_time
+                counters.items += 1
+
+                if show_progress and not cached and progress_context is None:
+                    progress_context = self._create_progress_context()
+                    progress = progress_context.__enter__()
+                    task_id = progress.add_task(
+                        f"Indexing with {self.max_workers} {self.executor} workers...",
+                        total=total,
+                    )
+                if progress is not None:
+                    progress.update(task_id, completed=self._stats.processed_files)
+        finally:
+            if progress_context is not None:
+                progress_context.__exit__(None, None, None)
+            with self._lock:
+                self._stats.add_stage(
+                    "write",
+                    counters.items,
+                    counters.busy_time,
+                    counters.idle_time,
+                    counters.blocked_time,
+                )
 
     def _process_file_with_monitoring(
         self, file_path: str, project_root: str, repo_map: Any
@@ -319,6 +1143,13 @@ class ParallelTagExtractor:
             f"  Workers: {self.max_workers} (avg {avg_worker_time:.3f}s per file)\n"
             f"  Errors: {stats.failed_files} files failed"
         )
+        for name, stage in stats.stages.items():
+            self.logger.info(
+                f"  Stage {name}: {stage.items} items "
+                f"({stats.stage_throughput(name):.1f}/s; busy {stage.busy_time:.2f}s, "
+                f"waiting for input {stage.idle_time:.2f}s, "
+                f"blocked downstream {stage.blocked_time:.2f}s)"
+            )
 
         # Log detailed errors if any
         if stats.errors:
@@ -362,12 +1193,24 @@ class ParallelTagExtractor:
                 "total_identifiers": stats.total_identifiers,
                 "processing_time": stats.processing_time,
                 "files_per_second": stats.files_per_second,
+                "cached_files": stats.cached_files,
+            },
+            "stage_performance": {
+                name: {
+                    "items": stage.items,
+                    "items_per_second": stats.stage_throughput(name),
+                    "busy_time": stage.busy_time,
+                    "idle_time": stage.idle_time,
+                    "blocked_time": stage.blocked_time,
+                }
+                for name, stage in stats.stages.items()
             },
             "worker_performance": worker_stats,
             "file_size_stats": size_stats,
             "configuration": {
                 "max_workers": self.max_workers,
                 "enable_progress": self.enable_progress,
+                "executor": self.executor,
             },
         }
 
@@ -0,0 +1,311 @@
+"""
+Shared snapshot of a project's files.
+
+Listing a project reads every directory and matches every entry against the
+ignore rules. A ProjectSnapshot does that once and records each file's stat
+metadata and each directory's mtime, so every consumer in a command (or in
+one daemon request) reads the same listing. Refreshing re-stats only the
+directories: a directory whose mtime is unchanged cannot have gained or lost
+entries, so only directories whose mtime changed are listed again.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .file_scanner import (
+    DirectoryListing,
+    ProjectIgnoreRules,
+    filter_git_files,
+    list_git_files,
+    list_project_directory,
+    project_path_prefix,
+    walk_project,
+)
+from .logging_service import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class FileStat:
+    """Stat metadata recorded for a project file."""
+
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class _DirState:
+    mtime_ns: int
+    files: List[str] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+
+
+class ProjectSnapshot:
+    """Project file listing with stat metadata and a generation number.
+
+    The listing is identical to get_project_files. ``generation`` increases
+    every time a refresh finds a change, so consumers can cache derived data
+    (filtered file lists, parsed tags) per generation.
+
+    File stat metadata is refreshed for the files in directories that
+    changed; an in-place edit does not change its directory's mtime, so
+    consumers that need content freshness (such as the tag cache) still
+    validate each file themselves.
+    """
+
+    def __init__(self, project_root: str, use_git_index: bool = False):
+        """
+        Scan a project.
+
+        Args:
+            project_root: Root directory of the project
+            use_git_index: List files from the git index when the project is
+                a git checkout
+        """
+        self.project_root = project_root
+        self.use_git_index = use_git_index
+        self.generation = 0
+        self._prefix = project_path_prefix(project_root)
+        self._lock = threading.RLock()
+        self._files: Dict[str, Optional[FileStat]] = {}
+        self._dirs: Dict[str, _DirState] = {}
+        self._rule_files: Dict[str, Optional[int]] = {}
+        self._rules: Optional[ProjectIgnoreRules] = None
+        self._from_git = False
+        self._sorted_files: Optional[Tuple[int, List[str]]] = None
+        self._build()
+
+    @property
+    def files(self) -> List[str]:
+        """Project file paths, in the same form and order get_project_files returns."""
+        with self._lock:
+            if self._sorted_files is None or self._sorted_files[0] != self.generation:
+                self._sorted_files = (self.generation, sorted(self._files))
+            return list(self._sorted_files[1])
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get the recorded stat metadata of a project file.
+
+        Args:
+            file_path: Path as listed in ``files``
+
+        Returns:
+            Recorded metadata, or None if the file is not in the snapshot or
+            could not be stat'ed
+        """
+        return self._files.get(file_path)
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def refresh(self) -> bool:
+        """Bring the snapshot up to date with the filesystem.
+
+        Returns:
+            True if any file was added, removed or re-stat'ed with new metadata
+        """
+        with self._lock:
+            if self._from_git or self._rules_changed():
+                return self._rebuild()
+
+            changed = False
+            for rel_dir in list(self._dirs):
+                state = self._dirs.get(rel_dir)
+                if state is None:
+                    # Dropped while rescanning its parent
+                    continue
+                mtime_ns = _mtime_ns(self._abs_dir(rel_dir))
+                if mtime_ns == state.mtime_ns:
+                    continue
+                if mtime_ns is None:
+                    self._drop_dir(rel_dir)
+                    changed = True
+                    continue
+                rescanned = self._rescan_dir(rel_dir)
+                if rescanned is None:
+                    # A .gitignore appeared: the ignore rules changed
+                    return self._rebuild()
+                changed = rescanned or changed
+
+            if changed:
+                self.generation += 1
+            return changed
+
+    def _abs_dir(self, rel_dir: str) -> str:
+        return self._prefix + rel_dir if rel_dir else self.project_root
+
+    def _build(self) -> None:
+        self._files = {}
+        self._dirs = {}
+        self._rules = ProjectIgnoreRules(self.project_root)
+        self._rule_files = {
+            path: _mtime_ns(path)
+            for path in (
+                str(Path(self.project_root, ".gitignore")),
+                str(Path(self.project_root, ".git", "info", "exclude")),
+            )
+        }
+
+        self._from_git = False
+        if self.use_git_index:
+            rel_paths = list_git_files(self.project_root)
+            if rel_paths is not None:
+                self._from_git = True
+                for file_path in filter_git_files(rel_paths, self._prefix):
+                    self._files[file_path] = _file_stat(file_path)
+                return
+
+        self._scan_tree("")
+
+    def _rebuild(self) -> bool:
+        previous = self._files
+        self._build()
+        changed = previous != self._files
+        if changed:
+            self.generation += 1
+        return changed
+
+    def _rules_changed(self) -> bool:
+        return any(
+            _mtime_ns(path) != mtime_ns for path, mtime_ns in self._rule_files.items()
+        )
+
+    def _scan_tree(self, rel_dir: str) -> None:
+        for listing in walk_project(
+            self.project_root, rules=self._rules, with_stat=True, start=rel_dir
+        ):
+            self._record(listing)
+
+    def _scan_dir(self, rel_dir: str) -> Optional[List[str]]:
+        """List one directory and record its files.
+
+        Returns:
+            Relative paths of the subdirectories to descend into, or None if
+            the directory vanished
+        """
+        assert self._rules is not None
+        listing = list_project_directory(
+            self.project_root, rel_dir, self._rules, with_stat=True
+        )
+        if listing is None:
+            return None
+        self._record(listing)
+        return listing.subdirs
+
+    def _record(self, listing: DirectoryListing) -> None:
+        if listing.has_gitignore:
+            gitignore_path = os.path.join(self._abs_dir(listing.rel_dir), ".gitignore")
+            self._rule_files[gitignore_path] = _mtime_ns(gitignore_path)
+
+        for file_path, st in zip(listing.files, listing.stats):
+            self._files[file_path] = (
+                FileStat(st.st_size, st.st_mtime_ns) if st is not None else None
+            )
+        self._dirs[listing.rel_dir] = _DirState(
+            listing.mtime_ns, listing.files, listing.subdirs
+        )
+
+    def _rescan_dir(self, rel_dir: str) -> Optional[bool]:
+        """List a changed directory again.
+
+        Returns:
+            Whether its entries changed, or None if it gained a .gitignore
+        """
+        old_state = self._dirs[rel_dir]
+        gitignore_path = os.path.join(self._abs_dir(rel_dir), ".gitignore")
+        if gitignore_path not in self._rule_files and os.path.exists(gitignore_path):
+            return None
+
+        old_files = {path: self._files.pop(path, None) for path in old_state.files}
+        subdirs = self._scan_dir(rel_dir)
+        if subdirs is None:
+            self._drop_dir(rel_dir)
+            return True
+        new_state = self._dirs[rel_dir]
+
+        kept_subdirs = set(subdirs)
+        for subdir in old_state.subdirs:
+            if subdir not in kept_subdirs:
+                self._drop_dir(subdir)
+        for subdir in subdirs:
+            if subdir not in self._dirs:
+                self._scan_tree(subdir)
+
+        new_files = {path: self._files[path] for path in new_state.files}
+        return old_files != new_files or set(old_state.subdirs) != kept_subdirs
+
+    def _drop_dir(self, rel_dir: str) -> None:
+        pending = [rel_dir]
+        while pending:
+            state = self._dirs.pop(pending.pop(), None)
+            if state is None:
+                continue
+            for file_path in state.files:
+                self._files.pop(file_path, None)
+            pending.extend(state.subdirs)
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _file_stat(path: str) -> Optional[FileStat]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return FileStat(st.st_size, st.st_mtime_ns)
+
+
+_snapshots: Dict[Tuple[str, bool], ProjectSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_project_snapshot(
+    project_root: str, use_git_index: bool = False
+) -> ProjectSnapshot:
+    """Get the shared snapshot of a project, scanning it on first use.
+
+    A snapshot that already exists is refreshed, which costs one stat per
+    directory, so every consumer sees the current listing.
+
+    Args:
+        project_root: Root directory of the project
+        use_git_index: List files from the git index when possible
+
+    Returns:
+        The process-wide snapshot for this root and listing mode
+    """
+    key = (str(Path(project_root)), use_git_index)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            snapshot = ProjectSnapshot(project_root, use_git_index=use_git_index)
+            _snapshots[key] = snapshot
+            return snapshot
+    snapshot.refresh()
+    return snapshot
+
+
+def refresh_project_snapshots() -> None:
+    """Refresh every shared snapshot (once per daemon request)."""
+    with _snapshots_lock:
+        snapshots = list(_snapshots.values())
+    for snapshot in snapshots:
+        snapshot.refresh()
+
+
+def clear_project_snapshots() -> None:
+    """Forget all shared snapshots."""
+    with _snapshots_lock:
+        _snapshots.clear()
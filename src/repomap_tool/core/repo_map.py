@@ -8,12 +8,23 @@ code analysis and search functionality.
 import logging
 from .config_service import get_config
 from .logging_service import get_logger
-from .file_scanner import get_project_files
+from .project_snapshot import ProjectSnapshot, get_project_snapshot
+from .identifier_index import IdentifierIndex
 import os
 import time
 import traceback
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
 from ..code_analysis.models import CodeTag
 from ..protocols import (
     RepoMapProtocol,
@@ -32,7 +43,7 @@ from ..models import (
 )
 from .analyzer import analyze_file_types, analyze_identifier_types, get_cache_size
 from .search_engine import fuzzy_search, semantic_search, hybrid_search, basic_search
-from .parallel_processor import ParallelTagExtractor
+from .parallel_processor import ParallelTagExtractor, ProcessingStats
 from rich.console import Console
 
 # Import matchers
@@ -46,6 +57,10 @@ except ImportError as e:
     logging.error(f"Failed to import matchers: {e}")
     MATCHERS_AVAILABLE = False
 
+if TYPE_CHECKING:
+    from .file_watcher import FileChange
+    from .tag_cache import TreeSitterTagCache
+
 
 class RepoMapService:
     """
@@ -113,10 +128,27 @@ class RepoMapService:
         self.centrality_calculator = centrality_calculator
         self.spellchecker_service = spellchecker_service
 
+        # One scan of the project shared by every listing in this service
+        self.project_snapshot: ProjectSnapshot = get_project_snapshot(
+            str(self.config.project_root),
+            use_git_index=self.config.performance.use_git_index,
+        )
+
         # Initialize components
         self.repo_map: Optional[RepoMapProtocol] = None
         self.analysis_results: Optional[Any] = None
 
+        # In-memory tags and identifier index, kept current by
+        # apply_file_changes once enable_live_index() has been called
+        self._live_tags: Optional[Dict[str, List[CodeTag]]] = None
+        self._identifier_index = IdentifierIndex()
+
+        # Stage throughput of the pipeline run that populated the tag cache
+        self.index_stats: Optional[ProcessingStats] = None
+
+        # Files covered by the last indexing run, diffed by refresh_index
+        self._indexed_files: Set[str] = set()
+
         # Initialize the system
         self._initialize_components()
 
@@ -156,14 +188,18 @@ class RepoMapService:
             cache_dir = Path(cache_dir)
         else:
             cache_dir = None
-        tag_cache = TreeSitterTagCache(cache_dir)
+        tag_cache = TreeSitterTagCache(
+            cache_dir, hash_algorithm=self.config.performance.cache_hash_algorithm
+        )
 
         # Create tree-sitter parser with cache
         project_root_str = (
             str(self.config.project_root) if self.config.project_root else None
         )
         self.tree_sitter_parser = TreeSitterParser(
-            project_root=project_root_str, cache=tag_cache
+            project_root=project_root_str,
+            cache=tag_cache,
+            extract_comments=self.config.performance.extract_comments,
         )
 
         # Populate cache by parsing all project files
@@ -172,55 +208,128 @@ class RepoMapService:
         # CustomRepoMap removed - using TreeSitterParser directly
 
     def _populate_tree_sitter_cache(self) -> None:
-        """Populate tree-sitter cache by parsing all project files."""
+        """Populate tree-sitter cache by parsing all project files.
+
+        Files stream through the extractor's discover, parse and write
+        stages, so only files with a missing or stale cache entry are parsed
+        and no more tags are held than fit in the pipeline's queues.
+        """
         try:
             # Get all project files
-            project_files = get_project_files(
-                str(self.config.project_root), self.config.verbose
-            )
+            project_files = self._get_project_files()
 
             self.logger.info(
                 f"Populating tree-sitter cache with {len(project_files)} files"
             )
 
-            # Parse each file to populate the cache
-            for file_path in project_files:
-                try:
-                    # This will parse the file and cache the results
-                    self.tree_sitter_parser.get_tags(file_path)
-                except Exception as e:
-                    self.logger.debug(f"Failed to parse {file_path}: {e}")
-                    continue
+            tag_cache = self.tree_sitter_parser.tag_cache
+            if tag_cache is None:
+                for file_path in project_files:
+                    try:
+                        self.tree_sitter_parser.get_tags(file_path)
+                    except Exception as e:
+                        self.logger.debug(f"Failed to parse {file_path}: {e}")
+            else:
+                self.index_stats = self._run_index_pipeline(project_files, tag_cache)
+            self._indexed_files = set(project_files)
 
             self.logger.info("Tree-sitter cache populated successfully")
 
         except Exception as e:
             self.logger.warning(f"Failed to populate tree-sitter cache: {e}")
 
+    def _run_index_pipeline(
+        self,
+        project_files: List[str],
+        tag_cache: "TreeSitterTagCache",
+        on_tags: Optional[Callable[[str, List[CodeTag]], None]] = None,
+        show_progress: Optional[bool] = None,
+    ) -> ProcessingStats:
+        """Stream files through the indexing pipeline into the tag cache.
+
+        Args:
+            project_files: Absolute paths of the files to index
+            tag_cache: Tag cache checked and filled by the pipeline
+            on_tags: Optional sink called with (file_path, tags) for every file
+            show_progress: Override the extractor's progress setting
+
+        Returns:
+            ProcessingStats of the run, with per-stage throughput
+        """
+        # Group cache writes into a few large transactions
+        with tag_cache.batched_writes(
+            max_files=self.config.performance.write_batch_size,
+            max_delay_ms=self.config.performance.write_batch_interval_ms,
+        ):
+            stats: ProcessingStats = self.parallel_extractor.run_pipeline(
+                project_files,
+                str(self.config.project_root),
+                tag_cache,
+                on_tags=on_tags,
+                show_progress=show_progress,
+            )
+        return stats
+
+    def _collect_identifiers(
+        self, project_files: List[str], show_progress: Optional[bool] = None
+    ) -> Set[str]:
+        """Get the distinct identifiers of the given files.
+
+        Tags are streamed from the tag cache (parsing any file whose entry is
+        missing or stale) and reduced to names as they arrive.
+
+        Args:
+            project_files: Absolute paths of the files to read
+            show_progress: Override the extractor's progress setting
+
+        Returns:
+            Set of identifier names
+        """
+        tag_cache = self.tree_sitter_parser.tag_cache
+        if tag_cache is None:
+            return set(self._extract_identifiers_from_files(project_files))
+
+        identifiers: Set[str] = set()
+
+        def collect(file_path: str, tags: List[CodeTag]) -> None:
+            identifiers.update(tag.name for tag in tags if tag.name)
+
+        self._run_index_pipeline(
+            project_files, tag_cache, on_tags=collect, show_progress=show_progress
+        )
+        return identifiers
+
     def _get_cached_identifiers(self) -> List[str]:
         """Get all identifiers from tree-sitter cache"""
-        all_identifiers = set()
+        identifiers = self._get_identifier_index().identifiers
+        self.logger.info(f"Retrieved {len(identifiers)} identifiers from cache")
+        return identifiers
 
-        # Use cached tags directly instead of re-parsing
-        cached_tags = self._get_cached_tags()
-        self.logger.info(
-            f"_get_cached_identifiers: Retrieved {len(cached_tags)} cached tags"
-        )
+    def _get_identifier_index(self) -> IdentifierIndex:
+        """Get the identifier -> locations index of the project's cached tags.
 
-        for tag in cached_tags:
-            all_identifiers.add(tag.name)
-            self.logger.debug(f"Added identifier: {tag.name} (type: {tag.kind})")
+        The live index is kept current by apply_file_changes; otherwise the
+        index is loaded from the tag cache, validating every file.
+        """
+        if self._live_tags is not None:
+            return self._identifier_index
 
-        self.logger.info(f"Retrieved {len(all_identifiers)} identifiers from cache")
-        return list(all_identifiers)
+        tag_cache = (
+            self.tree_sitter_parser.tag_cache if self.tree_sitter_parser else None
+        )
+        if tag_cache is None:
+            self.logger.debug("No tree-sitter cache available")
+            return IdentifierIndex()
+        index: IdentifierIndex = tag_cache.get_identifier_index(
+            self._get_project_files()
+        )
+        return index
 
     def _invalidate_stale_caches(self) -> None:
         """Invalidate cache entries for files that have been modified since caching."""
         try:
             # Get current project files
-            project_files = get_project_files(
-                str(self.config.project_root), self.config.verbose
-            )
+            project_files = self._get_project_files()
 
             # Check and invalidate stale caches in fuzzy matcher
             if self.fuzzy_matcher and hasattr(self.fuzzy_matcher, "cache_manager"):
@@ -251,19 +360,11 @@ class RepoMapService:
         """Get comprehensive project information."""
         start_time = time.time()
 
-        # Get project files
-        project_files = get_project_files(
-            str(self.config.project_root), self.config.verbose
-        )
-
         # Get project files and extract identifiers from tags
-        project_files = get_project_files(
-            str(self.config.project_root), self.config.verbose
-        )
+        project_files = self._get_project_files()
 
-        # Extract identifiers from all project files
-        identifier_list = self._extract_identifiers_from_files(project_files)
-        identifiers = set(identifier_list)
+        # Stream identifiers from all project files
+        identifiers = self._collect_identifiers(project_files)
 
         # Analyze project structure
         file_types = analyze_file_types(project_files)
@@ -315,9 +416,7 @@ class RepoMapService:
 
             # Task 1: Scan files
             scan_task = progress.add_task("Scanning project files...", total=None)
-            project_files = get_project_files(
-                str(self.config.project_root), self.config.verbose
-            )
+            project_files = self._get_project_files()
             progress.update(scan_task, completed=True)
 
             # Task 2: Extract identifiers
@@ -329,12 +428,12 @@ class RepoMapService:
                     else None
                 ),
             )
-            identifier_list = self._extract_identifiers_from_files(project_files)
+            # Only one live display can be active, so the pipeline's is off
+            identifiers = self._collect_identifiers(project_files, show_progress=False)
             progress.update(extract_task, completed=True)
 
             # Task 3: Analyze results
             analyze_task = progress.add_task("Analyzing results...", total=None)
-            identifiers = set(identifier_list)
             file_types = analyze_file_types(project_files)
             identifier_types = analyze_identifier_types(identifiers)
             progress.update(analyze_task, completed=True)
@@ -371,9 +470,7 @@ class RepoMapService:
         # Force cache refresh if empty
         if not self.tree_sitter_parser or not self.tree_sitter_parser.tag_cache:
             self.logger.debug("Tree-sitter cache is empty or missing, forcing refresh")
-            project_files = get_project_files(
-                str(self.config.project_root), self.config.verbose
-            )
+            project_files = self._get_project_files()
             if self.repo_map and project_files:
                 try:
                     self.repo_map.get_ranked_tags_map(project_files, max_tokens=4000)
@@ -385,19 +482,17 @@ class RepoMapService:
                     pass
 
         # ALWAYS use tree-sitter - no fallbacks
-        tags = self._get_cached_tags()
+        index = self._get_identifier_index()
 
-        # Log tag count
-        self.logger.debug(f"Found {len(tags) if tags else 0} cached tags")
+        # Log identifier count
+        self.logger.debug(f"Found {len(index)} cached identifiers")
 
-        if not tags:
+        if not index:
             # Force tree-sitter to scan files and populate cache
             self.logger.debug("Cache empty, forcing tree-sitter tag extraction")
 
             # Get project files
-            project_files = get_project_files(
-                str(self.config.project_root), self.config.verbose
-            )
+            project_files = self._get_project_files()
 
             # Force tree-sitter to extract tags
             if self.repo_map:
@@ -411,18 +506,20 @@ class RepoMapService:
                     )
                     pass
 
-                # Get cached tags from tree-sitter (now populated)
-                tags = self._get_cached_tags()
+                # Get cached identifiers from tree-sitter (now populated)
+                index = self._get_identifier_index()
 
-            if not tags:
+            if not index:
                 # If still no tags, the project has no identifiers (empty project)
                 self.logger.warning(
                     "No tags found after tree-sitter extraction - empty project?"
                 )
         else:
-            self.logger.debug(f"Using cached tags from tree-sitter: {len(tags)} found")
+            self.logger.debug(
+                f"Using cached identifiers from tree-sitter: {len(index)} found"
+            )
 
-        if not tags:
+        if not index:
             return SearchResponse(
                 query=request.query,
                 match_type=request.match_type,
@@ -432,14 +529,15 @@ class RepoMapService:
                 search_time_ms=(time.time() - start_time) * 1000,
             )
 
-        # Extract identifiers for search
-        identifiers = [tag.name for tag in tags]
+        # Search over distinct identifiers
+        identifiers = index.identifiers
 
         # Log identifier count
-        self.logger.debug(f"Extracted {len(identifiers)} identifiers from tags")
+        self.logger.debug(f"Searching {len(identifiers)} distinct identifiers")
         self.logger.debug(f"Sample identifiers: {identifiers[:10]}")
 
         # Perform search based on type
+        performance_metrics: Dict[str, Any] = {}
         if request.match_type == "fuzzy" and self.fuzzy_matcher:
             results = fuzzy_search(
                 request.query, identifiers, self.fuzzy_matcher, request.max_results
@@ -455,6 +553,7 @@ class RepoMapService:
                 self.hybrid_matcher,
                 request.max_results,
                 request.threshold,
+                performance_metrics,
             )
         else:
             # Fallback to basic search
@@ -463,27 +562,20 @@ class RepoMapService:
         # Enhance results with file path and line number information
         enhanced_results = []
         for result in results:
-            # Find the corresponding tag for this identifier
-            matching_tag = None
-            for tag in tags:
-                if tag.name == result.identifier:
-                    matching_tag = tag
-                    break
-
-            # Create enhanced result with file path and line number
+            # Report the identifier's definition, or its first reference
+            location = index.primary_location(result.identifier)
+
             # Filter out invalid line numbers (must be >= 1)
             line_number = None
-            if matching_tag and matching_tag.line is not None:
-                line_num = matching_tag.line
-                if isinstance(line_num, int) and line_num >= 1:
-                    line_number = line_num
+            if location and isinstance(location.line, int) and location.line >= 1:
+                line_number = location.line
 
             enhanced_result = MatchResult(
                 identifier=result.identifier,
                 score=result.score,
                 strategy=result.strategy,
                 match_type=result.match_type,
-                file_path=matching_tag.file if matching_tag else None,
+                file_path=location.file if location else None,
                 line_number=line_number,
                 context=result.context,
                 metadata=result.metadata,
@@ -530,6 +622,7 @@ class RepoMapService:
             results=enhanced_results,
             search_time_ms=processing_time * 1000,  # Convert to milliseconds
             spellcheck_suggestions=spellcheck_suggestions,
+            performance_metrics=performance_metrics,
         )
 
     def _get_cached_tags(self) -> List[CodeTag]:
@@ -539,6 +632,9 @@ class RepoMapService:
         Returns:
             List of tag dictionaries with name, type, file, and line information
         """
+        if self._live_tags is not None:
+            return [tag for tags in self._live_tags.values() for tag in tags]
+
         if not self.tree_sitter_parser or not self.tree_sitter_parser.tag_cache:
             self.logger.debug("No tree-sitter cache available")
             return []
@@ -549,33 +645,28 @@ class RepoMapService:
 
         try:
             cache = self.tree_sitter_parser.tag_cache
-            self.logger.info(
-                f"Tree-sitter cache type: {type(cache)}, size: {cache.get_cache_stats() if cache else 'N/A'}"
-            )
+            self.logger.info(f"Tree-sitter cache type: {type(cache)}")
 
             if not cache:
                 self.logger.info("Tree-sitter cache is empty")
                 return []
 
             # Get all project files and retrieve their cached tags
-            project_files = get_project_files(
-                str(self.config.project_root), self.config.verbose
-            )
+            project_files = self._get_project_files()
+
+            # Validate and load every file's tags in a few bulk queries
+            tags_by_file = cache.get_tags_bulk(project_files)
 
             all_tags = []
             files_with_tags = 0
             for file_path in project_files:
-                try:
-                    cached_tags = cache.get_tags(file_path)
-                    if cached_tags:
-                        all_tags.extend(cached_tags)
-                        files_with_tags += 1
-                        self.logger.debug(
-                            f"Retrieved {len(cached_tags)} tags from cache for {file_path}"
-                        )
-                except Exception as e:
-                    self.logger.debug(f"Error getting cached tags for {file_path}: {e}")
-                    continue
+                cached_tags = tags_by_file.get(file_path)
+                if cached_tags:
+                    all_tags.extend(cached_tags)
+                    files_with_tags += 1
+                    self.logger.debug(
+                        f"Retrieved {len(cached_tags)} tags from cache for {file_path}"
+                    )
 
             self.logger.info(
                 f"Retrieved tags from {files_with_tags} files out of {len(project_files)} total files"
@@ -588,6 +679,177 @@ class RepoMapService:
             self.logger.warning(f"Failed to retrieve tags from cache: {e}")
             return []
 
+    def enable_live_index(self) -> None:
+        """Load every file's tags into memory and keep them there.
+
+        Searches then read tags and identifiers from memory instead of
+        walking the project, and apply_file_changes updates them per file.
+        """
+        tag_cache = (
+            self.tree_sitter_parser.tag_cache if self.tree_sitter_parser else None
+        )
+        if tag_cache is None:
+            self.logger.debug("No tree-sitter cache available for live index")
+            return
+
+        project_files = self._get_project_files()
+        tags_by_file = tag_cache.get_tags_bulk(project_files)
+
+        self._live_tags = {}
+        self._identifier_index = IdentifierIndex()
+        for file_path in project_files:
+            self._set_live_tags(file_path, tags_by_file.get(file_path, []))
+
+        self.logger.debug(
+            f"Live index holds {len(self._identifier_index)} identifiers "
+            f"from {len(self._live_tags)} files"
+        )
+
+    def _set_live_tags(self, file_path: str, tags: Optional[List[CodeTag]]) -> None:
+        """Replace one file's tags in the live index (None removes the file)."""
+        if self._live_tags is None:
+            return
+
+        self._live_tags.pop(file_path, None)
+        self._identifier_index.replace_file(file_path, tags)
+        if tags is not None:
+            self._live_tags[file_path] = tags
+
+    def apply_file_changes(self, changes: Iterable["FileChange"]) -> Dict[str, int]:
+        """Bring indexes up to date with a batch of changed files.
+
+        Only the changed files are re-parsed: their tag cache entries, live
+        tags and identifiers, matcher caches and (if built) dependency and
+        call graph entries are replaced. Cached search results are cleared.
+
+        Args:
+            changes: Changes reported by a file watcher
+
+        Returns:
+            Number of created, modified and deleted files applied
+        """
+        stats = {"created": 0, "modified": 0, "deleted": 0}
+        self.project_snapshot.refresh()
+        tag_cache = (
+            self.tree_sitter_parser.tag_cache if self.tree_sitter_parser else None
+        )
+        graph = self.dependency_graph
+        graph_built = graph is not None and bool(graph.nodes)
+        cache_managers = [
+            cache_manager
+            for cache_manager in (
+                getattr(matcher, "cache_manager", None)
+                for matcher in (self.fuzzy_matcher, self.embedding_matcher)
+            )
+            if cache_manager
+        ]
+
+        write_batch = (
+            tag_cache.batched_writes(
+                max_files=self.config.performance.write_batch_size,
+                max_delay_ms=self.config.performance.write_batch_interval_ms,
+            )
+            if tag_cache is not None
+            else nullcontext()
+        )
+
+        with write_batch:
+            for change in changes:
+                file_path = change.path
+                stats[change.kind] += 1
+
+                tags: Optional[List[CodeTag]] = None
+                if change.kind == "deleted":
+                    if tag_cache is not None:
+                        tag_cache.invalidate_file(file_path)
+                else:
+                    try:
+                        # Stat-validated lookup: re-parses and re-caches the file
+                        tags = self.tree_sitter_parser.get_tags(file_path)
+                    except Exception as e:
+                        self.logger.debug(f"Failed to parse {file_path}: {e}")
+                        tags = []
+                self._set_live_tags(file_path, tags)
+
+                for cache_manager in cache_managers:
+                    cache_manager.invalidate_file_cache(file_path)
+
+                if graph_built:
+                    assert graph is not None
+                    if change.kind == "deleted":
+                        graph.remove_file(file_path)
+                    elif change.kind == "created":
+                        graph.add_file(file_path)
+                    else:
+                        graph.update_file(file_path)
+
+        if any(stats.values()):
+            self._clear_match_results()
+        self.logger.debug(f"Applied file changes: {stats}")
+        return stats
+
+    def refresh_index(self) -> Dict[str, int]:
+        """Catch up with files changed since the project was last indexed.
+
+        For services reused without a file watcher (such as by the ``serve``
+        daemon): files with a missing or stale tag cache entry are parsed
+        through the indexing pipeline, and they and the deleted files are
+        then applied as file changes.
+
+        Returns:
+            Number of created, modified and deleted files applied
+        """
+        stats = {"created": 0, "modified": 0, "deleted": 0}
+        tag_cache = (
+            self.tree_sitter_parser.tag_cache if self.tree_sitter_parser else None
+        )
+        if tag_cache is None:
+            return stats
+
+        from .file_watcher import FileChange
+
+        self.project_snapshot.refresh()
+        project_files = self._get_project_files()
+        previous, current = self._indexed_files, set(project_files)
+        changes = [FileChange(path, "deleted") for path in sorted(previous - current)]
+
+        valid = tag_cache.get_valid_files(project_files)
+        stale = [path for path in project_files if path not in valid]
+        if stale:
+            self.index_stats = self._run_index_pipeline(
+                stale, tag_cache, show_progress=False
+            )
+            changes.extend(
+                FileChange(path, "modified" if path in previous else "created")
+                for path in stale
+            )
+        self._indexed_files = current
+
+        if changes:
+            stats = self.apply_file_changes(changes)
+        return stats
+
+    def _clear_match_results(self) -> None:
+        """Drop cached search results after the identifiers changed.
+
+        Matchers key their results by query and settings only, so a result
+        computed before a file was created, modified or deleted would
+        otherwise still be returned afterwards.
+        """
+        matchers = (
+            self.fuzzy_matcher,
+            self.semantic_matcher,
+            getattr(self.hybrid_matcher, "fuzzy_matcher", None),
+        )
+        cleared: List[int] = []
+        for matcher in matchers:
+            if matcher is None or id(matcher) in cleared:
+                continue
+            cleared.append(id(matcher))
+            clear_cache = getattr(matcher, "clear_cache", None)
+            if callable(clear_cache):
+                clear_cache()
+
     def get_tags(self) -> List[str]:
         """Get all available tags/identifiers in the project."""
         # Try to use cached identifiers first
@@ -595,9 +857,7 @@ class RepoMapService:
 
         if not identifiers:
             # Fallback: re-parse files
-            project_files = get_project_files(
-                str(self.config.project_root), self.config.verbose
-            )
+            project_files = self._get_project_files()
             identifiers = self._extract_identifiers_from_files(project_files)
 
         return sorted(list(set(identifiers)))
@@ -658,7 +918,7 @@ class RepoMapService:
 
     def _get_project_files(self) -> List[str]:
         """Get list of project files, respecting .gitignore patterns."""
-        return get_project_files(str(self.config.project_root), self.config.verbose)
+        return self.project_snapshot.files
 
     def _extract_identifiers_from_files(self, project_files: List[str]) -> List[str]:
         """
@@ -708,6 +968,7 @@ class RepoMapService:
                 files=project_files,
                 project_root=str(self.config.project_root),
                 repo_map=self.repo_map,
+                tag_cache=self.tree_sitter_parser.tag_cache,
             )
 
             # Log performance statistics
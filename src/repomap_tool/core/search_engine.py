@@ -5,8 +5,9 @@ This module handles different types of search operations (fuzzy, semantic, hybri
 """
 
 import logging
+import time
 from .config_service import get_config
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from ..protocols import MatcherProtocol
 from ..models import MatchResult
 
@@ -132,8 +133,13 @@ def hybrid_search(
     hybrid_matcher: MatcherProtocol,
     limit: int = get_config("MAX_LIMIT", 10),
     threshold: float = get_config("HYBRID_THRESHOLD", 0.3),
+    performance_metrics: Optional[Dict[str, Any]] = None,
 ) -> List[MatchResult]:
-    """Perform hybrid search on identifiers."""
+    """Perform hybrid search on identifiers.
+
+    If performance_metrics is given, the TF-IDF build time and the matcher's
+    per-stage timings are added to it.
+    """
     # Input validation
     if not query or not identifiers:
         logging.warning("Empty query or identifiers provided")
@@ -145,12 +151,19 @@ def hybrid_search(
 
     try:
         # Ensure TF-IDF model is built for hybrid matcher
+        identifier_set = set(identifiers)
+        start = time.perf_counter()
         if hasattr(hybrid_matcher, "build_tfidf_model") and identifiers:
-            # Convert list to set for the build_tfidf_model method
-            identifier_set = set(identifiers)
             hybrid_matcher.build_tfidf_model(identifier_set)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        results = hybrid_matcher.match_identifiers(query, identifier_set, threshold)
 
-        results = hybrid_matcher.match_identifiers(query, set(identifiers), threshold)
+        if performance_metrics is not None:
+            performance_metrics["tfidf_model_ms"] = round(build_ms, 2)
+            performance_metrics.update(
+                getattr(hybrid_matcher, "last_search_metrics", None) or {}
+            )
 
         # Validate results and process
         match_results = []
@@ -3,37 +3,185 @@ Tree-sitter tag caching system for persistent tag storage.
 
 This module provides TreeSitterTagCache class that implements:
 - SQLite backend for persistent tag caching
-- File hash + mtime validation for cache invalidation
+- Long-lived per-thread connections running in WAL mode
+- Optional write batching that groups many files into one transaction
+- Stat fingerprint (size, mtime_ns, inode) validation with a content-hash
+  fallback for cache invalidation
 - CodeTag dataclass integration
+- Identifier -> locations index over the cached tags
 - Cache statistics and management
 """
 
 import os
 import sqlite3
 import hashlib
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple
 
 from ..core.logging_service import get_logger
 from ..code_analysis.models import CodeTag
+from .identifier_index import IdentifierIndex, IdentifierLocation
+
+# Optional fast non-cryptographic hash
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
 
 logger = get_logger(__name__)
 
+# Content hash algorithms supported for cache validation
+HASH_ALGORITHMS = ("sha256", "blake2b", "xxhash")
+
+# Files modified this close (seconds) to the time their entry was written may
+# have changed again within the same mtime tick, so their stat fingerprint is
+# not trusted and the content hash is compared instead.
+_RACY_WINDOW = 2.0
+
+# Pragmas applied to every pooled connection. WAL lets readers proceed while a
+# writer is active and, together with synchronous=NORMAL, avoids an fsync per
+# transaction; the remaining settings keep hot pages and temp tables in memory.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Busy timeout (seconds) used when another process holds the write lock
+_BUSY_TIMEOUT = 5.0
+
+# Statements are kept as module constants so sqlite3's per-connection statement
+# cache can reuse the prepared statement across calls.
+_SELECT_FILE_META = (
+    "SELECT file_hash, mtime, size, mtime_ns, inode, cached_at "
+    "FROM file_cache WHERE file_path = ?"
+)
+_UPDATE_FINGERPRINT = (
+    "UPDATE file_cache SET mtime = ?, size = ?, mtime_ns = ?, inode = ?, "
+    "cached_at = ? WHERE file_path = ?"
+)
+_SELECT_TAGS = (
+    "SELECT name, kind, file, line, column, end_line, end_column, rel_fname "
+    "FROM tags WHERE file_path = ?"
+)
+_DELETE_FILE_META = "DELETE FROM file_cache WHERE file_path = ?"
+_DELETE_FILE_TAGS = "DELETE FROM tags WHERE file_path = ?"
+_INSERT_FILE_META = (
+    "INSERT INTO file_cache (file_path, file_hash, mtime, cached_at, size, "
+    "mtime_ns, inode) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_CREATE_BULK_PATHS = (
+    "CREATE TEMP TABLE IF NOT EXISTS bulk_paths (file_path TEXT PRIMARY KEY)"
+)
+_INSERT_BULK_PATH = "INSERT OR IGNORE INTO temp.bulk_paths (file_path) VALUES (?)"
+_DELETE_BULK_PATH = "DELETE FROM temp.bulk_paths WHERE file_path = ?"
+_SELECT_BULK_FILE_META = (
+    "SELECT f.file_path, f.file_hash, f.mtime, f.size, f.mtime_ns, f.inode, "
+    "f.cached_at FROM file_cache f "
+    "JOIN temp.bulk_paths p ON f.file_path = p.file_path"
+)
+_SELECT_BULK_TAGS = (
+    "SELECT t.file_path, t.name, t.kind, t.file, t.line, t.column, t.end_line, "
+    "t.end_column, t.rel_fname FROM tags t "
+    "JOIN temp.bulk_paths p ON t.file_path = p.file_path "
+    "ORDER BY t.file_path, t.id"
+)
+_SELECT_BULK_LOCATIONS = (
+    "SELECT t.name, t.file_path, t.line, t.kind FROM tags t "
+    "JOIN temp.bulk_paths p ON t.file_path = p.file_path "
+    "ORDER BY t.file_path, t.id"
+)
+# Read-only lookups of a batch of files, filled with one "?" per path
+_SELECT_FILE_META_IN = (
+    "SELECT file_path, file_hash, mtime, size, mtime_ns, inode, cached_at "
+    "FROM file_cache WHERE file_path IN ({})"
+)
+_SELECT_TAGS_IN = (
+    "SELECT file_path, name, kind, file, line, column, end_line, end_column, "
+    "rel_fname FROM tags WHERE file_path IN ({}) ORDER BY file_path, id"
+)
+# Paths bound per read-only lookup, below SQLite's host parameter limit
+_MAX_IN_PATHS = 500
+_SELECT_NAME_LOCATIONS = (
+    "SELECT file_path, line, kind FROM tags WHERE name = ? ORDER BY file_path, id"
+)
+_INSERT_TAG = (
+    "INSERT INTO tags (file_path, name, kind, file, line, column, end_line, "
+    "end_column, rel_fname) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Pending write: (file_path, file_hash, stat at hashing time, tags)
+_PendingWrite = Tuple[str, str, os.stat_result, List[CodeTag]]
+
+# Fingerprint refresh: (file_path, stat, time the content was found unchanged)
+_Refresh = Tuple[str, os.stat_result, float]
+
+
+def _row_to_tag(row: Tuple[Any, ...]) -> CodeTag:
+    """CodeTag from a (file_path, name, kind, file, line, column, end_line,
+    end_column, rel_fname) row."""
+    return CodeTag(
+        name=row[1],
+        kind=row[2],
+        file=row[3],
+        line=row[4],
+        column=row[5],
+        end_line=row[6],
+        end_column=row[7],
+        rel_fname=row[8],
+    )
+
 
 class TreeSitterTagCache:
     """Generic tag caching system for tree-sitter parsing results using CodeTag"""
 
-    def __init__(self, cache_dir: Optional[Path] = None):
+    def __init__(
+        self, cache_dir: Optional[Path] = None, hash_algorithm: Optional[str] = None
+    ):
         """Initialize cache with SQLite backend
 
         Args:
             cache_dir: Directory for cache storage. Defaults to ~/.repomap-tool/cache
+            hash_algorithm: Content hash used when a file's stat fingerprint
+                changed: "sha256" (default), "blake2b" or "xxhash"
+
+        Raises:
+            ValueError: If hash_algorithm is not supported
         """
+        hash_algorithm = hash_algorithm or "sha256"
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(
+                f"Invalid hash algorithm: {hash_algorithm}. Valid: {HASH_ALGORITHMS}"
+            )
+        if hash_algorithm == "xxhash" and not XXHASH_AVAILABLE:
+            logger.warning("xxhash is not installed, using blake2b for the tag cache")
+            hash_algorithm = "blake2b"
+        self.hash_algorithm = hash_algorithm
+
         self.cache_dir = cache_dir or Path.home() / ".repomap-tool" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = self.cache_dir / "tags.db"
 
+        # One connection per thread, opened lazily and reused for every call
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        # Write batching state (see batched_writes)
+        self._write_lock = threading.Lock()
+        self._pending_writes: Dict[str, _PendingWrite] = {}
+        self._pending_refreshes: List[_Refresh] = []
+        self._batch_limits: Optional[Tuple[int, float]] = None
+        self._batch_started = time.monotonic()
+
         # Check if cache is disabled via environment variable
         if os.getenv("REPOMAP_DISABLE_CACHE", "0").lower() in ("1", "true", "yes"):
             self._cache_disabled = True
@@ -41,9 +189,51 @@ class TreeSitterTagCache:
             self._cache_disabled = False
             self._init_db()
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's pooled connection, opening it on first use
+
+        Returns:
+            Open SQLite connection configured for WAL mode
+        """
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        # Each connection is only used by the thread that opened it, but
+        # close() shuts them all down from whichever thread calls it
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=_BUSY_TIMEOUT,
+            cached_statements=64,
+            check_same_thread=False,
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+        self._local.conn = conn
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close all pooled connections
+
+        Buffered writes are flushed first. The cache stays usable;
+        connections are reopened on the next call.
+        """
+        self._flush_pending()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing tag cache connection: {e}")
+        self._local = threading.local()
+
     def _init_db(self) -> None:
         """Initialize SQLite database schema"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # File cache table - tracks file metadata
@@ -53,11 +243,20 @@ class TreeSitterTagCache:
                 file_path TEXT PRIMARY KEY,
                 file_hash TEXT NOT NULL,
                 mtime REAL NOT NULL,
-                cached_at REAL NOT NULL
+                cached_at REAL NOT NULL,
+                size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER
             )
         """
         )
 
+        # Stat fingerprint columns were added after the initial schema
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(file_cache)")}
+        for column in ("size", "mtime_ns", "inode"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE file_cache ADD COLUMN {column} INTEGER")
+
         # Tags table - stores CodeTag data
         cursor.execute(
             """
@@ -93,8 +292,15 @@ class TreeSitterTagCache:
         """
         )
 
+        # Identifier -> locations lookups
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_tags_name
+            ON tags(name)
+        """
+        )
+
         conn.commit()
-        conn.close()
 
     def get_tags(self, file_path: str) -> Optional[List[CodeTag]]:
         """Get cached tags for a file if valid - returns CodeTag objects
@@ -108,22 +314,14 @@ class TreeSitterTagCache:
         if self._cache_disabled:
             return None
 
+        self._flush_pending(file_path)
         if not self._is_cache_valid(file_path):
             return None
 
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT name, kind, file, line, column, end_line, end_column, rel_fname
-            FROM tags WHERE file_path = ?
-        """,
-            (file_path,),
-        )
+        conn = self._get_connection()
 
         tags = []
-        for row in cursor.fetchall():
+        for row in conn.execute(_SELECT_TAGS, (file_path,)):
             name, kind, file, line, column, end_line, end_column, rel_fname = row
             tag = CodeTag(
                 name=name,
@@ -137,12 +335,216 @@ class TreeSitterTagCache:
             )
             tags.append(tag)
 
-        conn.close()
         return tags
 
+    def get_tags_bulk(
+        self, file_paths: Iterable[str], read_only: bool = False
+    ) -> Dict[str, List[CodeTag]]:
+        """Get cached tags for many files at once - returns CodeTag objects
+
+        Freshness of every file is checked in a single pass and the tags of all
+        valid files are streamed back in one query, instead of one validity
+        check and one SELECT per file.
+
+        Args:
+            file_paths: Paths of the files to get cached tags for
+            read_only: Neither flush buffered writes nor write to the database,
+                for readers running alongside the thread that writes (see
+                get_valid_files)
+
+        Returns:
+            Mapping of file path to its CodeTag list. Files without a valid
+            cache entry are omitted.
+        """
+        if self._cache_disabled:
+            return {}
+
+        conn = self._get_connection()
+        results: Dict[str, List[CodeTag]] = {}
+
+        if read_only:
+            valid = self._read_valid_paths(conn, file_paths)
+            for file_path in valid:
+                results[file_path] = []
+            for start in range(0, len(valid), _MAX_IN_PATHS):
+                chunk = valid[start : start + _MAX_IN_PATHS]
+                query = _SELECT_TAGS_IN.format(",".join("?" * len(chunk)))
+                for row in conn.execute(query, chunk):
+                    results[row[0]].append(_row_to_tag(row))
+            return results
+
+        self._flush_pending()
+        with conn:
+            for file_path in self._stage_valid_paths(conn, file_paths):
+                results[file_path] = []
+
+            # Stream the tags of all remaining files back in one query
+            for row in conn.execute(_SELECT_BULK_TAGS):
+                results[row[0]].append(_row_to_tag(row))
+
+            conn.execute("DELETE FROM temp.bulk_paths")
+
+        logger.debug(f"Bulk cache lookup returned tags for {len(results)} files")
+        return results
+
+    def get_identifier_index(self, file_paths: Iterable[str]) -> IdentifierIndex:
+        """Load the identifier -> locations index for many files at once
+
+        Freshness is checked as in get_tags_bulk, but only the name, file,
+        line and kind of each tag are read, straight into the index.
+
+        Args:
+            file_paths: Paths of the files to index
+
+        Returns:
+            Index over the tags of every file with a valid cache entry
+        """
+        index = IdentifierIndex()
+        if self._cache_disabled:
+            return index
+
+        self._flush_pending()
+        conn = self._get_connection()
+        with conn:
+            self._stage_valid_paths(conn, file_paths)
+            for name, file_path, line, kind in conn.execute(_SELECT_BULK_LOCATIONS):
+                index.add(file_path, name, IdentifierLocation(file_path, line, kind))
+            conn.execute("DELETE FROM temp.bulk_paths")
+
+        logger.debug(f"Loaded identifier index with {len(index)} identifiers")
+        return index
+
+    def get_identifier_locations(self, name: str) -> List[IdentifierLocation]:
+        """Look up every cached location of one identifier
+
+        Entries are not re-validated; use get_identifier_index for results
+        that must reflect the current file contents.
+
+        Args:
+            name: Identifier name
+
+        Returns:
+            Locations of the identifier, definitions first
+        """
+        if self._cache_disabled:
+            return []
+
+        self._flush_pending()
+        rows = self._get_connection().execute(_SELECT_NAME_LOCATIONS, (name,))
+        locations = [IdentifierLocation(*row) for row in rows]
+        return [loc for loc in locations if loc.is_definition] + [
+            loc for loc in locations if not loc.is_definition
+        ]
+
+    def get_valid_files(
+        self, file_paths: Iterable[str], read_only: bool = False
+    ) -> Set[str]:
+        """Check which files have a valid cache entry, without loading tags
+
+        Uses the same single-pass freshness check as get_tags_bulk, for
+        callers that only need to know which files must be parsed again.
+
+        Args:
+            file_paths: Paths of the files to check
+            read_only: Neither flush buffered writes nor write to the
+                database, so the check never competes with another thread
+                for the write lock. Files with a buffered write count as not
+                cached, and refreshed fingerprints are stored with the next
+                write.
+
+        Returns:
+            Paths of the files whose cached tags are still valid
+        """
+        if self._cache_disabled:
+            return set()
+
+        conn = self._get_connection()
+        if read_only:
+            return set(self._read_valid_paths(conn, file_paths))
+
+        self._flush_pending()
+        with conn:
+            valid = set(self._stage_valid_paths(conn, file_paths))
+            conn.execute("DELETE FROM temp.bulk_paths")
+        return valid
+
+    def _stage_valid_paths(
+        self, conn: sqlite3.Connection, file_paths: Iterable[str]
+    ) -> List[str]:
+        """Load file paths into the bulk lookup table and drop the stale ones
+
+        Must run inside a transaction on ``conn``. Afterwards
+        temp.bulk_paths holds exactly the files with a valid cache entry.
+
+        Args:
+            conn: The calling thread's connection
+            file_paths: Paths of the files to check
+
+        Returns:
+            Paths of the files whose cache entry is valid
+        """
+        conn.execute(_CREATE_BULK_PATHS)
+        conn.execute("DELETE FROM temp.bulk_paths")
+        conn.executemany(_INSERT_BULK_PATH, ((path,) for path in file_paths))
+
+        # Validate freshness for every requested file that has an entry
+        valid = []
+        stale_paths = []
+        refreshed: List[_Refresh] = []
+        for row in conn.execute(_SELECT_BULK_FILE_META).fetchall():
+            is_valid, new_stat = self._validate_entry(row[0], row[1:])
+            if is_valid:
+                valid.append(row[0])
+                if new_stat is not None:
+                    refreshed.append((row[0], new_stat, time.time()))
+            else:
+                stale_paths.append((row[0],))
+        conn.executemany(_DELETE_BULK_PATH, stale_paths)
+        self._refresh_fingerprints(conn, refreshed)
+        return valid
+
+    def _read_valid_paths(
+        self, conn: sqlite3.Connection, file_paths: Iterable[str]
+    ) -> List[str]:
+        """Check file freshness with SELECTs only
+
+        Files with a buffered write are skipped rather than flushed, and
+        fingerprints that need refreshing are queued for the next write
+        instead of being updated here.
+
+        Args:
+            conn: The calling thread's connection
+            file_paths: Paths of the files to check
+
+        Returns:
+            Paths of the files whose cache entry is valid
+        """
+        with self._write_lock:
+            paths = [path for path in file_paths if path not in self._pending_writes]
+
+        valid = []
+        refreshed: List[_Refresh] = []
+        for start in range(0, len(paths), _MAX_IN_PATHS):
+            chunk = paths[start : start + _MAX_IN_PATHS]
+            query = _SELECT_FILE_META_IN.format(",".join("?" * len(chunk)))
+            for row in conn.execute(query, chunk).fetchall():
+                is_valid, new_stat = self._validate_entry(row[0], row[1:])
+                if is_valid:
+                    valid.append(row[0])
+                    if new_stat is not None:
+                        refreshed.append((row[0], new_stat, time.time()))
+
+        if refreshed:
+            with self._write_lock:
+                self._pending_refreshes.extend(refreshed)
+        return valid
+
     def set_tags(self, file_path: str, tags: List[CodeTag]) -> None:
         """Cache tags for a file - accepts CodeTag objects
 
+        Inside a batched_writes() block the write is buffered and committed
+        together with other files; otherwise it is committed immediately.
+
         Args:
             file_path: Path to the file being cached
             tags: List of CodeTag objects to cache
@@ -150,49 +552,141 @@ class TreeSitterTagCache:
         if self._cache_disabled:
             return
 
+        # Stat before hashing so a concurrent edit leaves a mismatched fingerprint
+        file_stat = os.stat(file_path)
         file_hash = self._compute_file_hash(file_path)
-        mtime = Path(file_path).stat().st_mtime
+        entry: _PendingWrite = (file_path, file_hash, file_stat, tags)
+
+        should_flush = False
+        with self._write_lock:
+            limits = self._batch_limits
+            if limits is not None:
+                self._pending_writes[file_path] = entry
+                max_files, max_delay = limits
+                should_flush = (
+                    len(self._pending_writes) >= max_files
+                    or time.monotonic() - self._batch_started >= max_delay
+                )
+
+        if limits is None:
+            with self._write_lock:
+                refreshes, self._pending_refreshes = self._pending_refreshes, []
+            self._write_entries([entry], refreshes)
+            logger.debug(f"Cached {len(tags)} tags for {file_path}")
+        elif should_flush:
+            self.flush()
+
+    @contextmanager
+    def batched_writes(
+        self, max_files: int = 500, max_delay_ms: int = 1000
+    ) -> Iterator["TreeSitterTagCache"]:
+        """Group set_tags calls into large transactions
+
+        Buffered writes are committed in one transaction whenever max_files
+        files are pending or max_delay_ms has passed since the last commit,
+        and once more when the block exits. Reading a buffered file flushes
+        the batch first, so buffered files are never reported as missing.
 
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        Args:
+            max_files: Number of buffered files that triggers a commit
+            max_delay_ms: Maximum age in milliseconds of the oldest buffered write
 
-        # Delete old entry if exists
-        cursor.execute("DELETE FROM file_cache WHERE file_path = ?", (file_path,))
-        cursor.execute("DELETE FROM tags WHERE file_path = ?", (file_path,))
+        Yields:
+            This cache instance
+        """
+        with self._write_lock:
+            previous = self._batch_limits
+            self._batch_limits = (max(1, max_files), max_delay_ms / 1000.0)
+            self._batch_started = time.monotonic()
+        try:
+            yield self
+        finally:
+            with self._write_lock:
+                self._batch_limits = previous
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit all buffered writes in a single transaction"""
+        with self._write_lock:
+            entries = list(self._pending_writes.values())
+            self._pending_writes = {}
+            refreshes, self._pending_refreshes = self._pending_refreshes, []
+            self._batch_started = time.monotonic()
+
+        if entries or refreshes:
+            self._write_entries(entries, refreshes)
+            logger.debug(f"Flushed cached tags for {len(entries)} files")
+
+    def _flush_pending(self, file_path: Optional[str] = None) -> None:
+        """Flush buffered writes before a read touches the database
 
-        # Insert file cache entry
-        cursor.execute(
-            """
-            INSERT INTO file_cache (file_path, file_hash, mtime, cached_at)
-            VALUES (?, ?, ?, ?)
-        """,
-            (file_path, file_hash, mtime, datetime.now().timestamp()),
-        )
+        Args:
+            file_path: Only flush if this file has a buffered write. Flushes
+                whenever anything is buffered if not given.
+        """
+        if file_path is None:
+            if self._pending_writes or self._pending_refreshes:
+                self.flush()
+        elif file_path in self._pending_writes:
+            self.flush()
+
+    def _write_entries(
+        self, entries: List[_PendingWrite], refreshes: Optional[List[_Refresh]] = None
+    ) -> None:
+        """Replace the cache entries of several files in one transaction
 
-        # Insert tags
-        for tag in tags:
-            cursor.execute(
-                """
-                INSERT INTO tags (file_path, name, kind, file, line, column, end_line, end_column, rel_fname)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        Args:
+            entries: Pending writes to persist
+            refreshes: Queued fingerprint refreshes, applied before the
+                entries so a file written again keeps its new fingerprint
+        """
+        paths = [(entry[0],) for entry in entries]
+        cached_at = datetime.now().timestamp()
+
+        conn = self._get_connection()
+        with conn:
+            self._refresh_fingerprints(conn, refreshes or [])
+
+            # Delete old entries if they exist
+            conn.executemany(_DELETE_FILE_META, paths)
+            conn.executemany(_DELETE_FILE_TAGS, paths)
+
+            # Insert file cache entries
+            conn.executemany(
+                _INSERT_FILE_META,
                 (
-                    file_path,
-                    tag.name,
-                    tag.kind,
-                    tag.file,
-                    tag.line,
-                    tag.column,
-                    tag.end_line,
-                    tag.end_column,
-                    tag.rel_fname,
+                    (
+                        file_path,
+                        file_hash,
+                        st.st_mtime,
+                        cached_at,
+                        st.st_size,
+                        st.st_mtime_ns,
+                        st.st_ino,
+                    )
+                    for file_path, file_hash, st, _ in entries
                 ),
             )
 
-        conn.commit()
-        conn.close()
-
-        logger.debug(f"Cached {len(tags)} tags for {file_path}")
+            # Insert tags
+            conn.executemany(
+                _INSERT_TAG,
+                (
+                    (
+                        file_path,
+                        tag.name,
+                        tag.kind,
+                        tag.file,
+                        tag.line,
+                        tag.column,
+                        tag.end_line,
+                        tag.end_column,
+                        tag.rel_fname,
+                    )
+                    for file_path, _, _, tags in entries
+                    for tag in tags
+                ),
+            )
 
     def invalidate_file(self, file_path: str) -> None:
         """Invalidate cache for a file
@@ -203,12 +697,18 @@ class TreeSitterTagCache:
         if self._cache_disabled:
             return
 
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM file_cache WHERE file_path = ?", (file_path,))
-        cursor.execute("DELETE FROM tags WHERE file_path = ?", (file_path,))
-        conn.commit()
-        conn.close()
+        with self._write_lock:
+            self._pending_writes.pop(file_path, None)
+            self._pending_refreshes = [
+                refresh
+                for refresh in self._pending_refreshes
+                if refresh[0] != file_path
+            ]
+
+        conn = self._get_connection()
+        with conn:
+            conn.execute(_DELETE_FILE_META, (file_path,))
+            conn.execute(_DELETE_FILE_TAGS, (file_path,))
 
         logger.debug(f"Invalidated cache for {file_path}")
 
@@ -217,17 +717,19 @@ class TreeSitterTagCache:
         if self._cache_disabled:
             return
 
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM file_cache")
-        cursor.execute("DELETE FROM tags")
-        conn.commit()
-        conn.close()
+        with self._write_lock:
+            self._pending_writes = {}
+            self._pending_refreshes = []
+
+        conn = self._get_connection()
+        with conn:
+            conn.execute("DELETE FROM file_cache")
+            conn.execute("DELETE FROM tags")
 
         logger.info("Tag cache cleared")
 
     def _is_cache_valid(self, file_path: str) -> bool:
-        """Check if cached data is still valid (mtime + hash)
+        """Check if cached data is still valid (stat fingerprint, then hash)
 
         Args:
             file_path: Path to the file to check
@@ -238,53 +740,112 @@ class TreeSitterTagCache:
         if self._cache_disabled:
             return False
 
-        if not Path(file_path).exists():
+        self._flush_pending(file_path)
+        conn = self._get_connection()
+        result = conn.execute(_SELECT_FILE_META, (file_path,)).fetchone()
+
+        if not result:
             return False
 
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        is_valid, new_stat = self._validate_entry(file_path, result)
+        if new_stat is not None:
+            with conn:
+                self._refresh_fingerprints(conn, [(file_path, new_stat, time.time())])
+        return is_valid
 
-        cursor.execute(
-            """
-            SELECT file_hash, mtime FROM file_cache WHERE file_path = ?
-        """,
-            (file_path,),
-        )
+    def _validate_entry(
+        self, file_path: str, meta: Tuple[Any, ...]
+    ) -> Tuple[bool, Optional[os.stat_result]]:
+        """Check a stored cache entry against the file on disk
 
-        result = cursor.fetchone()
-        conn.close()
+        The (size, mtime_ns, inode) fingerprint is compared first; the file
+        is only read and hashed when the fingerprint differs or the file was
+        modified too close to when the entry was written to trust it.
 
-        if not result:
-            return False
+        Args:
+            file_path: Path to the file to check
+            meta: Stored (file_hash, mtime, size, mtime_ns, inode, cached_at)
 
-        cached_hash, cached_mtime = result
+        Returns:
+            Tuple of (is_valid, stat). stat is set whenever the content had
+            to be hashed and still matches, so the stored fingerprint and
+            cached_at are refreshed and the next lookup can trust the stat.
+        """
+        cached_hash, cached_mtime, size, mtime_ns, inode, cached_at = meta
         if cached_hash is None or cached_mtime is None:
-            return False
+            return False, None
 
-        current_mtime = Path(file_path).stat().st_mtime
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False, None
 
-        # Check if file modified
-        if current_mtime > cached_mtime:
-            return False
+        fingerprint_matches = (size, mtime_ns, inode) == (
+            st.st_size,
+            st.st_mtime_ns,
+            st.st_ino,
+        )
+        if fingerprint_matches and st.st_mtime < cached_at - _RACY_WINDOW:
+            return True, None
+
+        # A different size always means different content
+        if size is not None and size != st.st_size:
+            return False, None
 
-        # Check if content changed
-        current_hash = self._compute_file_hash(file_path)
-        return bool(current_hash == cached_hash)
+        try:
+            current_hash = self._compute_file_hash(file_path)
+        except OSError:
+            return False, None
+
+        if current_hash != cached_hash:
+            return False, None
+        return True, st
+
+    def _refresh_fingerprints(
+        self,
+        conn: sqlite3.Connection,
+        refreshed: List[_Refresh],
+    ) -> None:
+        """Store new stat fingerprints for files whose content is unchanged
+
+        Args:
+            conn: Connection with an open transaction
+            refreshed: (file_path, stat, time checked) tuples to store; the
+                check time becomes the entry's cached_at
+        """
+        if not refreshed:
+            return
+        conn.executemany(
+            _UPDATE_FINGERPRINT,
+            (
+                (st.st_mtime, st.st_size, st.st_mtime_ns, st.st_ino, checked, path)
+                for path, st, checked in refreshed
+            ),
+        )
 
     def _compute_file_hash(self, file_path: str) -> str:
-        """Compute SHA256 hash of file content
+        """Compute the content hash of a file
 
         Args:
             file_path: Path to the file
 
         Returns:
-            SHA256 hash as hex string
+            Hash as hex string, using the configured hash_algorithm
         """
-        hasher = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+            return hashlib.file_digest(f, self._new_hasher).hexdigest()
+
+    def _new_hasher(self) -> Any:
+        """Create a hash object for the configured hash_algorithm
+
+        Returns:
+            Object with the hashlib update/hexdigest interface
+        """
+        if self.hash_algorithm == "xxhash":
+            return xxhash.xxh3_128()
+        if self.hash_algorithm == "blake2b":
+            return hashlib.blake2b(digest_size=16)
+        return hashlib.sha256()
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics
@@ -292,7 +853,8 @@ class TreeSitterTagCache:
         Returns:
             Dictionary with cache statistics
         """
-        conn = sqlite3.connect(str(self.db_path))
+        self._flush_pending()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute("SELECT COUNT(*) FROM file_cache")
@@ -304,8 +866,6 @@ class TreeSitterTagCache:
         cursor.execute("SELECT SUM(LENGTH(name) + LENGTH(kind)) FROM tags")
         approx_size = cursor.fetchone()[0] or 0
 
-        conn.close()
-
         return {
             "cached_files": file_count,
             "total_tags": tag_count,
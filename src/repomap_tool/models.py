@@ -49,6 +49,46 @@ class PerformanceConfig(BaseModel):
         default=False,
         description="Allow fallback to sequential processing on parallel errors (not recommended for development)",
     )
+    write_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=100000,
+        description="Number of files buffered per tag cache transaction during indexing",
+    )
+    write_batch_interval_ms: int = Field(
+        default=1000,
+        ge=0,
+        le=60000,
+        description="Maximum time in milliseconds a buffered tag cache write may wait",
+    )
+    cache_hash_algorithm: Literal["sha256", "blake2b", "xxhash"] = Field(
+        default="sha256",
+        description="Content hash used to validate tag cache entries whose stat fingerprint changed",
+    )
+    executor: Literal["thread", "process"] = Field(
+        default="thread",
+        description="Worker pool used for parsing: threads, or processes to scale across cores",
+    )
+    extract_comments: bool = Field(
+        default=True,
+        description="Attach nearby comments to parsed tags (skip when unused to save parse time)",
+    )
+    process_chunk_size: int = Field(
+        default=32,
+        ge=1,
+        le=10000,
+        description="Number of files sent to a worker process per task",
+    )
+    pipeline_queue_size: int = Field(
+        default=256,
+        ge=1,
+        le=100000,
+        description="Capacity of each queue between the discover, parse and write stages of indexing",
+    )
+    use_git_index: bool = Field(
+        default=False,
+        description="List project files from the git index instead of walking the tree",
+    )
 
 
 class FuzzyMatchConfig(BaseModel):
@@ -97,6 +137,14 @@ class EmbeddingConfig(BaseModel):
     model_config = ConfigDict(frozen=False)
 
     enabled: bool = Field(default=True, description="Always enabled")
+    backend: Literal["sentence-transformers", "hashing"] = Field(
+        default="sentence-transformers",
+        description="Embedding backend: a transformer model, or hashed subwords and "
+        "character n-grams (offline, no torch)",
+    )
+    hashing_dimension: int = Field(
+        default=256, ge=16, le=4096, description="Embedding length (hashing backend)"
+    )
     model_name: str = Field(
         default="nomic-ai/CodeRankEmbed", description="CodeRankEmbed model (fixed)"
     )
@@ -109,6 +157,26 @@ class EmbeddingConfig(BaseModel):
     cache_dir: Optional[str] = Field(
         default=None, description="Embedding cache directory"
     )
+    store_dtype: Literal["float32", "float16"] = Field(
+        default="float32",
+        description="Precision of embeddings in the on-disk store (float16 halves its size)",
+    )
+    batch_size: int = Field(
+        default=64, ge=1, le=4096, description="Identifiers encoded per model call"
+    )
+    ann_enabled: bool = Field(
+        default=False,
+        description="Search large identifier sets through an approximate (IVF) index",
+    )
+    ann_min_identifiers: int = Field(
+        default=20000, ge=1, description="Smallest identifier set searched via ANN"
+    )
+    ann_lists: int = Field(
+        default=0, ge=0, description="IVF lists (0: about sqrt of the identifiers)"
+    )
+    ann_probe: int = Field(
+        default=8, ge=1, description="IVF lists scanned per query (recall vs latency)"
+    )
 
 
 class TreeConfig(BaseModel):
@@ -1097,9 +1097,13 @@ def handle_authentication_request():
         assert result.exit_code != 0
         assert "No such command" in result.output or "Usage:" in result.output
 
-    def test_missing_required_arguments(self, cli_runner, temp_project):
+    def test_missing_required_arguments(self, cli_runner, temp_project, monkeypatch):
         """Test commands with missing required arguments."""
 
+        # Without a path, index create writes a config into the current
+        # directory, so run from the temporary project, not the repository
+        monkeypatch.chdir(temp_project)
+
         # Test analyze without project path (now works because project_path is optional)
         result = cli_runner.invoke(cli, ["--no-color", "index", "create"])
         assert result.exit_code == 0
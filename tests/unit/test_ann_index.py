@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the IVF approximate nearest-neighbour index.
+"""
+
+import numpy as np
+import pytest
+
+from repomap_tool.code_search import embedding_matcher as embedding_module
+from repomap_tool.code_search.ann_index import (
+    IVFIndex,
+    normalize_rows,
+    recall_at_k,
+    spherical_kmeans,
+)
+from repomap_tool.code_search.embedding_matcher import EmbeddingMatcher
+from repomap_tool.code_search.tfidf_index import top_k_indices
+
+
+def _clustered(count: int, clusters: int = 40, dimension: int = 48, seed: int = 0):
+    """Unit vectors scattered around random cluster centres, like embeddings."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dimension))
+    members = rng.integers(clusters, size=count)
+    vectors = centres[members] + 0.35 * rng.normal(size=(count, dimension))
+    return [f"name_{i}" for i in range(count)], normalize_rows(vectors)
+
+
+def _exact(keys, vectors, queries, k):
+    results = []
+    for scores in queries @ vectors.T:
+        results.append([(keys[i], float(scores[i])) for i in top_k_indices(scores, k)])
+    return results
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    keys, vectors = _clustered(6000)
+    _, queries = _clustered(200, seed=1)
+    return keys, vectors, queries
+
+
+def test_kmeans_returns_unit_centroids_for_every_cluster():
+    _, vectors = _clustered(500, clusters=5)
+
+    centroids = spherical_kmeans(vectors, 5, iterations=5)
+
+    assert centroids.shape == (5, vectors.shape[1])
+    np.testing.assert_allclose(np.linalg.norm(centroids, axis=1), 1.0, rtol=1e-5)
+
+
+def test_recall_at_10_against_exact_search(corpus):
+    keys, vectors, queries = corpus
+    index = IVFIndex.build(keys, vectors, n_probe=8)
+    exact = _exact(keys, vectors, queries, 10)
+
+    recall = recall_at_k(index.search(queries, -1.0, 10), exact, 10)
+    wider = recall_at_k(index.search(queries, -1.0, 10, n_probe=24), exact, 10)
+
+    assert index.n_lists == 77
+    assert recall >= 0.9
+    assert wider >= recall
+
+
+def test_probing_every_list_is_exact(corpus):
+    keys, vectors, queries = corpus
+    index = IVFIndex.build(keys, vectors)
+
+    found = index.search(queries[:20], 0.2, 10, n_probe=index.n_lists)
+
+    for matches, expected in zip(found, _exact(keys, vectors, queries[:20], 10)):
+        expected = [(key, score) for key, score in expected if score >= 0.2]
+        assert [key for key, _ in matches] == [key for key, _ in expected]
+        np.testing.assert_allclose(
+            [score for _, score in matches], [score for _, score in expected], 1e-5
+        )
+
+
+def test_add_is_incremental_and_search_respects_allowed(corpus):
+    keys, vectors, _ = corpus
+    index = IVFIndex.build(keys[:3000], vectors[:3000])
+
+    assert index.add(keys[2990:3010], vectors[2990:3010]) == 10
+    assert len(index) == 3010 and "name_3005" in index
+
+    allowed = {"name_3005", "name_1"}
+    found = index.search(vectors[3005], -1.0, n_probe=index.n_lists, allowed=allowed)
+    assert found[0][0][0] == "name_3005"
+    assert {key for key, _ in found[0]} == allowed
+
+
+def test_save_load_round_trip(tmp_path, corpus):
+    keys, vectors, queries = corpus
+    index = IVFIndex.build(keys[:1000], vectors[:1000], n_probe=3)
+    path = tmp_path / "index.npz"
+    index.save(path, "model-a")
+
+    loaded = IVFIndex.load(path, "model-a")
+
+    assert loaded is not None and len(loaded) == 1000 and loaded.n_probe == 3
+    assert loaded.search(queries[:5], 0.0, 5) == index.search(queries[:5], 0.0, 5)
+    assert IVFIndex.load(path, "model-b") is None
+    assert IVFIndex.load(tmp_path / "missing.npz", "model-a") is None
+
+
+WORDS = ["load", "user", "parse", "tree", "cache", "token", "save", "node"]
+
+
+class _FakeModel:
+    """Bag-of-words stand-in for a SentenceTransformer."""
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        vectors = np.array(
+            [[text.lower().count(word) for word in WORDS] + [1] for text in batch],
+            dtype=np.float32,
+        )
+        return vectors[0] if single else vectors
+
+
+def test_matcher_searches_large_sets_through_a_persisted_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        embedding_module, "_load_model", lambda name, device: _FakeModel()
+    )
+    identifiers = {f"{a}_{b}_{i}" for a in WORDS for b in WORDS for i in range(4)}
+    exact = EmbeddingMatcher(cache_dir=str(tmp_path))
+    approximate = EmbeddingMatcher(
+        cache_dir=str(tmp_path), ann_enabled=True, ann_min_identifiers=100
+    )
+
+    expected = exact.find_semantic_matches("load user", identifiers, 0.5, top_k=10)
+    found = approximate.find_semantic_matches("load user", identifiers, 0.5, top_k=10)
+
+    # Many identifiers share a bag of words, so compare scores, not ties
+    assert [score for _, score in found] == pytest.approx(
+        [score for _, score in expected]
+    )
+    assert (tmp_path / "embeddings.ivf.npz").exists()
+    assert len(approximate.ann_index) == len(identifiers)
+
+    reopened = EmbeddingMatcher(
+        cache_dir=str(tmp_path), ann_enabled=True, ann_min_identifiers=100
+    )
+    grown = identifiers | {"load_user_extra"}
+    matches = reopened.find_semantic_matches("load user", grown, 0.5)
+    assert len(reopened.ann_index) == len(grown)
+    assert {identifier for identifier, _ in matches} <= grown
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the serve daemon and its Unix-socket client.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from repomap_tool.cli.daemon import (
+    SOCKET_ENV_VAR,
+    DaemonClientGroup,
+    DaemonServer,
+    forward_to_daemon,
+    request_daemon,
+)
+from repomap_tool.cli.services.service_factory import ServiceFactory
+from repomap_tool.models import RepoMapConfig
+
+
+@click.group(cls=DaemonClientGroup)
+def toy_cli() -> None:
+    """Toy CLI used to exercise forwarding."""
+
+
+@toy_cli.command()
+@click.argument("name")
+def greet(name: str) -> None:
+    click.echo(f"hello {name} from {os.getpid()} in {os.getcwd()}")
+
+
+@toy_cli.command()
+def fail() -> None:
+    raise click.ClickException("boom")
+
+
+@toy_cli.command()
+def crash() -> None:
+    raise RuntimeError("unexpected")
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are length-limited, so avoid deep pytest tmp dirs
+    with tempfile.TemporaryDirectory(prefix="rmd") as tmp:
+        yield os.path.join(tmp, "daemon.sock")
+
+
+@pytest.fixture
+def running_daemon(socket_path):
+    server = DaemonServer(socket_path, toy_cli)
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    request_daemon(socket_path, {"op": "shutdown"}, timeout=5.0)
+    thread.join(timeout=5.0)
+
+
+class TestDaemonServer:
+    """Test request handling over the socket."""
+
+    def test_forwarded_command_output_and_exit_code(
+        self, running_daemon, tmp_path, monkeypatch
+    ):
+        """Commands run in the daemon process, in the client's directory."""
+        monkeypatch.chdir(tmp_path)
+        response = forward_to_daemon(["greet", "world"], running_daemon.socket_path)
+
+        assert response is not None
+        assert response["exit_code"] == 0
+        assert response["stdout"] == (
+            f"hello world from {os.getpid()} in {os.getcwd()}\n"
+        )
+        assert running_daemon.requests_served == 1
+
+    def test_errors_are_reported_not_raised(self, running_daemon):
+        """Click errors, usage errors and crashes map to exit codes."""
+        failed = forward_to_daemon(["fail"], running_daemon.socket_path)
+        usage = forward_to_daemon(["no-such-command"], running_daemon.socket_path)
+        crashed = forward_to_daemon(["crash"], running_daemon.socket_path)
+
+        assert failed["exit_code"] == 1 and "boom" in failed["stderr"]
+        assert usage["exit_code"] == 2
+        assert crashed["exit_code"] == 1 and "unexpected" in crashed["stderr"]
+
+        # The daemon keeps serving after failures
+        ping = request_daemon(running_daemon.socket_path, {"op": "ping"})
+        assert ping["ok"] and ping["served"] == 3
+
+    def test_refuses_to_replace_live_daemon(self, running_daemon):
+        """Binding to a socket a daemon is listening on fails."""
+        with pytest.raises(RuntimeError):
+            DaemonServer(running_daemon.socket_path, toy_cli).bind()
+
+    def test_stale_socket_is_replaced(self, socket_path):
+        """A leftover socket file from a dead daemon is removed on bind."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        assert os.path.exists(socket_path)
+
+        server = DaemonServer(socket_path, toy_cli)
+        server.bind()
+        server.close()
+        assert not os.path.exists(socket_path)
+
+
+class TestDaemonClient:
+    """Test the client side of forwarding."""
+
+    def test_unreachable_daemon_returns_none(self, socket_path):
+        """No daemon means no response rather than an error."""
+        assert forward_to_daemon(["greet", "x"], socket_path) is None
+
+    def test_group_forwards_when_socket_configured(self, running_daemon):
+        """The group sends argv to the daemon when the env var is set."""
+        result = CliRunner().invoke(
+            toy_cli,
+            ["greet", "daemon"],
+            env={SOCKET_ENV_VAR: running_daemon.socket_path},
+        )
+
+        assert result.exit_code == 0
+        assert "hello daemon" in result.output
+        assert running_daemon.requests_served == 1
+
+    def test_group_falls_back_to_local_execution(self, socket_path):
+        """Without a reachable daemon the command runs locally."""
+        result = CliRunner().invoke(
+            toy_cli, ["greet", "local"], env={SOCKET_ENV_VAR: socket_path}
+        )
+
+        assert result.exit_code == 0
+        assert "hello local" in result.output
+
+
+class TestServiceFactoryWarmCache:
+    """Test the caching the daemon relies on."""
+
+    def test_container_reused_per_configuration(self, tmp_path, monkeypatch):
+        """Same configuration shares a container; different options do not."""
+        created = []
+        monkeypatch.setattr(
+            "repomap_tool.cli.services.service_factory.create_container",
+            lambda config: created.append(config) or object(),
+        )
+        factory = ServiceFactory()
+        config = RepoMapConfig(project_root=str(tmp_path))
+        other = RepoMapConfig(project_root=str(tmp_path), max_results=7)
+
+        first = factory.get_container(config)
+        assert factory.get_container(config.model_copy()) is first
+        assert factory.get_container(other) is not first
+        assert len(created) == 2
+
+        factory.clear_cache(str(tmp_path))
+        assert factory.get_container(config) is not first
+
+    def test_refresh_indexes_catches_up_with_changed_files(
+        self, tmp_path, monkeypatch
+    ):
+        """Reused services re-index edited, new and deleted files."""
+        monkeypatch.setenv("REPOMAP_DISABLE_CACHE", "0")
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "utils.py").write_text("def load_settings():\n    pass\n")
+        (project / "old.py").write_text("def retired_helper():\n    pass\n")
+        config = RepoMapConfig(
+            project_root=str(project), cache_dir=str(tmp_path / "cache")
+        )
+        factory = ServiceFactory()
+        service = factory.create_repomap_service(config)
+        assert {"load_settings", "retired_helper"} <= set(
+            service._get_identifier_index().identifiers
+        )
+
+        (project / "utils.py").write_text(
+            "def load_settings():\n    pass\n\n\ndef save_settings():\n    pass\n"
+        )
+        (project / "newmod.py").write_text("def zzqqfrobnicate():\n    pass\n")
+        (project / "old.py").unlink()
+        factory.refresh_indexes()
+
+        assert factory.create_repomap_service(config) is service
+        identifiers = set(service._get_identifier_index().identifiers)
+        assert {"load_settings", "save_settings", "zzqqfrobnicate"} <= identifiers
+        assert "retired_helper" not in identifiers
+        assert service.refresh_index() == {"created": 0, "modified": 0, "deleted": 0}
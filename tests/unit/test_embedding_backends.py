@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable embedding backends.
+"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from repomap_tool.code_search.embedding_backends import HashingEmbedder, split_subwords
+from repomap_tool.code_search.embedding_matcher import EmbeddingMatcher
+
+
+def test_split_subwords_handles_identifier_styles_and_queries():
+    assert split_subwords("parseHTTPResponse2") == ["parse", "http", "response", "2"]
+    assert split_subwords("load_user-data.json") == ["load", "user", "data", "json"]
+    assert split_subwords("find the User") == ["find", "the", "user"]
+    assert split_subwords("__") == []
+
+
+def test_hashing_embeddings_are_unit_length_and_deterministic():
+    texts = ["load_user", "UserLoader", "parse tree", ""]
+
+    vectors = HashingEmbedder(dimension=64).encode(texts)
+    again = HashingEmbedder(dimension=64).encode(texts)
+
+    assert vectors.shape == (4, 64) and vectors.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(vectors[:3], axis=1), 1.0, rtol=1e-5)
+    assert not vectors[3].any()
+    np.testing.assert_array_equal(vectors, again)
+    assert HashingEmbedder(dimension=64).encode("load_user").shape == (64,)
+    assert HashingEmbedder(dimension=64).encode([]).shape == (0, 64)
+
+
+def test_hashing_embeddings_reflect_shared_words_and_fragments():
+    embedder = HashingEmbedder()
+    query, same, fragment, unrelated = embedder.encode(
+        ["load user", "loadUser", "user_loader", "parse_tree_node"]
+    )
+
+    assert query @ same == pytest.approx(1.0)
+    assert query @ fragment > 0.5
+    assert abs(query @ unrelated) < 0.2
+
+
+def test_matcher_runs_offline_with_the_hashing_backend(tmp_path):
+    matcher = EmbeddingMatcher(
+        cache_dir=str(tmp_path), backend="hashing", hashing_dimension=128
+    )
+    identifiers = {"load_user", "UserLoader", "parse_tree", "save_token"}
+
+    matches = matcher.find_semantic_matches("load user", identifiers, threshold=0.3)
+
+    assert matcher.enabled and matcher.model_name == "hashing-128-3-5-4"
+    assert matcher.store is not None
+    assert (tmp_path / "hashing").is_dir()
+    assert [identifier for identifier, _ in matches[:2]] == ["load_user", "UserLoader"]
+    assert "parse_tree" not in {identifier for identifier, _ in matches}
+
+
+def test_matcher_rejects_unknown_backends(tmp_path):
+    with pytest.raises(ValueError):
+        EmbeddingMatcher(cache_dir=str(tmp_path), backend="word2vec")
+
+
+def test_importing_the_matcher_does_not_load_torch():
+    code = (
+        "import sys, repomap_tool.code_search.embedding_matcher; "
+        "sys.exit('torch' in sys.modules or 'sentence_transformers' in sys.modules)"
+    )
+
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
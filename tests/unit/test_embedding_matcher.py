@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorized embedding search.
+"""
+
+import numpy as np
+import pytest
+
+from repomap_tool.code_search import embedding_matcher as embedding_module
+from repomap_tool.code_search.embedding_matcher import EmbeddingMatcher
+
+WORDS = ["load", "user", "parse", "tree", "cache", "token", "save", "node"]
+
+
+class _FakeModel:
+    """Bag-of-words stand-in for a SentenceTransformer."""
+
+    def __init__(self) -> None:
+        self.encode_calls = 0
+        self.batches = []
+        self.fail_on_call = None
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        self.encode_calls += 1
+        if self.encode_calls == self.fail_on_call:
+            raise RuntimeError("interrupted")
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.batches.append(batch)
+        vectors = np.array(
+            [
+                [text.lower().count(word) for word in WORDS] + [len(text) % 3]
+                for text in batch
+            ],
+            dtype=np.float32,
+        )
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture
+def matcher(tmp_path, monkeypatch):
+    model = _FakeModel()
+    monkeypatch.setattr(embedding_module, "_load_model", lambda name, device: model)
+    return EmbeddingMatcher(cache_dir=str(tmp_path))
+
+
+def _identifiers():
+    identifiers = set()
+    for i, first in enumerate(WORDS):
+        for second in WORDS[i:]:
+            identifiers.add(f"{first}_{second}")
+            identifiers.add(f"{first}{second.title()}Helper")
+    return identifiers
+
+
+def _cosine(matcher, query, identifier):
+    a = matcher.get_embedding(query).astype(np.float64)
+    b = matcher.get_embedding(identifier).astype(np.float64)
+    norms = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / norms) if norms else 0.0
+
+
+@pytest.mark.parametrize("query", ["load user", "tree", "cache token save"])
+def test_matches_equal_pairwise_cosine(matcher, query):
+    identifiers = _identifiers()
+    matcher.score_chunk_rows = 7
+
+    matches = matcher.find_semantic_matches(query, identifiers, threshold=0.3)
+
+    expected = {
+        identifier: _cosine(matcher, query, identifier) for identifier in identifiers
+    }
+    assert {identifier for identifier, _ in matches} == {
+        identifier for identifier, score in expected.items() if score >= 0.3
+    }
+    for identifier, score in matches:
+        assert score == pytest.approx(expected[identifier], abs=1e-5)
+    scores = [score for _, score in matches]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_top_k_and_batch_queries_match_single_queries(matcher):
+    identifiers = _identifiers()
+    queries = ["load user", "parse tree", "zzz"]
+    matcher.score_chunk_rows = 5
+
+    batch = matcher.find_semantic_matches_batch(queries, identifiers, 0.1, top_k=4)
+
+    for query, matches in zip(queries, batch):
+        full = matcher.find_semantic_matches(query, identifiers, 0.1)
+        assert [score for _, score in matches] == pytest.approx(
+            [score for _, score in full[:4]]
+        )
+        assert len(matches) == min(4, len(full))
+
+
+def test_missing_embeddings_are_computed_in_one_batch(matcher):
+    identifiers = _identifiers()
+
+    matcher.find_semantic_matches("load", identifiers)
+    calls = matcher.model.encode_calls
+    matcher.find_semantic_matches("user", identifiers)
+    subset = set(sorted(identifiers)[:10])
+    matcher.find_semantic_matches("user", subset, threshold=float("-inf"))
+
+    # The first search embeds its query and then every identifier in
+    # bounded batches; later searches only embed their new query
+    assert calls == 1 + -(-len(identifiers) // matcher.batch_size)
+    assert matcher.model.encode_calls == calls + 1
+    assert len(matcher.find_semantic_matches("user", subset, float("-inf"))) == 10
+
+
+def test_precompute_embeds_missing_identifiers_in_length_sorted_batches(matcher):
+    identifiers = sorted(_identifiers())
+    matcher.batch_compute_embeddings({identifier: "" for identifier in identifiers[:5]})
+    matcher.model.batches.clear()
+    reported = []
+
+    stats = matcher.precompute_embeddings(
+        identifiers + identifiers[:3],
+        batch_size=16,
+        progress=lambda done, missing: reported.append((done, missing)),
+    )
+
+    batches = matcher.model.batches
+    encoded = [identifier for batch in batches for identifier in batch]
+    assert sorted(encoded) == identifiers[5:]
+    assert [len(identifier) for identifier in encoded] == sorted(map(len, encoded))
+    assert all(len(batch) <= 16 for batch in batches)
+    assert reported[-1] == (len(identifiers) - 5, len(identifiers) - 5)
+    assert stats["total"] == len(identifiers)
+    assert (stats["cached"], stats["computed"]) == (5, len(identifiers) - 5)
+
+
+def test_precompute_resumes_after_a_failed_batch(matcher, tmp_path):
+    identifiers = sorted(_identifiers())
+    matcher.model.fail_on_call = 2
+
+    first = matcher.precompute_embeddings(identifiers, batch_size=10)
+
+    assert first["failed"] == 10
+    assert first["computed"] == len(identifiers) - 10
+
+    resumed = EmbeddingMatcher(cache_dir=str(tmp_path))
+    resumed.model.batches.clear()
+    second = resumed.precompute_embeddings(identifiers, batch_size=10)
+
+    assert second["computed"] == 10 and second["failed"] == 0
+    assert resumed.precompute_embeddings(identifiers)["computed"] == 0
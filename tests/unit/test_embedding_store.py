@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the consolidated embedding store.
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+from repomap_tool.code_search import embedding_matcher as embedding_module
+from repomap_tool.code_search.embedding_matcher import EmbeddingMatcher
+from repomap_tool.code_search.embedding_store import EmbeddingStore
+
+
+def _key(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def _vectors(count: int, dimension: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, dimension))
+
+
+class _FakeModel:
+    """Deterministic stand-in for a SentenceTransformer."""
+
+    def __init__(self) -> None:
+        self.encoded = 0
+
+    def encode(self, texts, convert_to_numpy=True, batch_size=32):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.encoded += len(batch)
+        vectors = np.array(
+            [_vectors(1, seed=int(_key(text), 16) % 2**32)[0] for text in batch],
+            dtype=np.float32,
+        )
+        return vectors[0] if single else vectors
+
+
+def test_store_round_trips_and_reopens(tmp_path):
+    keys = [_key(f"name_{i}") for i in range(50)]
+    vectors = _vectors(50)
+
+    store = EmbeddingStore(tmp_path, "model-a")
+    store.put_many(keys[:30], vectors[:30])
+    store.put_many(keys[30:], vectors[30:])
+
+    reopened = EmbeddingStore(tmp_path, "model-a")
+    found, matrix = reopened.get_many(list(reversed(keys)) + [_key("missing")])
+
+    assert found == list(reversed(keys))
+    np.testing.assert_allclose(matrix, vectors[::-1], rtol=1e-6)
+    assert len(reopened) == 50
+    assert reopened.dimension == 8
+    assert reopened.get(_key("missing")) is None
+
+
+def test_store_sees_rows_appended_by_another_handle(tmp_path):
+    reader = EmbeddingStore(tmp_path, "model-a")
+    writer = EmbeddingStore(tmp_path, "model-a")
+
+    writer.put_many([_key("a")], _vectors(1))
+
+    assert _key("a") in reader
+    np.testing.assert_allclose(reader.get(_key("a")), _vectors(1)[0], rtol=1e-6)
+
+
+def test_store_resets_for_another_model_or_dtype(tmp_path):
+    EmbeddingStore(tmp_path, "model-a").put_many([_key("a")], _vectors(1))
+
+    assert len(EmbeddingStore(tmp_path, "model-a")) == 1
+    assert len(EmbeddingStore(tmp_path, "model-b")) == 0
+    assert len(EmbeddingStore(tmp_path, "model-b", dtype="float16")) == 0
+
+
+def test_store_rejects_mismatched_dimensions(tmp_path):
+    store = EmbeddingStore(tmp_path, "model-a")
+    store.put_many([_key("a")], _vectors(1, dimension=8))
+
+    with pytest.raises(ValueError):
+        store.put_many([_key("b")], _vectors(1, dimension=4))
+    with pytest.raises(ValueError):
+        EmbeddingStore(tmp_path, "model-a", dtype="int8")
+
+
+def test_float16_store_returns_float32(tmp_path):
+    store = EmbeddingStore(tmp_path, "model-a", dtype="float16")
+    store.put_many([_key("a")], _vectors(1))
+
+    vector = store.get(_key("a"))
+
+    assert vector.dtype == np.float32
+    np.testing.assert_allclose(vector, _vectors(1)[0], atol=1e-2)
+
+
+def test_store_ignores_a_torn_append(tmp_path):
+    store = EmbeddingStore(tmp_path, "model-a")
+    store.put_many([_key("a")], _vectors(1))
+    with open(store.vectors_path, "ab") as handle:
+        handle.write(b"\0" * 10)
+
+    reopened = EmbeddingStore(tmp_path, "model-a")
+    reopened.put_many([_key("b")], _vectors(1, seed=1))
+
+    np.testing.assert_allclose(
+        reopened.get(_key("b")), _vectors(1, seed=1)[0], rtol=1e-6
+    )
+    assert len(reopened) == 2
+
+
+def test_stale_rows_are_compacted_in_the_background(tmp_path):
+    store = EmbeddingStore(tmp_path, "model-a", compact_ratio=0.5, compact_min_stale=4)
+    keys = [_key(f"name_{i}") for i in range(6)]
+    store.put_many(keys, _vectors(6))
+
+    assert store.discard(keys[:2] + [_key("missing")]) == 2
+    assert store.stale_rows == 2
+    store.put_many(keys[2:4], _vectors(2, seed=3))
+    store.wait_for_compaction(timeout=10)
+
+    assert store.stale_rows == 0
+    assert store.vectors_path.stat().st_size == 4 * 8 * 4
+    found, matrix = EmbeddingStore(tmp_path, "model-a").get_many(keys)
+    assert found == keys[2:]
+    np.testing.assert_allclose(matrix[:2], _vectors(2, seed=3), rtol=1e-6)
+    np.testing.assert_allclose(matrix[2:], _vectors(6)[4:], rtol=1e-6)
+
+
+def test_matcher_persists_embeddings_in_one_store(tmp_path, monkeypatch):
+    model = _FakeModel()
+    monkeypatch.setattr(embedding_module, "_load_model", lambda name, device: model)
+    legacy = _vectors(1, seed=9)[0].astype(np.float32)
+    np.save(tmp_path / f"{_key('legacy_name')}.npy", legacy)
+
+    matcher = EmbeddingMatcher(cache_dir=str(tmp_path))
+    computed = matcher.batch_compute_embeddings({"load_user": "a.py", "save": "b.py"})
+
+    assert not list(tmp_path.glob("*.npy"))
+    assert model.encoded == 2
+
+    fresh = EmbeddingMatcher(cache_dir=str(tmp_path))
+    loaded = fresh.load_cached_embeddings({"load_user", "save", "legacy_name"})
+
+    assert model.encoded == 2
+    np.testing.assert_allclose(loaded["load_user"], computed["load_user"])
+    np.testing.assert_allclose(loaded["legacy_name"], legacy)
+    assert fresh.get_cache_stats()["persistent_cache_size"] == 3
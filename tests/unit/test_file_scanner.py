@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Tests for project file discovery and compiled ignore matching.
+"""
+
+import os
+import random
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from repomap_tool.core.file_scanner import (
+    DEFAULT_EXCLUSIONS,
+    IgnoreMatcher,
+    get_project_files,
+    is_project_file,
+    iter_project_files,
+    list_git_files,
+    should_ignore_file,
+    walk_project,
+)
+
+ROOT = Path("/project")
+
+# One pattern of every shape should_ignore_file understands
+EDGE_PATTERNS = [
+    "build/",
+    "docs/_build/",
+    "*.log",
+    "*.tar.gz",
+    "*~",
+    "Dockerfile*",
+    "src/*.tmp",
+    "data/[ab]*.csv",
+    "?.cfg",
+    "**/cache",
+    "**/gen/out",
+    "**/test_*",
+    "**/logs/",
+    "vendor/**",
+    "src/**/fixtures",
+    "a**b",
+    "README",
+    "pkg/mod",
+    "",
+    "   ",
+]
+
+PATHS = [
+    "build",
+    "build/x.py",
+    "rebuild/x.py",
+    "docs/_build/index.html",
+    "docs/_build",
+    "app.log",
+    "app.log/inner.py",
+    "logs/app.log",
+    "dist/pkg.tar.gz",
+    "notes.txt~",
+    "Dockerfile",
+    "Dockerfile.dev",
+    "sub/Dockerfile",
+    "src/a.tmp",
+    "src/deep/a.tmp",
+    "data/a1.csv",
+    "data/c1.csv",
+    "x.cfg",
+    "xy.cfg",
+    "cache",
+    "lib/cache/x.py",
+    "lib/cachex/x.py",
+    "gen/out/x.py",
+    "lib/gen/out/x.py",
+    "test_main.py",
+    "tests/test_main.py",
+    "logs",
+    "logs/today.txt",
+    "vendor",
+    "vendor/lib.py",
+    "src/a/b/fixtures/f.json",
+    "src/fixtures",
+    "ab",
+    "README",
+    "README.md",
+    "pkg/mod",
+    "pkg/mod/x.py",
+    "pkg/module.py",
+    "main.py",
+]
+
+
+def _reference(rel_path, patterns):
+    return should_ignore_file(ROOT / rel_path, patterns, ROOT)
+
+
+class TestIgnoreMatcher:
+    """Test that compiled matching agrees with should_ignore_file."""
+
+    @pytest.mark.parametrize("rel_path", PATHS)
+    def test_matches_reference(self, rel_path):
+        patterns = DEFAULT_EXCLUSIONS + EDGE_PATTERNS
+        assert IgnoreMatcher(patterns).matches(rel_path) == _reference(
+            rel_path, patterns
+        )
+
+    def test_last_matching_pattern_wins(self):
+        patterns = ["*.log", "!keep.log", "logs/", "!logs/keep.log", "*.log"]
+        for rel_path in ["a.log", "keep.log", "logs/keep.log", "logs/x", "x.py"]:
+            assert IgnoreMatcher(patterns).matches(rel_path) == _reference(
+                rel_path, patterns
+            ), rel_path
+
+        assert not IgnoreMatcher(["*.log", "!keep.log"]).matches("keep.log")
+        assert IgnoreMatcher(["!keep.log", "*.log"]).matches("keep.log")
+
+    def test_random_patterns_match_reference(self):
+        rng = random.Random(0)
+        patterns_pool = EDGE_PATTERNS + ["!" + p for p in EDGE_PATTERNS if p.strip()]
+        for _ in range(200):
+            patterns = rng.sample(patterns_pool, rng.randint(1, 8))
+            matcher = IgnoreMatcher(patterns)
+            for rel_path in PATHS:
+                assert matcher.matches(rel_path) == _reference(rel_path, patterns), (
+                    patterns,
+                    rel_path,
+                )
+
+    def test_project_walk_uses_matcher(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.py").write_text("")
+        (tmp_path / "src" / "debug.log").write_text("")
+        (tmp_path / "src" / "keep.log").write_text("")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("")
+        (tmp_path / ".gitignore").write_text("*.log\n!src/keep.log\n")
+
+        assert sorted(get_project_files(str(tmp_path))) == [
+            str(tmp_path / "src" / "keep.log"),
+            str(tmp_path / "src" / "main.py"),
+        ]
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    files = {
+        ".gitignore": "*.scratch\n",
+        "root.py": "",
+        "notes.scratch": "",
+        "services/web/.gitignore": "out/\n!keep.scratch\n",
+        "services/web/app.js": "",
+        "services/web/keep.scratch": "",
+        "services/web/other.scratch": "",
+        "services/web/out/bundle.js": "",
+        "services/api/main.py": "",
+        "services/api/out/keep.py": "",
+        "services/api/local.cfg": "",
+        "services/api/third_party/.gitignore": "*\n",
+        "services/api/third_party/lib.py": "",
+    }
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("services/api/local.cfg\n")
+    return tmp_path
+
+
+MONOREPO_FILES = [
+    "root.py",
+    "services/api/main.py",
+    "services/api/out/keep.py",
+    "services/web/app.js",
+    "services/web/keep.scratch",
+]
+
+
+def _relative(paths, root):
+    return sorted(str(Path(p).relative_to(root)) for p in paths)
+
+
+class TestNestedIgnoreRules:
+    """Test per-directory .gitignore files and .git/info/exclude."""
+
+    def test_nested_gitignores_apply_to_their_directory(self, monorepo):
+        files = get_project_files(str(monorepo))
+        assert _relative(files, monorepo) == MONOREPO_FILES
+
+    def test_single_path_check_agrees_with_walk(self, monorepo):
+        included = set(get_project_files(str(monorepo)))
+        for path in monorepo.rglob("*"):
+            if path.is_file() and ".git" not in path.parts:
+                assert is_project_file(str(path), str(monorepo)) == (
+                    str(path) in included
+                ), path
+
+
+@pytest.fixture
+def wide_tree(tmp_path):
+    for i in range(20):
+        package = tmp_path / f"pkg{i}"
+        (package / "sub").mkdir(parents=True)
+        (package / "mod.py").write_text("")
+        (package / "sub" / "leaf.py").write_text("")
+        (package / "__pycache__").mkdir()
+        (package / "__pycache__" / "mod.cpython-311.pyc").write_text("")
+    return tmp_path
+
+
+class TestProjectWalker:
+    """Test the concurrent scandir walker."""
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_matches_single_path_checks(self, monorepo, max_workers):
+        expected = sorted(
+            str(p)
+            for p in monorepo.rglob("*")
+            if p.is_file() and is_project_file(str(p), str(monorepo))
+        )
+        files = list(iter_project_files(str(monorepo), max_workers=max_workers))
+        assert sorted(files) == expected
+        assert sorted(get_project_files(str(monorepo), max_workers=max_workers)) == (
+            expected
+        )
+
+    def test_project_files_are_sorted(self, wide_tree):
+        files = get_project_files(str(wide_tree), max_workers=4)
+        assert files == sorted(files)
+        assert files == get_project_files(str(wide_tree), max_workers=1)
+
+    def test_sequential_walk_keeps_os_walk_order(self, wide_tree):
+        expected = [root for root, _, _ in os.walk(wide_tree)]
+        listings = walk_project(str(wide_tree), max_workers=1)
+        assert [str(wide_tree / listing.rel_dir) for listing in listings] == expected
+
+    def test_parents_are_listed_before_children(self, wide_tree):
+        seen = set()
+        for listing in walk_project(str(wide_tree), max_workers=4, with_stat=True):
+            parent = listing.rel_dir.rpartition("/")[0]
+            assert not listing.rel_dir or parent in seen
+            assert len(listing.stats) == len(listing.files)
+            seen.add(listing.rel_dir)
+        assert len(seen) == 61
+
+    def test_stopping_early_shuts_down_workers(self, wide_tree):
+        files = iter_project_files(str(wide_tree), max_workers=4)
+        assert next(files)
+        files.close()
+        assert not [
+            t for t in threading.enumerate() if t.name.startswith("repomap-walk")
+        ]
+
+    def test_rejects_bad_worker_count(self, wide_tree):
+        with pytest.raises(ValueError):
+            list(walk_project(str(wide_tree), max_workers=0))
+
+    def test_overlaps_slow_directory_reads(self, wide_tree, monkeypatch):
+        real_scandir = os.scandir
+
+        def slow_scandir(path):
+            time.sleep(0.01)  # e.g. a network filesystem round trip
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", slow_scandir)
+
+        start = time.perf_counter()
+        sequential = get_project_files(str(wide_tree), max_workers=1)
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = get_project_files(str(wide_tree), max_workers=8)
+        parallel_time = time.perf_counter() - start
+
+        assert sorted(parallel) == sorted(sequential)
+        assert parallel_time < sequential_time / 2
+
+
+def _git(root, *args):
+    subprocess.run(
+        ["git", "-C", str(root), *args],
+        check=True,
+        capture_output=True,
+        env={
+            "GIT_AUTHOR_NAME": "t",
+            "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t",
+            "GIT_COMMITTER_EMAIL": "t@example.com",
+            "GIT_CONFIG_NOSYSTEM": "1",
+            "HOME": str(root),
+        },
+    )
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestGitIndexDiscovery:
+    """Test listing project files from the git index."""
+
+    def test_matches_walk_for_git_checkout(self, monorepo):
+        shutil.rmtree(monorepo / ".git")
+        _git(monorepo, "init", "-q")
+        (monorepo / ".git" / "info").mkdir(exist_ok=True)
+        (monorepo / ".git" / "info" / "exclude").write_text("services/api/local.cfg\n")
+        _git(monorepo, "add", "root.py", "services/web/app.js")
+        _git(monorepo, "commit", "-q", "-m", "init")
+        (monorepo / "deleted.py").write_text("")
+        _git(monorepo, "add", "deleted.py")
+        (monorepo / "deleted.py").unlink()
+
+        files = get_project_files(str(monorepo), use_git_index=True)
+        assert _relative(files, monorepo) == MONOREPO_FILES
+        assert sorted(files) == sorted(get_project_files(str(monorepo)))
+
+    def test_falls_back_to_walk_outside_git(self, monorepo):
+        if list_git_files(str(monorepo)) is not None:
+            pytest.skip("temporary directory is inside a git work tree")
+        files = get_project_files(str(monorepo), use_git_index=True)
+        assert _relative(files, monorepo) == MONOREPO_FILES
+
+
+def _synthetic_tree(count, seed=0):
+    """Relative paths shaped like a large monorepo checkout."""
+    rng = random.Random(seed)
+    top = ["src", "lib", "packages", "tests", "docs", "node_modules", "build"]
+    mid = ["core", "utils", "api", "models", "__pycache__", "vendor", "gen"]
+    names = ["main", "helpers", "index", "types", "config", "server", "client"]
+    exts = [".py", ".js", ".ts", ".pyc", ".log", ".md", ".json", ".so"]
+    paths = []
+    for i in range(count):
+        depth = rng.randint(0, 4)
+        parts = [rng.choice(top)] + [rng.choice(mid) for _ in range(depth)]
+        parts.append(f"{rng.choice(names)}{i % 97}{rng.choice(exts)}")
+        paths.append("/".join(parts))
+    return paths
+
+
+class TestIgnoreMatcherPerformance:
+    """Benchmark compiled matching against the per-pattern loop."""
+
+    def test_synthetic_100k_tree(self):
+        patterns = DEFAULT_EXCLUSIONS + [
+            "build/",
+            "*.log",
+            "**/gen",
+            "docs/**",
+            "!docs/index.md",
+        ]
+        paths = _synthetic_tree(100_000)
+        sample = paths[:5_000]
+
+        start = time.perf_counter()
+        matcher = IgnoreMatcher(patterns)
+        compiled = [matcher.matches(p) for p in paths]
+        compiled_per_path = (time.perf_counter() - start) / len(paths)
+
+        start = time.perf_counter()
+        reference = [_reference(p, patterns) for p in sample]
+        reference_per_path = (time.perf_counter() - start) / len(sample)
+
+        assert compiled[: len(sample)] == reference
+        print(
+            f"\nIgnore matching over {len(paths)} paths: "
+            f"{compiled_per_path * 1e6:.2f}us/path compiled, "
+            f"{reference_per_path * 1e6:.2f}us/path per-pattern "
+            f"({reference_per_path / compiled_per_path:.0f}x)"
+        )
+        assert compiled_per_path < reference_per_path
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Tests for file watching and incremental index updates.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from repomap_tool.code_analysis.advanced_dependency_graph import (
+    AdvancedDependencyGraph,
+)
+from repomap_tool.code_analysis.models import (
+    CallGraph,
+    FileImports,
+    FunctionCall,
+    Import,
+    ProjectImports,
+)
+from repomap_tool.core.file_scanner import get_project_files, is_project_file
+from repomap_tool.core.file_watcher import (
+    WATCHDOG_AVAILABLE,
+    NativeWatcher,
+    PollingWatcher,
+    create_file_watcher,
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("import b\n")
+    (tmp_path / "pkg" / "b.py").write_text("x = 1\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("module.exports = 1\n")
+    (tmp_path / "generated").mkdir()
+    (tmp_path / "generated" / "out.py").write_text("y = 2\n")
+    (tmp_path / "notes.log").write_text("log\n")
+    (tmp_path / ".gitignore").write_text("generated/\n")
+    return tmp_path
+
+
+def _as_set(changes):
+    return {(change.path, change.kind) for change in changes}
+
+
+class TestIsProjectFile:
+    """Test the single-path form of get_project_files' filtering."""
+
+    def test_agrees_with_project_walk(self, project):
+        """Every file on disk is classified the same way the walk does."""
+        included = set(get_project_files(str(project)))
+        every_file = [str(p) for p in project.rglob("*") if p.is_file()]
+
+        for file_path in every_file:
+            assert is_project_file(file_path, str(project)) == (
+                file_path in included
+            ), file_path
+        assert not is_project_file("/elsewhere/x.py", str(project))
+
+
+class TestPollingWatcher:
+    """Test the portable stat-diffing watcher."""
+
+    def test_reports_created_modified_and_deleted(self, project):
+        watcher = PollingWatcher(str(project), interval=0.05)
+        watcher.start()
+
+        (project / "pkg" / "c.py").write_text("z = 3\n")
+        (project / "pkg" / "a.py").write_text("import b\nimport c\n")
+        (project / "pkg" / "b.py").unlink()
+        (project / "node_modules" / "other.js").write_text("1\n")
+
+        assert _as_set(watcher.wait_for_changes(timeout=1.0)) == {
+            (str(project / "pkg" / "c.py"), "created"),
+            (str(project / "pkg" / "a.py"), "modified"),
+            (str(project / "pkg" / "b.py"), "deleted"),
+        }
+        assert watcher.wait_for_changes(timeout=0.1) == []
+
+    def test_rejects_bad_settings(self, project):
+        with pytest.raises(ValueError):
+            PollingWatcher(str(project), interval=0)
+        with pytest.raises(ValueError):
+            create_file_watcher(str(project), backend="fanotify")
+
+        assert isinstance(
+            create_file_watcher(str(project), backend="polling"), PollingWatcher
+        )
+
+
+@pytest.mark.skipif(not WATCHDOG_AVAILABLE, reason="watchdog not installed")
+class TestNativeWatcher:
+    """Test the notification-driven watcher."""
+
+    def _collect(self, watcher, expected, timeout=5.0):
+        seen = set()
+        deadline = time.monotonic() + timeout
+        while not expected <= seen and time.monotonic() < deadline:
+            seen |= _as_set(watcher.wait_for_changes(timeout=0.5))
+        return seen
+
+    def test_reports_only_project_file_changes(self, project):
+        watcher = NativeWatcher(str(project), debounce=0.05)
+        watcher.start()
+        try:
+            (project / "pkg" / "c.py").write_text("z = 3\n")
+            (project / "pkg" / "a.py").write_text("import c\n")
+            (project / "pkg" / "b.py").unlink()
+            (project / "node_modules" / "other.js").write_text("1\n")
+            (project / "generated" / "out.py").write_text("y = 3\n")
+
+            expected = {
+                (str(project / "pkg" / "c.py"), "created"),
+                (str(project / "pkg" / "a.py"), "modified"),
+                (str(project / "pkg" / "b.py"), "deleted"),
+            }
+            seen = self._collect(watcher, expected)
+        finally:
+            watcher.stop()
+
+        assert seen == expected
+
+    def test_directory_removal_deletes_its_files(self, project):
+        import shutil
+
+        watcher = NativeWatcher(str(project), debounce=0.05)
+        watcher.start()
+        try:
+            shutil.rmtree(project / "pkg")
+            expected = {
+                (str(project / "pkg" / "a.py"), "deleted"),
+                (str(project / "pkg" / "b.py"), "deleted"),
+            }
+            seen = self._collect(watcher, expected)
+        finally:
+            watcher.stop()
+
+        assert seen == expected
+
+    def test_ignore_rule_changes_update_known_files(self, project):
+        watcher = NativeWatcher(str(project), debounce=0.05)
+        watcher.start()
+        try:
+            # b.py becomes ignored and generated/ is no longer ignored
+            (project / ".gitignore").write_text("pkg/b.py\n")
+            expected = {
+                (str(project / "pkg" / "b.py"), "deleted"),
+                (str(project / "generated" / "out.py"), "created"),
+            }
+            seen = self._collect(watcher, expected)
+        finally:
+            watcher.stop()
+
+        assert seen == expected
+
+
+def _file_imports(file_path, *targets):
+    return FileImports(
+        file_path=file_path,
+        imports=[
+            Import(module=target, file_path=file_path, resolved_path=target)
+            for target in targets
+        ],
+        language="python",
+    )
+
+
+class TestIncrementalDependencyGraph:
+    """Test that per-file updates match a full rebuild."""
+
+    def _edges(self, graph):
+        imported_by = {
+            path: sorted(node.imported_by or []) for path, node in graph.nodes.items()
+        }
+        return set(graph.graph.edges), imported_by
+
+    def test_file_updates_match_rebuild(self):
+        before = {
+            "a.py": _file_imports("a.py", "b.py", "c.py"),
+            "b.py": _file_imports("b.py", "c.py"),
+            "c.py": _file_imports("c.py"),
+        }
+        after = {
+            "a.py": _file_imports("a.py", "c.py", "d.py"),
+            "c.py": _file_imports("c.py"),
+            "d.py": _file_imports("d.py", "c.py"),
+        }
+
+        graph = AdvancedDependencyGraph()
+        graph.build_graph(ProjectImports(files=dict(before)))
+
+        with patch.object(
+            graph.import_analyzer,
+            "analyze_file_imports",
+            side_effect=lambda path: after[path],
+        ) as mock_analyze:
+            graph.remove_file("b.py")
+            graph.add_file("d.py")
+            graph.update_file("a.py")
+
+        assert mock_analyze.call_count == 2
+
+        rebuilt = AdvancedDependencyGraph()
+        rebuilt.build_graph(ProjectImports(files=dict(after)))
+        assert self._edges(graph) == self._edges(rebuilt)
+        assert graph.get_dependents("c.py") == rebuilt.get_dependents("c.py")
+
+    def test_call_graph_updates_match_rebuild(self):
+        def call(file_path, caller, callee):
+            return FunctionCall(
+                name=callee,
+                file_path=file_path,
+                line_number=1,
+                caller=caller,
+                callee=callee,
+            )
+
+        shared = [call("a.py", "main", "helper"), call("b.py", "run", "helper")]
+        old_b = [call("b.py", "run", "parse"), call("b.py", "run", "helper")]
+        new_b = [call("b.py", "run", "load"), call("b.py", "start", "helper")]
+
+        graph = AdvancedDependencyGraph()
+        graph.integrate_call_graph(
+            CallGraph(function_calls=shared[:1] + old_b, function_locations={})
+        )
+        graph.replace_file_calls("b.py", new_b)
+
+        rebuilt = AdvancedDependencyGraph()
+        rebuilt.integrate_call_graph(
+            CallGraph(function_calls=shared[:1] + new_b, function_locations={})
+        )
+
+        assert dict(graph.function_dependencies) == dict(rebuilt.function_dependencies)
+        assert dict(graph.function_dependents) == dict(rebuilt.function_dependents)
+        assert graph.function_dependencies["run"] == {"load"}
+        assert graph.call_graph.function_locations == {"run": "b.py", "start": "b.py"}
+
+        graph.replace_file_calls("b.py", [])
+        assert graph.function_dependents == {"helper": {"main"}}
+
+
+class TestLiveIndex:
+    """Test that applied file changes reach search results."""
+
+    def _search(self, service, query):
+        from repomap_tool.models import SearchRequest
+
+        response = service.search_identifiers(
+            SearchRequest(query=query, match_type="fuzzy")
+        )
+        return {result.identifier for result in response.results}
+
+    def test_search_sees_created_and_deleted_files(self, project, monkeypatch):
+        from repomap_tool.cli.services import get_service_factory
+        from repomap_tool.core.file_watcher import FileChange
+        from repomap_tool.models import RepoMapConfig
+
+        monkeypatch.setenv("REPOMAP_DISABLE_CACHE", "0")
+        config = RepoMapConfig(
+            project_root=str(project), cache_dir=str(project / ".cache")
+        )
+        service = get_service_factory().create_repomap_service(config)
+        service.analyze_project()
+        service.enable_live_index()
+        assert "zzqqfrobnicate" not in self._search(service, "zzqqfrob")
+
+        new_file = project / "pkg" / "newmod.py"
+        new_file.write_text("def zzqqfrobnicate():\n    pass\n")
+        service.apply_file_changes([FileChange(str(new_file), "created")])
+        assert "zzqqfrobnicate" in self._search(service, "zzqqfrob")
+
+        new_file.unlink()
+        service.apply_file_changes([FileChange(str(new_file), "deleted")])
+        assert "zzqqfrobnicate" not in self._search(service, "zzqqfrob")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the fuzzy matching candidate index and batch scoring.
+"""
+
+import random
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from repomap_tool.code_search.fuzzy_index import FuzzyCandidateIndex
+from repomap_tool.code_search.fuzzy_scoring import _partial_ratio, score_candidates
+
+WORDS = [
+    "get",
+    "set",
+    "user",
+    "load",
+    "account",
+    "handler",
+    "parse",
+    "tree",
+    "node",
+    "id",
+    "x",
+    "ÉTÉ",
+    "data",
+    "cache",
+    "__init__",
+]
+
+QUERIES = [
+    "load_user",
+    "usr",
+    "get",
+    "x",
+    "getuseraccount",
+    "get user",
+    "É",
+    "_",
+    "data-cache",
+    "Node",
+    "user user",
+    "tree.node",
+    "LoadUser",
+]
+
+
+@pytest.fixture(scope="module")
+def identifiers():
+    rng = random.Random(7)
+    identifiers = {"a", "ab", "É", "x-x x", "get get", "LOAD_USER", "load_user"}
+    while len(identifiers) < 1500:
+        parts = [rng.choice(WORDS) for _ in range(rng.randint(1, 4))]
+        name = rng.choice(["_", "", "-", " ", ".", "__"]).join(parts)
+        if rng.random() < 0.3:
+            name = name.title()
+        if rng.random() < 0.1:
+            name += str(rng.randint(0, 99))
+        identifiers.add(name)
+    return identifiers
+
+
+def _matchers(container, threshold, strategies):
+    scan = container.fuzzy_matcher(
+        threshold=threshold,
+        strategies=strategies,
+        cache_results=False,
+        verbose=False,
+        index_min_identifiers=10**9,
+    )
+    indexed = container.fuzzy_matcher(
+        threshold=threshold,
+        strategies=strategies,
+        cache_results=False,
+        verbose=False,
+        index_min_identifiers=1,
+    )
+    return scan, indexed
+
+
+class TestFuzzyCandidateIndex:
+    """Test that the shortlist never drops a match."""
+
+    @pytest.mark.parametrize(
+        "strategies",
+        [
+            None,
+            ["prefix"],
+            ["suffix", "word"],
+            ["levenshtein"],
+            ["prefix", "suffix", "substring", "levenshtein", "word"],
+        ],
+    )
+    @pytest.mark.parametrize("threshold", [0, 50, 70, 85, 100])
+    def test_matches_full_scan(
+        self, session_container, identifiers, strategies, threshold
+    ):
+        scan, indexed = _matchers(session_container, threshold, strategies)
+
+        for query in QUERIES:
+            assert indexed.match_identifiers(query, identifiers) == (
+                scan.match_identifiers(query, identifiers)
+            ), query
+
+    def test_shortlist_is_smaller_than_the_set(self, identifiers):
+        index = FuzzyCandidateIndex(identifiers)
+
+        candidates = index.candidates("load_user", 70, ["prefix", "substring"])
+        assert "load_user" in candidates
+        assert "LOAD_USER" in candidates
+        assert len(candidates) < len(identifiers) / 10
+
+        candidates = index.candidates("getuseraccount", 95, ["levenshtein"])
+        assert len(candidates) < len(identifiers) / 2
+
+    def test_index_follows_identifier_set(self, session_container, identifiers):
+        _, matcher = _matchers(session_container, 70, None)
+
+        matcher.match_identifiers("load_user", identifiers)
+        index = matcher._candidate_index
+        assert index is not None and index.covers(identifiers)
+
+        matcher.match_identifiers("usr", set(identifiers))
+        assert matcher._candidate_index is index
+
+        grown = identifiers | {"load_users_later"}
+        matches = dict(matcher.match_identifiers("load_users_later", grown))
+        assert matches["load_users_later"] == 100
+        assert matcher._candidate_index is not index
+
+
+class TestBatchScoring:
+    """Test that batch scores are fuzzywuzzy's scores."""
+
+    def test_partial_ratio_matches_fuzzywuzzy(self, identifiers):
+        rng = random.Random(3)
+        names = sorted(identifiers)
+        for _ in range(2000):
+            a, b = (rng.choice(names).lower() for _ in range(2))
+            if rng.random() < 0.5:
+                a = a[: rng.randint(1, len(a))] if a else a
+            assert _partial_ratio(a, b) == fuzz.partial_ratio(a, b), (a, b)
+
+    def test_ratio_ties_round_like_fuzzywuzzy(self):
+        # 100 * 14 / 16 = 87.5 and 100 * 10 / 16 = 62.5 are exact ties
+        pairs = [("abcdefgh", "abcdefgx"), ("abcdefgh", "abcdexyz")]
+        index = FuzzyCandidateIndex([b for _, b in pairs])
+        for query, ident in pairs:
+            matches = dict(score_candidates(index, query, 0, ["levenshtein"]))
+            assert matches[ident] == max(
+                fuzz.ratio(query, ident),
+                fuzz.partial_ratio(query, ident),
+                fuzz.token_sort_ratio(query, ident),
+                fuzz.token_set_ratio(query, ident),
+            )
+
+    def test_batch_matches_single_queries(self, session_container, identifiers):
+        scan, indexed = _matchers(
+            session_container, 70, ["prefix", "suffix", "levenshtein", "word"]
+        )
+
+        results = indexed.batch_match_identifiers(QUERIES + QUERIES[:2], identifiers)
+
+        assert set(results) == set(QUERIES)
+        for query in QUERIES:
+            assert results[query] == scan.match_identifiers(query, identifiers)
+
+    def test_batch_indexes_small_sets_once(self, session_container):
+        matcher = session_container.fuzzy_matcher(
+            cache_results=False, verbose=False, index_min_identifiers=100
+        )
+        identifiers = {f"handler_{i}" for i in range(20)}
+
+        matcher.batch_match_identifiers(["handler"], identifiers)
+        assert matcher._candidate_index is None
+
+        results = matcher.batch_match_identifiers(
+            [f"handler_{i}" for i in range(10)], identifiers
+        )
+        assert matcher._candidate_index is not None
+        assert results["handler_3"][0] == ("handler_3", 100)
@@ -258,5 +258,84 @@ def test_hybrid_matcher(session_container, session_test_repo_path):
         print(f"   '{query}' vs '{identifier}': {context_score:.2f}")
 
 
+def _hybrid_matcher(container, max_candidates=1000):
+    return container.hybrid_matcher(
+        fuzzy_matcher=container.fuzzy_matcher(
+            threshold=60, cache_results=False, verbose=False
+        ),
+        embedding_matcher=None,
+        verbose=False,
+        max_candidates=max_candidates,
+    )
+
+
+def _generated_identifiers():
+    import random
+
+    words = ["get", "user", "load", "auth", "token", "data", "cache", "parse"]
+    words += ["config", "file", "node", "tree", "login", "session", "handler"]
+    rng = random.Random(5)
+    identifiers = set()
+    while len(identifiers) < 800:
+        parts = [rng.choice(words) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.5:
+            identifiers.add("_".join(parts))
+        else:
+            identifiers.add(parts[0] + "".join(p.title() for p in parts[1:]))
+    return identifiers
+
+
+def test_hybrid_rerank_matches_full_scoring(session_container):
+    """Recall must never drop an identifier full scoring would keep."""
+    matcher = _hybrid_matcher(session_container, max_candidates=10**6)
+    identifiers = _generated_identifiers()
+    matcher.build_tfidf_model(identifiers)
+
+    for query in ["auth", "load user", "cacheData", "xyz"]:
+        for threshold in [0.1, 0.3, 0.5]:
+            fuzzy_scores = {
+                identifier: score / 100.0
+                for identifier, score in matcher.fuzzy_matcher.match_identifiers(
+                    query, identifiers
+                )
+            }
+            expected = {}
+            for identifier in identifiers:
+                score, _ = matcher._combine_scores(
+                    query, identifier, fuzzy_scores.get(identifier, 0.0), 0.0
+                )
+                if score >= threshold:
+                    expected[identifier] = score
+
+            matches = matcher.find_hybrid_matches(query, identifiers, threshold)
+
+            assert {identifier: score for identifier, score, _ in matches} == (
+                expected
+            ), (query, threshold)
+            assert matcher.last_search_metrics["reranked_candidates"] <= len(
+                identifiers
+            )
+
+
+def test_hybrid_rerank_is_capped_and_timed(session_container):
+    from repomap_tool.core.search_engine import hybrid_search
+
+    matcher = _hybrid_matcher(session_container, max_candidates=50)
+    identifiers = sorted(_generated_identifiers())
+    metrics = {}
+
+    results = hybrid_search("user", identifiers, matcher, 10, 0.1, metrics)
+
+    uncapped = _hybrid_matcher(session_container, max_candidates=10**6)
+    uncapped.build_tfidf_model(set(identifiers))
+    full = uncapped.match_identifiers("user", set(identifiers), 0.1)
+    assert results[0].score == full[0][1] / 100.0
+    assert metrics["recall_candidates"] > 50
+    assert metrics["reranked_candidates"] == 50
+    for stage in ["tfidf_model_ms", "recall_fuzzy_ms", "recall_tfidf_ms"]:
+        assert metrics[stage] >= 0
+    assert metrics["rerank_ms"] >= 0
+
+
 if __name__ == "__main__":
     test_hybrid_matcher()
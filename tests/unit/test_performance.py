@@ -8,12 +8,26 @@ monitoring features.
 
 import pytest
 import tempfile
+import threading
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 from repomap_tool.models import RepoMapConfig, PerformanceConfig
 from repomap_tool.core.repo_map import RepoMapService
-from repomap_tool.core.parallel_processor import ParallelTagExtractor, ProcessingStats
+from repomap_tool.core.parallel_processor import (
+    PIPELINE_STAGES,
+    ParallelTagExtractor,
+    ProcessingStats,
+    pack_tags,
+    unpack_tags,
+    worker_context,
+)
+from repomap_tool.core.tag_cache import TreeSitterTagCache
+from repomap_tool.code_analysis.models import CodeTag
+from repomap_tool.exceptions import ParallelProcessingError
+
+TEST_REPO = Path(__file__).parent.parent / "fixtures" / "test-repo"
 
 
 class TestPerformanceConfig:
@@ -33,6 +47,7 @@ class TestPerformanceConfig:
         assert (
             config.allow_fallback is False
         )  # Development-focused: fail fast by default
+        assert config.executor == "thread"
 
     def test_custom_config(self):
         """Test custom performance configuration."""
@@ -204,6 +219,265 @@ class TestParallelTagExtractor:
         assert processing_stats["processing_time"] == 5.0
         assert processing_stats["files_per_second"] == 2.0
 
+    def test_executor_validation(self):
+        """Test executor selection and validation."""
+        mock_console = MagicMock()
+
+        assert ParallelTagExtractor(console=mock_console).executor == "thread"
+        extractor = ParallelTagExtractor(
+            console=mock_console, executor="process", chunk_size=8
+        )
+        assert extractor.executor == "process"
+        assert extractor.chunk_size == 8
+
+        with pytest.raises(ValueError):
+            ParallelTagExtractor(console=mock_console, executor="fiber")
+
+    def test_worker_processes_are_not_forked(self):
+        """Test pools never fork a process that may hold another thread's lock."""
+        assert worker_context().get_start_method() in ("forkserver", "spawn")
+
+    def test_pack_unpack_tags_roundtrip(self):
+        """Test compact tag rows rebuild identical CodeTags."""
+        tags = [
+            CodeTag(
+                name="run",
+                kind="name.definition.function",
+                file="/tmp/a.py",
+                line=3,
+                column=4,
+                end_line=3,
+                end_column=7,
+                comment="Run it",
+            )
+        ]
+
+        assert unpack_tags("/tmp/a.py", pack_tags(tags)) == tags
+
+    def test_process_executor_matches_thread_executor(self):
+        """Test worker processes return the same tags as threads."""
+        mock_console = MagicMock()
+        files = sorted(str(p) for p in TEST_REPO.glob("*.py"))
+
+        results = {}
+        for executor in ("thread", "process"):
+            extractor = ParallelTagExtractor(
+                max_workers=2,
+                enable_progress=False,
+                console=mock_console,
+                executor=executor,
+                chunk_size=3,
+            )
+            # Capture order within a file is not stable, so compare sorted tags
+            results[executor] = {
+                file_path: (sorted(tags, key=_tag_key), error)
+                for file_path, tags, error in extractor.iter_file_tags(
+                    files, str(TEST_REPO)
+                )
+            }
+
+        assert set(results["process"]) == set(files)
+        assert results["process"] == results["thread"]
+
+    def test_process_executor_uses_given_tag_cache(self, tmp_path, monkeypatch):
+        """Test extract_tags_parallel stores process results in the given cache."""
+        monkeypatch.setenv("REPOMAP_DISABLE_CACHE", "0")
+        tag_cache = TreeSitterTagCache(cache_dir=tmp_path / "cache")
+        files = sorted(p.name for p in TEST_REPO.glob("*.py"))[:3]
+        extractor = ParallelTagExtractor(
+            max_workers=2,
+            enable_progress=False,
+            console=MagicMock(),
+            executor="process",
+        )
+
+        _, stats = extractor.extract_tags_parallel(
+            files, str(TEST_REPO), repo_map=None, tag_cache=tag_cache
+        )
+
+        assert stats.processed_files == len(files)
+        for file_name in files:
+            assert tag_cache.get_tags(str(TEST_REPO / file_name)) is not None
+        tag_cache.close()
+
+    def test_populate_tag_cache_writes_in_parent(self):
+        """Test populate_tag_cache stores worker results through the given cache."""
+        mock_console = MagicMock()
+        mock_cache = Mock()
+        files = sorted(str(p) for p in TEST_REPO.glob("*.py"))[:4]
+        extractor = ParallelTagExtractor(
+            max_workers=2,
+            enable_progress=False,
+            console=mock_console,
+            executor="process",
+            chunk_size=2,
+        )
+
+        stats = extractor.populate_tag_cache(files, str(TEST_REPO), mock_cache)
+
+        assert stats.processed_files == len(files)
+        assert stats.failed_files == 0
+        written = {call.args[0] for call in mock_cache.set_tags.call_args_list}
+        assert written == set(files)
+
+
+def _tag_key(tag):
+    """Sort key for comparing tag lists regardless of capture order."""
+    return (tag.line, tag.column, tag.name, tag.kind)
+
+
+def _fake_parse(self, file_path):
+    """Stand-in for TreeSitterParser.parse_file: one tag per file."""
+    return [CodeTag(name=Path(file_path).stem, kind="def", file=file_path, line=1)]
+
+
+class TestIndexingPipeline:
+    """Test the streaming discover/parse/write pipeline."""
+
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("REPOMAP_DISABLE_CACHE", "0")
+        files = []
+        for i in range(40):
+            file_path = tmp_path / "src" / f"mod_{i}.py"
+            file_path.parent.mkdir(exist_ok=True)
+            file_path.write_text(f"x_{i} = {i}\n")
+            files.append(str(file_path))
+        return tmp_path, files
+
+    def _extractor(self, **kwargs):
+        options = dict(max_workers=2, enable_progress=False, console=MagicMock())
+        options.update(kwargs)
+        return ParallelTagExtractor(**options)
+
+    @patch(
+        "repomap_tool.code_analysis.tree_sitter_parser.TreeSitterParser.parse_file",
+        _fake_parse,
+    )
+    def test_parses_only_stale_files(self, project, tmp_path):
+        root, files = project
+        cache = TreeSitterTagCache(tmp_path / "cache")
+        extractor = self._extractor(chunk_size=8, queue_size=4)
+
+        with cache.batched_writes():
+            first = extractor.run_pipeline(iter(files), str(root), cache)
+
+        assert first.total_files == len(files)
+        assert first.successful_files == len(files)
+        assert first.cached_files == 0
+        assert first.total_identifiers == len(files)
+        assert set(first.stages) == set(PIPELINE_STAGES)
+        assert first.stages["discover"].items == len(files)
+        assert first.stages["parse"].items == len(files)
+        assert first.stages["write"].items == len(files)
+        assert first.stage_throughput("write") > 0
+        assert [t.name for t in cache.get_tags(files[3])] == ["mod_3"]
+
+        Path(files[0]).write_text("changed = 1\n")
+        second = extractor.run_pipeline(files, str(root), cache)
+
+        assert second.cached_files == len(files) - 1
+        assert second.stages["parse"].items == 1
+        assert second.processed_files == len(files)
+        cache.close()
+
+    @patch(
+        "repomap_tool.code_analysis.tree_sitter_parser.TreeSitterParser.parse_file",
+        _fake_parse,
+    )
+    def test_on_tags_sees_cached_and_parsed_files(self, project, tmp_path):
+        root, files = project
+        cache = TreeSitterTagCache(tmp_path / "cache")
+        extractor = self._extractor()
+        extractor.run_pipeline(files[:10], str(root), cache)
+
+        seen = {}
+        stats = extractor.run_pipeline(
+            files,
+            str(root),
+            cache,
+            on_tags=lambda path, tags: seen.update({path: [t.name for t in tags]}),
+        )
+
+        assert seen == {path: [Path(path).stem] for path in files}
+        assert stats.cached_files == 10
+        assert stats.stages["parse"].items == len(files) - 10
+        cache.close()
+
+    def test_backpressure_bounds_read_ahead(self, project):
+        """A slow writer stops discovery from running ahead of it."""
+        root, files = project
+        files = files * 5
+        pulled = 0
+        max_ahead = 0
+
+        def source():
+            nonlocal pulled
+            for file_path in files:
+                pulled += 1
+                yield file_path
+
+        written = 0
+
+        def slow_write(file_path, tags):
+            nonlocal written, max_ahead
+            written += 1
+            max_ahead = max(max_ahead, pulled - written)
+            time.sleep(0.001)
+
+        cache = Mock()
+        cache.get_valid_files.return_value = set()
+        cache.set_tags.side_effect = slow_write
+        queue_size, chunk_size, workers = 4, 4, 2
+        extractor = self._extractor(
+            max_workers=workers, chunk_size=chunk_size, queue_size=queue_size
+        )
+
+        with patch(
+            "repomap_tool.code_analysis.tree_sitter_parser.TreeSitterParser."
+            "parse_file",
+            _fake_parse,
+        ):
+            stats = extractor.run_pipeline(source(), str(root), cache)
+
+        assert written == len(files) == stats.successful_files
+        # Everything in flight: a discovery batch, both queues, one per worker
+        assert max_ahead <= chunk_size + 2 * queue_size + workers + 1
+        assert stats.stages["discover"].blocked_time > 0
+
+    def test_stage_failure_stops_pipeline(self, project):
+        root, files = project
+        cache = Mock()
+        cache.get_valid_files.side_effect = RuntimeError("database is locked")
+        extractor = self._extractor()
+
+        with pytest.raises(ParallelProcessingError, match="database is locked"):
+            extractor.run_pipeline(files, str(root), cache)
+        assert not [
+            t for t in threading.enumerate() if t.name.startswith("repomap-pipeline")
+        ]
+
+    def test_process_executor_matches_threads(self):
+        files = sorted(str(p) for p in TEST_REPO.glob("*.py"))
+        results = {}
+        for executor in ("thread", "process"):
+            cache = Mock()
+            cache.get_valid_files.return_value = set()
+            extractor = self._extractor(executor=executor, chunk_size=3)
+            stats = extractor.run_pipeline(files, str(TEST_REPO), cache)
+            results[executor] = {
+                call.args[0]: sorted(_tag_key(t) for t in call.args[1])
+                for call in cache.set_tags.call_args_list
+            }
+            assert stats.processed_files == len(files)
+
+        assert set(results["process"]) == set(results["thread"])
+        assert results["process"] == results["thread"]
+
+    def test_rejects_bad_queue_size(self):
+        with pytest.raises(ValueError):
+            self._extractor(queue_size=-1)
+
 
 class TestProcessingStats:
     """Test ProcessingStats class."""
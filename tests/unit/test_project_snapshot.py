@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared, incrementally refreshed project snapshot.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from repomap_tool.code_analysis.file_discovery_service import FileDiscoveryService
+from repomap_tool.core.file_scanner import get_project_files
+from repomap_tool.core.project_snapshot import (
+    ProjectSnapshot,
+    clear_project_snapshots,
+    get_project_snapshot,
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "a.py").write_text("a = 1\n")
+    (tmp_path / "src" / "main.py").write_text("import pkg\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "guide.md").write_text("# Guide\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("1\n")
+    (tmp_path / ".gitignore").write_text("*.tmp\n")
+    return tmp_path
+
+
+def _touch_dir(path):
+    """Make sure a directory's mtime moves even on coarse-grained clocks."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestProjectSnapshot:
+    """Test snapshot listing and refresh."""
+
+    def test_matches_project_walk(self, project):
+        snapshot = ProjectSnapshot(str(project))
+
+        assert snapshot.files == get_project_files(str(project))
+        main = str(project / "src" / "main.py")
+        assert main in snapshot
+        assert snapshot.stat(main).size == len("import pkg\n")
+        assert snapshot.generation == 0
+
+    def test_unchanged_refresh_keeps_generation(self, project):
+        snapshot = ProjectSnapshot(str(project))
+
+        assert snapshot.refresh() is False
+        assert snapshot.generation == 0
+
+    def test_refresh_picks_up_changed_directories(self, project):
+        snapshot = ProjectSnapshot(str(project))
+
+        (project / "src" / "pkg" / "b.py").write_text("b = 2\n")
+        (project / "src" / "pkg" / "a.py").unlink()
+        (project / "src" / "pkg" / "scratch.tmp").write_text("")
+        (project / "src" / "new").mkdir()
+        (project / "src" / "new" / "c.py").write_text("c = 3\n")
+        shutil.rmtree(project / "docs")
+        for directory in (project, project / "src", project / "src" / "pkg"):
+            _touch_dir(directory)
+
+        assert snapshot.refresh() is True
+        assert snapshot.generation == 1
+        assert snapshot.files == get_project_files(str(project))
+        assert str(project / "src" / "new" / "c.py") in snapshot
+        assert str(project / "docs" / "guide.md") not in snapshot
+
+    def test_new_gitignore_rescans_with_new_rules(self, project):
+        snapshot = ProjectSnapshot(str(project))
+
+        (project / "src" / ".gitignore").write_text("pkg/\n")
+        _touch_dir(project / "src")
+
+        assert snapshot.refresh() is True
+        assert str(project / "src" / "pkg" / "a.py") not in snapshot
+        assert snapshot.files == get_project_files(str(project))
+
+    def test_shared_snapshot_is_reused(self, project):
+        clear_project_snapshots()
+        try:
+            snapshot = get_project_snapshot(str(project))
+            assert get_project_snapshot(str(project)) is snapshot
+            assert get_project_snapshot(str(project) + "/") is snapshot
+            assert get_project_snapshot(str(project), use_git_index=True) is not (
+                snapshot
+            )
+        finally:
+            clear_project_snapshots()
+
+    def test_file_discovery_follows_generation(self, project):
+        snapshot = ProjectSnapshot(str(project))
+        discovery = FileDiscoveryService(str(project), snapshot=snapshot)
+        before = discovery.get_all_files()
+
+        (project / "src" / "extra.py").write_text("x = 1\n")
+        _touch_dir(project / "src")
+        assert discovery.get_all_files() == before
+
+        snapshot.refresh()
+        assert str(project / "src" / "extra.py") in discovery.get_all_files()
@@ -9,9 +9,11 @@ import pytest
 import tempfile
 import shutil
 import os
+import sqlite3
 from pathlib import Path
 from datetime import datetime
 
+from repomap_tool.core.identifier_index import IdentifierIndex, IdentifierLocation
 from repomap_tool.core.tag_cache import TreeSitterTagCache
 from repomap_tool.code_analysis.models import CodeTag
 
@@ -252,3 +254,463 @@ class TestClass:
 
         # Should return None for nonexistent file
         assert cache.get_tags(file_path) is None
+
+    @pytest.mark.cache_isolation
+    def test_connection_is_reused(self, cache, sample_tags):
+        """Test that repeated calls share one pooled connection."""
+        file_path = sample_tags[0].file
+
+        first = cache._get_connection()
+        cache.set_tags(file_path, sample_tags)
+        cache.get_tags(file_path)
+        cache.get_cache_stats()
+
+        assert cache._get_connection() is first
+
+    @pytest.mark.cache_isolation
+    def test_wal_mode_enabled(self, cache):
+        """Test that the pooled connection runs in WAL mode."""
+        conn = cache._get_connection()
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode.lower() == "wal"
+
+    @pytest.mark.cache_isolation
+    def test_connection_per_thread(self, cache):
+        """Test that each thread gets its own connection."""
+        import threading
+
+        main_conn = cache._get_connection()
+        thread_conns = []
+
+        def worker():
+            thread_conns.append(cache._get_connection())
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert len(thread_conns) == 1
+        assert thread_conns[0] is not main_conn
+
+    @pytest.mark.cache_isolation
+    def test_close_closes_other_threads_connections(self, cache):
+        """Test that close() shuts connections opened by worker threads."""
+        import sqlite3
+        import threading
+
+        opened = threading.Event()
+        closed = threading.Event()
+        errors = []
+
+        def worker():
+            conn = cache._get_connection()
+            opened.set()
+            closed.wait(timeout=5)
+            try:
+                conn.execute("SELECT 1")
+            except sqlite3.ProgrammingError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        opened.wait(timeout=5)
+        cache.close()
+        closed.set()
+        thread.join()
+
+        assert len(errors) == 1
+        assert "closed" in str(errors[0])
+
+    @pytest.mark.cache_isolation
+    def test_close_reopens_on_next_use(self, cache, sample_tags):
+        """Test that the cache stays usable after close()."""
+        file_path = sample_tags[0].file
+        cache.set_tags(file_path, sample_tags)
+
+        cache.close()
+
+        retrieved = cache.get_tags(file_path)
+        assert retrieved is not None
+        assert len(retrieved) == 2
+
+    @pytest.mark.cache_isolation
+    def test_get_tags_bulk(self, cache, sample_tags, temp_cache_dir):
+        """Test loading tags for many files in one call."""
+        file1 = temp_cache_dir / "file1.py"
+        file1.write_text("class TestClass:\n    pass")
+        file2 = temp_cache_dir / "file2.py"
+        file2.write_text("def test_function():\n    pass")
+        empty = temp_cache_dir / "empty.py"
+        empty.write_text("")
+        uncached = temp_cache_dir / "uncached.py"
+        uncached.write_text("x = 1")
+
+        cache.set_tags(str(file1), [sample_tags[0]])
+        cache.set_tags(str(file2), [sample_tags[1]])
+        cache.set_tags(str(empty), [])
+
+        results = cache.get_tags_bulk(
+            [str(file1), str(file2), str(empty), str(uncached), "/nonexistent.py"]
+        )
+
+        assert set(results) == {str(file1), str(file2), str(empty)}
+        assert [t.name for t in results[str(file1)]] == ["TestClass"]
+        assert [t.name for t in results[str(file2)]] == ["test_function"]
+        assert results[str(empty)] == []
+
+    @pytest.mark.cache_isolation
+    def test_get_tags_bulk_skips_stale_files(self, cache, sample_tags, temp_cache_dir):
+        """Test that bulk lookup drops files modified since caching."""
+        test_file = temp_cache_dir / "test_file.py"
+        test_file.write_text("def test(): pass")
+        cache.set_tags(str(test_file), sample_tags)
+
+        test_file.write_text("def test(): pass\n# Modified")
+
+        assert cache.get_tags_bulk([str(test_file)]) == {}
+        # Repeated calls must not see paths from the previous lookup
+        assert cache.get_tags_bulk([]) == {}
+
+    @pytest.mark.cache_isolation
+    def test_get_valid_files(self, cache, sample_tags, temp_cache_dir):
+        """Test checking freshness without loading tags."""
+        fresh = temp_cache_dir / "fresh.py"
+        fresh.write_text("class TestClass:\n    pass")
+        stale = temp_cache_dir / "stale.py"
+        stale.write_text("x = 1")
+        uncached = temp_cache_dir / "uncached.py"
+        uncached.write_text("y = 2")
+        cache.set_tags(str(fresh), sample_tags)
+        cache.set_tags(str(stale), sample_tags)
+        stale.write_text("x = 2  # modified")
+
+        assert cache.get_valid_files([str(fresh), str(stale), str(uncached)]) == {
+            str(fresh)
+        }
+        assert cache.get_tags_bulk([str(stale)]) == {}
+
+    @pytest.mark.cache_isolation
+    def test_identifier_index(self, cache, sample_tags, temp_cache_dir):
+        """Test loading every location of each identifier."""
+        caller = temp_cache_dir / "caller.py"
+        caller.write_text("TestClass()\nTestClass()\n")
+        stale = temp_cache_dir / "stale.py"
+        stale.write_text("TestClass\n")
+        references = [
+            CodeTag(name="TestClass", kind="name.reference.call", file=str(f), line=n)
+            for f, n in ((caller, 1), (caller, 2), (stale, 1))
+        ]
+        cache.set_tags(str(caller), references[:2])
+        cache.set_tags(str(stale), references[2:])
+        cache.set_tags(sample_tags[0].file, sample_tags)
+        stale.write_text("renamed = 1\n")
+
+        index = cache.get_identifier_index(
+            [str(caller), str(stale), sample_tags[0].file]
+        )
+
+        assert sorted(index.identifiers) == ["TestClass", "test_function"]
+        assert index.locations("TestClass") == [
+            IdentifierLocation(str(caller), 1, "name.reference.call"),
+            IdentifierLocation(str(caller), 2, "name.reference.call"),
+            IdentifierLocation(sample_tags[0].file, 2, "class.name"),
+        ]
+        assert index.primary_location("test_function") == IdentifierLocation(
+            sample_tags[0].file, 3, "name.definition.function"
+        )
+        assert "renamed" not in index
+        assert cache.get_identifier_locations("test_function") == [
+            index.primary_location("test_function")
+        ]
+        assert len(cache.get_identifier_locations("TestClass")) == 4
+
+    @pytest.mark.cache_isolation
+    def test_batched_writes_commit_on_exit(self, cache, sample_tags, temp_cache_dir):
+        """Test that batched writes are buffered and committed together."""
+        files = []
+        for i in range(3):
+            file_path = temp_cache_dir / f"batched_{i}.py"
+            file_path.write_text(f"x = {i}\n")
+            files.append(str(file_path))
+
+        with cache.batched_writes(max_files=100, max_delay_ms=60_000):
+            for file_path in files:
+                cache.set_tags(file_path, sample_tags)
+            assert len(cache._pending_writes) == 3
+
+        assert cache._pending_writes == {}
+        assert cache.get_cache_stats()["cached_files"] == 3
+        assert len(cache.get_tags(files[0])) == 2
+
+    @pytest.mark.cache_isolation
+    def test_batched_writes_flush_at_max_files(
+        self, cache, sample_tags, temp_cache_dir
+    ):
+        """Test that reaching max_files commits the pending batch."""
+        with cache.batched_writes(max_files=2, max_delay_ms=60_000):
+            for i in range(3):
+                file_path = temp_cache_dir / f"batched_{i}.py"
+                file_path.write_text(f"x = {i}\n")
+                cache.set_tags(str(file_path), sample_tags)
+            assert len(cache._pending_writes) == 1
+
+    @pytest.mark.cache_isolation
+    def test_unrelated_reads_keep_batch_pending(
+        self, cache, sample_tags, temp_cache_dir
+    ):
+        """Test that cache misses for other files do not flush the batch."""
+        other_file = temp_cache_dir / "other.py"
+        other_file.write_text("y = 2\n")
+
+        with cache.batched_writes(max_files=100, max_delay_ms=60_000):
+            cache.set_tags(sample_tags[0].file, sample_tags)
+            assert cache.get_tags(str(other_file)) is None
+            assert len(cache._pending_writes) == 1
+
+    @pytest.mark.cache_isolation
+    def test_reads_see_buffered_writes(self, cache, sample_tags):
+        """Test that reads inside a batch flush pending writes first."""
+        file_path = sample_tags[0].file
+
+        with cache.batched_writes(max_files=100, max_delay_ms=60_000):
+            cache.set_tags(file_path, sample_tags)
+            retrieved = cache.get_tags(file_path)
+            assert cache._pending_writes == {}
+
+        assert retrieved is not None
+        assert len(retrieved) == 2
+
+    @pytest.mark.cache_isolation
+    def test_unchanged_file_skips_content_hash(
+        self, cache, sample_tags, temp_cache_dir
+    ):
+        """Test that a matching stat fingerprint avoids re-hashing the file."""
+        test_file = temp_cache_dir / "old_file.py"
+        test_file.write_text("def test(): pass\n")
+        # Age the file so its fingerprint is outside the racy window
+        old_time = datetime.now().timestamp() - 60
+        os.utime(test_file, (old_time, old_time))
+        cache.set_tags(str(test_file), sample_tags)
+
+        def fail_hash(file_path):
+            raise AssertionError("content hash should not be computed")
+
+        cache._compute_file_hash = fail_hash
+
+        assert cache.get_tags(str(test_file)) is not None
+        assert str(test_file) in cache.get_tags_bulk([str(test_file)])
+
+    @pytest.mark.cache_isolation
+    def test_touched_file_revalidated_by_hash(self, cache, sample_tags, temp_cache_dir):
+        """Test that a touched but unchanged file stays cached."""
+        test_file = temp_cache_dir / "touched.py"
+        test_file.write_text("def test(): pass\n")
+        old_time = datetime.now().timestamp() - 120
+        os.utime(test_file, (old_time, old_time))
+        cache.set_tags(str(test_file), sample_tags)
+
+        # Change mtime only; content stays the same
+        new_time = old_time + 60
+        os.utime(test_file, (new_time, new_time))
+
+        assert cache.get_tags(str(test_file)) is not None
+
+        conn = cache._get_connection()
+        mtime_ns = conn.execute(
+            "SELECT mtime_ns FROM file_cache WHERE file_path = ?", (str(test_file),)
+        ).fetchone()[0]
+        assert mtime_ns == test_file.stat().st_mtime_ns
+
+    @pytest.mark.cache_isolation
+    def test_racy_entry_hashed_once(self, cache, sample_tags, temp_cache_dir):
+        """Test that a racy entry is trusted again after one matching hash."""
+        test_file = temp_cache_dir / "racy.py"
+        test_file.write_text("def test(): pass\n")
+        old_time = datetime.now().timestamp() - 60
+        os.utime(test_file, (old_time, old_time))
+        cache.set_tags(str(test_file), sample_tags)
+
+        # Pretend the entry was written right after the file was saved
+        conn = cache._get_connection()
+        with conn:
+            conn.execute(
+                "UPDATE file_cache SET cached_at = ? WHERE file_path = ?",
+                (old_time + 1, str(test_file)),
+            )
+
+        hashed = []
+        compute_hash = cache._compute_file_hash
+
+        def counting_hash(file_path):
+            hashed.append(file_path)
+            return compute_hash(file_path)
+
+        cache._compute_file_hash = counting_hash
+
+        assert cache.get_tags(str(test_file)) is not None
+        assert cache.get_tags(str(test_file)) is not None
+        assert str(test_file) in cache.get_tags_bulk([str(test_file)])
+        assert hashed == [str(test_file)]
+
+    @pytest.mark.cache_isolation
+    def test_read_only_lookup_keeps_batch_pending(
+        self, cache, sample_tags, temp_cache_dir
+    ):
+        """Test that read-only lookups skip buffered files instead of flushing."""
+        committed = temp_cache_dir / "committed.py"
+        committed.write_text("x = 1\n")
+        cache.set_tags(str(committed), sample_tags)
+        paths = [str(committed), sample_tags[0].file]
+
+        with cache.batched_writes(max_files=100, max_delay_ms=60_000):
+            cache.set_tags(sample_tags[0].file, sample_tags)
+            assert cache.get_valid_files(paths, read_only=True) == {str(committed)}
+            assert list(cache.get_tags_bulk(paths, read_only=True)) == [str(committed)]
+            assert len(cache._pending_writes) == 1
+
+    @pytest.mark.cache_isolation
+    def test_read_only_lookup_does_not_write(self, cache, sample_tags, temp_cache_dir):
+        """Test that read-only lookups queue fingerprint refreshes for the
+        next write instead of taking the write lock."""
+        test_file = temp_cache_dir / "touched.py"
+        test_file.write_text("def test(): pass\n")
+        old_time = datetime.now().timestamp() - 120
+        os.utime(test_file, (old_time, old_time))
+        cache.set_tags(str(test_file), sample_tags)
+        os.utime(test_file, (old_time + 60, old_time + 60))
+
+        # Another connection holds the write lock for the whole lookup
+        writer = sqlite3.connect(str(cache.db_path), timeout=0)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            assert cache.get_valid_files([str(test_file)], read_only=True) == {
+                str(test_file)
+            }
+        finally:
+            writer.rollback()
+            writer.close()
+        assert len(cache._pending_refreshes) == 1
+
+        cache.flush()
+        mtime_ns = (
+            cache._get_connection()
+            .execute(
+                "SELECT mtime_ns FROM file_cache WHERE file_path = ?",
+                (str(test_file),),
+            )
+            .fetchone()[0]
+        )
+        assert mtime_ns == test_file.stat().st_mtime_ns
+        assert cache._pending_refreshes == []
+
+    @pytest.mark.cache_isolation
+    def test_blake2b_hash_algorithm(self, temp_cache_dir, sample_tags):
+        """Test caching with a non-default content hash."""
+        cache = TreeSitterTagCache(cache_dir=temp_cache_dir, hash_algorithm="blake2b")
+        file_path = sample_tags[0].file
+
+        cache.set_tags(file_path, sample_tags)
+
+        assert len(cache._compute_file_hash(file_path)) == 32
+        assert cache.get_tags(file_path) is not None
+
+    def test_invalid_hash_algorithm(self, temp_cache_dir):
+        """Test that unknown hash algorithms are rejected."""
+        with pytest.raises(ValueError, match="Invalid hash algorithm"):
+            TreeSitterTagCache(cache_dir=temp_cache_dir, hash_algorithm="md5")
+
+    @pytest.mark.cache_isolation
+    def test_legacy_schema_is_migrated(self, temp_cache_dir, sample_tags):
+        """Test that databases without fingerprint columns are upgraded."""
+        import sqlite3
+
+        conn = sqlite3.connect(str(temp_cache_dir / "tags.db"))
+        conn.execute(
+            "CREATE TABLE file_cache (file_path TEXT PRIMARY KEY, "
+            "file_hash TEXT NOT NULL, mtime REAL NOT NULL, cached_at REAL NOT NULL)"
+        )
+        conn.commit()
+        conn.close()
+
+        cache = TreeSitterTagCache(cache_dir=temp_cache_dir)
+        file_path = sample_tags[0].file
+        cache.set_tags(file_path, sample_tags)
+
+        assert cache.get_tags(file_path) is not None
+
+
+class TestIdentifierIndex:
+    """Test the in-memory identifier -> locations index."""
+
+    def _tags(self, file_path, *names_and_kinds):
+        return [
+            CodeTag(name=name, kind=kind, file=file_path, line=i + 1)
+            for i, (name, kind) in enumerate(names_and_kinds)
+        ]
+
+    def test_definitions_come_first(self):
+        index = IdentifierIndex.from_tags(
+            {
+                "a.py": self._tags("a.py", ("load", "name.reference.call")),
+                "b.py": self._tags(
+                    "b.py",
+                    ("load", "name.reference.call"),
+                    ("load", "name.definition.function"),
+                ),
+            }
+        )
+
+        assert index.identifiers == ["load"]
+        assert index.primary_location("load") == IdentifierLocation(
+            "b.py", 2, "name.definition.function"
+        )
+        assert [loc.file for loc in index.locations("load")] == ["b.py", "a.py", "b.py"]
+        assert index.primary_location("missing") is None
+        assert index.locations("missing") == []
+
+    def test_replace_and_remove_file(self):
+        index = IdentifierIndex.from_tags(
+            {
+                "a.py": self._tags("a.py", ("old", "name.definition.function")),
+                "b.py": self._tags("b.py", ("old", "name.reference.call")),
+            }
+        )
+
+        index.replace_file("a.py", self._tags("a.py", ("new", "name.definition.class")))
+        assert sorted(index.identifiers) == ["new", "old"]
+        assert index.primary_location("old").file == "b.py"
+
+        index.replace_file("b.py", None)
+        assert index.identifiers == ["new"]
+        assert len(index) == 1
+
+
+class TestSearchLocations:
+    """Test that search results report locations from the identifier index."""
+
+    def test_result_reports_definition_before_reference(self, tmp_path, monkeypatch):
+        from repomap_tool.cli.services import get_service_factory
+        from repomap_tool.models import RepoMapConfig, SearchRequest
+
+        monkeypatch.setenv("REPOMAP_DISABLE_CACHE", "0")
+        project = tmp_path / "project"
+        project.mkdir()
+        # a.py sorts first, so its reference is seen before the definition
+        (project / "a.py").write_text(
+            "from b import load_settings\n\nload_settings()\n"
+        )
+        (project / "b.py").write_text("\n\ndef load_settings():\n    pass\n")
+
+        config = RepoMapConfig(
+            project_root=str(project), cache_dir=str(tmp_path / "cache")
+        )
+        service = get_service_factory().create_repomap_service(config)
+        service.analyze_project()
+
+        response = service.search_identifiers(
+            SearchRequest(query="load_settings", match_type="fuzzy")
+        )
+
+        result = next(r for r in response.results if r.identifier == "load_settings")
+        assert result.file_path == str(project / "b.py")
+        assert result.line_number == 3
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the sparse TF-IDF index and the matchers built on it.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from repomap_tool.code_search.tfidf_index import TfidfIndex, top_k_indices
+
+WORDS = ["get", "set", "user", "load", "data", "cache", "auth", "token", "node"]
+
+QUERIES = ["auth", "load user", "cacheData", "get_user_token", "xyz", ""]
+
+
+def _generated_identifiers(count: int = 400):
+    rng = random.Random(7)
+    identifiers = set()
+    while len(identifiers) < count:
+        parts = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.5:
+            identifiers.add("_".join(parts))
+        else:
+            identifiers.add(parts[0] + "".join(p.title() for p in parts[1:]))
+    return identifiers
+
+
+@pytest.fixture(scope="module")
+def learned_matcher(session_container):
+    matcher = session_container.adaptive_semantic_matcher(verbose=False)
+    matcher.learn_from_identifiers(_generated_identifiers())
+    return matcher
+
+
+def test_top_k_indices_orders_and_keeps_ties_stable():
+    scores = np.array([0.2, 0.9, 0.5, 0.9, 0.1])
+
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+    assert top_k_indices(scores, None).tolist() == [1, 3, 2, 0, 4]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 0, 4]
+    assert top_k_indices(scores, 0).tolist() == []
+
+
+def test_index_only_scores_identifiers_sharing_a_word():
+    index = TfidfIndex(
+        {"get_user": ["get", "user"], "load_data": ["load", "data"], "x": []}
+    )
+
+    rows, scores = index.similarities(["user", "unknown"])
+
+    assert index.identifiers_at(rows) == ["get_user"]
+    assert scores[0] == pytest.approx(
+        index.idf[index.vocabulary["user"]] / index.norms[0]
+    )
+    assert len(index.similarities(["unknown"])[0]) == 0
+    assert index.rows_with_words(["data", "user"]).tolist() == [0, 1]
+    assert index.covers({"get_user", "load_data", "x"})
+    assert not index.covers({"get_user"})
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_semantic_matches_equal_pairwise_scoring(learned_matcher, query):
+    identifiers = set(learned_matcher.identifier_words)
+    expected = {
+        identifier: learned_matcher.semantic_similarity(query, identifier)
+        for identifier in identifiers
+    }
+    expected = {i: s for i, s in expected.items() if s >= 0.1}
+
+    matches = learned_matcher.find_semantic_matches(query, identifiers, 0.1)
+
+    assert {identifier for identifier, _ in matches} == set(expected)
+    for identifier, score in matches:
+        assert score == pytest.approx(expected[identifier])
+    scores = [score for _, score in matches]
+    assert scores == sorted(scores, reverse=True)
+    assert (
+        learned_matcher.find_semantic_matches(query, identifiers, 0.1, max_results=5)
+        == matches[:5]
+    )
+
+
+def test_semantic_matches_respect_the_searched_identifiers(learned_matcher):
+    searched = set(sorted(learned_matcher.identifier_words)[:40]) | {"unseen_name"}
+
+    matches = learned_matcher.find_semantic_matches("user", searched, 0.1)
+    everything = learned_matcher.find_semantic_matches("user", searched, 0.0)
+
+    assert {identifier for identifier, _ in matches} <= searched
+    assert {identifier for identifier, _ in everything} == searched
+
+
+def test_related_identifiers_exclude_the_identifier_itself(learned_matcher):
+    identifier = next(iter(sorted(learned_matcher.identifier_words)))
+
+    related = learned_matcher.get_related_identifiers(identifier, max_results=8)
+
+    assert len(related) <= 8
+    assert identifier not in {other for other, _ in related}
+    assert all(score > 0.1 for _, score in related)
+    assert learned_matcher.get_related_identifiers("never_learned") == []
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Tests for TreeSitterParser parser and compiled query caching.
+"""
+
+import random
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from repomap_tool.code_analysis.models import CodeTag
+from repomap_tool.code_analysis.tree_sitter_parser import TreeSitterParser
+
+TEST_REPO = Path(__file__).parent.parent / "fixtures" / "test-repo"
+MODULE = "repomap_tool.code_analysis.tree_sitter_parser"
+
+
+def _fixture_files():
+    return sorted(
+        str(path)
+        for path in TEST_REPO.iterdir()
+        if path.suffix in {".py", ".js", ".ts"}
+    )
+
+
+class TestTreeSitterParserCaching:
+    """Test per-language parser and query caching."""
+
+    def test_query_compiled_once_per_language(self):
+        """Parsing many files of one language compiles the query once."""
+        # The mocked tree has no real nodes to walk for comments
+        parser = TreeSitterParser(extract_comments=False)
+        files = [f for f in _fixture_files() if f.endswith(".py")]
+        assert len(files) > 1
+
+        with (
+            patch(f"{MODULE}.get_language") as mock_get_language,
+            patch(f"{MODULE}.get_parser") as mock_get_parser,
+        ):
+            mock_get_language.return_value.query.return_value.captures.return_value = {}
+            for file_path in files:
+                parser.parse_file(file_path)
+
+        assert mock_get_language.return_value.query.call_count == 1
+        assert mock_get_parser.call_count == 1
+        assert mock_get_parser.return_value.parse.call_count == len(files)
+
+    def test_parsers_are_thread_local(self):
+        """Each thread gets its own parser instance."""
+        parser = TreeSitterParser()
+        seen = []
+
+        with patch(f"{MODULE}.get_parser", side_effect=lambda lang: MagicMock()):
+
+            def worker():
+                seen.append(parser._get_parser("python"))
+                seen.append(parser._get_parser("python"))
+
+            threads = [threading.Thread(target=worker) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(seen) == 4
+        assert len({id(p) for p in seen}) == 2
+
+    def test_missing_query_is_not_reloaded(self):
+        """A language without a query file is only looked up once."""
+        parser = TreeSitterParser()
+
+        with patch.object(parser, "_load_query", return_value=None) as mock_load:
+            assert parser._get_compiled_query("cobol") is None
+            assert parser._get_compiled_query("cobol") is None
+
+        assert mock_load.call_count == 1
+
+    def test_cached_parse_matches_fresh_parse(self):
+        """Reusing parsers and queries yields the same tags as fresh ones."""
+        parser = TreeSitterParser()
+        files = _fixture_files()
+
+        warm = {f: parser.parse_file(f) for f in files}
+        warm_again = {f: parser.parse_file(f) for f in files}
+        fresh = {f: TreeSitterParser().parse_file(f) for f in files}
+
+        def key(tags):
+            # Query.captures does not return nodes in a stable order
+            return sorted((t.name, t.kind, t.line, t.column) for t in tags)
+
+        for file_path in files:
+            expected = key(fresh[file_path])
+            assert key(warm[file_path]) == expected
+            assert key(warm_again[file_path]) == expected
+
+    def test_cached_parse_overhead_not_higher(self):
+        """Reusing compiled queries and parsers costs no more per file than
+        rebuilding them for every file."""
+        files = _fixture_files()
+        rounds = 5
+        parser = TreeSitterParser()
+
+        def best_round(reset: bool) -> float:
+            # The fastest round, so scheduler noise does not decide the test
+            best = float("inf")
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for file_path in files:
+                    if reset:
+                        parser._local = threading.local()
+                    parser.parse_file(file_path)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        uncached = best_round(reset=True)
+        for file_path in files:
+            parser.parse_file(file_path)
+        cached = best_round(reset=False)
+
+        assert cached <= uncached
+
+
+class TestParsedFileAnalysis:
+    """Test the memoized per-file analysis shared by analyzers."""
+
+    def test_analysis_is_memoized_until_file_changes(self, tmp_path):
+        """An unchanged file is parsed once; a modified file is re-parsed."""
+        source = tmp_path / "module.py"
+        source.write_text("import os\n\n\ndef main():\n    os.getcwd()\n")
+        parser = TreeSitterParser()
+
+        with patch.object(
+            parser, "_parse_code", wraps=parser._parse_code
+        ) as mock_parse:
+            first = parser.analyze_file(str(source))
+            second = parser.analyze_file(str(source))
+            assert first is second
+            assert mock_parse.call_count == 1
+
+            source.write_text("def main():\n    pass\n\n\ndef other():\n    pass\n")
+            third = parser.analyze_file(str(source))
+            assert mock_parse.call_count == 2
+
+        assert first.line_count == 5
+        assert third.line_count == 6
+        assert any(tag.name == "other" for tag in third.tags)
+
+    def test_analysis_splits_imports_and_calls(self, tmp_path):
+        """Imports and calls are the matching subsets of the parsed tags."""
+        source = tmp_path / "module.py"
+        source.write_text("import os\n\n# Entry point\ndef main():\n    os.getcwd()\n")
+        parser = TreeSitterParser()
+
+        parsed = parser.analyze_file(str(source))
+
+        assert parsed.error is None
+        assert parsed.content == source.read_text()
+        assert all(tag in parsed.tags for tag in parsed.imports + parsed.calls)
+        assert all("import" in tag.kind for tag in parsed.imports)
+        assert all(tag.kind == "name.reference.call" for tag in parsed.calls)
+        assert any(c["text"] == "# Entry point" for c in parsed.comments)
+
+    def test_unreadable_file_reports_error(self, tmp_path):
+        """Missing or undecodable files yield an empty record with an error."""
+        parser = TreeSitterParser()
+        binary = tmp_path / "binary.py"
+        binary.write_bytes(b"\xff\xfe\x00invalid")
+
+        missing = parser.analyze_file(str(tmp_path / "missing.py"))
+        undecodable = parser.analyze_file(str(binary))
+
+        for parsed in (missing, undecodable):
+            assert parsed.error
+            assert parsed.tags == []
+            assert parsed.line_count == 0
+
+    def test_analysis_cache_is_bounded(self, tmp_path):
+        """The least recently used record is evicted past the size limit."""
+        parser = TreeSitterParser(analysis_cache_size=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.py"
+            path.write_text(f"def {name}():\n    pass\n")
+            paths.append(str(path))
+            parser.analyze_file(str(path))
+
+        assert list(parser._analysis_cache) == paths[1:]
+
+        with pytest.raises(ValueError):
+            TreeSitterParser(analysis_cache_size=0)
+
+    def test_analyzers_share_a_single_parse(self, tmp_path):
+        """Import, call and file analyzers parse each file only once."""
+        from repomap_tool.code_analysis.ast_file_analyzer import ASTFileAnalyzer
+        from repomap_tool.code_analysis.call_graph_builder import CallGraphBuilder
+        from repomap_tool.code_analysis.import_analyzer import ImportAnalyzer
+
+        source = tmp_path / "module.py"
+        source.write_text("import os\n\n\ndef main():\n    os.getcwd()\n")
+        parser = TreeSitterParser(project_root=str(tmp_path))
+
+        with patch.object(
+            parser, "_parse_code", wraps=parser._parse_code
+        ) as mock_parse:
+            ImportAnalyzer(
+                str(tmp_path), tree_sitter_parser=parser
+            ).analyze_file_imports(str(source))
+            CallGraphBuilder(
+                str(tmp_path), tree_sitter_parser=parser
+            ).analyze_file_calls(str(source))
+            result = ASTFileAnalyzer(
+                str(tmp_path), tree_sitter_parser=parser
+            ).analyze_file(str(source))
+            parser.get_tags(str(source))
+
+        assert mock_parse.call_count == 1
+        assert result.line_count == 5
+
+
+class TestCommentAssociation:
+    """Test comment collection and matching to tags."""
+
+    @staticmethod
+    def _comment(line, text):
+        return {"text": text, "line": line, "column": 0}
+
+    @staticmethod
+    def _tag(line):
+        return CodeTag(
+            name=f"n{line}", kind="name.definition.function", file="f.py", line=line
+        )
+
+    def test_nearest_preceding_comment_within_five_lines(self):
+        """Each tag gets the closest earlier comment, first one on a shared line."""
+        parser = TreeSitterParser()
+        comments = [
+            self._comment(1, "# header"),
+            self._comment(3, "/* first */"),
+            self._comment(3, "/* second */"),
+            self._comment(20, "# far below"),
+        ]
+        tags = [self._tag(1), self._tag(4), self._tag(9), self._tag(21)]
+
+        parser._associate_comments_with_code(tags, comments, "")
+
+        assert [tag.comment for tag in tags] == [None, "first", None, "far below"]
+
+    def test_bisect_matches_linear_scan(self):
+        """Bisect matching picks the same comment as scanning every comment."""
+        rng = random.Random(7)
+        parser = TreeSitterParser()
+        lines = sorted(rng.randint(1, 400) for _ in range(150))
+        comments = [self._comment(line, f"# c{i}") for i, line in enumerate(lines)]
+        tags = [self._tag(rng.randint(1, 420)) for _ in range(300)]
+
+        def linear(tag_line):
+            best, best_distance = None, float("inf")
+            for comment in comments:
+                distance = tag_line - comment["line"]
+                if 0 < distance <= 5 and distance < best_distance:
+                    best, best_distance = comment["text"][2:], distance
+            return best
+
+        parser._associate_comments_with_code(tags, comments, "")
+
+        assert [tag.comment for tag in tags] == [linear(tag.line) for tag in tags]
+
+    def test_comment_walk_stops_on_stuck_cursor(self):
+        """A cursor that never reaches the end is bounded by descendant_count."""
+        parser = TreeSitterParser()
+        node = MagicMock(descendant_count=10)
+        cursor = node.walk.return_value
+        cursor.node.type = "identifier"
+        cursor.goto_first_child.return_value = True
+        comment_nodes = []
+
+        parser._find_comment_nodes(node, comment_nodes)
+
+        assert comment_nodes == []
+        assert cursor.goto_first_child.call_count == 10
+
+    def test_comment_extraction_can_be_disabled(self):
+        """With extract_comments=False no comment walk happens."""
+        parser = TreeSitterParser(extract_comments=False)
+        files = [f for f in _fixture_files() if f.endswith(".py")]
+
+        with (
+            patch(f"{MODULE}.get_language") as mock_get_language,
+            patch(f"{MODULE}.get_parser"),
+            patch.object(parser, "_find_comment_nodes") as mock_find,
+        ):
+            mock_get_language.return_value.query.return_value.captures.return_value = {}
+            parsed = parser.analyze_file(files[0])
+
+        mock_find.assert_not_called()
+        assert parsed.comments == []